@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Summarize traces recorded by tap.py.
+
+Reports per-method request counts, errors, latency percentiles and message
+sizes, how many requests were in flight at once, and the client workload as a
+--mix string for bench.py:
+
+    python -m mcp_testing.scripts.analyze_trace ~/mcp-traces --output-dir reports --json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the parent directory to the Python path
+parent_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(parent_dir))
+
+from mcp_testing.utils.reporter import latency_to_markdown
+from mcp_testing.utils.trace import analyze_trace, read_trace, trace_files, trace_to_markdown
+
+
+def log_with_timestamp(message):
+    """Log a message with a timestamp prefix."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {message}")
+
+
+def main():
+    """Analyze the traces and write the report."""
+    parser = argparse.ArgumentParser(description="Summarize MCP traffic traces recorded by tap.py.")
+    parser.add_argument("traces", nargs="+", help="Trace segments (.ndjson.gz) or directories containing them")
+    parser.add_argument("--output-dir", default="reports", help="Directory to store the report")
+    parser.add_argument("--json", action="store_true", help="Also write the analysis as JSON")
+    args = parser.parse_args()
+
+    files = trace_files(args.traces)
+    if not files:
+        log_with_timestamp("No trace segments found")
+        return 1
+    analysis = analyze_trace(read_trace(files))
+    log_with_timestamp(f"Analyzed {analysis['frames']} frames from {analysis['sessions']} sessions "
+                       f"in {len(files)} segments")
+    for method, stats in analysis["methods"].items():
+        log_with_timestamp(f"{method}: {stats['requests']} requests, {stats['errors']} errors")
+    if analysis["mix"]:
+        log_with_timestamp(f"Bench mix: {analysis['mix']}")
+
+    output_dir = os.path.join(parent_dir, args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    report_basename = f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    if args.json:
+        json_path = os.path.join(output_dir, f"{report_basename}.json")
+        with open(json_path, "w") as f:
+            json.dump({"traces": files, **analysis}, f, indent=2)
+        log_with_timestamp(f"JSON analysis saved to: {json_path}")
+
+    lines = ["# MCP Traffic Trace Analysis", ""]
+    lines.extend(trace_to_markdown(analysis))
+    latency_lines = latency_to_markdown(analysis["latency"])
+    if latency_lines:
+        lines.append("")
+        lines.extend(latency_lines)
+    markdown_path = os.path.join(output_dir, f"{report_basename}.md")
+    with open(markdown_path, "w") as f:
+        f.write("\n".join(lines))
+    log_with_timestamp(f"Markdown trace analysis generated: {markdown_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
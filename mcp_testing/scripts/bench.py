@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Benchmark an MCP server under load (mcp-bench).
+
+This script drives a weighted mix of MCP requests against a STDIO server and
+reports throughput, error rate and latency percentiles.
+
+Load Models:
+    Closed loop (default): --concurrency sessions each send their next request as
+    soon as the previous one completes.
+
+    Open loop (--rate): requests arrive at a fixed rate. Latency is measured from
+    each request's scheduled arrival, so queueing behind a slow server is counted
+    rather than hidden (coordinated omission).
+
+Workload Mix:
+    --mix takes comma-separated operation=weight entries. An operation is an MCP
+    method, optionally followed by a target:
+
+        ping=5,tools/call:echo=3,resources/read=1
+
+    tools/call arguments are generated from the tool's input schema. resources/read
+    without a target reads the first resource returned by resources/list.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the parent directory to the Python path
+parent_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(parent_dir))
+
+from mcp_testing.utils.load_generator import (
+    BenchmarkSession,
+    LoadGenerator,
+    WorkloadMix,
+    benchmark_to_markdown
+)
+from mcp_testing.utils.reporter import extract_server_name
+from mcp_testing.transports.dispatcher import ClientRequestDispatcher, load_responders, server_requests_to_markdown
+from mcp_testing.utils.server_compatibility import prepare_environment_for_server
+
+
+def log_with_timestamp(message):
+    """Log a message with a timestamp prefix."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {message}")
+
+
+def main():
+    """Run the benchmark and generate a report."""
+    parser = argparse.ArgumentParser(description="Benchmark an MCP server under load.")
+    parser.add_argument("--server-command", required=True, help="Command to start the server")
+    parser.add_argument(
+        "--protocol-version",
+        choices=["2024-11-05", "2025-03-26", "2025-06-18"],
+        default="2025-06-18",
+        help="Protocol version to use"
+    )
+    parser.add_argument("--args", help="Additional arguments to pass to the server")
+    parser.add_argument("--mix", default="ping", help="Workload mix, e.g. 'ping=5,tools/call:echo=3,resources/read=1'")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of concurrent sessions")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured run time in seconds")
+    parser.add_argument("--requests", type=int, help="Closed loop only: stop after this many measured requests")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured warmup time in seconds")
+    parser.add_argument("--seed", type=int, help="Random seed for a reproducible operation sequence")
+    parser.add_argument("--output-dir", default="reports", help="Directory to store reports")
+    parser.add_argument("--responders",
+                        help="JSON file with canned, scripted or delayed answers to server-to-client requests")
+    parser.add_argument("--json", action="store_true", help="Generate JSON report")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args()
+
+    full_server_command = args.server_command
+    if args.args:
+        full_server_command = f"{full_server_command} {args.args}"
+
+    try:
+        mix = WorkloadMix.parse(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        dispatcher = ClientRequestDispatcher(load_responders(args.responders) if args.responders else None,
+                                             workers=max(4, args.concurrency))
+    except (OSError, ValueError) as e:
+        parser.error(f"--responders: {e}")
+
+    env_vars = prepare_environment_for_server(full_server_command)
+    env_vars["MCP_PROTOCOL_VERSION"] = args.protocol_version
+
+    def session_factory(index):
+        return BenchmarkSession(
+            full_server_command,
+            args.protocol_version,
+            env_vars=env_vars,
+            name=f"bench-{index}",
+            debug=args.debug,
+            dispatcher=dispatcher
+        )
+
+    generator = LoadGenerator(session_factory, mix, concurrency=args.concurrency, seed=args.seed)
+
+    log_with_timestamp(f"Benchmarking: {full_server_command}")
+    log_with_timestamp(f"Workload mix: {', '.join(mix.labels())}")
+    if args.rate:
+        log_with_timestamp(f"Open loop at {args.rate:g} req/s for {args.duration:g}s "
+                           f"({args.concurrency} sessions, {args.warmup:g}s warmup)")
+        summary = generator.run_open_loop(args.rate, args.duration, warmup=args.warmup)
+    else:
+        duration = None if args.requests else args.duration
+        log_with_timestamp(f"Closed loop with {args.concurrency} sessions "
+                           f"({args.warmup:g}s warmup)")
+        summary = generator.run_closed_loop(duration=duration, requests=args.requests,
+                                            warmup=args.warmup)
+
+    dispatcher.close()
+    summary["server_requests"] = dispatcher.summary()
+    for method, stats in summary["server_requests"].items():
+        log_with_timestamp(f"Server request {method}: {stats['count']} answered, "
+                           f"p50 round trip {stats['p50'] * 1000:.2f}ms")
+
+    overall = summary["overall"]
+    log_with_timestamp(f"Requests: {overall['count']}, throughput: {overall['throughput']:.1f} req/s, "
+                       f"errors: {overall['errors']}")
+    log_with_timestamp(f"Latency p50: {overall['percentiles']['50.0'] * 1000:.2f}ms, "
+                       f"p99: {overall['percentiles']['99.0'] * 1000:.2f}ms")
+
+    output_dir = os.path.join(parent_dir, args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    server_name = extract_server_name(full_server_command)
+    report_basename = f"bench_{server_name}_{args.protocol_version}_{timestamp}"
+
+    if args.json:
+        json_report = {
+            "server": server_name,
+            "protocol_version": args.protocol_version,
+            "timestamp": timestamp,
+            "mix": mix.labels(),
+            "benchmark": summary
+        }
+        json_report_path = os.path.join(output_dir, f"{report_basename}.json")
+        with open(json_report_path, 'w') as f:
+            json.dump(json_report, f, indent=2)
+        log_with_timestamp(f"JSON report saved to: {json_report_path}")
+
+    markdown_lines = [
+        f"# {server_name} MCP Benchmark Report",
+        "",
+        "## Server Information",
+        "",
+        f"- **Server Command**: `{full_server_command}`",
+        f"- **Protocol Version**: {args.protocol_version}",
+        f"- **Test Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"- **Workload Mix**: `{args.mix}`",
+        "- **Validator**: Janix",
+        ""
+    ]
+    markdown_lines.extend(benchmark_to_markdown(summary))
+    if summary["server_requests"]:
+        markdown_lines.append("")
+        markdown_lines.extend(server_requests_to_markdown(summary["server_requests"]))
+
+    markdown_report_path = os.path.join(output_dir, f"{report_basename}.md")
+    with open(markdown_report_path, 'w') as f:
+        f.write("\n".join(markdown_lines))
+    log_with_timestamp(f"Markdown benchmark report generated: {markdown_report_path}")
+
+    return 0 if overall["count"] > 0 and overall["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        log_with_timestamp("Benchmark interrupted by user")
+        sys.exit(130)
+    except Exception as e:
+        log_with_timestamp(f"Error running benchmark: {str(e)}")
+        sys.exit(1)
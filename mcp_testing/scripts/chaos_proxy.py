@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Chaos proxy between an MCP client and server.
+
+STDIO mode wraps a server command; the proxy is started in its place and relays
+stdin and stdout with the faults of the profile:
+
+    python mcp_testing/scripts/chaos_proxy.py --profile chaos.json -- python server.py
+
+HTTP mode is a reverse proxy in front of a running server; point the client at
+the printed URL instead of the server:
+
+    python mcp_testing/scripts/chaos_proxy.py --profile chaos.json --target http://localhost:9000 --listen 127.0.0.1:9100
+
+compliance_report --chaos wraps the server command automatically.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the Python path
+parent_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(parent_dir))
+
+from mcp_testing.utils.chaos import ChaosHTTPProxy, ChaosProfile, run_stdio_proxy
+
+
+def main():
+    """Run the chaos proxy."""
+    parser = argparse.ArgumentParser(description="Inject latency, reordering, duplicates and drops "
+                                                 "between an MCP client and server.")
+    parser.add_argument("--profile", required=True, help="JSON chaos profile")
+    parser.add_argument("--stats", help="Append the session's fault counters to this file as a JSON line")
+    parser.add_argument("--target", help="HTTP mode: base URL of the server")
+    parser.add_argument("--listen", default="127.0.0.1:0", help="HTTP mode: address to listen on (host:port)")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="STDIO mode: -- server command")
+    args = parser.parse_args()
+
+    try:
+        profile = ChaosProfile.load(args.profile)
+    except (OSError, ValueError) as e:
+        parser.error(f"--profile: {e}")
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+    if args.target:
+        host, _, port = args.listen.rpartition(":")
+        proxy = ChaosHTTPProxy(profile, args.target, host or "127.0.0.1", int(port or 0)).start()
+        # stderr, so the URL can be read while stdout stays free for the caller
+        print(f"Chaos proxy for {args.target} listening on {proxy.url}", file=sys.stderr, flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            proxy.stop()
+            if args.stats:
+                with open(args.stats, "a") as f:
+                    f.write(json.dumps(proxy.stats()) + "\n")
+        return 0
+
+    if not command:
+        parser.error("give a server command after -- (STDIO mode) or --target (HTTP mode)")
+    return run_stdio_proxy(profile, command, args.stats)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,17 +34,59 @@ import asyncio
 import json
 import os
 import sys
+import tempfile
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Callable, Dict, Any
+from typing import List, Callable, Dict, Any, Optional
 
 # Add the parent directory to the Python path
 parent_dir = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(parent_dir))
 
 from mcp_testing.utils.runner import run_tests
-from mcp_testing.utils.reporter import results_to_markdown, extract_server_name, generate_markdown_report
+from mcp_testing.utils.reporter import results_to_markdown, extract_server_name, generate_markdown_report, latency_to_markdown
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.resource_monitor import ResourceMonitor, resources_to_markdown
+from mcp_testing.utils.load_generator import create_protocol_adapter
+from mcp_testing.utils.startup import measure_startup, startup_to_markdown
+from mcp_testing.utils.result_sink import ResultSink, PhaseTimer, create_result_sink
+from mcp_testing.utils.history import (
+    RunHistory,
+    compare_to_history,
+    history_to_markdown,
+    DEFAULT_HISTORY_RUNS,
+    DEFAULT_REGRESSION_ALPHA,
+    DEFAULT_REGRESSION_MIN_RATIO
+)
+from mcp_testing.utils.sharding import select_shard, parse_shard_spec
+from mcp_testing.utils.cancellation import (
+    DEFAULT_CANCEL_GRACE,
+    cancel_after_timeout,
+    cancellation_to_markdown,
+    summarize_cancellations,
+)
+from mcp_testing.utils.chaos import (
+    ChaosProfile,
+    chaos_server_command,
+    chaos_to_markdown,
+    read_chaos_stats,
+    summarize_chaos,
+)
+from mcp_testing.utils.timeouts import (
+    AdaptiveTimeouts,
+    DEFAULT_LEARN_RUNS,
+    DEFAULT_TIMEOUT_FACTOR,
+    DEFAULT_TIMEOUT_FLOOR,
+    timeouts_to_markdown,
+)
+from mcp_testing.utils.soak import (
+    SoakRunner,
+    parse_soak_spec,
+    soak_to_markdown,
+    DEFAULT_MAX_RSS_SLOPE_MB_PER_HOUR,
+    DEFAULT_MAX_LATENCY_DRIFT_PCT_PER_HOUR
+)
 from mcp_testing.tests.base_protocol.test_initialization import TEST_CASES as INIT_TEST_CASES
 from mcp_testing.tests.features.test_tools import TEST_CASES as TOOLS_TEST_CASES
 from mcp_testing.tests.features.test_async_tools import TEST_CASES as ASYNC_TOOLS_TEST_CASES
@@ -54,11 +96,24 @@ from mcp_testing.tests.features.test_2025_06_18 import TEST_CASES as TEST_2025_0
 from mcp_testing.tests.specification_coverage import TEST_CASES as SPEC_COVERAGE_TEST_CASES
 
 # Imports for adapters
+from mcp_testing.transports.base import MCPTransportAdapter
 from mcp_testing.transports.stdio import StdioTransportAdapter
+from mcp_testing.transports.dispatcher import (
+    ClientRequestDispatcher,
+    Responder,
+    load_responders,
+    server_requests_to_markdown,
+)
+from mcp_testing.transports.mirror import MirroringTransportAdapter
 from mcp_testing.protocols.v2024_11_05 import MCP2024_11_05Adapter
 from mcp_testing.protocols.v2025_03_26 import MCP2025_03_26Adapter
 from mcp_testing.protocols.v2025_06_18 import MCP2025_06_18Adapter
 from mcp_testing.protocols.base import MCPProtocolAdapter
+from mcp_testing.utils.differential import (
+    parse_ignore_paths,
+    summarize_differential,
+    differential_to_markdown
+)
 
 # Import server compatibility utilities
 try:
@@ -105,23 +160,73 @@ def is_http_url(server_command: str) -> bool:
     """Check if the server command is an HTTP URL."""
     return server_command.startswith("http://") or server_command.startswith("https://")
 
+def get_responders(args) -> Optional[Dict[str, Responder]]:
+    """Load the --responders file, if one was given."""
+    path = getattr(args, "responders", None)
+    return load_responders(path) if path else None
+
+def is_tool_test(test_name: str) -> bool:
+    """Return True for tests that run with --tools-timeout."""
+    return test_name.startswith("test_tool_") or test_name.startswith("test_tools_")
+
 # Create a custom test runner that adds additional logging
 class VerboseTestRunner:
     """A test runner that provides verbose output during test execution."""
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, resource_interval: float = 0.0,
+                 sink: ResultSink = None, cancel_grace: float = DEFAULT_CANCEL_GRACE,
+                 responders: Optional[Dict[str, Responder]] = None):
         """Initialize the test runner.
 
         Parameters
         ----------
         debug
             Enable verbose logging from the transport + protocol layers.
+        resource_interval
+            Seconds between samples of the server's resource usage; 0 disables sampling.
+        sink
+            Receives each test result as soon as the test has finished.
+        cancel_grace
+            Seconds a server has to answer a ping after a timed-out test's requests are cancelled.
+        responders
+            Answers to requests the server sends the client (sampling, roots, elicitation), by method;
+            the defaults cover every method not given.
         """
         self.debug = debug
+        self.resource_interval = resource_interval
+        self.sink = sink or ResultSink()
+        self.cancel_grace = cancel_grace
+        # Request latency by method, accumulated over every test this runner executes
+        self.latency = LatencyRecorder()
+        # serverInfo from the most recent successful initialize
+        self.server_info: Dict[str, Any] = {}
+        # Answers server-to-client requests for every test's transport
+        self.dispatcher = ClientRequestDispatcher(responders)
+    
+    def _create_transport(self, test_name: str, server_command: str,
+                          env_vars: Dict[str, str]) -> MCPTransportAdapter:
+        """
+        Create the transport adapter used for a single test.
+        
+        Args:
+            test_name: Name of the test the transport is created for
+            server_command: Command to start the server
+            env_vars: Environment variables to set
+            
+        Returns:
+            A transport adapter that has not been started yet
+        """
+        return StdioTransportAdapter(
+            server_command=server_command,
+            env_vars=env_vars,
+            debug=self.debug,
+            dispatcher=self.dispatcher
+        )
     
     async def run_tests(self, tests: List[Callable], protocol: str, server_command: str, 
                        env_vars: Dict[str, str], debug: bool = False, 
-                       timeout: float = 30.0) -> Dict[str, Any]:
+                       timeout: float = 30.0,
+                       adaptive_timeouts: Optional[AdaptiveTimeouts] = None) -> Dict[str, Any]:
         """
         Run a list of tests with verbose output.
         
@@ -132,6 +237,8 @@ class VerboseTestRunner:
             env_vars: Environment variables to set
             debug: Whether to enable debug output
             timeout: Test timeout in seconds
+            adaptive_timeouts: Per-test deadlines learned from history; ``timeout``
+                is the ceiling and the fallback for tests without history
             
         Returns:
             Dictionary containing test results
@@ -154,7 +261,11 @@ class VerboseTestRunner:
                 test_name = test_item.__name__
             
             start_time = time.time()
+            phases = PhaseTimer()
+            deadline, learned = (adaptive_timeouts.timeout_for(test_name, timeout)
+                                 if adaptive_timeouts else (timeout, False))
             transport_adapter = None # Ensure it's defined for finally block
+            monitor = None
             protocol_adapter: MCPProtocolAdapter = None # Ensure it's defined for finally block
 
             # Skip shutdown-related tests if shutdown is disabled
@@ -170,20 +281,23 @@ class VerboseTestRunner:
                     "message": "Test skipped because shutdown is disabled"
                 })
                 skipped += 1
+                self.sink.write(results[-1])
                 continue
 
             try:
                 log_with_timestamp(f"Running test: {test_name}")
 
                 # Create and start transport adapter
-                transport_adapter = StdioTransportAdapter(
-                    server_command=server_command,
-                    env_vars=env_vars,
-                    debug=self.debug
-                )
+                transport_adapter = self._create_transport(test_name, server_command, env_vars)
                 
                 if not transport_adapter.start():
                     raise Exception("Failed to start transport adapter")
+                phases.mark("launch")
+                
+                # Sample the server's resource usage while the test runs
+                process = getattr(transport_adapter, "process", None)
+                if self.resource_interval > 0 and process is not None:
+                    monitor = ResourceMonitor(process.pid, interval=self.resource_interval).start()
 
                 # Create protocol adapter
                 if protocol == "2024-11-05":
@@ -208,16 +322,29 @@ class VerboseTestRunner:
                 if self.debug:
                     log_with_timestamp(f"  Initializing server for {test_name}...")
                 await protocol_adapter.initialize()
+                self.server_info = protocol_adapter.server_info or self.server_info
                 if self.debug:
                     log_with_timestamp(f"  Sending initialized notification for {test_name}...")
                 await protocol_adapter.send_initialized()
+                phases.mark("initialize")
 
-                # Run the actual test function with the protocol adapter
-                test_passed, message = await asyncio.wait_for(
-                    test_func(protocol_adapter),
-                    timeout=timeout
-                )
+                # Run the actual test function with the protocol adapter; the transport
+                # deadline also stops a read that is blocked on a hung server
+                transport_adapter.set_deadline(deadline)
+                try:
+                    test_passed, message = await asyncio.wait_for(
+                        test_func(protocol_adapter),
+                        timeout=deadline
+                    )
+                except Exception:
+                    if transport_adapter.deadline_expired is True:
+                        raise asyncio.TimeoutError()
+                    raise
+                if transport_adapter.deadline_expired is True:
+                    raise asyncio.TimeoutError()
+                transport_adapter.set_deadline(None)
                 duration = time.time() - start_time
+                phases.mark("test")
                 
                 if test_passed:
                     passed += 1
@@ -240,18 +367,34 @@ class VerboseTestRunner:
 
             except asyncio.TimeoutError:
                 duration = time.time() - start_time
+                phases.mark("test")
                 timeouts += 1
                 failed += 1
-                log_with_timestamp(f"  ❌ Timeout after {duration:.2f}s for test {test_name}")
+                limit = f"{deadline:.2f}s {'learned' if learned else 'configured'} deadline"
+                log_with_timestamp(f"  ❌ Timeout after {duration:.2f}s for test {test_name} ({limit})")
                 results.append({
                     "name": test_name,
                     "passed": False,
+                    "timeout": True,
                     "duration": duration,
-                    "message": f"Test timed out after {duration:.2f}s"
+                    "message": f"Test timed out after {duration:.2f}s ({limit})"
                 })
+                # Cancel the outstanding requests so the server can be shut down normally
+                cancellation = cancel_after_timeout(
+                    transport_adapter, f"{test_name} exceeded its {deadline:.2f}s deadline", self.cancel_grace)
+                if cancellation:
+                    results[-1]["cancellation"] = cancellation
+                    if cancellation["healthy"]:
+                        log_with_timestamp(f"  Cancelled {len(cancellation['requests'])} requests; server answered "
+                                           f"a ping after {cancellation['latency'] * 1000:.1f}ms")
+                    else:
+                        log_with_timestamp(f"  Server did not recover within {self.cancel_grace:g}s of cancellation; "
+                                           "stopping it")
                 
             except Exception as e:
                 duration = time.time() - start_time
+                # Time up to the error, whichever phase it happened in
+                phases.mark("error")
                 failed += 1
                 log_with_timestamp(f"  ❌ Error during {test_name} ({duration:.2f}s): {str(e)}")
                 if self.debug:
@@ -264,6 +407,11 @@ class VerboseTestRunner:
                     "message": str(e)
                 })
             finally:
+                if monitor:
+                    resources = monitor.stop()
+                    if resources and results and results[-1]["name"] == test_name:
+                        results[-1]["resources"] = resources
+                
                 # Shutdown sequence
                 if protocol_adapter:
                     if not global_skip_shutdown:
@@ -279,7 +427,15 @@ class VerboseTestRunner:
                         log_with_timestamp(f"  Skipping shutdown for {test_name} as configured.")
                 
                 if transport_adapter:
+                    self.latency.merge(transport_adapter.latency)
                     transport_adapter.stop()
+                phases.mark("teardown")
+            
+            results[-1]["phases"] = phases.phases
+            if adaptive_timeouts:
+                results[-1]["deadline"] = deadline
+                results[-1]["deadline_learned"] = learned
+            self.sink.write(results[-1])
         
         return {
             "results": results,
@@ -290,6 +446,207 @@ class VerboseTestRunner:
             "timeouts": timeouts
         }
 
+    async def run_soak(self, soak_runner: SoakRunner, protocol: str, server_command: str,
+                       env_vars: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Run a soak on a single long-lived session.
+        
+        Args:
+            soak_runner: The configured soak runner
+            protocol: Protocol version to use
+            server_command: Command to start the server
+            env_vars: Environment variables to set
+            
+        Returns:
+            The soak summary
+        """
+        transport_adapter = self._create_transport("soak", server_command, env_vars)
+        if not transport_adapter.start():
+            raise Exception("Failed to start transport adapter")
+        
+        protocol_adapter = None
+        try:
+            protocol_adapter = create_protocol_adapter(protocol, transport_adapter, self.debug)
+            await protocol_adapter.initialize()
+            await protocol_adapter.send_initialized()
+            return await soak_runner.run(protocol_adapter, transport_adapter)
+        finally:
+            if protocol_adapter and not is_shutdown_skipped():
+                try:
+                    await protocol_adapter.shutdown()
+                    await protocol_adapter.exit()
+                except Exception as e_shutdown:
+                    if self.debug:
+                        log_with_timestamp(f"  Error during soak shutdown: {str(e_shutdown)}")
+            transport_adapter.stop()
+
+class DifferentialTestRunner(VerboseTestRunner):
+    """A verbose test runner that mirrors every request to a baseline server."""
+    
+    def __init__(self, baseline_command: str, debug: bool = False, resource_interval: float = 0.0,
+                 sink: ResultSink = None, cancel_grace: float = DEFAULT_CANCEL_GRACE,
+                 responders: Optional[Dict[str, Responder]] = None):
+        """Initialize the differential test runner.
+
+        Parameters
+        ----------
+        baseline_command
+            Command to start the baseline server that receives the mirrored requests.
+        debug
+            Enable verbose logging from the transport + protocol layers.
+        resource_interval
+            Seconds between samples of the target server's resource usage; 0 disables sampling.
+        sink
+            Receives each test result as soon as the test has finished.
+        cancel_grace
+            Seconds a server has to answer a ping after a timed-out test's requests are cancelled.
+        responders
+            Answers to server-to-client requests, used for both servers.
+        """
+        super().__init__(debug=debug, resource_interval=resource_interval, sink=sink,
+                         cancel_grace=cancel_grace, responders=responders)
+        self.baseline_command = baseline_command
+        # Kept apart so the report only covers the target's requests
+        self.baseline_dispatcher = ClientRequestDispatcher(responders)
+        self.exchanges_by_test: Dict[str, List[Dict[str, Any]]] = {}
+    
+    def _create_transport(self, test_name: str, server_command: str,
+                          env_vars: Dict[str, str]) -> MCPTransportAdapter:
+        """Create a transport that drives the target and the baseline together."""
+        target = super()._create_transport(test_name, server_command, env_vars)
+        baseline = StdioTransportAdapter(
+            server_command=self.baseline_command,
+            env_vars=env_vars,
+            debug=self.debug,
+            dispatcher=self.baseline_dispatcher
+        )
+        transport = MirroringTransportAdapter(target, baseline, debug=self.debug)
+        self.exchanges_by_test[test_name] = transport.exchanges
+        return transport
+
+async def run_soak_mode(args, full_server_command: str, env_vars: Dict[str, str],
+                        output_dir: str, timestamp: str) -> int:
+    """
+    Run the --soak mode and write its report.
+    
+    Returns:
+        0 if no leak or latency drift beyond the thresholds was found, 1 otherwise
+    """
+    iterations, duration = parse_soak_spec(args.soak)
+    known_tests = dict((name, func) for func, name in (
+        INIT_TEST_CASES + TOOLS_TEST_CASES + ASYNC_TOOLS_TEST_CASES + DYNAMIC_TOOL_TEST_CASES +
+        DYNAMIC_ASYNC_TEST_CASES + TEST_2025_06_18_CASES + SPEC_COVERAGE_TEST_CASES
+    ))
+    workloads = []
+    for name in [n.strip() for n in args.soak_tests.split(",") if n.strip()]:
+        if name not in known_tests:
+            log_with_timestamp(f"Unknown soak workload: {name}")
+            return 1
+        workloads.append((known_tests[name], name))
+    
+    soak_runner = SoakRunner(
+        workloads,
+        iterations=iterations,
+        duration=duration,
+        windows=args.soak_windows,
+        max_rss_slope=args.soak_max_rss_growth,
+        max_latency_drift=args.soak_max_latency_drift,
+        timeout=args.tools_timeout,
+        log=log_with_timestamp,
+        cancel_grace=getattr(args, "cancel_grace", DEFAULT_CANCEL_GRACE)
+    )
+    amount = f"{iterations} iterations" if iterations else f"{duration:g}s"
+    log_with_timestamp(f"Soaking {', '.join(n for _, n in workloads)} for {amount} on one session")
+    
+    runner = VerboseTestRunner(debug=args.debug, responders=get_responders(args))
+    summary = await runner.run_soak(soak_runner, args.protocol_version, full_server_command, env_vars)
+    
+    log_with_timestamp(f"Soak finished: {summary['iterations']} iterations in {summary['elapsed']:.1f}s")
+    for problem in summary["problems"]:
+        log_with_timestamp(f"  ❌ {problem}")
+    log_with_timestamp(f"Soak Status: {'✅ Passed' if summary['passed'] else '❌ Failed'}")
+    
+    server_name = extract_server_name(full_server_command)
+    report_basename = f"soak_{server_name}_{args.protocol_version}_{timestamp}"
+    
+    if args.json:
+        json_report_path = os.path.join(output_dir, f"{report_basename}.json")
+        with open(json_report_path, 'w') as f:
+            json.dump({
+                "server": server_name,
+                "protocol_version": args.protocol_version,
+                "timestamp": timestamp,
+                "soak": summary
+            }, f, indent=2)
+        log_with_timestamp(f"JSON report saved to: {json_report_path}")
+    
+    markdown_lines = [
+        f"# {server_name} MCP Soak Report",
+        "",
+        "## Server Information",
+        "",
+        f"- **Server Command**: `{full_server_command}`",
+        f"- **Protocol Version**: {args.protocol_version}",
+        f"- **Test Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "- **Validator**: Janix",
+        ""
+    ]
+    markdown_lines.extend(soak_to_markdown(summary))
+    if summary.get("cancellation"):
+        markdown_lines.append("")
+        markdown_lines.extend(cancellation_to_markdown(summary["cancellation"]))
+    if summary["latency"]:
+        markdown_lines.append("")
+        markdown_lines.extend(latency_to_markdown(summary["latency"]))
+    
+    markdown_report_path = os.path.join(output_dir, f"{report_basename}.md")
+    with open(markdown_report_path, 'w') as f:
+        f.write("\n".join(markdown_lines))
+    log_with_timestamp(f"Markdown soak report generated: {markdown_report_path}")
+    
+    return 0 if summary["passed"] else 1
+
+async def run_learn_mode(args, tests: List[tuple], full_server_command: str,
+                         env_vars: Dict[str, str], history_path: str) -> int:
+    """
+    Run the --learn mode: run the tests several times with the configured timeouts
+    and record each run in the history, so later runs can use --adaptive-timeouts.
+    
+    Returns:
+        0 once the runs are recorded
+    """
+    server_name = extract_server_name(full_server_command)
+    timeout = max(args.test_timeout, args.tools_timeout)
+    for run in range(1, args.learn + 1):
+        log_with_timestamp(f"Learning run {run}/{args.learn}: {len(tests)} tests with {timeout}s timeout")
+        runner = VerboseTestRunner(debug=args.debug, responders=get_responders(args))
+        results = await runner.run_tests(
+            tests,
+            protocol=args.protocol_version,
+            server_command=full_server_command,
+            env_vars=env_vars,
+            debug=args.debug,
+            timeout=timeout
+        )
+        with RunHistory(history_path) as history:
+            history.record_run(server_name, args.protocol_version, results["results"], runner.latency,
+                               server_version=runner.server_info.get("version"))
+        log_with_timestamp(f"Recorded run {run}: {results['passed']} passed, {results['failed']} failed")
+    
+    with RunHistory(history_path) as history:
+        adaptive_timeouts = AdaptiveTimeouts.from_history(
+            history, server_name, args.protocol_version, args.history_runs,
+            factor=args.timeout_factor, floor=args.timeout_floor
+        )
+    log_with_timestamp(f"Deadlines learned in {history_path}:")
+    for _, name in tests:
+        ceiling = args.tools_timeout if is_tool_test(name) else args.test_timeout
+        deadline, learned = adaptive_timeouts.timeout_for(name, ceiling)
+        note = "" if learned else f" (fewer than {adaptive_timeouts.min_samples} passing runs)"
+        log_with_timestamp(f"  {name}: {deadline:.2f}s{note}")
+    return 0
+
+
 async def main():
     """Run the compliance tests and generate a report."""
     parser = argparse.ArgumentParser(description="Generate a compliance report for an MCP server.")
@@ -317,8 +674,75 @@ async def main():
     parser.add_argument("--test-timeout", type=int, default=30, help="Timeout for individual tests in seconds")
     parser.add_argument("--tools-timeout", type=int, default=30, help="Timeout for tool tests in seconds")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
+    parser.add_argument("--diff-against", help="Command for a baseline server to receive the same requests")
+    parser.add_argument("--diff-ignore", help="Comma-separated response paths to ignore when diffing (supports * and **)")
+    parser.add_argument("--resource-interval", type=float, default=0.5,
+                        help="Seconds between samples of server RSS, CPU, fds and threads (0 disables)")
+    parser.add_argument("--soak", help="Soak mode: repeat --soak-tests on one session for N iterations or a duration (e.g. 500, 30m, 2h)")
+    parser.add_argument("--soak-tests", default="test_each_tool", help="Comma-separated tests to repeat in soak mode")
+    parser.add_argument("--soak-windows", type=int, default=20, help="Number of windows the soak run is split into")
+    parser.add_argument("--soak-max-rss-growth", type=float, default=DEFAULT_MAX_RSS_SLOPE_MB_PER_HOUR,
+                        help="Fail the soak if server RSS grows faster than this many MB per hour")
+    parser.add_argument("--soak-max-latency-drift", type=float, default=DEFAULT_MAX_LATENCY_DRIFT_PCT_PER_HOUR,
+                        help="Fail the soak if p50 latency grows faster than this many percent per hour")
+    parser.add_argument("--diff-strict", action="store_true", help="Fail the run if any response differs from the baseline")
+    parser.add_argument("--startup-runs", type=int, default=0,
+                        help="Launch the server this many times before testing and report cold start times")
+    parser.add_argument("--history", nargs="?", const="",
+                        help="Record the run in a SQLite history and fail on latency regressions "
+                             "(default: history.sqlite in --output-dir)")
+    parser.add_argument("--history-runs", type=int, default=DEFAULT_HISTORY_RUNS,
+                        help="Number of recent runs that form the regression baseline")
+    parser.add_argument("--regression-alpha", type=float, default=DEFAULT_REGRESSION_ALPHA,
+                        help="Significance level of the regression test")
+    parser.add_argument("--regression-min-ratio", type=float, default=DEFAULT_REGRESSION_MIN_RATIO,
+                        help="Minimum p50 slowdown (current / baseline) reported as a regression")
+    parser.add_argument("--shard", help="Run only shard i of N (e.g. 2/4), balanced by recorded test durations")
+    parser.add_argument("--shard-durations",
+                        help="History database with test durations for balancing shards (default: the --history database)")
+    parser.add_argument("--adaptive-timeouts", action="store_true",
+                        help="Derive each test's timeout from the p99 of its recorded durations in the history "
+                             "database; --test-timeout and --tools-timeout become the ceilings")
+    parser.add_argument("--timeout-factor", type=float, default=DEFAULT_TIMEOUT_FACTOR,
+                        help="Safety factor applied to the recorded p99 for adaptive timeouts")
+    parser.add_argument("--timeout-floor", type=float, default=DEFAULT_TIMEOUT_FLOOR,
+                        help="Smallest adaptive timeout in seconds")
+    parser.add_argument("--cancel-grace", type=float, default=DEFAULT_CANCEL_GRACE,
+                        help="Seconds a server has to answer a ping after a timed-out test's requests are cancelled")
+    parser.add_argument("--responders",
+                        help="JSON file with canned, scripted or delayed answers to server-to-client requests "
+                             "(sampling/createMessage, roots/list, elicitation/create)")
+    parser.add_argument("--chaos",
+                        help="Run the server behind a chaos proxy that injects the latency, bandwidth cap, "
+                             "reordering, duplicates, drops and partial writes of this JSON profile")
+    parser.add_argument("--learn", nargs="?", type=int, const=DEFAULT_LEARN_RUNS,
+                        help=f"Run the tests N times (default {DEFAULT_LEARN_RUNS}) with the configured timeouts "
+                             "and record them in the history database for --adaptive-timeouts")
+    parser.add_argument("--ndjson", nargs="?", const="",
+                        help="Stream results as NDJSON, one line per finished test (default: <report>.ndjson in --output-dir)")
+    parser.add_argument("--junit-xml", nargs="?", const="",
+                        help="Stream results as JUnit XML (default: <report>.xml in --output-dir)")
 
     args = parser.parse_args()
+    if args.learn is not None and args.learn < 1:
+        parser.error("--learn needs at least one run")
+    if args.chaos:
+        if args.soak or args.learn is not None:
+            parser.error("--chaos cannot be combined with --soak or --learn")
+        try:
+            ChaosProfile.load(args.chaos)
+        except (OSError, ValueError) as e:
+            parser.error(f"--chaos: {e}")
+    if args.responders:
+        try:
+            load_responders(args.responders)
+        except (OSError, ValueError) as e:
+            parser.error(f"--responders: {e}")
+    if args.shard:
+        try:
+            parse_shard_spec(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
     
     # Build the full command with args
     full_server_command = args.server_command
@@ -440,11 +864,85 @@ async def main():
         if skipped_count > 0:
             log_with_timestamp(f"Skipped {skipped_count} tests based on configuration")
     
+    if getattr(args, "soak", None):
+        return await run_soak_mode(args, full_server_command, env_vars, output_dir, timestamp)
+    
+    # Learning and adaptive timeouts use the same database as --history
+    history_path = getattr(args, "history", None) or os.path.join(output_dir, "history.sqlite")
+    if getattr(args, "learn", None):
+        return await run_learn_mode(args, tests, full_server_command, env_vars, history_path)
+    
+    # Keep only this job's share of the tests
+    shard_suffix = ""
+    if getattr(args, "shard", None):
+        durations = {}
+        durations_path = args.shard_durations
+        if durations_path is None and getattr(args, "history", None) is not None:
+            durations_path = history_path
+        if durations_path and os.path.exists(durations_path):
+            with RunHistory(durations_path) as history:
+                durations = history.test_durations(extract_server_name(full_server_command),
+                                                   args.protocol_version, args.history_runs)
+        planned_count = len(tests)
+        tests = select_shard(tests, args.shard, durations)
+        index, count = parse_shard_spec(args.shard)
+        shard_suffix = f"_shard{index}of{count}"
+        log_with_timestamp(f"Shard {index}/{count}: running {len(tests)} of {planned_count} tests "
+                           f"({'recorded durations' if durations else 'static weights'})")
+    
+    # Give each test a deadline that fits its recorded durations
+    adaptive_timeouts = None
+    if getattr(args, "adaptive_timeouts", False):
+        durations = {}
+        if os.path.exists(history_path):
+            with RunHistory(history_path) as history:
+                durations = history.phase_durations(extract_server_name(full_server_command),
+                                                    args.protocol_version, "test", args.history_runs)
+        adaptive_timeouts = AdaptiveTimeouts(durations, factor=args.timeout_factor, floor=args.timeout_floor)
+        learned = adaptive_timeouts.learned([name for _, name in tests])
+        log_with_timestamp(f"Adaptive timeouts: {len(learned)} of {len(tests)} tests have learned deadlines"
+                           + ("" if len(learned) == len(tests) else " (use --learn to record more runs)"))
+    
+    # Tests talk to the server through the chaos proxy; names, history and cold start use the real command
+    test_server_command = full_server_command
+    chaos_stats_path = None
+    if getattr(args, "chaos", None):
+        fd, chaos_stats_path = tempfile.mkstemp(prefix="chaos_", suffix=".ndjson")
+        os.close(fd)
+        test_server_command = chaos_server_command(full_server_command, args.chaos, chaos_stats_path)
+        log_with_timestamp(f"Chaos proxy profile: {args.chaos}")
+    
     log_with_timestamp(f"Running compliance tests for protocol {args.protocol_version}...")
     log_with_timestamp(f"Server command: {full_server_command}")
     log_with_timestamp(f"Test mode: {args.test_mode}")
     log_with_timestamp(f"Total tests to run: {len(tests)}")
     
+    # Measure cold start on fresh processes before the tests warm any caches
+    startup = None
+    if getattr(args, "startup_runs", 0) > 0:
+        log_with_timestamp(f"Measuring cold start over {args.startup_runs} launches...")
+        startup = measure_startup(full_server_command, args.protocol_version, env_vars,
+                                  runs=args.startup_runs, timeout=args.test_timeout,
+                                  log=log_with_timestamp)
+        if startup["headline"] is not None:
+            log_with_timestamp(f"Cold start (exec → initialize, p50): {startup['headline'] * 1000:.1f}ms")
+    
+    # Stream each result to disk as it finishes so a crashed run keeps its results
+    report_basename = f"cr_{extract_server_name(full_server_command)}_{args.protocol_version}_{timestamp}{shard_suffix}"
+    def sink_path(value, extension):
+        if value is None:
+            return None
+        return value or os.path.join(output_dir, f"{report_basename}.{extension}")
+    sink = create_result_sink(sink_path(getattr(args, "ndjson", None), "ndjson"),
+                              sink_path(getattr(args, "junit_xml", None), "xml"))
+    sink.open({
+        "server": extract_server_name(full_server_command),
+        "server_command": full_server_command,
+        "protocol_version": args.protocol_version,
+        "timestamp": timestamp,
+        "shard": getattr(args, "shard", None)
+    })
+    
     # Run the tests
     start_time = time.time()
     
@@ -454,36 +952,49 @@ async def main():
     
     if args.verbose or True:  # Always use verbose logging
         # Use our custom verbose test runner
-        runner = VerboseTestRunner(debug=args.debug)
+        diff_against = getattr(args, "diff_against", None)
+        if diff_against:
+            log_with_timestamp(f"Mirroring requests to baseline server: {diff_against}")
+            runner = DifferentialTestRunner(baseline_command=diff_against, debug=args.debug,
+                                            resource_interval=args.resource_interval, sink=sink,
+                                            cancel_grace=getattr(args, "cancel_grace", DEFAULT_CANCEL_GRACE),
+                                            responders=get_responders(args))
+        else:
+            runner = VerboseTestRunner(debug=args.debug, resource_interval=args.resource_interval,
+                                       sink=sink, cancel_grace=getattr(args, "cancel_grace", DEFAULT_CANCEL_GRACE),
+                                       responders=get_responders(args))
         
         # Group tests by type and run with appropriate timeouts
-        tool_tests = [(func, name) for func, name in tests if name.startswith("test_tool_") or name.startswith("test_tools_")]
-        non_tool_tests = [(func, name) for func, name in tests if not (name.startswith("test_tool_") or name.startswith("test_tools_"))]
+        tool_tests = [(func, name) for func, name in tests if is_tool_test(name)]
+        non_tool_tests = [(func, name) for func, name in tests if not is_tool_test(name)]
+        limit = "timeout ceiling" if adaptive_timeouts else "timeout"
         
         # Run non-tool tests first with standard timeout
         if non_tool_tests:
-            log_with_timestamp(f"Running {len(non_tool_tests)} non-tool tests with {test_timeout}s timeout")
+            log_with_timestamp(f"Running {len(non_tool_tests)} non-tool tests with {test_timeout}s {limit}")
             non_tool_results = await runner.run_tests(
                 non_tool_tests, 
                 protocol=args.protocol_version,
-                server_command=full_server_command,
+                server_command=test_server_command,
                 env_vars=env_vars,
                 debug=args.debug,
-                timeout=test_timeout
+                timeout=test_timeout,
+                adaptive_timeouts=adaptive_timeouts
             )
         else:
             non_tool_results = {"results": [], "total": 0, "passed": 0, "failed": 0, "skipped": 0}
         
         # Run tool tests with extended timeout
         if tool_tests:
-            log_with_timestamp(f"Running {len(tool_tests)} tool tests with {tools_timeout}s timeout")
+            log_with_timestamp(f"Running {len(tool_tests)} tool tests with {tools_timeout}s {limit}")
             tool_results = await runner.run_tests(
                 tool_tests, 
                 protocol=args.protocol_version,
-                server_command=full_server_command,
+                server_command=test_server_command,
                 env_vars=env_vars,
                 debug=args.debug,
-                timeout=tools_timeout
+                timeout=tools_timeout,
+                adaptive_timeouts=adaptive_timeouts
             )
             
             # Combine results
@@ -497,6 +1008,7 @@ async def main():
             }
         else:
             results = non_tool_results
+        results["latency"] = runner.latency.to_dict()
     else:
         # Use the standard test runner
         from mcp_testing.utils.runner import MCPTestRunner
@@ -504,10 +1016,11 @@ async def main():
         results = await run_tests(
             tests, 
             args.protocol_version,
-            server_command=full_server_command,
+            server_command=test_server_command,
             env_vars=env_vars,
             debug=args.debug,
-            timeout=tools_timeout  # Use the longer timeout for all tests in non-verbose mode
+            timeout=tools_timeout,  # Use the longer timeout for all tests in non-verbose mode
+            sink=sink
         )
     
     # Calculate summary information - Ensure results is a dictionary with the right fields
@@ -556,18 +1069,117 @@ async def main():
         log_with_timestamp(f"Skipped: {results['skipped']}")
     log_with_timestamp(f"Compliance Status: {compliance_status} ({compliance_percentage:.1f}%)")
     
+    sink.close({
+        "total": total_tests,
+        "passed": passed_tests,
+        "failed": failed_tests,
+        "skipped": results.get("skipped", 0),
+        "compliance_percentage": compliance_percentage,
+        "duration": time.time() - start_time
+    })
+    for sink_item in sink.sinks:
+        log_with_timestamp(f"Streamed results saved to: {sink_item.path}")
+    
+    # Call out servers whose memory grew substantially during a test
+    for r in results['results']:
+        resources = r.get("resources") if isinstance(r, dict) else None
+        if resources and resources["rss_growth"]:
+            log_with_timestamp(
+                f"⚠️ Server RSS grew from {resources['rss_start'] / 1048576:.1f} MB to "
+                f"{resources['rss_peak'] / 1048576:.1f} MB during {r['name']}"
+            )
+    
+    # Requests the server sent to the client during the tests
+    server_requests = {}
+    dispatcher = getattr(runner, "dispatcher", None)
+    if isinstance(dispatcher, ClientRequestDispatcher):
+        server_requests = dispatcher.summary()
+        dispatcher.close()
+        if isinstance(runner, DifferentialTestRunner):
+            runner.baseline_dispatcher.close()
+    for method, stats in server_requests.items():
+        log_with_timestamp(f"Server request {method}: {stats['count']} answered, {stats['errors']} errors, "
+                           f"p50 round trip {stats['p50'] * 1000:.2f}ms")
+    
+    # How cheaply the server recovered from timeouts
+    cancellation = summarize_cancellations(
+        [r.get("cancellation") for r in results['results'] if isinstance(r, dict)])
+    if cancellation:
+        log_with_timestamp(f"Cancellation: server recovered from {cancellation['healthy']} of "
+                           f"{cancellation['timeouts']} timeouts")
+    
+    # Compare target and baseline responses recorded during a differential run
+    differential = None
+    if isinstance(runner, DifferentialTestRunner):
+        differential = summarize_differential(
+            runner.exchanges_by_test,
+            parse_ignore_paths(getattr(args, "diff_ignore", None))
+        )
+        log_with_timestamp(
+            f"Differential: {differential['total_mismatches']} of {differential['total_requests']} "
+            f"responses differ from baseline"
+        )
+    
     # Extract server name from the command (for report purposes)
     server_name = extract_server_name(full_server_command)
     
+    # Faults injected by the chaos proxy and their effect on latency against clean runs
+    chaos = None
+    if chaos_stats_path:
+        baseline = None
+        if os.path.exists(history_path):
+            with RunHistory(history_path) as history:
+                baseline = history.method_histograms(
+                    history.recent_runs(server_name, args.protocol_version, args.history_runs))
+        chaos = summarize_chaos(ChaosProfile.load(args.chaos), read_chaos_stats(chaos_stats_path),
+                                LatencyRecorder.from_dict(results.get("latency", {})), baseline)
+        os.remove(chaos_stats_path)
+        injected = {key: sum(d.get(key, 0) for d in chaos["directions"].values())
+                    for key in ("frames", "dropped", "duplicated", "reordered")}
+        log_with_timestamp(f"Chaos: {injected['frames']} frames over {chaos['sessions']} sessions, "
+                           f"{injected['dropped']} dropped, {injected['duplicated']} duplicated, "
+                           f"{injected['reordered']} reordered")
+    
+    # Compare latency with earlier runs, then add this run to the history
+    comparison = None
+    if chaos and getattr(args, "history", None) is not None:
+        log_with_timestamp("Chaos run not recorded in the history; latency is compared in the Chaos section")
+    elif getattr(args, "history", None) is not None:
+        with RunHistory(history_path) as history:
+            comparison = compare_to_history(
+                history, server_name, args.protocol_version,
+                LatencyRecorder.from_dict(results.get("latency", {})),
+                runs=args.history_runs,
+                alpha=args.regression_alpha,
+                min_ratio=args.regression_min_ratio
+            )
+            # A shard ran only part of the suite, so it must not become a baseline or a source of test durations
+            if not getattr(args, "shard", None):
+                history.record_run(
+                    server_name, args.protocol_version, results["results"],
+                    LatencyRecorder.from_dict(results.get("latency", {})),
+                    server_version=getattr(runner, "server_info", {}).get("version")
+                )
+        if comparison["regressions"]:
+            log_with_timestamp(f"❌ Latency regressions against the last {comparison['baseline_runs']} runs: "
+                               f"{', '.join(comparison['regressions'])}")
+        else:
+            log_with_timestamp(f"Performance history: no regressions "
+                               f"({comparison['baseline_runs']} earlier runs in {history_path})")
+        if getattr(args, "shard", None):
+            log_with_timestamp(f"Shard {args.shard} not recorded in the history; only full runs are")
+    
     # Generate the report filename - always use "cr_" prefix for consistency
-    report_basename = f"cr_{server_name}_{args.protocol_version}_{timestamp}"
+    report_basename = f"cr_{server_name}_{args.protocol_version}_{timestamp}{shard_suffix}"
     
     if args.json:
         # Generate JSON report
         json_report = {
             "server": server_name,
+            "server_command": full_server_command,
             "protocol_version": args.protocol_version,
             "timestamp": timestamp,
+            "shard": getattr(args, "shard", None),
             "validator": "Janix",  # Add Janix as the validator
             "total_tests": total_tests,
             "passed_tests": passed_tests,
@@ -576,6 +1188,20 @@ async def main():
             "compliance_status": compliance_status,
             "results": results
         }
+        if differential:
+            json_report["differential"] = differential
+        if startup:
+            json_report["startup"] = startup
+        if comparison:
+            json_report["history"] = comparison
+        if server_requests:
+            json_report["server_requests"] = server_requests
+        if cancellation:
+            json_report["cancellation"] = cancellation
+        if chaos:
+            json_report["chaos"] = chaos
+        if adaptive_timeouts:
+            json_report["adaptive_timeouts"] = adaptive_timeouts.to_dict(results["results"])
         
         json_report_path = os.path.join(output_dir, f"{report_basename}.json")
         with open(json_report_path, 'w') as f:
@@ -618,6 +1244,11 @@ async def main():
             f"- **Failed**: {results['failed']} ({(results['failed'] / results['total'] * 100) if results['total'] > 0 else 0:.1f}%)",
             ""
         ])
+        if startup and startup["headline"] is not None:
+            markdown_lines[-1:-1] = [f"- **Cold Start (p50)**: {startup['headline'] * 1000:.1f}ms to initialize"]
+        if comparison and comparison["regressions"]:
+            markdown_lines[-1:-1] = [f"- **Performance Regressions**: {len(comparison['regressions'])} "
+                                     f"({', '.join(comparison['regressions'])})"]
         
         # Add compliance status
         if results['failed'] == 0:
@@ -683,6 +1314,42 @@ async def main():
                 markdown_lines.append(f"| {test_name} | {duration} | {message} |")
         else:
             markdown_lines.append("All tests passed! 🎉")
+        
+        if startup:
+            markdown_lines.append("")
+            markdown_lines.extend(startup_to_markdown(startup))
+        
+        if results.get('latency'):
+            markdown_lines.append("")
+            markdown_lines.extend(latency_to_markdown(results['latency']))
+        
+        if comparison:
+            markdown_lines.append("")
+            markdown_lines.extend(history_to_markdown(comparison))
+        
+        if chaos:
+            markdown_lines.append("")
+            markdown_lines.extend(chaos_to_markdown(chaos))
+        
+        if server_requests:
+            markdown_lines.append("")
+            markdown_lines.extend(server_requests_to_markdown(server_requests))
+        
+        if cancellation:
+            markdown_lines.append("")
+            markdown_lines.extend(cancellation_to_markdown(cancellation))
+        
+        if adaptive_timeouts:
+            markdown_lines.append("")
+            markdown_lines.extend(timeouts_to_markdown(adaptive_timeouts.to_dict(results["results"])))
+        
+        resource_lines = resources_to_markdown(results['results'])
+        if resource_lines:
+            markdown_lines.append("")
+            markdown_lines.extend(resource_lines)
+        
+        if differential:
+            markdown_lines.extend(differential_to_markdown(differential, runner.baseline_command))
             
         # Generate and write the report
         markdown_content = "\n".join(markdown_lines)
@@ -698,6 +1365,12 @@ async def main():
             traceback.print_exc()
     
     # Set exit code based on compliance
+    if differential and getattr(args, "diff_strict", False) and differential["total_mismatches"] > 0:
+        log_with_timestamp("Failing run because responses differ from the baseline (--diff-strict)")
+        return 1
+    if comparison and comparison["regressions"]:
+        log_with_timestamp("Failing run because of latency regressions (--history)")
+        return 1
     return 0 if compliance_percentage == 100 else 1
 
 
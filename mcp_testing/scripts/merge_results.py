@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Merge sharded test results into one compliance report.
+
+Each CI job runs one shard (--shard i/N) and keeps its result file. This script
+combines those files into a single Markdown report, a single compliance
+percentage and an exit code for the whole run.
+
+Accepted inputs:
+    - JSON reports from compliance_report --json
+    - JSON files from run_stdio_tests --output-file
+    - NDJSON streams from --ndjson (including partial files from crashed jobs)
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the parent directory to the Python path
+parent_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(parent_dir))
+
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.reporter import extract_server_name, generate_markdown_report
+from mcp_testing.utils.resource_monitor import resources_to_markdown
+from mcp_testing.utils.result_sink import read_ndjson_results
+from mcp_testing.utils.sharding import merge_results, compliance_percentage
+
+
+def log_with_timestamp(message):
+    """Log a message with a timestamp prefix."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {message}")
+
+
+def load_result_file(path):
+    """
+    Load one shard's results.
+
+    Args:
+        path: A JSON report or NDJSON stream
+
+    Returns:
+        A tuple (run information, results dictionary)
+    """
+    if path.endswith(".ndjson"):
+        info = {}
+        with open(path) as f:
+            first = f.readline()
+        try:
+            header = json.loads(first)
+            if header.get("type") == "run":
+                info = header
+        except json.JSONDecodeError:
+            pass
+        return info, {"results": read_ndjson_results([path])}
+
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data.get("results"), dict):
+        # compliance_report --json wraps the results dictionary with run information
+        return data, data["results"]
+    return {}, data
+
+
+def main():
+    """Merge the shard results and write the combined report."""
+    parser = argparse.ArgumentParser(description="Merge sharded MCP test results into one report.")
+    parser.add_argument("inputs", nargs="+", help="Shard result files (.json or .ndjson)")
+    parser.add_argument("--server-command", help="Server command shown in the report (default: from the inputs)")
+    parser.add_argument("--protocol-version", help="Protocol version shown in the report (default: from the inputs)")
+    parser.add_argument("--output-dir", default="reports", help="Directory to store the merged report")
+    parser.add_argument("--json", action="store_true", help="Also write the merged results as JSON")
+    args = parser.parse_args()
+
+    infos, parts = [], []
+    for path in args.inputs:
+        try:
+            info, part = load_result_file(path)
+        except (OSError, ValueError) as e:
+            log_with_timestamp(f"Error reading {path}: {e}")
+            return 1
+        infos.append(info)
+        parts.append(part)
+        log_with_timestamp(f"Loaded {len(part.get('results', []))} results from {path}"
+                           + (f" (shard {info['shard']})" if info.get("shard") else ""))
+
+    server_command = args.server_command or next(
+        (i["server_command"] for i in infos if i.get("server_command")), "unknown")
+    protocol_versions = sorted({i["protocol_version"] for i in infos if i.get("protocol_version")})
+    if len(protocol_versions) > 1:
+        log_with_timestamp(f"⚠️ Inputs cover several protocol versions: {', '.join(protocol_versions)}")
+    protocol_version = args.protocol_version or (protocol_versions[0] if protocol_versions else "unknown")
+
+    shards = [i["shard"] for i in infos if i.get("shard")]
+    duplicates = sorted({shard for shard in shards if shards.count(shard) > 1})
+    if duplicates:
+        log_with_timestamp(f"⚠️ The same shard appears more than once: {', '.join(duplicates)}")
+
+    merged = merge_results(parts)
+    latency = LatencyRecorder()
+    for part in parts:
+        if part.get("latency"):
+            latency.merge(LatencyRecorder.from_dict(part["latency"]))
+    if latency:
+        merged["latency"] = latency.to_dict()
+
+    percentage = compliance_percentage(merged)
+    log_with_timestamp(f"Merged {len(parts)} inputs: {merged['total']} tests, {merged['passed']} passed, "
+                       f"{merged['failed']} failed, {merged['skipped']} skipped")
+    log_with_timestamp(f"Compliance: {percentage:.1f}%")
+
+    output_dir = os.path.join(parent_dir, args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_basename = f"cr_{extract_server_name(server_command)}_{protocol_version}_{timestamp}_merged"
+
+    if args.json:
+        json_path = os.path.join(output_dir, f"{report_basename}.json")
+        with open(json_path, "w") as f:
+            json.dump({
+                "server": extract_server_name(server_command),
+                "server_command": server_command,
+                "protocol_version": protocol_version,
+                "timestamp": timestamp,
+                "shards": len(parts),
+                "compliance_percentage": percentage,
+                "results": merged
+            }, f, indent=2)
+        log_with_timestamp(f"JSON report saved to: {json_path}")
+
+    report = generate_markdown_report(merged, server_command, protocol_version)
+    resource_lines = resources_to_markdown(merged["results"])
+    if resource_lines:
+        report += "\n\n" + "\n".join(resource_lines)
+    markdown_path = os.path.join(output_dir, f"{report_basename}.md")
+    with open(markdown_path, "w") as f:
+        f.write(report)
+    log_with_timestamp(f"Markdown merged report generated: {markdown_path}")
+
+    return 0 if merged["total"] > 0 and percentage == 100 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
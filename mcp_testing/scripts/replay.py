@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Replay sessions recorded by tap.py against an MCP server.
+
+The client side of every traced session is sent to the server again and the
+responses and latencies are compared with the trace:
+
+    # Replay each traced session once at the recorded pace
+    python -m mcp_testing.scripts.replay ~/mcp-traces --server-command "python my_server.py"
+
+    # 20 replays, 5 at once, twice as fast as recorded
+    python -m mcp_testing.scripts.replay ~/mcp-traces --server-command "python my_server.py" \\
+        --replays 20 --concurrency 5 --speed 2
+
+    # As fast as the server answers
+    python -m mcp_testing.scripts.replay ~/mcp-traces --server-command "python my_server.py" --speed max
+
+Each replay starts its own server process and initializes it through the
+protocol adapters, using the protocol version negotiated in the trace unless
+--protocol-version is given.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the parent directory to the Python path
+parent_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(parent_dir))
+
+from mcp_testing.transports.dispatcher import ClientRequestDispatcher, load_responders, server_requests_to_markdown
+from mcp_testing.utils.differential import parse_ignore_paths
+from mcp_testing.utils.load_generator import BenchmarkSession
+from mcp_testing.utils.replay import TraceReplayer, load_traced_sessions, replay_to_markdown
+from mcp_testing.utils.reporter import extract_server_name
+from mcp_testing.utils.server_compatibility import prepare_environment_for_server
+from mcp_testing.utils.trace import read_trace, trace_files
+
+SUPPORTED_VERSIONS = ["2024-11-05", "2025-03-26", "2025-06-18"]
+
+
+def log_with_timestamp(message):
+    """Log a message with a timestamp prefix."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {message}")
+
+
+def parse_speed(value):
+    """Parse --speed: a positive multiple of the traced pace, or 'max'."""
+    if value == "max":
+        return None
+    try:
+        speed = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'max', got {value!r}")
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
+
+def main():
+    """Replay the traces and write the report."""
+    parser = argparse.ArgumentParser(description="Replay traced MCP client sessions against a server.")
+    parser.add_argument("traces", nargs="+", help="Trace segments or directories containing them")
+    parser.add_argument("--server-command", required=True, help="Command to start the server")
+    parser.add_argument("--args", help="Additional arguments to pass to the server")
+    parser.add_argument("--protocol-version", choices=SUPPORTED_VERSIONS,
+                        help="Protocol version to use (default: the version negotiated in the trace)")
+    parser.add_argument("--speed", type=parse_speed, default=1.0,
+                        help="Multiple of the traced pace (e.g. 2 for twice as fast), or 'max'")
+    parser.add_argument("--replays", type=int, help="Number of replays (default: one per traced session)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of replays running at once")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each response")
+    parser.add_argument("--diff-ignore", help="Comma-separated response paths to ignore when diffing (supports * and **)")
+    parser.add_argument("--diff-strict", action="store_true", help="Fail the run if any response differs from the trace")
+    parser.add_argument("--responders",
+                        help="JSON file with canned, scripted or delayed answers to server-to-client requests")
+    parser.add_argument("--output-dir", default="reports", help="Directory to store reports")
+    parser.add_argument("--json", action="store_true", help="Generate JSON report")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args()
+
+    full_server_command = args.server_command
+    if args.args:
+        full_server_command = f"{full_server_command} {args.args}"
+
+    files = trace_files(args.traces)
+    sessions = load_traced_sessions(read_trace(files))
+    if not sessions:
+        log_with_timestamp("No client requests found in the traces")
+        return 1
+
+    try:
+        dispatcher = ClientRequestDispatcher(load_responders(args.responders) if args.responders else None,
+                                             workers=max(4, args.concurrency))
+    except (OSError, ValueError) as e:
+        parser.error(f"--responders: {e}")
+
+    env_vars = prepare_environment_for_server(full_server_command)
+
+    def session_factory(index, traced_version):
+        version = args.protocol_version or traced_version
+        if version not in SUPPORTED_VERSIONS:
+            version = SUPPORTED_VERSIONS[-1]
+        return BenchmarkSession(
+            full_server_command,
+            version,
+            env_vars={**env_vars, "MCP_PROTOCOL_VERSION": version},
+            name=f"replay-{index}",
+            debug=args.debug,
+            dispatcher=dispatcher
+        )
+
+    try:
+        replayer = TraceReplayer(sessions, session_factory, speed=args.speed, replays=args.replays,
+                                 concurrency=args.concurrency, timeout=args.timeout,
+                                 ignore_paths=parse_ignore_paths(args.diff_ignore))
+    except ValueError as e:
+        parser.error(str(e))
+
+    pace = "as fast as possible" if args.speed is None else f"at {args.speed:g}x the traced pace"
+    log_with_timestamp(f"Replaying {len(sessions)} traced sessions from {len(files)} segments against: "
+                       f"{full_server_command}")
+    log_with_timestamp(f"{replayer.replays} replays, {args.concurrency} at once, {pace}")
+    summary = replayer.run()
+
+    dispatcher.close()
+    summary["server_requests"] = dispatcher.summary()
+
+    log_with_timestamp(f"Requests: {summary['requests']}, errors: {summary['errors']}, "
+                       f"diverged: {summary['diverged']}, failed replays: {len(summary['failures'])}")
+    for failure in summary["failures"]:
+        log_with_timestamp(f"Replay {failure['replay']} failed: {failure['error']}")
+
+    output_dir = os.path.join(parent_dir, args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    server_name = extract_server_name(full_server_command)
+    report_basename = f"replay_{server_name}_{timestamp}"
+
+    if args.json:
+        json_report = {
+            "server": server_name,
+            "timestamp": timestamp,
+            "traces": files,
+            "replay": summary
+        }
+        json_report_path = os.path.join(output_dir, f"{report_basename}.json")
+        with open(json_report_path, 'w') as f:
+            json.dump(json_report, f, indent=2)
+        log_with_timestamp(f"JSON report saved to: {json_report_path}")
+
+    markdown_lines = [
+        f"# {server_name} MCP Trace Replay Report",
+        "",
+        "## Server Information",
+        "",
+        f"- **Server Command**: `{full_server_command}`",
+        f"- **Test Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"- **Traces**: {len(files)} segments",
+        "- **Validator**: Janix",
+        ""
+    ]
+    markdown_lines.extend(replay_to_markdown(summary))
+    if summary["server_requests"]:
+        markdown_lines.append("")
+        markdown_lines.extend(server_requests_to_markdown(summary["server_requests"]))
+
+    markdown_report_path = os.path.join(output_dir, f"{report_basename}.md")
+    with open(markdown_report_path, 'w') as f:
+        f.write("\n".join(markdown_lines))
+    log_with_timestamp(f"Markdown replay report generated: {markdown_report_path}")
+
+    if summary["failures"] or summary["requests"] == 0:
+        return 1
+    if args.diff_strict and summary["diverged"]:
+        log_with_timestamp("Failing run because responses differ from the trace (--diff-strict)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        log_with_timestamp("Replay interrupted by user")
+        sys.exit(130)
+    except Exception as e:
+        log_with_timestamp(f"Error running replay: {str(e)}")
+        sys.exit(1)
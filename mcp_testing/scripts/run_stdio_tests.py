@@ -19,7 +19,10 @@ parent_dir = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(parent_dir))
 
 from mcp_testing.utils.runner import run_tests
-from mcp_testing.utils.reporter import results_to_markdown
+from mcp_testing.utils.reporter import results_to_markdown, extract_server_name
+from mcp_testing.utils.result_sink import create_result_sink
+from mcp_testing.utils.history import RunHistory
+from mcp_testing.utils.sharding import select_shard, parse_shard_spec
 from mcp_testing.tests.base_protocol.test_initialization import TEST_CASES as INIT_TEST_CASES
 from mcp_testing.tests.features.test_tools import TEST_CASES as TOOLS_TEST_CASES
 from mcp_testing.tests.features.test_async_tools import TEST_CASES as ASYNC_TOOLS_TEST_CASES
@@ -35,7 +38,16 @@ async def main():
     parser.add_argument("--output-file", help="File to write results to (in JSON format)")
     parser.add_argument("--markdown", action="store_true", help="Generate a Markdown compliance report")
     parser.add_argument("--markdown-file", help="Filename for the Markdown report (default: auto-generated)")
+    parser.add_argument("--ndjson", help="Stream results to this file as NDJSON, one line per finished test")
+    parser.add_argument("--junit-xml", help="Stream results to this file as JUnit XML")
+    parser.add_argument("--shard", help="Run only shard i of N (e.g. 2/4), balanced by recorded test durations")
+    parser.add_argument("--shard-durations", help="History database with test durations for balancing shards")
     args = parser.parse_args()
+    if args.shard:
+        try:
+            parse_shard_spec(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
     
     # Set environment variables for the server
     env_vars = os.environ.copy()
@@ -50,6 +62,22 @@ async def main():
     if args.protocol_version == "2025-03-26":
         all_tests.extend(ASYNC_TOOLS_TEST_CASES)
     
+    # Keep only this job's share of the tests
+    if args.shard:
+        durations = {}
+        if args.shard_durations and os.path.exists(args.shard_durations):
+            with RunHistory(args.shard_durations) as history:
+                durations = history.test_durations(extract_server_name(args.server_command),
+                                                   args.protocol_version)
+        planned_count = len(all_tests)
+        all_tests = select_shard(all_tests, args.shard, durations)
+        print(f"Shard {args.shard}: running {len(all_tests)} of {planned_count} tests")
+    
+    # Stream each result to disk as it finishes
+    sink = create_result_sink(args.ndjson, args.junit_xml)
+    sink.open({"server_command": args.server_command, "protocol_version": args.protocol_version,
+               "shard": args.shard})
+    
     # Run the tests
     results = await run_tests(
         tests=all_tests,
@@ -57,8 +85,10 @@ async def main():
         transport="stdio",
         server_command=args.server_command,
         env_vars=env_vars,
-        debug=args.debug
+        debug=args.debug,
+        sink=sink
     )
+    sink.close({key: results.get(key, 0) for key in ("passed", "failed", "skipped", "timeouts")})
     
     # Print results
     print(f"\nTest Results:")
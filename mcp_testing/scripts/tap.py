@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Trace the traffic of a STDIO MCP server.
+
+Use the tap as the server command in a host application's configuration. It
+starts the real server, forwards stdin and stdout unchanged and writes every
+frame with a timestamp to a rotating, gzip-compressed trace:
+
+    python /path/to/mcp_testing/scripts/tap.py --trace-dir ~/mcp-traces -- npx -y @modelcontextprotocol/server-everything
+
+Summarize the traces with analyze_trace.py.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+parent_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(parent_dir))
+
+from mcp_testing.utils.trace import DEFAULT_MAX_SEGMENT_BYTES, DEFAULT_MAX_SEGMENTS, run_tap
+
+
+def main():
+    """Run the server behind the tap."""
+    parser = argparse.ArgumentParser(description="Forward a STDIO MCP server's traffic and record it to a trace.")
+    parser.add_argument("--trace-dir", required=True, help="Directory the trace segments are written to")
+    parser.add_argument("--max-segment-mb", type=float, default=DEFAULT_MAX_SEGMENT_BYTES / 1048576,
+                        help="Start a new trace segment after this many MB of frames")
+    parser.add_argument("--max-segments", type=int, default=DEFAULT_MAX_SEGMENTS,
+                        help="Number of segments kept per session; older ones are deleted")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="-- server command")
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("give the server command after --")
+    return run_tap(command, args.trace_dir, int(args.max_segment_mb * 1048576), args.max_segments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,13 @@ Transport adapters for MCP Testing Framework.
 """
 
 from mcp_testing.transports.base import MCPTransportAdapter
+from mcp_testing.transports.dispatcher import ClientRequestDispatcher
 from mcp_testing.transports.http import HttpTransportAdapter
 from mcp_testing.transports.stdio import StdioTransportAdapter
 
 __all__ = [
     'MCPTransportAdapter',
+    'ClientRequestDispatcher',
     'HttpTransportAdapter',
     'StdioTransportAdapter',
 ] 
\ No newline at end of file
@@ -8,13 +8,23 @@ This module defines the base interface for transport adapters used in the MCP te
 Transport adapters handle the communication between the test client and the MCP server.
 """
 
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Union, List
 
+from mcp_testing.utils.histogram import LatencyRecorder
+
+
+class RequestTimeoutError(TimeoutError):
+    """Raised when a request is still unanswered at the transport's deadline."""
+
 
 class MCPTransportAdapter(ABC):
     """Base class for MCP transport adapters."""
     
+    # Transports that honour set_deadline() and track outstanding requests
+    supports_deadline = False
+    
     def __init__(self, debug: bool = False):
         """
         Initialize the transport adapter.
@@ -24,6 +34,35 @@ class MCPTransportAdapter(ABC):
         """
         self.debug = debug
         self.is_started = False
+        # Round-trip latency of every request, by method
+        self.latency = LatencyRecorder()
+        # Requests sent but not yet answered, by id, and ids whose late responses are dropped
+        self.outstanding: Dict[Any, str] = {}
+        self.cancelled: set = set()
+        self.late_responses = 0
+        self.deadline: Optional[float] = None
+        self.deadline_expired = False
+    
+    def set_deadline(self, seconds: Optional[float]) -> None:
+        """
+        Limit how long reads may wait, for transports that support it.
+        
+        Args:
+            seconds: Seconds from now after which waiting for a response raises
+                RequestTimeoutError, or None to wait indefinitely
+        """
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.deadline_expired = False
+    
+    def _record_latency(self, method: str, start: float) -> None:
+        """
+        Record the round-trip latency of a request.
+        
+        Args:
+            method: The JSON-RPC method (or "batch")
+            start: The time.perf_counter() value taken before the request was sent
+        """
+        self.latency.record(method, time.perf_counter() - start)
     
     @abstractmethod
     def start(self) -> bool:
@@ -0,0 +1,325 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Client-side Request Dispatcher for MCP Testing.
+
+MCP servers may send requests to the client: ``sampling/createMessage``,
+``roots/list``, ``elicitation/create`` and ``ping``. A transport with a
+dispatcher hands these to it as they arrive instead of mistaking them for the
+response to its own request. Each request is answered on a worker thread by the
+responder registered for its method, so a slow responder does not hold up
+responses to outstanding client requests.
+
+Responders are pluggable:
+    - CannedResponder returns a fixed result or error
+    - ScriptedResponder returns a sequence of results and errors, one per request
+    - LatencyResponder delays another responder, to see how a server copes with
+      a slow client
+
+The round trip of every server request (received → answer written) is recorded
+per method.
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp_testing.utils.histogram import LatencyRecorder
+
+# JSON-RPC error codes used in answers
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+DEFAULT_DISPATCHER_WORKERS = 4
+
+
+class ResponderError(Exception):
+    """Raised by a responder to answer with a JSON-RPC error."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-RPC error object."""
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+class Responder(ABC):
+    """Answers one kind of server-to-client request."""
+
+    @abstractmethod
+    def respond(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer a request.
+
+        Args:
+            params: The request's params
+
+        Returns:
+            The JSON-RPC result
+
+        Raises:
+            ResponderError: To answer with a JSON-RPC error
+        """
+        pass
+
+
+class CannedResponder(Responder):
+    """Returns the same result, or raises the same error, every time."""
+
+    def __init__(self, result: Optional[Dict[str, Any]] = None, error: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the responder.
+
+        Args:
+            result: The result to return
+            error: A JSON-RPC error object to answer with instead
+        """
+        self.result = result if result is not None else {}
+        self.error = error
+
+    def respond(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.error:
+            raise ResponderError(self.error.get("code", INTERNAL_ERROR), self.error.get("message", "Error"),
+                                 self.error.get("data"))
+        return self.result
+
+
+class ScriptedResponder(Responder):
+    """Answers successive requests with successive steps; the last step repeats."""
+
+    def __init__(self, steps: List[Dict[str, Any]]):
+        """
+        Initialize the responder.
+
+        Args:
+            steps: Each step is {"result": ...} or {"error": {...}}
+        """
+        if not steps:
+            raise ValueError("A scripted responder needs at least one step")
+        self.steps = [CannedResponder(step.get("result"), step.get("error")) for step in steps]
+        self._index = itertools.count()
+        self._lock = threading.Lock()
+
+    def respond(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            index = next(self._index)
+        return self.steps[min(index, len(self.steps) - 1)].respond(params)
+
+
+class LatencyResponder(Responder):
+    """Delays another responder by a fixed time plus random jitter."""
+
+    def __init__(self, inner: Responder, delay: float, jitter: float = 0.0, seed: Optional[int] = None):
+        """
+        Initialize the responder.
+
+        Args:
+            inner: The responder producing the answer
+            delay: Seconds to wait before answering
+            jitter: Up to this many extra seconds, chosen uniformly at random
+            seed: Random seed for reproducible jitter
+        """
+        self.inner = inner
+        self.delay = delay
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def respond(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            extra = self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+        time.sleep(self.delay + extra)
+        return self.inner.respond(params)
+
+
+class ElicitationResponder(Responder):
+    """Accepts elicitation requests with a placeholder value for each requested field."""
+
+    _PLACEHOLDERS = {"string": "test", "number": 1, "integer": 1, "boolean": True}
+
+    def respond(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        properties = (params.get("requestedSchema") or {}).get("properties") or {}
+        content = {}
+        for name, schema in properties.items():
+            if schema.get("enum"):
+                content[name] = schema["enum"][0]
+            else:
+                content[name] = self._PLACEHOLDERS.get(schema.get("type"), "test")
+        return {"action": "accept", "content": content}
+
+
+def default_responders() -> Dict[str, Responder]:
+    """Return responders for every request a 2025-06-18 server may send the client."""
+    return {
+        "ping": CannedResponder({}),
+        "roots/list": CannedResponder({"roots": [{"uri": "file:///tmp/mcp-test-root", "name": "Test Root"}]}),
+        "sampling/createMessage": CannedResponder({
+            "role": "assistant",
+            "content": {"type": "text", "text": "This is a test response."},
+            "model": "mcp-test-client",
+            "stopReason": "endTurn"
+        }),
+        "elicitation/create": ElicitationResponder(),
+    }
+
+
+def load_responders(path: str) -> Dict[str, Responder]:
+    """
+    Load responders from a JSON file.
+
+    The file maps a method to a spec with "result", "error" or "script" (a list
+    of steps), optionally with "delay" and "jitter" in seconds, e.g.::
+
+        {"sampling/createMessage": {"script": [{"result": {...}}, {"error": {"code": -1, "message": "No"}}],
+                                    "delay": 0.2}}
+
+    Args:
+        path: Location of the JSON file
+
+    Returns:
+        Responders by method
+
+    Raises:
+        ValueError: If the file is not a valid responder specification
+    """
+    with open(path) as f:
+        specs = json.load(f)
+    if not isinstance(specs, dict):
+        raise ValueError(f"{path}: expected an object mapping methods to responders")
+
+    responders: Dict[str, Responder] = {}
+    for method, spec in specs.items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"{path}: responder for {method} must be an object")
+        if "script" in spec:
+            responder: Responder = ScriptedResponder(spec["script"])
+        elif "result" in spec or "error" in spec:
+            responder = CannedResponder(spec.get("result"), spec.get("error"))
+        elif method in default_responders():
+            responder = default_responders()[method]
+        else:
+            raise ValueError(f"{path}: responder for {method} needs a result, error or script")
+        if spec.get("delay") or spec.get("jitter"):
+            responder = LatencyResponder(responder, float(spec.get("delay", 0)), float(spec.get("jitter", 0)))
+        responders[method] = responder
+    return responders
+
+
+class ClientRequestDispatcher:
+    """Answers server-to-client requests on worker threads."""
+
+    def __init__(self, responders: Optional[Dict[str, Responder]] = None,
+                 workers: int = DEFAULT_DISPATCHER_WORKERS):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            responders: Responders by method, added to (or replacing) the defaults
+            workers: Number of requests answered at the same time
+        """
+        self.responders = default_responders()
+        self.responders.update(responders or {})
+        self.latency = LatencyRecorder()
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="mcp-server-requests")
+
+    def register(self, method: str, responder: Responder) -> None:
+        """Answer requests for ``method`` with ``responder``."""
+        self.responders[method] = responder
+
+    @staticmethod
+    def is_server_request(message: Any) -> bool:
+        """Return True if a message read from the server is a request to the client."""
+        return isinstance(message, dict) and "method" in message and "id" in message
+
+    def dispatch(self, request: Dict[str, Any], reply: Callable[[Dict[str, Any]], None]) -> Future:
+        """
+        Answer a server request in the background.
+
+        Args:
+            request: The JSON-RPC request from the server
+            reply: Writes the JSON-RPC response back to the server
+
+        Returns:
+            A future that completes once the answer has been written
+        """
+        return self._pool.submit(self._answer, request, reply, time.perf_counter())
+
+    def _answer(self, request: Dict[str, Any], reply: Callable[[Dict[str, Any]], None],
+                received: float) -> None:
+        method = request.get("method", "")
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+        responder = self.responders.get(method)
+        if responder is None:
+            response["error"] = {"code": METHOD_NOT_FOUND, "message": f"Method not found: {method}"}
+        else:
+            try:
+                response["result"] = responder.respond(request.get("params") or {})
+            except ResponderError as e:
+                response["error"] = e.to_dict()
+            except Exception as e:
+                response["error"] = {"code": INTERNAL_ERROR, "message": str(e)}
+        if "error" in response:
+            with self._lock:
+                self.errors[method] = self.errors.get(method, 0) + 1
+        try:
+            reply(response)
+        except Exception:
+            # The session has ended; nobody is waiting for the answer any more
+            return
+        self.latency.record(method, time.perf_counter() - received)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the number of requests, errors and round-trip percentiles by method."""
+        with self._lock:
+            errors = dict(self.errors)
+        return {
+            method: {
+                "count": histogram.count,
+                "errors": errors.get(method, 0),
+                "p50": histogram.percentile(50),
+                "p99": histogram.percentile(99),
+                "max": histogram.max,
+            }
+            for method, histogram in sorted(self.latency.histograms.items())
+        }
+
+    def close(self) -> None:
+        """Stop the worker threads, dropping requests that have not started."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def server_requests_to_markdown(summary: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Format the server-to-client requests answered during a run as Markdown.
+
+    Args:
+        summary: The output of ClientRequestDispatcher.summary
+
+    Returns:
+        Markdown lines
+    """
+    lines = [
+        "## Server-to-Client Requests",
+        "",
+        "| Method | Requests | Errors | p50 Round Trip | p99 Round Trip | Max |",
+        "|--------|----------|--------|----------------|----------------|-----|",
+    ]
+    for method, stats in summary.items():
+        lines.append(f"| {method} | {stats['count']} | {stats['errors']} | {stats['p50'] * 1000:.2f}ms | "
+                     f"{stats['p99'] * 1000:.2f}ms | {stats['max'] * 1000:.2f}ms |")
+    return lines
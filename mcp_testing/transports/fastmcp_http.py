@@ -184,6 +184,7 @@ class FastMCPHttpAdapter(HttpTransportAdapter):
         # Ensure URL has session param
         url = f"{self.server_url}?session_id={self.session_id}"
         self.logger.debug(f"POST {url} -> {method} id={request_id}")
+        start = time.perf_counter()
         try:
             resp = self.session.post(url, json=req, headers=self.headers, timeout=self.timeout)
         except Exception as exc:
@@ -196,6 +197,7 @@ class FastMCPHttpAdapter(HttpTransportAdapter):
         ok, msg = self._wait_for_sse_response(request_id, self.timeout)
         if not ok:
             raise TimeoutError(f"Timed out waiting for response id {request_id}")
+        self._record_latency(method, start)
         return msg  # type: ignore[return-value]
 
     def send_notification(self, notification: Dict[str, Any]) -> None:
@@ -552,6 +552,7 @@ class HttpTransportAdapter(MCPTransportAdapter):
                 url += f"?session_id={self.session_id}"
             
             # Send request with retry handling
+            start = time.perf_counter()
             response = self.session.post(
                 url,
                 json=request,
@@ -561,6 +562,7 @@ class HttpTransportAdapter(MCPTransportAdapter):
             
             # Process response (includes 401/WWW-Authenticate handling)
             json_response = self._handle_response(response)
+            self._record_latency(method, start)
             
             # Extract session ID if this is an initialization response
             if method == "initialize" and response.ok:
@@ -706,6 +708,7 @@ class HttpTransportAdapter(MCPTransportAdapter):
                 url += f"?session_id={self.session_id}"
             
             # Send the HTTP request
+            start = time.perf_counter()
             response = self.session.post(
                 url,
                 json=requests,
@@ -726,6 +729,7 @@ class HttpTransportAdapter(MCPTransportAdapter):
             if not isinstance(responses, list):
                 raise ConnectionError("Expected batch response to be an array")
                 
+            self._record_latency("batch", start)
             return responses
             
         except requests.RequestException as e:
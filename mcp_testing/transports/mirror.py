@@ -0,0 +1,386 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Mirroring Transport Adapter for MCP Testing.
+
+This module implements a transport adapter that drives two servers with the same
+request stream. Every message sent through the adapter is forwarded to a primary
+(target) transport and a mirror (baseline) transport concurrently. The primary's
+response is returned to the caller, while both responses and their latencies are
+recorded so they can be compared after the run.
+
+Servers often hand out their own identifiers (async call ids, resource ids) that
+the client echoes back in later requests. The adapter learns which baseline value
+corresponds to each target value and rewrites mirrored requests accordingly, so the
+baseline sees an equivalent request stream rather than unknown ids.
+"""
+
+import copy
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, Any, List, Optional, Tuple
+
+from mcp_testing.transports.base import MCPTransportAdapter
+
+
+# Result fields whose values are server-issued handles that clients send back
+ALIAS_KEYS = ("id", "uri", "sessionId", "session_id")
+
+# Seconds stop() waits for the baseline to answer mirrored calls still running
+DEFAULT_MIRROR_TIMEOUT = 5.0
+
+
+def learn_aliases(source: Any, other: Any, aliases: Dict[str, str]) -> None:
+    """
+    Record which server-issued identifiers in ``other`` correspond to those in ``source``.
+
+    Args:
+        source: A response whose identifiers appear in later requests
+        other: The equivalent response from another server (or run)
+        aliases: Mapping from source identifiers to other identifiers, updated in place
+    """
+    if isinstance(source, dict) and isinstance(other, dict):
+        for key, value in source.items():
+            if key not in other:
+                continue
+            counterpart = other[key]
+            if (key in ALIAS_KEYS and isinstance(value, str) and isinstance(counterpart, str)
+                    and value != counterpart):
+                aliases[value] = counterpart
+            else:
+                learn_aliases(value, counterpart, aliases)
+    elif isinstance(source, list) and isinstance(other, list):
+        for source_item, other_item in zip(source, other):
+            learn_aliases(source_item, other_item, aliases)
+
+
+def translate_aliases(payload: Any, aliases: Dict[str, str]) -> Any:
+    """Return a copy of a payload with every known identifier replaced by its alias."""
+    if isinstance(payload, dict):
+        return {key: translate_aliases(value, aliases) for key, value in payload.items()}
+    if isinstance(payload, list):
+        return [translate_aliases(item, aliases) for item in payload]
+    if isinstance(payload, str):
+        return aliases.get(payload, payload)
+    return payload
+
+
+class MirroringTransportAdapter(MCPTransportAdapter):
+    """
+    Transport adapter that mirrors traffic to a baseline server.
+
+    The test code only ever sees the primary transport's responses, so test
+    outcomes are unaffected by the baseline. Each exchange is appended to
+    ``exchanges`` as a dictionary with the request, both responses (or errors)
+    and both latencies in seconds.
+
+    The primary is called on the caller's thread and its response is returned
+    as soon as it arrives. Mirrored calls run in order on a single worker
+    thread, so a slow baseline lags behind instead of holding up the test;
+    ``stop()`` waits at most ``mirror_timeout`` seconds for the baseline to catch
+    up and records anything still unanswered as a baseline error.
+
+    Deadlines are set on both transports. The primary's deadline state and
+    outstanding requests are the adapter's own, so a timed-out test cancels the
+    target's requests, and the cancellations are mirrored to the baseline.
+    """
+
+    def __init__(self, primary: MCPTransportAdapter, mirror: MCPTransportAdapter,
+                 debug: bool = False, mirror_timeout: float = DEFAULT_MIRROR_TIMEOUT):
+        """
+        Initialize the mirroring transport adapter.
+
+        Args:
+            primary: The transport for the server under test
+            mirror: The transport for the baseline server
+            debug: Whether to enable debug output
+            mirror_timeout: Seconds stop() waits for mirrored calls still running
+        """
+        self.primary = None
+        # Resets the forwarded state before the transports are set, so theirs is left alone
+        super().__init__(debug=debug)
+        self.primary = primary
+        self.mirror = mirror
+        self.mirror_timeout = mirror_timeout
+        self.exchanges: List[Dict[str, Any]] = []
+        self.aliases: Dict[str, str] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Mirrored calls not yet known to be finished, with their exchanges
+        self._pending: List[Tuple[Future, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+        # Exchanges given up on by wait_for_mirror, by id(), which late baseline answers must not fill in
+        self._abandoned: set = set()
+
+    @property
+    def process(self):
+        """The primary server process, for callers that inspect it."""
+        return getattr(self.primary, "process", None)
+
+    @property
+    def supports_deadline(self) -> bool:
+        """Deadlines work when the primary supports them."""
+        return getattr(self.primary, "supports_deadline", False) is True
+
+    @property
+    def deadline_expired(self) -> bool:
+        """Whether the primary's deadline passed."""
+        return getattr(self.primary, "deadline_expired", False) is True
+
+    @deadline_expired.setter
+    def deadline_expired(self, value: bool) -> None:
+        if self.primary is not None:
+            self.primary.deadline_expired = value
+
+    @property
+    def outstanding(self) -> Dict[Any, str]:
+        """The primary's unanswered requests."""
+        return self.primary.outstanding
+
+    @outstanding.setter
+    def outstanding(self, value: Dict[Any, str]) -> None:
+        if self.primary is not None:
+            self.primary.outstanding = value
+
+    @property
+    def cancelled(self) -> set:
+        """Ids whose late responses the primary drops."""
+        return self.primary.cancelled
+
+    @cancelled.setter
+    def cancelled(self, value: set) -> None:
+        if self.primary is not None:
+            self.primary.cancelled = value
+
+    @property
+    def late_responses(self) -> int:
+        """Late responses the primary dropped."""
+        return self.primary.late_responses
+
+    @late_responses.setter
+    def late_responses(self, value: int) -> None:
+        if self.primary is not None:
+            self.primary.late_responses = value
+
+    def set_deadline(self, seconds: Optional[float]) -> None:
+        """
+        Limit how long reads may wait, on both transports.
+
+        Args:
+            seconds: Seconds from now after which waiting for a response raises
+                RequestTimeoutError, or None to wait indefinitely
+        """
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        for transport in (self.primary, self.mirror):
+            if getattr(transport, "supports_deadline", False) is True:
+                transport.set_deadline(seconds)
+
+    @staticmethod
+    def _timed_call(func, *args) -> Tuple[Any, Optional[str], float]:
+        """Call ``func`` and return (result, error message, latency in seconds)."""
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+            return result, None, time.perf_counter() - start
+        except Exception as e:
+            return None, str(e), time.perf_counter() - start
+
+    def _learn_aliases(self, target: Any, baseline: Any) -> None:
+        """Remember baseline equivalents of server-issued identifiers."""
+        learn_aliases(target, baseline, self.aliases)
+
+    def _translate(self, payload: Any) -> Any:
+        """Rewrite known target identifiers in a payload to their baseline values."""
+        return translate_aliases(payload, self.aliases)
+
+    def _mirror_call(self, method_name: str, payload: Any, exchange: Dict[str, Any],
+                     primary_done: threading.Event) -> None:
+        """Send a payload to the baseline and complete its exchange; runs on the worker thread."""
+        # Translated here, after earlier exchanges have taught the aliases it may need
+        mirrored = self._translate(payload) if self.aliases else payload
+        if isinstance(mirrored, dict) and mirrored.get("method") == "notifications/cancelled":
+            # The baseline drops late answers to cancelled requests just like the target
+            request_id = mirrored.get("params", {}).get("requestId")
+            self.mirror.outstanding.pop(request_id, None)
+            self.mirror.cancelled.add(request_id)
+        result, error, latency = self._timed_call(getattr(self.mirror, method_name), mirrored)
+        primary_done.wait()
+        with self._lock:
+            if id(exchange) in self._abandoned:
+                return
+            exchange.update(baseline_response=copy.deepcopy(result), baseline_error=error,
+                            baseline_latency=latency)
+        if error is None and exchange["target_error"] is None:
+            self._learn_aliases(exchange["target_response"], result)
+
+    def _send_both(self, kind: str, method_name: str, payload: Any) -> Tuple[Any, float]:
+        """
+        Send the payload to the primary now and queue it for the baseline.
+
+        Returns:
+            The primary's result and latency in seconds
+
+        Raises:
+            Whatever the primary transport raised
+        """
+        exchange = {
+            "kind": kind,
+            "method": payload.get("method", "") if isinstance(payload, dict) else "batch",
+            "request": copy.deepcopy(payload),
+            "target_response": None,
+            "target_error": None,
+            "target_latency": 0.0,
+            "baseline_response": None,
+            "baseline_error": None,
+            "baseline_latency": 0.0,
+        }
+        self.exchanges.append(exchange)
+        primary_done = threading.Event()
+        self._pending = [(future, pending) for future, pending in self._pending if not future.done()]
+        self._pending.append((self._executor.submit(self._mirror_call, method_name, payload, exchange,
+                                                    primary_done), exchange))
+        start = time.perf_counter()
+        try:
+            result = getattr(self.primary, method_name)(payload)
+        except Exception as e:
+            exchange.update(target_error=str(e), target_latency=time.perf_counter() - start)
+            raise
+        finally:
+            primary_done.set()
+        latency = time.perf_counter() - start
+        # Copy responses so later mutation by protocol adapters doesn't leak into the record
+        exchange.update(target_response=copy.deepcopy(result), target_latency=latency)
+        return result, latency
+
+    def wait_for_mirror(self, timeout: float) -> int:
+        """
+        Wait for mirrored calls still running and give up on the rest.
+
+        Args:
+            timeout: Seconds to wait in total
+
+        Returns:
+            The number of mirrored calls recorded as timed out
+        """
+        deadline = time.monotonic() + timeout
+        unanswered = 0
+        for future, exchange in self._pending:
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                unanswered += 1
+        with self._lock:
+            for future, exchange in self._pending:
+                if not future.done():
+                    exchange.update(baseline_error=f"Baseline did not answer within {timeout:g}s of the target",
+                                    baseline_latency=exchange["target_latency"] + timeout)
+                    self._abandoned.add(id(exchange))
+        self._pending = []
+        return unanswered
+
+    def start(self) -> bool:
+        """
+        Start both transports.
+
+        Returns:
+            True if both transports started successfully, False otherwise
+        """
+        if self.is_started:
+            return True
+
+        # Launch both servers in parallel so startup costs about one spawn
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-mirror")
+        mirror = self._executor.submit(self.mirror.start)
+        primary_started = self.primary.start()
+        mirror_started = mirror.result()
+
+        if not (primary_started and mirror_started):
+            if self.debug:
+                print(f"Mirroring transport failed to start "
+                      f"(target: {primary_started}, baseline: {mirror_started})")
+            self.primary.stop()
+            self.mirror.stop()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            return False
+
+        self.is_started = True
+        return True
+
+    def stop(self) -> bool:
+        """
+        Stop both transports.
+
+        The baseline gets at most ``mirror_timeout`` seconds to finish mirrored
+        calls still running; it is then stopped, which ends any call it is stuck in.
+
+        Returns:
+            True if both transports stopped successfully, False otherwise
+        """
+        primary_stopped = self.primary.stop() is not False
+        if self._executor is not None:
+            unanswered = self.wait_for_mirror(self.mirror_timeout)
+            if unanswered and self.debug:
+                print(f"Baseline left {unanswered} mirrored calls unanswered")
+        mirror_stopped = self.mirror.stop() is not False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.is_started = False
+        return primary_stopped and mirror_stopped
+
+    def send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a JSON-RPC request to both servers and return the target's response.
+
+        Args:
+            request: The JSON-RPC request object
+
+        Returns:
+            The JSON-RPC response object from the target server
+
+        Raises:
+            ConnectionError: If the transport is not started or the target request fails
+        """
+        if not self.is_started:
+            raise ConnectionError("Transport not started")
+
+        response, latency = self._send_both("request", "send_request", request)
+        self.latency.record(request.get("method", ""), latency)
+        return response
+
+    def send_notification(self, notification: Dict[str, Any]) -> None:
+        """
+        Send a JSON-RPC notification to both servers.
+
+        Args:
+            notification: The JSON-RPC notification object
+
+        Raises:
+            ConnectionError: If the transport is not started or the target notification fails
+        """
+        if not self.is_started:
+            raise ConnectionError("Transport not started")
+
+        self._send_both("notification", "send_notification", notification)
+
+    def send_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send a batch of JSON-RPC requests to both servers.
+
+        Args:
+            requests: A list of JSON-RPC request objects
+
+        Returns:
+            A list of JSON-RPC response objects from the target server
+
+        Raises:
+            ConnectionError: If the transport is not started or the target batch fails
+        """
+        if not self.is_started:
+            raise ConnectionError("Transport not started")
+
+        responses, latency = self._send_both("batch", "send_batch", requests)
+        self.latency.record("batch", latency)
+        return responses
@@ -8,12 +8,16 @@ This module implements the STDIO transport adapter for the MCP testing framework
 It launches an MCP server as a subprocess and communicates with it via stdin/stdout.
 """
 
+import collections
 import json
+import queue
 import subprocess
+import threading
 import time
 from typing import Dict, Any, List, Optional
 
-from mcp_testing.transports.base import MCPTransportAdapter
+from mcp_testing.transports.base import MCPTransportAdapter, RequestTimeoutError
+from mcp_testing.transports.dispatcher import ClientRequestDispatcher, METHOD_NOT_FOUND
 
 
 class StdioTransportAdapter(MCPTransportAdapter):
@@ -24,8 +28,11 @@ class StdioTransportAdapter(MCPTransportAdapter):
     via standard input/output.
     """
     
+    supports_deadline = True
+    
     def __init__(self, server_command: str, env_vars: Optional[Dict[str, str]] = None, 
-                 timeout: float = 5.0, debug: bool = False):
+                 timeout: float = 5.0, debug: bool = False,
+                 dispatcher: Optional[ClientRequestDispatcher] = None):
         """
         Initialize the STDIO transport adapter.
         
@@ -34,12 +41,23 @@ class StdioTransportAdapter(MCPTransportAdapter):
             env_vars: Environment variables to pass to the server process
             timeout: Timeout for server responses in seconds
             debug: Whether to enable debug output
+            dispatcher: Answers requests the server sends to the client; without
+                one they are answered with "method not found"
         """
         super().__init__(debug=debug)
         self.server_command = server_command
         self.env_vars = env_vars or {}
         self.timeout = timeout
         self.process = None
+        # Recent server stderr output, kept so long sessions don't fill the pipe
+        self.stderr_lines = collections.deque(maxlen=200)
+        # Once a deadline or dispatcher is used, a reader thread owns stdout and hands lines over here
+        self._lines: Optional[queue.Queue] = None
+        self.dispatcher = dispatcher
+        # Notifications received while waiting for responses
+        self.notifications = collections.deque(maxlen=200)
+        # Requests and answers to server requests may be written from several threads
+        self._write_lock = threading.Lock()
     
     def __del__(self):
         """Clean up on deletion to avoid Windows file descriptor issues"""
@@ -91,6 +109,16 @@ class StdioTransportAdapter(MCPTransportAdapter):
                     print(f"Server error output: {stderr}")
                 return False
                 
+            # Drain stderr in the background; a server that logs every request
+            # would otherwise block once the pipe buffer is full
+            threading.Thread(
+                target=self._drain_stderr, args=(self.process.stderr,), daemon=True
+            ).start()
+            
+            # Server requests must be answered even while no client request is outstanding
+            if self.dispatcher is not None:
+                self._start_reader()
+                
             self.is_started = True
             return True
             
@@ -99,6 +127,93 @@ class StdioTransportAdapter(MCPTransportAdapter):
                 print(f"Failed to start server process: {str(e)}")
             return False
     
+    def _drain_stderr(self, stream) -> None:
+        """Read the server's stderr until it closes, keeping the most recent lines."""
+        try:
+            for line in stream:
+                self.stderr_lines.append(line.rstrip("\n"))
+        except (ValueError, OSError):
+            # The stream was closed by stop()
+            pass
+    
+    def _read_stdout(self, stream, lines: queue.Queue) -> None:
+        """Read the server's stdout line by line until it closes, answering server requests at once."""
+        try:
+            for line in stream:
+                if self.dispatcher is not None:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        message = None
+                    if ClientRequestDispatcher.is_server_request(message):
+                        self.dispatcher.dispatch(message, self._reply)
+                        continue
+                lines.put(line)
+        except (ValueError, OSError):
+            # The stream was closed by stop()
+            pass
+        lines.put("")
+    
+    def _start_reader(self) -> None:
+        """Hand stdout to a reader thread for the rest of the session."""
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._read_stdout, args=(self.process.stdout, self._lines), daemon=True
+        ).start()
+    
+    def _write(self, message: Any) -> None:
+        """Write one JSON-RPC message to the server."""
+        with self._write_lock:
+            self.process.stdin.write(json.dumps(message) + "\n")
+            self.process.stdin.flush()
+    
+    def _reply(self, response: Dict[str, Any]) -> None:
+        """Send the answer to a server request."""
+        if self.debug:
+            print(f"Answering server request: {json.dumps(response)}")
+        self._write(response)
+    
+    def _handle_server_message(self, message: Any) -> bool:
+        """
+        Handle a request or notification from the server read while waiting for a response.
+        
+        Returns:
+            True if the message was not a response
+        """
+        if not isinstance(message, dict) or "method" not in message:
+            return False
+        if "id" not in message:
+            self.notifications.append(message)
+        elif self.dispatcher is not None:
+            self.dispatcher.dispatch(message, self._reply)
+        else:
+            self._reply({"jsonrpc": "2.0", "id": message["id"],
+                         "error": {"code": METHOD_NOT_FOUND, "message": f"Method not found: {message['method']}"}})
+        return True
+    
+    def _read_line(self) -> str:
+        """
+        Read one line of server output, waiting no longer than the deadline.
+        
+        Raises:
+            RequestTimeoutError: If the deadline passes first
+        """
+        if self._lines is None:
+            if self.deadline is None:
+                return self.process.stdout.readline()
+            # A blocking readline cannot be abandoned, so hand stdout to a thread for good
+            self._start_reader()
+        
+        wait = None if self.deadline is None else self.deadline - time.monotonic()
+        try:
+            # Once the deadline has passed, fail even if a line is already waiting
+            if wait is not None and wait <= 0:
+                raise queue.Empty
+            return self._lines.get(timeout=wait)
+        except queue.Empty:
+            self.deadline_expired = True
+            raise RequestTimeoutError("Deadline passed while waiting for the server")
+    
     def stop(self) -> bool:
         """
         Stop the server process.
@@ -204,21 +319,38 @@ class StdioTransportAdapter(MCPTransportAdapter):
                 print(f"Sending request: {request_str.strip()}")
             
             # Send the request
-            self.process.stdin.write(request_str)
-            self.process.stdin.flush()
-            
-            # Read the response
-            response_str = self.process.stdout.readline().strip()
-            
-            if not response_str:
-                raise ConnectionError("No response received from server")
+            start = time.perf_counter()
+            request_id = request.get("id")
+            self.cancelled.discard(request_id)
+            self.outstanding[request_id] = request.get("method", "")
+            with self._write_lock:
+                self.process.stdin.write(request_str)
+                self.process.stdin.flush()
+            
+            while True:
+                # Read the response
+                response_str = self._read_line().strip()
                 
-            if self.debug:
-                print(f"Received response: {response_str}")
-            
-            # Parse and return the response
-            return json.loads(response_str)
-            
+                if not response_str:
+                    raise ConnectionError("No response received from server")
+                    
+                if self.debug:
+                    print(f"Received response: {response_str}")
+                
+                # Parse and return the response, dropping answers to cancelled requests
+                response = json.loads(response_str)
+                if self._handle_server_message(response):
+                    continue
+                if isinstance(response, dict) and response.get("id") in self.cancelled:
+                    self.cancelled.discard(response.get("id"))
+                    self.late_responses += 1
+                    continue
+                self.outstanding.pop(request_id, None)
+                self._record_latency(request.get("method", ""), start)
+                return response
+            
+        except RequestTimeoutError:
+            raise
         except json.JSONDecodeError as e:
             raise ConnectionError(f"Invalid JSON response: {str(e)}")
         except Exception as e:
@@ -245,8 +377,9 @@ class StdioTransportAdapter(MCPTransportAdapter):
                 print(f"Sending notification: {notification_str.strip()}")
             
             # Send the notification
-            self.process.stdin.write(notification_str)
-            self.process.stdin.flush()
+            with self._write_lock:
+                self.process.stdin.write(notification_str)
+                self.process.stdin.flush()
             
         except Exception as e:
             raise ConnectionError(f"Failed to send notification: {str(e)}")
@@ -275,35 +408,30 @@ class StdioTransportAdapter(MCPTransportAdapter):
                 print(f"Sending batch request: {batch_str.strip()}")
             
             # Send the batch request
-            self.process.stdin.write(batch_str)
-            self.process.stdin.flush()
-            
-            # Set up for non-blocking read with timeout
-            import select
-            import time
-            
-            start_time = time.time()
-            response_str = ""
-            stdout_fd = self.process.stdout.fileno()
-            
-            # Wait for response with timeout
-            while time.time() - start_time < self.timeout:
-                # Check if data is available to read
-                ready, _, _ = select.select([stdout_fd], [], [], 0.1)
-                if ready:
-                    # Read available data
-                    line = self.process.stdout.readline().strip()
-                    if line:
-                        response_str = line
+            batch_start = time.perf_counter()
+            with self._write_lock:
+                self.process.stdin.write(batch_str)
+                self.process.stdin.flush()
+            
+            # Wait no longer than the test's deadline, or the transport timeout without one
+            own_deadline = self.deadline is None
+            if own_deadline:
+                self.set_deadline(self.timeout)
+            try:
+                while True:
+                    response_str = self._read_line().strip()
+                    if not response_str:
+                        raise ConnectionError("No response received from server")
+                    if not self._handle_server_message(json.loads(response_str)):
                         break
-                
-                # Small sleep to prevent CPU spinning
-                time.sleep(0.05)
-            
-            # Check if we got a response
-            if not response_str:
+            except RequestTimeoutError:
+                if not own_deadline:
+                    raise
                 raise ConnectionError(f"No response received from server within {self.timeout} seconds")
-                
+            finally:
+                if own_deadline:
+                    self.set_deadline(None)
+            
             if self.debug:
                 print(f"Received batch response: {response_str}")
             
@@ -313,8 +441,11 @@ class StdioTransportAdapter(MCPTransportAdapter):
             if not isinstance(responses, list):
                 raise ConnectionError("Expected batch response to be an array")
                 
+            self._record_latency("batch", batch_start)
             return responses
             
+        except RequestTimeoutError:
+            raise
         except json.JSONDecodeError as e:
             raise ConnectionError(f"Invalid JSON response: {str(e)}")
         except Exception as e:
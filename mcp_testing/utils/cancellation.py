@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Cooperative Cancellation for MCP Testing Framework.
+
+When a test runs past its deadline, the requests it left unanswered are
+cancelled with ``notifications/cancelled`` instead of killing the server. The
+server then gets a grace period to drop the work and answer a ping. A server
+that answers is healthy and its session can be shut down normally or kept for
+more work; one that does not is stopped.
+
+The cancellation latency is the time from sending the cancellations until the
+ping is answered, i.e. how long the server kept working on requests nobody was
+waiting for. Responses to cancelled requests that still arrive are discarded by
+the transport and counted as late responses.
+"""
+
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from mcp_testing.transports.base import MCPTransportAdapter
+
+DEFAULT_CANCEL_GRACE = 1.0
+
+# The initialize request must not be cancelled (MCP specification, cancellation)
+_UNCANCELLABLE_METHODS = ("initialize",)
+
+
+def cancel_after_timeout(transport: MCPTransportAdapter, reason: str,
+                         grace: float = DEFAULT_CANCEL_GRACE) -> Optional[Dict[str, Any]]:
+    """
+    Cancel a timed-out test's outstanding requests and check the server is healthy.
+
+    If the server does not answer the ping within the grace period, the
+    transport is left with an expired deadline so the teardown that follows
+    cannot block on it.
+
+    Args:
+        transport: The transport the test used
+        reason: Reason sent with each cancellation
+        grace: Seconds the server has to answer a ping after the cancellations
+
+    Returns:
+        A dictionary with the cancelled request ids, whether the server stayed
+        healthy, the cancellation latency and the number of late responses, or
+        None if the transport does not support deadlines
+    """
+    if getattr(transport, "supports_deadline", False) is not True or not transport.is_started:
+        return None
+
+    pending = dict(transport.outstanding)
+    transport.outstanding.clear()
+    cancellable = [request_id for request_id, method in pending.items()
+                   if method not in _UNCANCELLABLE_METHODS]
+    late_before = transport.late_responses
+
+    sent = time.monotonic()
+    healthy = len(cancellable) == len(pending)
+    if healthy:
+        try:
+            for request_id in cancellable:
+                transport.send_notification({
+                    "jsonrpc": "2.0",
+                    "method": "notifications/cancelled",
+                    "params": {"requestId": request_id, "reason": reason}
+                })
+            transport.cancelled.update(cancellable)
+            transport.set_deadline(grace)
+            # Any answer means the server is responsive again, even an error from a server without ping
+            transport.send_request({"jsonrpc": "2.0", "id": f"ping-after-cancel-{int(sent * 1000)}",
+                                    "method": "ping"})
+        except Exception:
+            healthy = False
+    latency = time.monotonic() - sent
+
+    # A server that did not recover gets no more time during teardown
+    transport.set_deadline(None if healthy else 0)
+    return {
+        "requests": [str(request_id) for request_id in cancellable],
+        "healthy": healthy,
+        "latency": latency if healthy else None,
+        "late_responses": transport.late_responses - late_before,
+    }
+
+
+def summarize_cancellations(cancellations: Sequence[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Summarize the cancellations made during a run.
+
+    Args:
+        cancellations: Outputs of cancel_after_timeout; None entries are ignored
+
+    Returns:
+        Counts and cancellation latency statistics, or None if nothing was cancelled
+    """
+    records = [c for c in cancellations if c]
+    if not records:
+        return None
+    latencies = sorted(c["latency"] for c in records if c["latency"] is not None)
+    return {
+        "timeouts": len(records),
+        "requests": sum(len(c["requests"]) for c in records),
+        "healthy": sum(1 for c in records if c["healthy"]),
+        "late_responses": sum(c["late_responses"] for c in records),
+        "latency": {
+            "p50": statistics.median(latencies),
+            "max": latencies[-1],
+            "mean": statistics.fmean(latencies),
+        } if latencies else None,
+    }
+
+
+def cancellation_to_markdown(summary: Dict[str, Any]) -> List[str]:
+    """
+    Format a cancellation summary as Markdown.
+
+    Args:
+        summary: The output of summarize_cancellations
+
+    Returns:
+        Markdown lines
+    """
+    lines = [
+        "## Cancellation",
+        "",
+        f"- **Timed-out Tests**: {summary['timeouts']} ({summary['requests']} requests cancelled)",
+        f"- **Server Recovered**: {summary['healthy']} of {summary['timeouts']}",
+    ]
+    if summary["latency"]:
+        lines.append(f"- **Cancellation Latency**: p50 {summary['latency']['p50'] * 1000:.1f}ms, "
+                     f"max {summary['latency']['max'] * 1000:.1f}ms")
+    lines.append(f"- **Responses After Cancellation**: {summary['late_responses']}")
+    return lines
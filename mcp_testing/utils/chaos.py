@@ -0,0 +1,724 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Chaos Proxy for MCP Testing Framework.
+
+A chaos proxy sits between the validator and a server and degrades the link
+the way slow pipes and lossy proxies do in real deployments. Every frame (a
+JSON-RPC line on STDIO, a request or response body or SSE event over HTTP) can
+be:
+
+    - delayed by a latency drawn from a distribution (fixed, uniform, normal,
+      lognormal or exponential)
+    - slowed to a bandwidth cap, so large frames take longer than small ones
+    - reordered, by holding it back so later frames overtake it
+    - duplicated
+    - dropped
+    - written in two parts with a pause in between (a partial write)
+
+Faults are configured with a JSON profile. Settings at the top level apply to
+both directions; ``client_to_server`` and ``server_to_client`` sections
+override them per direction::
+
+    {
+        "seed": 7,
+        "latency": {"distribution": "lognormal", "median": 0.02, "sigma": 0.8},
+        "bandwidth": 65536,
+        "reorder": 0.05,
+        "server_to_client": {"duplicate": 0.01, "partial_write": 0.1},
+        "client_to_server": {"drop": 0.001}
+    }
+
+In STDIO mode the proxy wraps the server command (see chaos_server_command) and
+appends its counters to a stats file when it exits, one JSON line per session.
+In HTTP mode it is a reverse proxy in front of a server URL.
+"""
+
+import heapq
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from mcp_testing.utils.histogram import LatencyHistogram, LatencyRecorder
+
+DIRECTIONS = ("client_to_server", "server_to_client")
+
+# Extra hold of a reordered frame unless the profile sets "reorder_delay"
+DEFAULT_REORDER_DELAY = 0.05
+# Pause between the two parts of a partial write unless the profile sets "partial_pause"
+DEFAULT_PARTIAL_PAUSE = 0.01
+
+_PROBABILITIES = ("reorder", "duplicate", "drop", "partial_write")
+_SETTINGS = ("latency", "bandwidth", "reorder_delay", "partial_pause") + _PROBABILITIES
+
+# Headers that describe a single connection and are not forwarded by the HTTP proxy
+_HOP_BY_HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "te", "trailer",
+               "upgrade", "content-length", "host"}
+
+
+class LatencyDistribution:
+    """A distribution of per-frame delays in seconds."""
+
+    _PARAMETERS = {
+        "fixed": ("value",),
+        "uniform": ("min", "max"),
+        "normal": ("mean", "stddev"),
+        "lognormal": ("median", "sigma"),
+        "exponential": ("mean",),
+    }
+
+    def __init__(self, spec: Any):
+        """
+        Initialize the distribution.
+
+        Args:
+            spec: A number of seconds (a fixed delay) or an object with
+                "distribution" and its parameters
+
+        Raises:
+            ValueError: If the distribution or its parameters are invalid
+        """
+        if isinstance(spec, (int, float)):
+            spec = {"distribution": "fixed", "value": spec}
+        if not isinstance(spec, dict):
+            raise ValueError("latency must be a number of seconds or an object")
+        self.kind = spec.get("distribution", "fixed")
+        if self.kind not in self._PARAMETERS:
+            raise ValueError(f"unknown latency distribution {self.kind!r} "
+                             f"(expected one of {', '.join(self._PARAMETERS)})")
+        try:
+            self.params = {name: float(spec[name]) for name in self._PARAMETERS[self.kind]}
+        except KeyError as e:
+            raise ValueError(f"{self.kind} latency needs {e.args[0]!r}")
+        if any(value < 0 for value in self.params.values()):
+            raise ValueError("latency parameters must not be negative")
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a delay; never negative."""
+        p = self.params
+        if self.kind == "fixed":
+            value = p["value"]
+        elif self.kind == "uniform":
+            value = rng.uniform(p["min"], p["max"])
+        elif self.kind == "normal":
+            value = rng.gauss(p["mean"], p["stddev"])
+        elif self.kind == "lognormal":
+            value = p["median"] * math.exp(rng.gauss(0.0, p["sigma"])) if p["median"] > 0 else 0.0
+        else:
+            value = rng.expovariate(1.0 / p["mean"]) if p["mean"] > 0 else 0.0
+        return max(0.0, value)
+
+    def describe(self) -> str:
+        """Return a short description such as "lognormal(median=0.02, sigma=0.8)"."""
+        return f"{self.kind}({', '.join(f'{k}={v:g}' for k, v in self.params.items())})"
+
+
+class ChaosSettings:
+    """The faults injected in one direction."""
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the settings.
+
+        Args:
+            spec: Profile settings; missing ones inject nothing
+
+        Raises:
+            ValueError: If a setting is invalid
+        """
+        spec = spec or {}
+        unknown = set(spec) - set(_SETTINGS)
+        if unknown:
+            raise ValueError(f"unknown chaos settings: {', '.join(sorted(unknown))}")
+        self.latency = LatencyDistribution(spec["latency"]) if "latency" in spec else None
+        self.bandwidth = float(spec.get("bandwidth") or 0)
+        self.reorder_delay = float(spec.get("reorder_delay", DEFAULT_REORDER_DELAY))
+        self.partial_pause = float(spec.get("partial_pause", DEFAULT_PARTIAL_PAUSE))
+        for name in _PROBABILITIES:
+            value = float(spec.get(name, 0))
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be a probability between 0 and 1")
+            setattr(self, name, value)
+        if self.bandwidth < 0 or self.reorder_delay < 0 or self.partial_pause < 0:
+            raise ValueError("bandwidth, reorder_delay and partial_pause must not be negative")
+
+    def describe(self) -> str:
+        """Return the active faults as a short comma-separated list."""
+        parts = []
+        if self.latency:
+            parts.append(f"latency {self.latency.describe()}")
+        if self.bandwidth:
+            parts.append(f"bandwidth {self.bandwidth:g} B/s")
+        for name in _PROBABILITIES:
+            if getattr(self, name):
+                parts.append(f"{name.replace('_', ' ')} {getattr(self, name) * 100:g}%")
+        return ", ".join(parts) or "none"
+
+
+class ChaosProfile:
+    """Fault settings for both directions of a link."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Initialize the profile.
+
+        Args:
+            spec: The profile (see the module docstring)
+
+        Raises:
+            ValueError: If the profile is invalid
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("a chaos profile must be a JSON object")
+        unknown = set(spec) - set(_SETTINGS) - set(DIRECTIONS) - {"seed"}
+        if unknown:
+            raise ValueError(f"unknown chaos settings: {', '.join(sorted(unknown))}")
+        self.spec = spec
+        self.seed = spec.get("seed")
+        shared = {key: value for key, value in spec.items() if key in _SETTINGS}
+        self.directions: Dict[str, ChaosSettings] = {}
+        for direction in DIRECTIONS:
+            override = spec.get(direction, {})
+            if not isinstance(override, dict):
+                raise ValueError(f"{direction} must be an object")
+            self.directions[direction] = ChaosSettings({**shared, **override})
+
+    @classmethod
+    def load(cls, path: str) -> "ChaosProfile":
+        """
+        Load a profile from a JSON file.
+
+        Raises:
+            ValueError: If the file is not a valid profile
+        """
+        with open(path) as f:
+            try:
+                spec = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}: {e}")
+        return cls(spec)
+
+    def rng(self, salt: str) -> random.Random:
+        """Return a random generator; seeded profiles give each direction its own reproducible stream."""
+        return random.Random(None if self.seed is None else f"{self.seed}:{salt}")
+
+
+class ChaosChannel:
+    """
+    Delivers frames in one direction with the configured faults.
+
+    Frames are scheduled on arrival and written by a delivery thread, so a
+    delayed frame never blocks the reader. Frames keep their order (like a pipe
+    or TCP stream) unless reordered: a reordered frame is held for an extra
+    ``reorder_delay`` and later frames may overtake it.
+    """
+
+    def __init__(self, settings: ChaosSettings, write: Callable[[bytes], None],
+                 rng: Optional[random.Random] = None, name: str = "chaos"):
+        """
+        Initialize the channel.
+
+        Args:
+            settings: The faults to inject
+            write: Writes (and flushes) bytes to the receiving side
+            rng: Random generator for fault decisions
+            name: Name of the delivery thread
+        """
+        self.settings = settings
+        self._write = write
+        self._rng = rng or random.Random()
+        self._heap: List[Any] = []
+        self._order = itertools.count()
+        self._floor = 0.0
+        self._link_free = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.counters = {"frames": 0, "bytes": 0, "delivered": 0, "dropped": 0, "duplicated": 0,
+                         "reordered": 0, "partial_writes": 0, "write_errors": 0}
+        self.delay = LatencyHistogram()
+        self._thread = threading.Thread(target=self._deliver, name=name, daemon=True)
+        self._thread.start()
+
+    def send(self, frame: bytes) -> None:
+        """Schedule a frame for delivery (or drop it)."""
+        settings, rng = self.settings, self._rng
+        now = time.monotonic()
+        with self._condition:
+            self.counters["frames"] += 1
+            self.counters["bytes"] += len(frame)
+            if settings.drop and rng.random() < settings.drop:
+                self.counters["dropped"] += 1
+                return
+            delay = settings.latency.sample(rng) if settings.latency else 0.0
+            if settings.reorder and rng.random() < settings.reorder:
+                self.counters["reordered"] += 1
+                due = max(now + delay, self._floor) + settings.reorder_delay
+            else:
+                due = max(now + delay, self._floor)
+                self._floor = due
+            # Where a partial write splits the frame, or 0 for a whole write; drawn here with the other
+            # decisions so a seeded profile makes the same choices whatever the delivery timing
+            split = 0
+            if settings.partial_write and rng.random() < settings.partial_write and len(frame) > 1:
+                split = rng.randint(1, len(frame) - 1)
+            heapq.heappush(self._heap, (due, next(self._order), now, frame, split))
+            if settings.duplicate and rng.random() < settings.duplicate:
+                self.counters["duplicated"] += 1
+                heapq.heappush(self._heap, (due, next(self._order), now, frame, 0))
+            self._condition.notify()
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Deliver the frames still scheduled, then stop the delivery thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def _deliver(self) -> None:
+        settings = self.settings
+        while True:
+            with self._condition:
+                while True:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    elif self._closed:
+                        return
+                    else:
+                        self._condition.wait()
+                _, _, received, frame, split = heapq.heappop(self._heap)
+
+            # Frames share the link: each one occupies it for len / bandwidth seconds
+            if settings.bandwidth:
+                start = max(time.monotonic(), self._link_free)
+                self._link_free = start + len(frame) / settings.bandwidth
+                time.sleep(max(0.0, self._link_free - time.monotonic()))
+            try:
+                if split:
+                    self._write(frame[:split])
+                    time.sleep(settings.partial_pause)
+                    self._write(frame[split:])
+                else:
+                    self._write(frame)
+            except (OSError, ValueError):
+                with self._condition:
+                    self.counters["write_errors"] += 1
+                continue
+            with self._condition:
+                if split:
+                    self.counters["partial_writes"] += 1
+                self.counters["delivered"] += 1
+                self.delay.record(time.monotonic() - received)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters and the histogram of added delay."""
+        with self._condition:
+            return {**self.counters, "delay": self.delay.to_dict()}
+
+
+def _writer(stream) -> Callable[[bytes], None]:
+    def write(data: bytes) -> None:
+        stream.write(data)
+        stream.flush()
+    return write
+
+
+def _append_stats(path: Optional[str], mode: str, channels: Dict[str, ChaosChannel]) -> None:
+    if not path:
+        return
+    record = {"mode": mode, "directions": {name: channel.stats() for name, channel in channels.items()}}
+    # One line per session; appends of a single short line do not interleave
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def run_stdio_proxy(profile: ChaosProfile, command: Sequence[str], stats_path: Optional[str] = None) -> int:
+    """
+    Run a server behind the chaos proxy, relaying this process's stdin and stdout.
+
+    Args:
+        profile: The faults to inject
+        command: The server command and its arguments
+        stats_path: File the session's counters are appended to on exit
+
+    Returns:
+        The server's exit code
+    """
+    process = subprocess.Popen(list(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+    channels = {
+        "client_to_server": ChaosChannel(profile.directions["client_to_server"], _writer(process.stdin),
+                                         profile.rng("client_to_server"), "chaos-client-to-server"),
+        "server_to_client": ChaosChannel(profile.directions["server_to_client"], _writer(sys.stdout.buffer),
+                                         profile.rng("server_to_client"), "chaos-server-to-client"),
+    }
+    finished = threading.Event()
+
+    def finish(*_):
+        # Stopped by the validator: take the server down too and keep the counters
+        if finished.is_set():
+            return
+        finished.set()
+        process.terminate()
+        _append_stats(stats_path, "stdio", channels)
+        os._exit(128 + signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, finish)
+
+    def relay_client():
+        for line in iter(sys.stdin.buffer.readline, b""):
+            channels["client_to_server"].send(line)
+        channels["client_to_server"].close()
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+    threading.Thread(target=relay_client, daemon=True).start()
+    for line in iter(process.stdout.readline, b""):
+        channels["server_to_client"].send(line)
+    channels["server_to_client"].close()
+    returncode = process.wait()
+    if not finished.is_set():
+        finished.set()
+        _append_stats(stats_path, "stdio", channels)
+    return returncode
+
+
+def chaos_server_command(server_command: str, profile_path: str, stats_path: Optional[str] = None) -> str:
+    """
+    Wrap a STDIO server command so the server runs behind the chaos proxy.
+
+    Args:
+        server_command: The command that starts the server
+        profile_path: The chaos profile
+        stats_path: File each session's counters are appended to
+
+    Returns:
+        A command for StdioTransportAdapter
+    """
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "chaos_proxy.py")
+    parts = [sys.executable, script, "--profile", os.path.abspath(profile_path)]
+    if stats_path:
+        parts.extend(["--stats", os.path.abspath(stats_path)])
+    return " ".join(parts + ["--", server_command])
+
+
+class ChannelRecorder:
+    """Counters of the HTTP proxy for one direction."""
+
+    def __init__(self):
+        self.counters = {"frames": 0, "bytes": 0, "delivered": 0, "dropped": 0, "duplicated": 0,
+                         "reordered": 0, "partial_writes": 0, "write_errors": 0}
+        self.delay = LatencyHistogram()
+
+
+class ChaosHTTPProxy:
+    """
+    Reverse proxy that injects faults between an HTTP client and an MCP server.
+
+    Client-to-server faults apply to request bodies and server-to-client faults
+    to response bodies, or to each event of an SSE stream. A dropped request or
+    response closes the connection without an answer; a duplicated request is
+    sent to the server twice and the client sees the first response.
+    """
+
+    def __init__(self, profile: ChaosProfile, target: str, host: str = "127.0.0.1", port: int = 0,
+                 timeout: float = 60.0):
+        """
+        Initialize the proxy.
+
+        Args:
+            profile: The faults to inject
+            target: Base URL of the server, e.g. http://localhost:9000
+            host: Address to listen on
+            port: Port to listen on; 0 picks a free port
+            timeout: Seconds to wait for the server
+        """
+        parts = urlsplit(target)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"chaos HTTP proxy needs an http:// target, got {target!r}")
+        self.profile = profile
+        self.target_host = parts.hostname
+        self.target_port = parts.port or 80
+        self.timeout = timeout
+        self.stats_lock = threading.Lock()
+        self.recorded = {direction: ChannelRecorder() for direction in DIRECTIONS}
+        self.rngs = {direction: profile.rng(direction) for direction in DIRECTIONS}
+        self.server = ThreadingHTTPServer((host, port), _ChaosHandler)
+        self.server.daemon_threads = True
+        self.server.proxy = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL clients should use instead of the target."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ChaosHTTPProxy":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="chaos-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def decide(self, direction: str, size: int) -> Dict[str, Any]:
+        """
+        Decide the faults for one frame.
+
+        Returns:
+            {"drop", "delay", "duplicate", "partial"}; the delay includes
+            reordering and transmission time at the bandwidth cap
+        """
+        settings, rng = self.profile.directions[direction], self.rngs[direction]
+        with self.stats_lock:
+            counters = self.recorded[direction].counters
+            counters["frames"] += 1
+            counters["bytes"] += size
+            if settings.drop and rng.random() < settings.drop:
+                counters["dropped"] += 1
+                return {"drop": True, "delay": 0.0, "duplicate": False, "partial": False}
+            delay = settings.latency.sample(rng) if settings.latency else 0.0
+            if settings.reorder and rng.random() < settings.reorder:
+                counters["reordered"] += 1
+                delay += settings.reorder_delay
+            if settings.bandwidth:
+                delay += size / settings.bandwidth
+            duplicate = bool(settings.duplicate) and rng.random() < settings.duplicate
+            if duplicate:
+                counters["duplicated"] += 1
+            partial = bool(settings.partial_write) and size > 1 and rng.random() < settings.partial_write
+            if partial:
+                counters["partial_writes"] += 1
+            counters["delivered"] += 1
+            self.recorded[direction].delay.record(delay)
+        return {"drop": False, "delay": delay, "duplicate": duplicate, "partial": partial}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters in the format the STDIO proxy appends to its stats file."""
+        with self.stats_lock:
+            return {"mode": "http", "directions": {
+                direction: {**recorder.counters, "delay": recorder.delay.to_dict()}
+                for direction, recorder in self.recorded.items()
+            }}
+
+
+class _ChaosHandler(BaseHTTPRequestHandler):
+    """Forwards one request through the chaos proxy."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._proxy()
+
+    def do_POST(self):
+        self._proxy()
+
+    def do_DELETE(self):
+        self._proxy()
+
+    def _forward(self, body: bytes) -> http.client.HTTPResponse:
+        proxy = self.server.proxy
+        connection = http.client.HTTPConnection(proxy.target_host, proxy.target_port, timeout=proxy.timeout)
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in _HOP_BY_HOP}
+        connection.request(self.command, self.path, body=body or None, headers=headers)
+        return connection.getresponse()
+
+    def _drop(self) -> None:
+        self.close_connection = True
+
+    def _write_body(self, data: bytes, partial: bool) -> None:
+        if partial:
+            split = len(data) // 2
+            self.wfile.write(data[:split])
+            self.wfile.flush()
+            time.sleep(self.server.proxy.profile.directions["server_to_client"].partial_pause)
+            self.wfile.write(data[split:])
+        else:
+            self.wfile.write(data)
+        self.wfile.flush()
+
+    def _proxy(self) -> None:
+        proxy = self.server.proxy
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        request_faults = proxy.decide("client_to_server", len(body))
+        if request_faults["drop"]:
+            return self._drop()
+        time.sleep(request_faults["delay"])
+        if request_faults["duplicate"]:
+            threading.Thread(target=lambda: self._forward(body).read(), daemon=True).start()
+        try:
+            upstream = self._forward(body)
+        except OSError as e:
+            self.send_error(502, f"Chaos proxy could not reach the server: {e}")
+            return
+
+        headers = [(k, v) for k, v in upstream.getheaders() if k.lower() not in _HOP_BY_HOP]
+        if "text/event-stream" in (upstream.getheader("Content-Type") or ""):
+            self.send_response(upstream.status)
+            for key, value in headers:
+                self.send_header(key, value)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            event = b""
+            for line in iter(upstream.readline, b""):
+                event += line
+                if line.strip():
+                    continue
+                faults = proxy.decide("server_to_client", len(event))
+                if not faults["drop"]:
+                    time.sleep(faults["delay"])
+                    self._write_body(event, faults["partial"])
+                    if faults["duplicate"]:
+                        self._write_body(event, False)
+                event = b""
+            return
+
+        data = upstream.read()
+        response_faults = proxy.decide("server_to_client", len(data))
+        if response_faults["drop"]:
+            return self._drop()
+        time.sleep(response_faults["delay"])
+        self.send_response(upstream.status)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self._write_body(data, response_faults["partial"])
+
+
+def read_chaos_stats(path: str) -> List[Dict[str, Any]]:
+    """Read the per-session records appended by the STDIO proxy, skipping torn lines."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def summarize_chaos(profile: ChaosProfile, records: Sequence[Dict[str, Any]],
+                    latency: Optional[LatencyRecorder] = None,
+                    baseline: Optional[Dict[str, LatencyHistogram]] = None) -> Dict[str, Any]:
+    """
+    Summarize the faults injected during a run and their effect on latency.
+
+    Args:
+        profile: The profile used
+        records: Per-session stats (read_chaos_stats or ChaosHTTPProxy.stats)
+        latency: Per-method request latency observed by the validator
+        baseline: Per-method latency of clean runs, to show the impact
+
+    Returns:
+        The profile, per-direction totals with added-delay percentiles, and
+        per-method p50/p99 next to the clean baseline when there is one
+    """
+    directions = {}
+    for direction in DIRECTIONS:
+        totals: Dict[str, Any] = {}
+        delay = LatencyHistogram()
+        for record in records:
+            stats = (record.get("directions") or {}).get(direction)
+            if not stats:
+                continue
+            for key, value in stats.items():
+                if key == "delay":
+                    delay.merge(LatencyHistogram.from_dict(value))
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        totals["delay"] = {"p50": delay.percentile(50), "p99": delay.percentile(99), "max": delay.max} \
+            if delay.count else None
+        directions[direction] = totals
+
+    methods = []
+    for method, histogram in sorted((latency.histograms if latency else {}).items()):
+        if not histogram.count:
+            continue
+        reference = (baseline or {}).get(method)
+        methods.append({
+            "method": method,
+            "count": histogram.count,
+            "p50": histogram.percentile(50),
+            "p99": histogram.percentile(99),
+            "baseline_p50": reference.percentile(50) if reference and reference.count else None,
+            "baseline_p99": reference.percentile(99) if reference and reference.count else None,
+        })
+    return {
+        "profile": profile.spec,
+        "faults": {direction: profile.directions[direction].describe() for direction in DIRECTIONS},
+        "sessions": len(records),
+        "directions": directions,
+        "methods": methods,
+    }
+
+
+def chaos_to_markdown(summary: Dict[str, Any]) -> List[str]:
+    """
+    Format a chaos summary as Markdown.
+
+    Args:
+        summary: The output of summarize_chaos
+
+    Returns:
+        Markdown lines
+    """
+    def ms(value):
+        return "n/a" if value is None else f"{value * 1000:.2f}ms"
+
+    lines = [
+        "## Chaos",
+        "",
+        f"- **Client → Server Faults**: {summary['faults']['client_to_server']}",
+        f"- **Server → Client Faults**: {summary['faults']['server_to_client']}",
+        f"- **Proxied Sessions**: {summary['sessions']}",
+        "",
+        "| Direction | Frames | Dropped | Duplicated | Reordered | Partial Writes | p50 Added | p99 Added |",
+        "|-----------|--------|---------|------------|-----------|----------------|-----------|-----------|",
+    ]
+    for direction in DIRECTIONS:
+        totals = summary["directions"][direction]
+        delay = totals.get("delay") or {}
+        lines.append(f"| {direction.replace('_', ' ')} | {totals.get('frames', 0)} | {totals.get('dropped', 0)} | "
+                     f"{totals.get('duplicated', 0)} | {totals.get('reordered', 0)} | "
+                     f"{totals.get('partial_writes', 0)} | {ms(delay.get('p50'))} | {ms(delay.get('p99'))} |")
+    if summary["methods"]:
+        lines.extend([
+            "",
+            "### Latency Under Chaos",
+            "",
+            "| Method | Requests | p50 | Clean p50 | p99 | Clean p99 | p99 Change |",
+            "|--------|----------|-----|-----------|-----|-----------|------------|",
+        ])
+        for row in summary["methods"]:
+            change = (f"{(row['p99'] / row['baseline_p99'] - 1) * 100:+.0f}%"
+                      if row["baseline_p99"] else "n/a")
+            lines.append(f"| {row['method']} | {row['count']} | {ms(row['p50'])} | {ms(row['baseline_p50'])} | "
+                         f"{ms(row['p99'])} | {ms(row['baseline_p99'])} | {change} |")
+    return lines
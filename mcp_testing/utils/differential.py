@@ -0,0 +1,264 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Differential comparison for MCP Testing Framework.
+
+This module compares the exchanges recorded by a MirroringTransportAdapter, where
+the same request stream was sent to a target server and a baseline server. Responses
+are compared field by field, ignoring configurable paths such as ids and timestamps,
+and per-request latency deltas are summarised for the compliance report.
+"""
+
+import fnmatch
+import statistics
+from typing import Dict, Any, List, Optional
+
+# Paths that legitimately differ between two runs of the same server
+DEFAULT_IGNORE_PATHS = [
+    "id",
+    "**.id",
+    "**.sessionId",
+    "**.session_id",
+    "**.timestamp",
+    "**.createdAt",
+    "**.completedAt",
+]
+
+
+def parse_ignore_paths(value: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated list of ignore paths.
+
+    Args:
+        value: Comma-separated dotted paths (e.g. "id,result.serverInfo.version")
+
+    Returns:
+        The list of ignore paths, or the defaults if value is empty
+    """
+    if not value:
+        return list(DEFAULT_IGNORE_PATHS)
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+
+def _path_matches(path: str, pattern: str) -> bool:
+    """
+    Check whether a dotted path matches an ignore pattern.
+
+    Each segment is matched with fnmatch, and a ``**`` segment matches any
+    number of segments (including none).
+    """
+    path_parts = path.split(".") if path else []
+    pattern_parts = pattern.split(".")
+
+    def match(pi: int, qi: int) -> bool:
+        if qi == len(pattern_parts):
+            return pi == len(path_parts)
+        if pattern_parts[qi] == "**":
+            return any(match(k, qi + 1) for k in range(pi, len(path_parts) + 1))
+        if pi == len(path_parts):
+            return False
+        return fnmatch.fnmatchcase(path_parts[pi], pattern_parts[qi]) and match(pi + 1, qi + 1)
+
+    return match(0, 0)
+
+
+def is_ignored(path: str, ignore_paths: List[str]) -> bool:
+    """Return True if the path matches any of the ignore patterns."""
+    return any(_path_matches(path, pattern) for pattern in ignore_paths)
+
+
+def compare_values(target: Any, baseline: Any, ignore_paths: Optional[List[str]] = None,
+                   path: str = "") -> List[Dict[str, Any]]:
+    """
+    Compare two JSON values field by field.
+
+    Args:
+        target: The value from the server under test
+        baseline: The value from the baseline server
+        ignore_paths: Dotted path patterns to skip (defaults to DEFAULT_IGNORE_PATHS)
+        path: The dotted path of the values being compared (used for recursion)
+
+    Returns:
+        A list of differences, each with "path", "target" and "baseline" keys
+    """
+    if ignore_paths is None:
+        ignore_paths = DEFAULT_IGNORE_PATHS
+
+    if path and is_ignored(path, ignore_paths):
+        return []
+
+    differences = []
+
+    if isinstance(target, dict) and isinstance(baseline, dict):
+        for key in sorted(set(target) | set(baseline), key=str):
+            child = f"{path}.{key}" if path else str(key)
+            if key not in target:
+                if not is_ignored(child, ignore_paths):
+                    differences.append({"path": child, "target": "<missing>", "baseline": baseline[key]})
+            elif key not in baseline:
+                if not is_ignored(child, ignore_paths):
+                    differences.append({"path": child, "target": target[key], "baseline": "<missing>"})
+            else:
+                differences.extend(compare_values(target[key], baseline[key], ignore_paths, child))
+    elif isinstance(target, list) and isinstance(baseline, list):
+        if len(target) != len(baseline):
+            differences.append({
+                "path": f"{path}.length" if path else "length",
+                "target": len(target),
+                "baseline": len(baseline),
+            })
+        for index, (t_item, b_item) in enumerate(zip(target, baseline)):
+            child = f"{path}.{index}" if path else str(index)
+            differences.extend(compare_values(t_item, b_item, ignore_paths, child))
+    elif target != baseline:
+        differences.append({"path": path or "<root>", "target": target, "baseline": baseline})
+
+    return differences
+
+
+def compare_exchanges(exchanges: List[Dict[str, Any]],
+                      ignore_paths: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Compare the recorded exchanges of one test.
+
+    Args:
+        exchanges: Exchanges recorded by a MirroringTransportAdapter
+        ignore_paths: Dotted path patterns to skip
+
+    Returns:
+        One entry per request/batch exchange with its differences and latency delta
+    """
+    comparisons = []
+    for exchange in exchanges:
+        if exchange.get("kind") == "notification":
+            continue
+
+        if exchange.get("target_error") or exchange.get("baseline_error"):
+            if exchange.get("target_error") == exchange.get("baseline_error"):
+                differences = []
+            else:
+                differences = [{
+                    "path": "<transport>",
+                    "target": exchange.get("target_error") or "ok",
+                    "baseline": exchange.get("baseline_error") or "ok",
+                }]
+        else:
+            differences = compare_values(
+                exchange.get("target_response"),
+                exchange.get("baseline_response"),
+                ignore_paths,
+            )
+
+        comparisons.append({
+            "method": exchange.get("method", ""),
+            "differences": differences,
+            "target_latency": exchange.get("target_latency", 0.0),
+            "baseline_latency": exchange.get("baseline_latency", 0.0),
+            "latency_delta": exchange.get("target_latency", 0.0) - exchange.get("baseline_latency", 0.0),
+        })
+    return comparisons
+
+
+def summarize_differential(exchanges_by_test: Dict[str, List[Dict[str, Any]]],
+                           ignore_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Summarise the differential run across all tests.
+
+    Args:
+        exchanges_by_test: Recorded exchanges keyed by test name
+        ignore_paths: Dotted path patterns to skip
+
+    Returns:
+        A dictionary with per-test comparisons and overall totals
+    """
+    tests = []
+    total_requests = 0
+    total_mismatches = 0
+
+    for test_name, exchanges in exchanges_by_test.items():
+        comparisons = compare_exchanges(exchanges, ignore_paths)
+        mismatched = [c for c in comparisons if c["differences"]]
+        target_latencies = [c["target_latency"] for c in comparisons]
+        baseline_latencies = [c["baseline_latency"] for c in comparisons]
+
+        total_requests += len(comparisons)
+        total_mismatches += len(mismatched)
+
+        tests.append({
+            "name": test_name,
+            "requests": len(comparisons),
+            "mismatches": len(mismatched),
+            "target_median_latency": statistics.median(target_latencies) if target_latencies else 0.0,
+            "baseline_median_latency": statistics.median(baseline_latencies) if baseline_latencies else 0.0,
+            "mean_latency_delta": statistics.mean(c["latency_delta"] for c in comparisons) if comparisons else 0.0,
+            "comparisons": comparisons,
+        })
+
+    return {
+        "ignore_paths": list(ignore_paths if ignore_paths is not None else DEFAULT_IGNORE_PATHS),
+        "total_requests": total_requests,
+        "total_mismatches": total_mismatches,
+        "tests": tests,
+    }
+
+
+def differential_to_markdown(summary: Dict[str, Any], baseline_command: str,
+                             max_details: int = 50) -> List[str]:
+    """
+    Render a differential summary as Markdown report lines.
+
+    Args:
+        summary: The summary returned by summarize_differential
+        baseline_command: The command used to start the baseline server
+        max_details: Maximum number of individual field differences to list
+
+    Returns:
+        A list of Markdown lines
+    """
+    lines = [
+        "",
+        "## Differential Comparison",
+        "",
+        f"- **Baseline Command**: `{baseline_command}`",
+        f"- **Requests Compared**: {summary['total_requests']}",
+        f"- **Mismatched Responses**: {summary['total_mismatches']}",
+        f"- **Ignored Paths**: {', '.join(f'`{p}`' for p in summary['ignore_paths'])}",
+        "",
+        "| Test | Requests | Mismatches | Target p50 | Baseline p50 | Mean Δ |",
+        "|------|----------|------------|------------|--------------|--------|",
+    ]
+
+    for test in summary["tests"]:
+        test_name = test["name"].replace("test_", "").replace("_", " ").title()
+        lines.append(
+            f"| {test_name} | {test['requests']} | {test['mismatches']} | "
+            f"{test['target_median_latency'] * 1000:.1f}ms | "
+            f"{test['baseline_median_latency'] * 1000:.1f}ms | "
+            f"{test['mean_latency_delta'] * 1000:+.1f}ms |"
+        )
+
+    details = []
+    for test in summary["tests"]:
+        for comparison in test["comparisons"]:
+            for difference in comparison["differences"]:
+                details.append((test["name"], comparison["method"], difference))
+
+    if details:
+        lines.extend([
+            "",
+            "### Response Differences",
+            "",
+            "| Test | Method | Path | Target | Baseline |",
+            "|------|--------|------|--------|----------|",
+        ])
+        for test_name, method, difference in details[:max_details]:
+            lines.append(
+                f"| {test_name} | {method} | `{difference['path']}` | "
+                f"{difference['target']} | {difference['baseline']} |"
+            )
+        if len(details) > max_details:
+            lines.append("")
+            lines.append(f"... and {len(details) - max_details} more differences")
+
+    return lines
@@ -0,0 +1,271 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Latency Histograms for MCP Testing Framework.
+
+This module provides an HDR-style latency histogram. Values are recorded in whole
+microseconds into logarithmic buckets: every power-of-two range is split into the
+same number of linear sub-buckets, so the relative error of any reported value is
+bounded (about 1.6% with the default 7 significant bits) while the bucket array
+has a fixed size. Recording is O(1), memory does not grow with the number of
+samples, and two histograms with the same configuration merge by adding counts,
+which makes them suitable for long soak runs and for combining results from
+several workers or processes.
+"""
+
+import math
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """
+    Fixed-size logarithmic histogram of latencies.
+
+    Latencies are passed in and returned as seconds. Values below one microsecond
+    are recorded as zero and values above ``max_seconds`` are recorded in the last
+    bucket; the exact minimum and maximum are tracked separately.
+    """
+
+    def __init__(self, significant_bits: int = 7, max_seconds: float = 3600.0):
+        """
+        Initialize the histogram.
+
+        Args:
+            significant_bits: Number of bits of precision kept per power-of-two range
+            max_seconds: Largest latency resolved into its own bucket
+        """
+        if not 2 <= significant_bits <= 16:
+            raise ValueError("significant_bits must be between 2 and 16")
+        self.significant_bits = significant_bits
+        self.max_seconds = max_seconds
+        self._sub_count = 1 << significant_bits
+        self._half_count = self._sub_count >> 1
+        self._max_value = max(int(max_seconds * 1_000_000), self._sub_count)
+        self.counts: List[int] = [0] * (self._index(self._max_value) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: int) -> int:
+        """Return the bucket index for a value in microseconds."""
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.significant_bits
+        return self._sub_count + (shift - 1) * self._half_count + ((value >> shift) - self._half_count)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Return the lowest and highest value in microseconds that map to a bucket."""
+        if index < self._sub_count:
+            return index, index
+        shift = (index - self._sub_count) // self._half_count + 1
+        mantissa = (index - self._sub_count) % self._half_count + self._half_count
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """
+        Record a latency.
+
+        Args:
+            seconds: The latency in seconds
+            count: Number of times to record the value
+        """
+        value = min(max(int(seconds * 1_000_000), 0), self._max_value)
+        self.counts[self._index(value)] += count
+        self.count += count
+        self.total += seconds * count
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        """The mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Return the latency at a percentile.
+
+        The result is the upper bound of the bucket holding the nearest-rank sample,
+        clamped to the recorded minimum and maximum.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            The latency in seconds, or 0.0 if nothing has been recorded
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        last = len(self.counts) - 1
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index == last:
+                    # Values beyond max_seconds all land here; only the maximum is exact
+                    return self.max
+                value = self._bounds(index)[1] / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentiles(self, pcts: Iterable[float]) -> Dict[str, float]:
+        """Return a mapping of percentile (as a string) to latency in seconds."""
+        return {str(float(p)): self.percentile(p) for p in pcts}
+
+    def buckets(self) -> List[Tuple[float, float, int]]:
+        """Return (lower seconds, upper seconds, count) for every non-empty bucket."""
+        result = []
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                low, high = self._bounds(index)
+                result.append((low / 1_000_000, (high + 1) / 1_000_000, bucket_count))
+        return result
+
+    def coarse_buckets(self) -> List[Tuple[float, float, int]]:
+        """
+        Return counts grouped into power-of-two ranges, for display.
+
+        Returns:
+            (lower seconds, upper seconds, count) for each range between the
+            smallest and largest non-empty range
+        """
+        grouped: Dict[int, int] = {}
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                exponent = self._bounds(index)[0].bit_length()
+                grouped[exponent] = grouped.get(exponent, 0) + bucket_count
+        if not grouped:
+            return []
+        return [
+            ((1 << (exponent - 1)) / 1_000_000 if exponent else 0.0,
+             (1 << exponent) / 1_000_000,
+             grouped.get(exponent, 0))
+            for exponent in range(min(grouped), max(grouped) + 1)
+        ]
+
+    def _check_compatible(self, other: "LatencyHistogram") -> None:
+        if (other.significant_bits, other._max_value) != (self.significant_bits, self._max_value):
+            raise ValueError("Cannot merge histograms with different configurations")
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Add the counts of another histogram to this one.
+
+        Args:
+            other: A histogram with the same configuration
+
+        Returns:
+            This histogram
+
+        Raises:
+            ValueError: If the histograms have different configurations
+        """
+        self._check_compatible(other)
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the histogram to a JSON-compatible dictionary with sparse buckets."""
+        return {
+            "significant_bits": self.significant_bits,
+            "max_seconds": self.max_seconds,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram serialized with to_dict."""
+        histogram = cls(data.get("significant_bits", 7), data.get("max_seconds", 3600.0))
+        for index, bucket_count in data.get("buckets", {}).items():
+            histogram.counts[int(index)] = bucket_count
+        histogram.count = data.get("count", 0)
+        histogram.total = data.get("total", 0.0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
+
+
+class LatencyRecorder:
+    """
+    Thread-safe collection of latency histograms keyed by method.
+
+    Transports own one recorder each and record every request round trip in it.
+    Recorders from separate sessions, workers or processes can be merged.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def record(self, method: str, seconds: float) -> None:
+        """Record a latency in seconds for a method."""
+        with self._lock:
+            histogram = self.histograms.get(method)
+            if histogram is None:
+                histogram = self.histograms[method] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def merge(self, other: "LatencyRecorder") -> "LatencyRecorder":
+        """
+        Merge another recorder into this one.
+
+        Args:
+            other: The recorder to merge
+
+        Returns:
+            This recorder
+        """
+        with other._lock:
+            incoming = list(other.histograms.items())
+        with self._lock:
+            for method, histogram in incoming:
+                if method in self.histograms:
+                    self.histograms[method].merge(histogram)
+                else:
+                    self.histograms[method] = LatencyHistogram.from_dict(histogram.to_dict())
+        return self
+
+    def total(self) -> LatencyHistogram:
+        """Return a histogram combining all methods."""
+        combined = LatencyHistogram()
+        with self._lock:
+            for histogram in self.histograms.values():
+                combined.merge(histogram)
+        return combined
+
+    def __bool__(self) -> bool:
+        return any(h.count for h in self.histograms.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize all histograms to a JSON-compatible dictionary."""
+        with self._lock:
+            return {method: h.to_dict() for method, h in sorted(self.histograms.items())}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyRecorder":
+        """Rebuild a recorder serialized with to_dict."""
+        recorder = cls()
+        for method, histogram in data.items():
+            recorder.histograms[method] = LatencyHistogram.from_dict(histogram)
+        return recorder
@@ -0,0 +1,418 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Run History and Performance Regression Detection for MCP Testing Framework.
+
+Compliance runs can be recorded in a local SQLite database keyed by server name,
+protocol version and test. Each run stores pass/fail and per-phase durations for
+every test, and per-method latency percentiles together with the full latency
+histogram.
+
+At the end of a run the request latencies of each method are compared with the
+same method's latencies over the last K recorded runs using a one-sided
+Mann-Whitney U test. The test is rank-based, so it makes no assumption about the
+shape of the latency distribution and is not thrown off by a few outliers. A
+method is flagged as a regression only when the slowdown is statistically
+significant and its p50 also grew by at least a minimum ratio, so a large run
+does not fail on a shift too small to matter.
+"""
+
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+from mcp_testing.utils.histogram import LatencyHistogram, LatencyRecorder
+
+DEFAULT_HISTORY_RUNS = 10
+DEFAULT_REGRESSION_ALPHA = 0.01
+DEFAULT_REGRESSION_MIN_RATIO = 1.2
+# Fewer baseline runs than this and no comparison is made
+MIN_BASELINE_RUNS = 3
+
+# Sample sizes up to this product use the exact U distribution
+_EXACT_LIMIT = 400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    server TEXT NOT NULL,
+    protocol_version TEXT NOT NULL,
+    server_version TEXT,
+    started TEXT NOT NULL,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_server ON runs (server, protocol_version, id);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    test TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    duration REAL,
+    PRIMARY KEY (run_id, test)
+);
+CREATE TABLE IF NOT EXISTS test_phases (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    test TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, test, phase)
+);
+CREATE TABLE IF NOT EXISTS method_latency (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    method TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL,
+    p50 REAL,
+    p90 REAL,
+    p99 REAL,
+    p999 REAL,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (run_id, method)
+);
+"""
+
+
+def _normal_sf(z: float) -> float:
+    """Upper tail probability of the standard normal distribution."""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _exact_u_sf(u: float, m: int, n: int) -> float:
+    """P(U >= u) under the null hypothesis, for sample sizes m and n without ties."""
+    # counts[j][k]: number of orderings of i and j items with U == k, built up over i
+    counts = [[1] for _ in range(n + 1)]
+    for i in range(1, m + 1):
+        row = [[1]]
+        for j in range(1, n + 1):
+            size = i * j + 1
+            left, below = counts[j], row[j - 1]
+            row.append([(left[k - j] if 0 <= k - j < len(left) else 0)
+                        + (below[k] if k < len(below) else 0) for k in range(size)])
+        counts = row
+    distribution = counts[n]
+    start = math.ceil(u - 1e-9)
+    return sum(distribution[max(start, 0):]) / sum(distribution)
+
+
+def mann_whitney_greater(sample: Sequence[Tuple[float, int]],
+                         baseline: Sequence[Tuple[float, int]]) -> Tuple[float, float]:
+    """
+    One-sided Mann-Whitney U test that ``sample`` tends to be larger than ``baseline``.
+
+    Both samples are given as (value, count) pairs so histogram buckets can be
+    used directly. Small samples use the exact distribution of U; larger samples
+    use the normal approximation with tie and continuity corrections.
+
+    Args:
+        sample: The values under test
+        baseline: The reference values
+
+    Returns:
+        A tuple (U statistic of ``sample``, p-value)
+    """
+    merged: Dict[float, List[int]] = {}
+    for value, count in sample:
+        merged.setdefault(value, [0, 0])[0] += count
+    for value, count in baseline:
+        merged.setdefault(value, [0, 0])[1] += count
+    m = sum(c[0] for c in merged.values())
+    n = sum(c[1] for c in merged.values())
+    if not m or not n:
+        return 0.0, 1.0
+
+    rank_sum = 0.0
+    ties = 0.0
+    position = 0
+    for value in sorted(merged):
+        in_sample, in_baseline = merged[value]
+        tied = in_sample + in_baseline
+        rank_sum += in_sample * (position + (tied + 1) / 2)
+        ties += tied ** 3 - tied
+        position += tied
+    u = rank_sum - m * (m + 1) / 2
+
+    if m * n <= _EXACT_LIMIT:
+        return u, _exact_u_sf(u, m, n)
+
+    total = m + n
+    variance = m * n / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - m * n / 2 - 0.5) / math.sqrt(variance)
+    return u, _normal_sf(z)
+
+
+def histogram_sample(histogram: LatencyHistogram) -> List[Tuple[float, int]]:
+    """Return a histogram's buckets as (lower bound in seconds, count) pairs."""
+    return [(low, count) for low, _, count in histogram.buckets()]
+
+
+class RunHistory:
+    """SQLite store of past compliance runs."""
+
+    def __init__(self, path: str):
+        """
+        Open or create the history database.
+
+        Args:
+            path: Location of the SQLite file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record_run(self, server: str, protocol_version: str, results: List[Dict[str, Any]],
+                   latency: Optional[LatencyRecorder] = None, server_version: Optional[str] = None,
+                   started: Optional[str] = None) -> int:
+        """
+        Store a finished run.
+
+        Args:
+            server: Server name
+            protocol_version: Protocol version tested
+            results: The per-test result dictionaries
+            latency: Per-method latency recorded during the run
+            server_version: Version reported in serverInfo, if known
+            started: ISO timestamp of the run (default: now)
+
+        Returns:
+            The id of the stored run
+        """
+        tests = [r for r in results if isinstance(r, dict) and r.get("name")]
+        passed = sum(1 for r in tests if r.get("passed"))
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (server, protocol_version, server_version, started, total, passed, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (server, protocol_version, server_version, started or datetime.now().isoformat(),
+                 len(tests), passed, len(tests) - passed))
+            run_id = cursor.lastrowid
+            for result in tests:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO test_results (run_id, test, passed, skipped, duration) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (run_id, result["name"], int(bool(result.get("passed"))),
+                     int(bool(result.get("skipped"))), result.get("duration")))
+                for phase, seconds in (result.get("phases") or {}).items():
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO test_phases (run_id, test, phase, seconds) VALUES (?, ?, ?, ?)",
+                        (run_id, result["name"], phase, seconds))
+            for method, histogram in (latency.histograms.items() if latency else []):
+                if not histogram.count:
+                    continue
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO method_latency "
+                    "(run_id, method, count, mean, p50, p90, p99, p999, histogram) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, method, histogram.count, histogram.mean, histogram.percentile(50),
+                     histogram.percentile(90), histogram.percentile(99), histogram.percentile(99.9),
+                     json.dumps(histogram.to_dict())))
+        return run_id
+
+    def recent_runs(self, server: str, protocol_version: str, limit: int,
+                    before: Optional[int] = None) -> List[int]:
+        """
+        Return the ids of the most recent runs for a server, newest first.
+
+        Args:
+            server: Server name
+            protocol_version: Protocol version
+            limit: Maximum number of runs
+            before: Only consider runs older than this run id
+        """
+        rows = self.connection.execute(
+            "SELECT id FROM runs WHERE server = ? AND protocol_version = ? AND id < ? "
+            "ORDER BY id DESC LIMIT ?",
+            (server, protocol_version, before if before is not None else 2 ** 62, limit))
+        return [row[0] for row in rows]
+
+    def method_histograms(self, run_ids: Iterable[int]) -> Dict[str, LatencyHistogram]:
+        """Return the latency histograms of the given runs merged per method."""
+        run_ids = list(run_ids)
+        merged: Dict[str, LatencyHistogram] = {}
+        if not run_ids:
+            return merged
+        placeholders = ",".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT method, histogram FROM method_latency WHERE run_id IN ({placeholders})", run_ids)
+        for method, data in rows:
+            histogram = LatencyHistogram.from_dict(json.loads(data))
+            if method in merged:
+                merged[method].merge(histogram)
+            else:
+                merged[method] = histogram
+        return merged
+
+    def test_durations(self, server: str, protocol_version: str,
+                       limit: int = DEFAULT_HISTORY_RUNS) -> Dict[str, List[float]]:
+        """
+        Return recent durations of each test, newest first.
+
+        Args:
+            server: Server name
+            protocol_version: Protocol version
+            limit: Number of recent runs to look at
+
+        Returns:
+            A mapping of test name to the durations recorded in those runs
+        """
+        run_ids = self.recent_runs(server, protocol_version, limit)
+        durations: Dict[str, List[float]] = {}
+        if not run_ids:
+            return durations
+        placeholders = ",".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT test, duration FROM test_results WHERE run_id IN ({placeholders}) "
+            "AND skipped = 0 AND duration IS NOT NULL ORDER BY run_id DESC", run_ids)
+        for test, duration in rows:
+            durations.setdefault(test, []).append(duration)
+        return durations
+
+    def phase_durations(self, server: str, protocol_version: str, phase: str = "test",
+                        limit: int = DEFAULT_HISTORY_RUNS) -> Dict[str, List[float]]:
+        """
+        Return recent durations of one phase of each passing test, newest first.
+
+        Failed tests are left out so a timed-out attempt does not count as a
+        normal duration.
+
+        Args:
+            server: Server name
+            protocol_version: Protocol version
+            phase: Phase name, e.g. "test" or "initialize"
+            limit: Number of recent runs to look at
+
+        Returns:
+            A mapping of test name to the phase durations recorded in those runs
+        """
+        run_ids = self.recent_runs(server, protocol_version, limit)
+        durations: Dict[str, List[float]] = {}
+        if not run_ids:
+            return durations
+        placeholders = ",".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            "SELECT p.test, p.seconds FROM test_phases p JOIN test_results r "
+            "ON r.run_id = p.run_id AND r.test = p.test "
+            f"WHERE p.run_id IN ({placeholders}) AND p.phase = ? AND r.passed = 1 AND r.skipped = 0 "
+            "ORDER BY p.run_id DESC", run_ids + [phase])
+        for test, seconds in rows:
+            durations.setdefault(test, []).append(seconds)
+        return durations
+
+
+def compare_to_history(history: RunHistory, server: str, protocol_version: str,
+                       latency: LatencyRecorder, runs: int = DEFAULT_HISTORY_RUNS,
+                       alpha: float = DEFAULT_REGRESSION_ALPHA,
+                       min_ratio: float = DEFAULT_REGRESSION_MIN_RATIO) -> Dict[str, Any]:
+    """
+    Compare a run's per-method latency against recent runs of the same server.
+
+    Call this before recording the run, so the run is not part of its own baseline.
+
+    Args:
+        history: The run history
+        server: Server name
+        protocol_version: Protocol version
+        latency: Per-method latency of the current run
+        runs: Number of recent runs forming the baseline
+        alpha: Significance level of the one-sided Mann-Whitney U test
+        min_ratio: Minimum ratio of current to baseline p50 for a regression
+
+    Returns:
+        A summary with the baseline run count, a row per method and the list of
+        methods that regressed
+    """
+    run_ids = history.recent_runs(server, protocol_version, runs)
+    summary: Dict[str, Any] = {
+        "baseline_runs": len(run_ids),
+        "history_runs": runs,
+        "alpha": alpha,
+        "min_ratio": min_ratio,
+        "methods": [],
+        "regressions": [],
+    }
+    if len(run_ids) < MIN_BASELINE_RUNS:
+        return summary
+
+    baseline = history.method_histograms(run_ids)
+    for method, current in sorted(latency.histograms.items()):
+        reference = baseline.get(method)
+        if not current.count or reference is None or not reference.count:
+            continue
+        _, p_value = mann_whitney_greater(histogram_sample(current), histogram_sample(reference))
+        p50, baseline_p50 = current.percentile(50), reference.percentile(50)
+        ratio = p50 / baseline_p50 if baseline_p50 > 0 else None
+        regression = p_value < alpha and ratio is not None and ratio >= min_ratio
+        summary["methods"].append({
+            "method": method,
+            "count": current.count,
+            "baseline_count": reference.count,
+            "p50": p50,
+            "baseline_p50": baseline_p50,
+            "p99": current.percentile(99),
+            "baseline_p99": reference.percentile(99),
+            "ratio": ratio,
+            "p_value": p_value,
+            "regression": regression,
+        })
+        if regression:
+            summary["regressions"].append(method)
+    return summary
+
+
+def history_to_markdown(comparison: Dict[str, Any]) -> List[str]:
+    """
+    Render a history comparison as Markdown report lines.
+
+    Args:
+        comparison: The summary returned by compare_to_history
+
+    Returns:
+        A list of Markdown lines
+    """
+    lines = ["## Performance History", ""]
+    if comparison["baseline_runs"] < MIN_BASELINE_RUNS:
+        lines.append(f"Not enough history to compare: {comparison['baseline_runs']} earlier runs recorded, "
+                     f"{MIN_BASELINE_RUNS} needed.")
+        return lines
+
+    regressions = comparison["regressions"]
+    status = (f"❌ {len(regressions)} regression{'s' if len(regressions) != 1 else ''}"
+              if regressions else "✅ No regressions")
+    lines.extend([
+        f"- **Baseline**: last {comparison['baseline_runs']} runs",
+        f"- **Test**: one-sided Mann-Whitney U, α = {comparison['alpha']:g}, "
+        f"minimum p50 slowdown ×{comparison['min_ratio']:g}",
+        f"- **Status**: {status}",
+        "",
+        "| Method | Requests | p50 | Baseline p50 | Change | p99 | Baseline p99 | p-value | |",
+        "|--------|----------|-----|--------------|--------|-----|--------------|---------|--|",
+    ])
+    for row in comparison["methods"]:
+        change = f"{(row['ratio'] - 1) * 100:+.1f}%" if row["ratio"] is not None else "n/a"
+        lines.append(
+            f"| {row['method']} | {row['count']} | {row['p50'] * 1000:.2f}ms | "
+            f"{row['baseline_p50'] * 1000:.2f}ms | {change} | {row['p99'] * 1000:.2f}ms | "
+            f"{row['baseline_p99'] * 1000:.2f}ms | {row['p_value']:.3g} | "
+            f"{'❌' if row['regression'] else ''} |"
+        )
+    return lines
@@ -0,0 +1,543 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Load Generator for MCP Testing Framework.
+
+This module drives a weighted mix of MCP requests against a server using the
+framework's transport and protocol adapters. Two load models are supported:
+
+- Closed loop: a fixed number of sessions each send their next request as soon as
+  the previous one completes. Throughput is whatever the server sustains.
+- Open loop: requests are scheduled at a fixed arrival rate, independent of how fast
+  the server answers. Latency is measured from each request's scheduled start time,
+  so a stalled server shows up as queueing delay instead of being hidden by
+  coordinated omission.
+"""
+
+import asyncio
+import itertools
+import math
+import queue
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from mcp_testing.transports.base import MCPTransportAdapter
+from mcp_testing.transports.dispatcher import ClientRequestDispatcher
+from mcp_testing.transports.stdio import StdioTransportAdapter
+from mcp_testing.protocols.base import MCPProtocolAdapter
+from mcp_testing.protocols.v2024_11_05 import MCP2024_11_05Adapter
+from mcp_testing.protocols.v2025_03_26 import MCP2025_03_26Adapter
+from mcp_testing.protocols.v2025_06_18 import MCP2025_06_18Adapter
+from mcp_testing.tests.features.test_tools import generate_test_value_for_parameter
+from mcp_testing.utils.histogram import LatencyHistogram, LatencyRecorder
+from mcp_testing.utils.reporter import LATENCY_PERCENTILES, histogram_to_text
+
+# Percentiles reported for every benchmark
+REPORT_PERCENTILES = LATENCY_PERCENTILES
+
+
+def create_protocol_adapter(protocol_version: str, transport: MCPTransportAdapter,
+                            debug: bool = False) -> MCPProtocolAdapter:
+    """
+    Create the protocol adapter for a protocol version.
+
+    Args:
+        protocol_version: The protocol version to use
+        transport: The transport adapter to communicate through
+        debug: Whether to enable debug output
+
+    Returns:
+        A protocol adapter bound to the transport
+
+    Raises:
+        ValueError: If the protocol version is not supported
+    """
+    if protocol_version == "2024-11-05":
+        return MCP2024_11_05Adapter(transport=transport, debug=debug)
+    elif protocol_version == "2025-03-26":
+        return MCP2025_03_26Adapter(transport=transport, debug=debug)
+    elif protocol_version == "2025-06-18":
+        return MCP2025_06_18Adapter(transport=transport, debug=debug)
+    raise ValueError(f"Unsupported protocol version: {protocol_version}")
+
+
+class WorkloadMix:
+    """
+    A weighted mix of MCP operations.
+
+    Operations are written as ``method`` or ``method:target``, for example
+    ``ping``, ``tools/call:echo`` or ``resources/read:mcp://resources/doc``.
+    """
+
+    def __init__(self, operations: List[Tuple[str, Optional[str], float]]):
+        """
+        Initialize the workload mix.
+
+        Args:
+            operations: List of (method, target, weight) tuples
+        """
+        if not operations:
+            raise ValueError("Workload mix must contain at least one operation")
+        if any(weight <= 0 for _, _, weight in operations):
+            raise ValueError("Workload weights must be positive")
+        self.operations = operations
+        self._cumulative = list(itertools.accumulate(weight for _, _, weight in operations))
+
+    @classmethod
+    def parse(cls, spec: str) -> "WorkloadMix":
+        """
+        Parse a mix specification such as ``ping=5,tools/call:echo=3,resources/read=1``.
+
+        Args:
+            spec: Comma-separated ``operation[=weight]`` entries
+
+        Returns:
+            The parsed workload mix
+        """
+        operations = []
+        for entry in spec.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            operation, _, weight = entry.partition("=")
+            method, _, target = operation.partition(":")
+            try:
+                weight_value = float(weight) if weight else 1.0
+            except ValueError:
+                raise ValueError(f"Invalid weight in workload entry: {entry}")
+            operations.append((method.strip(), target.strip() or None, weight_value))
+        return cls(operations)
+
+    def choose(self, rng: random.Random) -> Tuple[str, Optional[str]]:
+        """Pick the next operation using the given random generator."""
+        point = rng.random() * self._cumulative[-1]
+        for (method, target, _), bound in zip(self.operations, self._cumulative):
+            if point < bound:
+                return method, target
+        method, target, _ = self.operations[-1]
+        return method, target
+
+    def labels(self) -> List[str]:
+        """Return the display label of each operation."""
+        return [f"{method}:{target}" if target else method for method, target, _ in self.operations]
+
+
+class BenchmarkSession:
+    """
+    One initialized MCP session used by a load generator worker.
+
+    The session owns its transport and protocol adapter, discovers tools and
+    resources once, and turns workload operations into JSON-RPC requests.
+    """
+
+    def __init__(self, server_command: str, protocol_version: str,
+                 env_vars: Optional[Dict[str, str]] = None, name: str = "session",
+                 debug: bool = False, dispatcher: Optional[ClientRequestDispatcher] = None):
+        """
+        Initialize the session.
+
+        Args:
+            server_command: Command to launch the server
+            protocol_version: Protocol version to negotiate
+            env_vars: Environment variables for the server process
+            name: Name used as a prefix for request ids
+            debug: Whether to enable debug output
+            dispatcher: Answers requests the server sends while under load; may be shared by sessions
+        """
+        self.server_command = server_command
+        self.protocol_version = protocol_version
+        self.env_vars = env_vars
+        self.name = name
+        self.debug = debug
+        self.dispatcher = dispatcher
+        self.transport: Optional[MCPTransportAdapter] = None
+        self.protocol: Optional[MCPProtocolAdapter] = None
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.resource_uri: Optional[str] = None
+        self._ids = itertools.count(1)
+
+    def open(self) -> None:
+        """
+        Start the server, initialize the session and discover tools and resources.
+
+        Raises:
+            ConnectionError: If the server cannot be started or initialized
+        """
+        self.transport = StdioTransportAdapter(
+            server_command=self.server_command,
+            env_vars=self.env_vars,
+            debug=self.debug,
+            dispatcher=self.dispatcher
+        )
+        if not self.transport.start():
+            raise ConnectionError(f"Failed to start server: {self.server_command}")
+
+        self.protocol = create_protocol_adapter(self.protocol_version, self.transport, self.debug)
+        asyncio.run(self.protocol.initialize())
+        asyncio.run(self.protocol.send_initialized())
+
+        try:
+            tools = asyncio.run(self.protocol.get_tools_list())
+            self.tools = {tool.get("name"): tool for tool in tools if isinstance(tool, dict)}
+        except Exception:
+            self.tools = {}
+
+        try:
+            resources = asyncio.run(self.protocol.get_resources_list())
+            if resources:
+                self.resource_uri = resources[0].get("uri")
+        except Exception:
+            self.resource_uri = None
+
+    def close(self) -> None:
+        """Stop the server process."""
+        if self.transport:
+            self.transport.stop()
+            self.transport = None
+
+    def next_id(self) -> str:
+        """Return a request id that is unique within this session."""
+        return f"{self.name}-{next(self._ids)}"
+
+    def build_request(self, method: str, target: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the JSON-RPC request for a workload operation.
+
+        Args:
+            method: The MCP method
+            target: Tool name for tools/call, URI for resources/read, otherwise unused
+
+        Returns:
+            The JSON-RPC request object
+        """
+        request = {
+            "jsonrpc": "2.0",
+            "id": self.next_id(),
+            "method": method,
+        }
+
+        if method == "tools/call":
+            tool_name = target or next(iter(self.tools), None)
+            if tool_name is None:
+                raise ValueError("No tools available for tools/call")
+            tool = self.tools.get(tool_name, {})
+            schema = tool.get("inputSchema") or tool.get("parameters") or {}
+            properties = schema.get("properties", {})
+            request["params"] = {
+                "name": tool_name,
+                "arguments": {
+                    name: generate_test_value_for_parameter(name, details)
+                    for name, details in properties.items()
+                }
+            }
+        elif method == "resources/read":
+            uri = target or self.resource_uri
+            if uri is None:
+                raise ValueError("No resources available for resources/read")
+            request["params"] = {"uri": uri}
+        elif target:
+            request["params"] = {"name": target}
+
+        return request
+
+    def execute(self, method: str, target: Optional[str]) -> bool:
+        """
+        Send one workload operation and wait for its response.
+
+        Returns:
+            True if the server answered with a result, False on a JSON-RPC error
+
+        Raises:
+            ConnectionError: If the transport fails
+        """
+        response = self.transport.send_request(self.build_request(method, target))
+        return "error" not in response
+
+
+class LoadStats:
+    """
+    Latency and outcome statistics for a load run, grouped by operation.
+
+    Latencies go into fixed-size histograms, so memory stays constant however
+    many requests are recorded.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self._lock = threading.Lock()
+        self.latency = LatencyRecorder()
+        self.errors: Dict[str, int] = {}
+
+    def record(self, label: str, latency: float, ok: bool) -> None:
+        """Record one completed (or failed) request."""
+        self.latency.record(label, latency)
+        if not ok:
+            with self._lock:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Summarize the run.
+
+        Args:
+            elapsed: Wall-clock duration of the measured phase in seconds
+
+        Returns:
+            A dictionary with overall and per-operation statistics, plus the
+            serialized histograms under "latency"
+        """
+        with self._lock:
+            errors = dict(self.errors)
+
+        def describe(histogram: LatencyHistogram, error_count: int) -> Dict[str, Any]:
+            count = histogram.count
+            return {
+                "count": count,
+                "errors": error_count,
+                "error_rate": (error_count / count) if count else 0.0,
+                "throughput": (count / elapsed) if elapsed > 0 else 0.0,
+                "mean": histogram.mean,
+                "max": histogram.max or 0.0,
+                "percentiles": histogram.percentiles(REPORT_PERCENTILES),
+            }
+
+        return {
+            "elapsed": elapsed,
+            "overall": describe(self.latency.total(), sum(errors.values())),
+            "operations": {
+                label: describe(histogram, errors.get(label, 0))
+                for label, histogram in sorted(self.latency.histograms.items())
+            },
+            "latency": self.latency.to_dict(),
+        }
+
+
+class LoadGenerator:
+    """
+    Closed-loop and open-loop load generator for MCP servers.
+
+    Each worker owns one BenchmarkSession, because the stdio transport carries
+    one outstanding request at a time.
+    """
+
+    def __init__(self, session_factory: Callable[[int], BenchmarkSession], mix: WorkloadMix,
+                 concurrency: int = 1, seed: Optional[int] = None):
+        """
+        Initialize the load generator.
+
+        Args:
+            session_factory: Callable returning a new (unopened) session for a worker index
+            mix: The workload mix to drive
+            concurrency: Number of concurrent sessions
+            seed: Optional random seed for a reproducible operation sequence
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self.session_factory = session_factory
+        self.mix = mix
+        self.concurrency = concurrency
+        self.seed = seed
+
+    def _label(self, method: str, target: Optional[str]) -> str:
+        return f"{method}:{target}" if target else method
+
+    def _open_sessions(self) -> List[BenchmarkSession]:
+        """Open all worker sessions, closing any already opened on failure."""
+        sessions = []
+        try:
+            for index in range(self.concurrency):
+                session = self.session_factory(index)
+                session.open()
+                sessions.append(session)
+        except Exception:
+            for session in sessions:
+                session.close()
+            raise
+        return sessions
+
+    def _execute(self, session: BenchmarkSession, method: str, target: Optional[str]) -> bool:
+        try:
+            return session.execute(method, target)
+        except Exception:
+            return False
+
+    def run_closed_loop(self, duration: Optional[float] = None, requests: Optional[int] = None,
+                        warmup: float = 0.0) -> Dict[str, Any]:
+        """
+        Run with a fixed number of sessions, each sending back-to-back requests.
+
+        Args:
+            duration: Measured run time in seconds
+            requests: Total number of measured requests (alternative to duration)
+            warmup: Seconds of unmeasured load before measurement starts
+
+        Returns:
+            The run summary from LoadStats.summary
+        """
+        if duration is None and requests is None:
+            raise ValueError("Either duration or requests must be given")
+
+        sessions = self._open_sessions()
+        stats = LoadStats()
+        remaining = itertools.count()
+        measure_from = time.perf_counter() + warmup
+        deadline = None if duration is None else measure_from + duration
+
+        def worker(index: int, session: BenchmarkSession) -> None:
+            rng = random.Random(None if self.seed is None else self.seed + index)
+            while True:
+                now = time.perf_counter()
+                if deadline is not None and now >= deadline:
+                    return
+                measuring = now >= measure_from
+                if measuring and requests is not None and next(remaining) >= requests:
+                    return
+                method, target = self.mix.choose(rng)
+                start = time.perf_counter()
+                ok = self._execute(session, method, target)
+                if measuring:
+                    stats.record(self._label(method, target), time.perf_counter() - start, ok)
+
+        try:
+            threads = [
+                threading.Thread(target=worker, args=(i, s), daemon=True)
+                for i, s in enumerate(sessions)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - measure_from
+        finally:
+            for session in sessions:
+                session.close()
+
+        summary = stats.summary(max(elapsed, 0.0))
+        summary.update({"mode": "closed", "concurrency": self.concurrency})
+        return summary
+
+    def run_open_loop(self, rate: float, duration: float, warmup: float = 0.0,
+                      drain_timeout: float = 30.0) -> Dict[str, Any]:
+        """
+        Run with requests arriving at a fixed rate.
+
+        Latency is measured from each request's scheduled arrival time, so time a
+        request spends waiting for a free session counts against the server.
+
+        Args:
+            rate: Arrival rate in requests per second
+            duration: Measured run time in seconds
+            warmup: Seconds of unmeasured load before measurement starts
+            drain_timeout: Seconds to wait for queued requests after the schedule ends;
+                requests still queued after that are counted as errors
+
+        Returns:
+            The run summary from LoadStats.summary
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+
+        sessions = self._open_sessions()
+        stats = LoadStats()
+        rng = random.Random(self.seed)
+        schedule: "queue.Queue" = queue.Queue()
+        start_time = time.perf_counter()
+        measure_from = start_time + warmup
+        total = int(math.ceil(rate * (warmup + duration)))
+        drain_deadline = start_time + warmup + duration + drain_timeout
+
+        for i in range(total):
+            method, target = self.mix.choose(rng)
+            schedule.put((start_time + i / rate, method, target))
+
+        def worker(session: BenchmarkSession) -> None:
+            while True:
+                try:
+                    intended, method, target = schedule.get_nowait()
+                except queue.Empty:
+                    return
+                label = self._label(method, target)
+                now = time.perf_counter()
+                if now > drain_deadline:
+                    if intended >= measure_from:
+                        stats.record(label, now - intended, False)
+                    continue
+                if intended > now:
+                    time.sleep(intended - now)
+                ok = self._execute(session, method, target)
+                if intended >= measure_from:
+                    stats.record(label, time.perf_counter() - intended, ok)
+
+        try:
+            threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in sessions]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = max(time.perf_counter() - measure_from, duration)
+        finally:
+            for session in sessions:
+                session.close()
+
+        summary = stats.summary(elapsed)
+        summary.update({"mode": "open", "concurrency": self.concurrency, "target_rate": rate})
+        return summary
+
+
+def benchmark_to_markdown(summary: Dict[str, Any]) -> List[str]:
+    """
+    Render a load run summary as Markdown report lines.
+
+    Args:
+        summary: The summary returned by LoadGenerator.run_closed_loop or run_open_loop
+
+    Returns:
+        A list of Markdown lines
+    """
+    overall = summary["overall"]
+    if summary.get("mode") == "open":
+        model = f"Open loop, {summary['target_rate']:g} req/s target, {summary['concurrency']} sessions"
+    else:
+        model = f"Closed loop, {summary['concurrency']} sessions"
+
+    def latency_cells(stats: Dict[str, Any]) -> str:
+        return " | ".join(
+            f"{stats['percentiles'][str(p)] * 1000:.2f}ms" for p in REPORT_PERCENTILES
+        )
+
+    header = " | ".join(f"p{p:g}" for p in REPORT_PERCENTILES)
+    lines = [
+        "## Summary",
+        "",
+        f"- **Load Model**: {model}",
+        f"- **Measured Duration**: {summary['elapsed']:.2f}s",
+        f"- **Requests**: {overall['count']}",
+        f"- **Throughput**: {overall['throughput']:.1f} req/s",
+        f"- **Error Rate**: {overall['error_rate'] * 100:.2f}% ({overall['errors']} errors)",
+        "",
+        f"| Requests | Mean | {header} | Max |",
+        "|----------|------|" + "------|" * len(REPORT_PERCENTILES) + "-----|",
+        f"| {overall['count']} | {overall['mean'] * 1000:.2f}ms | {latency_cells(overall)} | "
+        f"{overall['max'] * 1000:.2f}ms |",
+        "",
+        "## Latency by Operation",
+        "",
+        f"| Operation | Requests | Errors | Throughput | {header} |",
+        "|-----------|----------|--------|------------|" + "------|" * len(REPORT_PERCENTILES),
+    ]
+
+    for label, stats in summary["operations"].items():
+        lines.append(
+            f"| {label} | {stats['count']} | {stats['errors']} | {stats['throughput']:.1f} req/s | "
+            f"{latency_cells(stats)} |"
+        )
+
+    for label, histogram in summary.get("latency", {}).items():
+        lines.extend(["", f"### {label}", "", "```"])
+        lines.extend(histogram_to_text(LatencyHistogram.from_dict(histogram)))
+        lines.append("```")
+
+    return lines
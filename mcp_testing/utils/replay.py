@@ -0,0 +1,389 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Trace Replay for MCP Testing Framework.
+
+This module turns sessions recorded by the tap into a reproducible load test.
+The client side of each traced session is sent again to a server under test,
+either at the original pace, at a multiple of it, or as fast as the server
+answers. Every replay runs on its own session and server process, opened by a
+BenchmarkSession so initialization goes through the protocol adapters rather
+than the traced handshake.
+
+Each response is compared with the traced one (ignoring ids and timestamps,
+like the differential mode of the compliance report) and each latency is set
+next to the traced latency of the same method. Server-issued identifiers such
+as resource URIs or session ids in a response are rewritten in later requests,
+so a replay can follow handles the server under test hands out.
+
+The STDIO transport carries one request at a time, so requests that overlapped
+in the trace are sent one after the other. The time a request waits past its
+scheduled send time is reported as schedule lag.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from mcp_testing.transports.mirror import learn_aliases, translate_aliases
+from mcp_testing.utils.differential import DEFAULT_IGNORE_PATHS, compare_values
+from mcp_testing.utils.histogram import LatencyHistogram, LatencyRecorder
+from mcp_testing.utils.load_generator import BenchmarkSession
+from mcp_testing.utils.trace import CLIENT_TO_SERVER, SERVER_TO_CLIENT
+
+# Session setup and teardown, done by BenchmarkSession instead of being replayed
+SETUP_METHODS = ("initialize", "notifications/initialized", "shutdown", "exit")
+
+# Label under which batches are reported
+BATCH_METHOD = "batch"
+
+# Number of response differences kept in the summary
+MAX_DIFFERENCES = 50
+
+
+def _parse(frame: str) -> Any:
+    try:
+        return json.loads(frame)
+    except ValueError:
+        return None
+
+
+def load_traced_sessions(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Extract the client side of each traced session.
+
+    Requests, notifications and batches sent by the client become replay steps,
+    each with its offset from the first one and, for requests, the traced
+    response and latency. Responses are matched by id, oldest request first,
+    so clients that reuse ids are handled. Session setup and teardown and the client's answers
+    to server-to-client requests are left out.
+
+    Args:
+        records: Frame records as yielded by read_trace
+
+    Returns:
+        One dictionary per session with "session", "protocol_version" (from the
+        traced initialize, or None) and "steps"
+    """
+    sessions: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        session = sessions.setdefault(record["session"], {
+            "session": record["session"], "protocol_version": None, "steps": [], "pending": {}, "start": None,
+        })
+        message = _parse(record["frame"])
+        pending = session["pending"]
+
+        if record["dir"] == SERVER_TO_CLIENT:
+            if isinstance(message, list):
+                key = tuple(sorted(str(item.get("id")) for item in message if isinstance(item, dict)))
+                waiting = pending.get((BATCH_METHOD, key))
+            elif isinstance(message, dict) and "method" not in message and "id" in message:
+                waiting = pending.get(str(message["id"]))
+            else:
+                continue
+            if not waiting:
+                continue
+            step = waiting.pop(0)
+            step["response"] = message
+            step["latency"] = record["t"] - step["t"]
+            continue
+
+        if record["dir"] != CLIENT_TO_SERVER:
+            continue
+        if isinstance(message, list):
+            requests = [item for item in message if isinstance(item, dict) and "method" in item]
+            if not requests:
+                continue
+            step = {"kind": "batch", "method": BATCH_METHOD, "message": requests}
+            key = tuple(sorted(str(item["id"]) for item in requests if "id" in item))
+            if key:
+                pending.setdefault((BATCH_METHOD, key), []).append(step)
+        elif isinstance(message, dict) and "method" in message:
+            method = message["method"]
+            if method == "initialize":
+                params = message.get("params") if isinstance(message.get("params"), dict) else {}
+                session["protocol_version"] = params.get("protocolVersion")
+            if method in SETUP_METHODS:
+                continue
+            if "id" in message:
+                step = {"kind": "request", "method": method, "message": message}
+                pending.setdefault(str(message["id"]), []).append(step)
+            else:
+                step = {"kind": "notification", "method": method, "message": message}
+        else:
+            continue
+
+        if session["start"] is None:
+            session["start"] = record["t"]
+        step.update({"t": record["t"], "offset": record["t"] - session["start"], "response": None, "latency": None})
+        session["steps"].append(step)
+
+    traced = []
+    for session in sessions.values():
+        for step in session["steps"]:
+            del step["t"]
+        if session["steps"]:
+            traced.append({key: session[key] for key in ("session", "protocol_version", "steps")})
+    return traced
+
+
+class TraceReplayer:
+    """
+    Replays traced client sessions against a server.
+
+    Replay ``i`` replays traced session ``i % len(sessions)`` on a session of
+    its own, and up to ``concurrency`` replays run at once.
+    """
+
+    def __init__(self, sessions: List[Dict[str, Any]],
+                 session_factory: Callable[[int, Optional[str]], BenchmarkSession],
+                 speed: Optional[float] = 1.0, replays: Optional[int] = None, concurrency: int = 1,
+                 timeout: float = 30.0, ignore_paths: Optional[List[str]] = None):
+        """
+        Initialize the replayer.
+
+        Args:
+            sessions: Traced sessions from load_traced_sessions
+            session_factory: Callable returning a new (unopened) session for a replay
+                index and the traced protocol version (None if the trace has no initialize)
+            speed: Multiple of the traced pace (2.0 sends twice as fast), or None to send
+                each request as soon as the previous one is answered
+            replays: Number of replays; defaults to one per traced session
+            concurrency: Number of replays running at once
+            timeout: Seconds to wait for each response
+            ignore_paths: Response paths left out of the comparison (defaults to DEFAULT_IGNORE_PATHS)
+        """
+        if not sessions:
+            raise ValueError("No client requests found in the trace")
+        if speed is not None and speed <= 0:
+            raise ValueError("Speed must be positive")
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self.sessions = sessions
+        self.session_factory = session_factory
+        self.speed = speed
+        self.replays = len(sessions) if replays is None else replays
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.ignore_paths = DEFAULT_IGNORE_PATHS if ignore_paths is None else ignore_paths
+
+        self._lock = threading.Lock()
+        self.latency = LatencyRecorder()
+        self.lag = LatencyHistogram()
+        self.methods: Dict[str, Dict[str, int]] = {}
+        self.differences: List[Dict[str, Any]] = []
+        self.failures: List[Dict[str, Any]] = []
+
+    def _count(self, method: str, key: str) -> None:
+        with self._lock:
+            stats = self.methods.setdefault(method, {"requests": 0, "errors": 0, "diverged": 0})
+            stats[key] += 1
+
+    def _compare(self, replay: int, step: Dict[str, Any], response: Any, original: Any) -> None:
+        """Count and keep the differences between a replayed and a traced response."""
+        differences = compare_values(response, original, self.ignore_paths)
+        if not differences:
+            return
+        self._count(step["method"], "diverged")
+        with self._lock:
+            for difference in differences[:MAX_DIFFERENCES - len(self.differences)]:
+                self.differences.append({
+                    "replay": replay, "method": step["method"], "offset": step["offset"],
+                    "path": difference["path"], "replay_value": difference["target"],
+                    "trace_value": difference["baseline"],
+                })
+
+    def _send(self, replay: int, session: BenchmarkSession, step: Dict[str, Any],
+              aliases: Dict[str, str]) -> None:
+        """Send one step and compare what comes back with the trace."""
+        transport = session.transport
+        if step["kind"] == "notification":
+            transport.send_notification(translate_aliases(step["message"], aliases))
+            return
+        if step["kind"] == "batch" and not any("id" in message for message in step["message"]):
+            # Nothing answers a batch of notifications, so send them without waiting for a reply
+            for message in step["message"]:
+                transport.send_notification(translate_aliases(message, aliases))
+            return
+
+        originals = step["message"] if step["kind"] == "batch" else [step["message"]]
+        requests, traced_ids = [], {}
+        for original in originals:
+            request = translate_aliases(original, aliases)
+            if "id" in original:
+                request["id"] = session.next_id()
+                traced_ids[request["id"]] = original["id"]
+            requests.append(request)
+
+        transport.set_deadline(self.timeout)
+        start = time.perf_counter()
+        try:
+            if step["kind"] == "batch":
+                responses = transport.send_batch(requests)
+            else:
+                responses = [transport.send_request(requests[0])]
+        finally:
+            transport.set_deadline(None)
+        self.latency.record(step["method"], time.perf_counter() - start)
+
+        self._count(step["method"], "requests")
+        traced_responses = step["response"] if step["kind"] == "batch" else [step["response"]]
+        by_id = {str(r.get("id")): r for r in traced_responses or [] if isinstance(r, dict)}
+        for response in responses:
+            if not isinstance(response, dict):
+                continue
+            if "error" in response:
+                self._count(step["method"], "errors")
+            traced_id = traced_ids.get(response.get("id"))
+            original = by_id.get(str(traced_id))
+            if original is None:
+                continue
+            # Handles the server under test issued differently are not differences
+            learn_aliases(original.get("result"), response.get("result"), aliases)
+            self._compare(replay, step, {**response, "id": traced_id}, translate_aliases(original, aliases))
+
+    def _replay(self, index: int) -> None:
+        traced = self.sessions[index % len(self.sessions)]
+        session = self.session_factory(index, traced["protocol_version"])
+        try:
+            session.open()
+            aliases: Dict[str, str] = {}
+            started = time.perf_counter()
+            for step in traced["steps"]:
+                if self.speed is not None:
+                    scheduled = started + step["offset"] / self.speed
+                    now = time.perf_counter()
+                    if scheduled > now:
+                        time.sleep(scheduled - now)
+                    else:
+                        with self._lock:
+                            self.lag.record(now - scheduled)
+                self._send(index, session, step, aliases)
+        except Exception as e:
+            with self._lock:
+                self.failures.append({"replay": index, "session": traced["session"], "error": str(e)})
+        finally:
+            session.close()
+
+    def _trace_latency(self) -> LatencyRecorder:
+        """Latency of the traced requests of every replayed session, each counted once."""
+        latency = LatencyRecorder()
+        for traced in self.sessions[:self.replays]:
+            for step in traced["steps"]:
+                if step["latency"] is not None:
+                    latency.record(step["method"], step["latency"])
+        return latency
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all replays.
+
+        Returns:
+            Run settings and totals; per-method requests, errors, diverged
+            responses and traced vs replayed p50/p99; schedule lag; the first
+            response differences; replays that failed; and the serialized replay
+            and trace latency histograms
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(self._replay, range(self.replays)))
+        elapsed = time.perf_counter() - started
+
+        trace_latency = self._trace_latency()
+        methods = []
+        for method, stats in sorted(self.methods.items()):
+            replayed = self.latency.histograms.get(method)
+            traced = trace_latency.histograms.get(method)
+            methods.append({
+                "method": method,
+                **stats,
+                "p50": replayed.percentile(50) if replayed else None,
+                "p99": replayed.percentile(99) if replayed else None,
+                "trace_p50": traced.percentile(50) if traced else None,
+                "trace_p99": traced.percentile(99) if traced else None,
+            })
+        return {
+            "traced_sessions": len(self.sessions),
+            "replays": self.replays,
+            "concurrency": self.concurrency,
+            "speed": self.speed,
+            "elapsed": elapsed,
+            "requests": sum(stats["requests"] for stats in self.methods.values()),
+            "errors": sum(stats["errors"] for stats in self.methods.values()),
+            "diverged": sum(stats["diverged"] for stats in self.methods.values()),
+            "methods": methods,
+            "schedule_lag": {"count": self.lag.count, "p50": self.lag.percentile(50),
+                             "p99": self.lag.percentile(99), "max": self.lag.max or 0.0},
+            "differences": self.differences,
+            "failures": self.failures,
+            "latency": self.latency.to_dict(),
+            "trace_latency": trace_latency.to_dict(),
+        }
+
+
+def replay_to_markdown(summary: Dict[str, Any]) -> List[str]:
+    """
+    Format a replay summary as Markdown.
+
+    Args:
+        summary: The output of TraceReplayer.run
+
+    Returns:
+        Markdown lines
+    """
+    def ms(value):
+        return "n/a" if value is None else f"{value * 1000:.2f}ms"
+
+    pace = "as fast as possible" if summary["speed"] is None else f"{summary['speed']:g}x traced pace"
+    lag = summary["schedule_lag"]
+    lines = [
+        "## Replay",
+        "",
+        f"- **Pace**: {pace}",
+        f"- **Replays**: {summary['replays']} of {summary['traced_sessions']} traced sessions, "
+        f"{summary['concurrency']} at once",
+        f"- **Duration**: {summary['elapsed']:.2f}s",
+        f"- **Requests**: {summary['requests']} ({summary['errors']} errors)",
+        f"- **Diverged Responses**: {summary['diverged']}",
+        f"- **Failed Replays**: {len(summary['failures'])}",
+    ]
+    if lag["count"]:
+        lines.append(f"- **Schedule Lag**: {lag['count']} requests sent late, p50 {ms(lag['p50'])}, "
+                     f"p99 {ms(lag['p99'])}, max {ms(lag['max'])}")
+
+    if summary["methods"]:
+        lines.extend([
+            "",
+            "### Latency vs Trace",
+            "",
+            "| Method | Requests | Errors | Diverged | p50 | Traced p50 | p99 | Traced p99 | p99 Change |",
+            "|--------|----------|--------|----------|-----|------------|-----|------------|------------|",
+        ])
+        for row in summary["methods"]:
+            change = (f"{(row['p99'] / row['trace_p99'] - 1) * 100:+.0f}%"
+                      if row["p99"] is not None and row["trace_p99"] else "n/a")
+            lines.append(f"| {row['method']} | {row['requests']} | {row['errors']} | {row['diverged']} | "
+                         f"{ms(row['p50'])} | {ms(row['trace_p50'])} | {ms(row['p99'])} | "
+                         f"{ms(row['trace_p99'])} | {change} |")
+
+    if summary["differences"]:
+        lines.extend([
+            "",
+            "### Response Differences",
+            "",
+            "| Replay | Method | Offset | Path | Replay | Trace |",
+            "|--------|--------|--------|------|--------|-------|",
+        ])
+        for difference in summary["differences"]:
+            lines.append(f"| {difference['replay']} | {difference['method']} | {difference['offset']:.3f}s | "
+                         f"`{difference['path']}` | `{json.dumps(difference['replay_value'])}` | "
+                         f"`{json.dumps(difference['trace_value'])}` |")
+
+    if summary["failures"]:
+        lines.extend(["", "### Failed Replays", ""])
+        for failure in summary["failures"]:
+            lines.append(f"- Replay {failure['replay']} ({failure['session']}): {failure['error']}")
+    return lines
@@ -13,6 +13,11 @@ from datetime import datetime
 import os
 import re
 
+from mcp_testing.utils.histogram import LatencyRecorder
+
+# Percentiles shown in latency sections of reports
+LATENCY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
 # Import the specification coverage metrics
 try:
     from mcp_testing.tests.specification_coverage import get_specification_coverage
@@ -291,6 +296,11 @@ def generate_markdown_report(results: Dict[str, Any], server_command: str, proto
             
         report.append(f"| {category} | {stats['total']} | {stats['passed']} | {stats['failed']} | {compliance} |")
     
+    # Add latency by method when the runner recorded it
+    if results.get('latency'):
+        report.append("")
+        report.extend(latency_to_markdown(results['latency']))
+    
     # Add protocol-specific notes
     if protocol_version == "2025-03-26":
         report.extend([
@@ -313,6 +323,70 @@ def generate_markdown_report(results: Dict[str, Any], server_command: str, proto
     return "\n".join(report)
 
 
+def latency_to_markdown(latency, title: str = "Latency by Method", bar_width: int = 40) -> List[str]:
+    """
+    Render per-method latency percentiles and histograms as Markdown report lines.
+    
+    Args:
+        latency: A LatencyRecorder, or a dictionary produced by LatencyRecorder.to_dict
+        title: Heading for the section
+        bar_width: Width in characters of the longest histogram bar
+        
+    Returns:
+        A list of Markdown lines, empty if no latency was recorded
+    """
+    if isinstance(latency, dict):
+        latency = LatencyRecorder.from_dict(latency)
+    histograms = {m: h for m, h in sorted(latency.histograms.items()) if h.count}
+    if not histograms:
+        return []
+    
+    header = " | ".join(f"p{p:g}" for p in LATENCY_PERCENTILES)
+    lines = [
+        f"## {title}",
+        "",
+        f"| Method | Requests | Mean | {header} | Max |",
+        "|--------|----------|------|" + "------|" * len(LATENCY_PERCENTILES) + "-----|",
+    ]
+    for method, histogram in histograms.items():
+        cells = " | ".join(f"{histogram.percentile(p) * 1000:.2f}ms" for p in LATENCY_PERCENTILES)
+        lines.append(
+            f"| {method} | {histogram.count} | {histogram.mean * 1000:.2f}ms | {cells} | "
+            f"{histogram.max * 1000:.2f}ms |"
+        )
+    
+    for method, histogram in histograms.items():
+        lines.extend(["", f"### {method}", "", "```"])
+        lines.extend(histogram_to_text(histogram, bar_width))
+        lines.append("```")
+    
+    return lines
+
+
+def histogram_to_text(histogram, bar_width: int = 40) -> List[str]:
+    """
+    Render a latency histogram as text bars over power-of-two millisecond ranges.
+    
+    Args:
+        histogram: A LatencyHistogram
+        bar_width: Width in characters of the longest bar
+        
+    Returns:
+        A list of text lines, empty if the histogram has no samples
+    """
+    buckets = histogram.coarse_buckets()
+    if not buckets:
+        return []
+    largest = max(count for _, _, count in buckets)
+    lines = []
+    for low, high, count in buckets:
+        bar = "#" * round(count / largest * bar_width)
+        if count and not bar:
+            bar = "."
+        lines.append(f"{low * 1000:>10.3f} - {high * 1000:<10.3f} ms | {count:>8} | {bar}")
+    return lines
+
+
 def save_markdown_report(report: str, output_file: str = None) -> str:
     """
     Save a Markdown report to a file.
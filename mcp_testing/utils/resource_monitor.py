@@ -0,0 +1,257 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Server Resource Monitoring for MCP Testing Framework.
+
+This module samples an MCP server process's resource usage from ``/proc/<pid>``
+while tests run: resident memory, CPU time, open file descriptors and thread
+count. Samples cover the server process and its descendants, so servers launched
+through wrappers such as ``npx`` or ``uv run`` are measured as a whole.
+
+Monitoring is Linux-only. On other platforms, or if the process has already
+exited, the monitor records no samples and its summary is None.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+PROC_ROOT = "/proc"
+
+# Peak RSS at least this many times the first sample is reported as growth...
+RSS_GROWTH_FACTOR = 2.0
+# ...provided it also grew by at least this many bytes
+RSS_GROWTH_MIN_BYTES = 50 * 1024 * 1024
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+    PAGE_SIZE = 4096
+
+
+def _read_stat(pid: int, proc_root: str = PROC_ROOT) -> Optional[List[str]]:
+    """Return the fields of /proc/<pid>/stat after the command name, or None."""
+    try:
+        with open(os.path.join(proc_root, str(pid), "stat")) as f:
+            data = f.read()
+    except OSError:
+        return None
+    # The command name is in parentheses and may itself contain spaces
+    return data[data.rfind(")") + 2:].split()
+
+
+def _descendants(pid: int, proc_root: str = PROC_ROOT) -> List[int]:
+    """Return the pid and all of its descendant pids."""
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir(proc_root)
+    except OSError:
+        return [pid]
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        fields = _read_stat(int(entry), proc_root)
+        if fields:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+
+    result, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        result.append(current)
+        pending.extend(children.get(current, []))
+    return result
+
+
+def read_process_stats(pid: int, include_children: bool = True,
+                       proc_root: str = PROC_ROOT) -> Optional[Dict[str, Any]]:
+    """
+    Read current resource usage for a process.
+
+    Args:
+        pid: The process id
+        include_children: Whether to add the usage of all descendant processes
+        proc_root: Location of the proc filesystem
+
+    Returns:
+        A dictionary with rss_bytes, cpu_seconds, fds and threads, or None if the
+        process does not exist or /proc is unavailable
+    """
+    pids = _descendants(pid, proc_root) if include_children else [pid]
+    stats = {"rss_bytes": 0, "cpu_seconds": 0.0, "fds": 0, "threads": 0}
+    found = False
+
+    for current in pids:
+        fields = _read_stat(current, proc_root)
+        if not fields:
+            continue
+        found = True
+        # Fields after the name start at field 3 (state); utime/stime are fields 14/15,
+        # num_threads is field 20 and rss (in pages) is field 24
+        stats["cpu_seconds"] += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        stats["threads"] += int(fields[17])
+        stats["rss_bytes"] += int(fields[21]) * PAGE_SIZE
+        try:
+            stats["fds"] += len(os.listdir(os.path.join(proc_root, str(current), "fd")))
+        except OSError:
+            pass
+
+    return stats if found else None
+
+
+class ResourceMonitor:
+    """
+    Background sampler of a server process's resource usage.
+
+    The monitor takes a sample when started, every ``interval`` seconds while
+    running and once more when stopped.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5, include_children: bool = True):
+        """
+        Initialize the resource monitor.
+
+        Args:
+            pid: The server process id
+            interval: Seconds between samples
+            include_children: Whether to include descendant processes
+        """
+        self.pid = pid
+        self.interval = interval
+        self.include_children = include_children
+        self.samples: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """Take one sample and store it."""
+        stats = read_process_stats(self.pid, self.include_children)
+        if stats is not None:
+            stats["time"] = time.monotonic()
+            self.samples.append(stats)
+        return stats
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> "ResourceMonitor":
+        """Start sampling in a background thread."""
+        self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mcp-resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """
+        Stop sampling.
+
+        Returns:
+            The summary of all samples taken
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        return self.summary()
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Summarize the samples.
+
+        Returns:
+            Peak and average RSS, file descriptors and threads, CPU seconds used
+            between the first and last sample, and whether RSS grew notably;
+            None if no samples were taken
+        """
+        if not self.samples:
+            return None
+
+        def peak(key):
+            return max(s[key] for s in self.samples)
+
+        def average(key):
+            return sum(s[key] for s in self.samples) / len(self.samples)
+
+        first, last = self.samples[0], self.samples[-1]
+        rss_peak = peak("rss_bytes")
+        return {
+            "samples": len(self.samples),
+            "duration": last["time"] - first["time"],
+            "rss_start": first["rss_bytes"],
+            "rss_peak": rss_peak,
+            "rss_avg": average("rss_bytes"),
+            # CPU time is cumulative over the process's life, which may be longer than the sampled window;
+            # children that exited meanwhile take their CPU time with them, hence the floor
+            "cpu_seconds": max(0.0, last["cpu_seconds"] - first["cpu_seconds"]),
+            "fds_peak": peak("fds"),
+            "fds_avg": average("fds"),
+            "threads_peak": peak("threads"),
+            "threads_avg": average("threads"),
+            "rss_growth": (rss_peak >= first["rss_bytes"] * RSS_GROWTH_FACTOR
+                           and rss_peak - first["rss_bytes"] >= RSS_GROWTH_MIN_BYTES),
+        }
+
+
+def _format_bytes(value: float) -> str:
+    """Format a byte count in MB."""
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+def resources_to_markdown(results: List[Dict[str, Any]]) -> List[str]:
+    """
+    Render per-test server resource usage as Markdown report lines.
+
+    Args:
+        results: Test result dictionaries, some of which carry a "resources" summary
+
+    Returns:
+        A list of Markdown lines, empty if no test has resource data
+    """
+    measured = [r for r in results if isinstance(r, dict) and r.get("resources")]
+    if not measured:
+        return []
+
+    peak_rss = max(r["resources"]["rss_peak"] for r in measured)
+    peak_fds = max(r["resources"]["fds_peak"] for r in measured)
+    peak_threads = max(r["resources"]["threads_peak"] for r in measured)
+    total_cpu = sum(r["resources"]["cpu_seconds"] for r in measured)
+
+    lines = [
+        "## Server Resources",
+        "",
+        f"- **Peak RSS**: {_format_bytes(peak_rss)}",
+        f"- **Total CPU Time**: {total_cpu:.2f}s",
+        f"- **Peak Open File Descriptors**: {peak_fds}",
+        f"- **Peak Threads**: {peak_threads}",
+        "",
+        "| Test | Peak RSS | Avg RSS | CPU | Peak FDs | Avg FDs | Peak Threads |",
+        "|------|----------|---------|-----|----------|---------|--------------|",
+    ]
+
+    findings = []
+    for result in measured:
+        stats = result["resources"]
+        test_name = result.get("name", "").replace("test_", "").replace("_", " ").title()
+        marker = " ⚠️" if stats["rss_growth"] else ""
+        lines.append(
+            f"| {test_name} | {_format_bytes(stats['rss_peak'])}{marker} | "
+            f"{_format_bytes(stats['rss_avg'])} | {stats['cpu_seconds']:.2f}s | "
+            f"{stats['fds_peak']} | {stats['fds_avg']:.1f} | {stats['threads_peak']} |"
+        )
+        if stats["rss_growth"]:
+            findings.append(
+                f"- **{test_name}**: RSS grew from {_format_bytes(stats['rss_start'])} "
+                f"to {_format_bytes(stats['rss_peak'])}"
+            )
+
+    if findings:
+        lines.extend(["", "### Resource Findings", ""])
+        lines.extend(findings)
+
+    return lines
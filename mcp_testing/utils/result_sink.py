@@ -0,0 +1,288 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Streaming Result Sinks for MCP Testing Framework.
+
+Test runners hand every finished test result to a result sink as soon as the
+test completes, instead of only collecting results for a report at the end. A
+run that dies midway therefore still leaves the results of every completed test
+on disk, and long matrix runs can be followed live with ``tail -f``.
+
+Two sinks are provided:
+
+- NDJSONResultSink writes one JSON object per line: a "run" header, one "test"
+  record per result and a closing "summary". Each line is flushed when written,
+  and files from several shards can be merged by concatenating their "test"
+  records (see read_ndjson_results).
+- JUnitXMLResultSink writes JUnit XML for CI systems. Test cases are appended and
+  flushed as they finish; when the sink is closed the file is rewritten with the
+  suite totals. If the run crashes the file is left without its closing tags.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+
+class ResultSink:
+    """
+    Base class for destinations that receive test results as they finish.
+
+    Subclasses override the hooks they need; the defaults do nothing.
+    """
+
+    def open(self, run_info: Dict[str, Any]) -> None:
+        """
+        Start a run.
+
+        Args:
+            run_info: Details of the run, such as server and protocol_version
+        """
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """
+        Record one finished test.
+
+        Args:
+            result: The test result dictionary produced by the runner
+        """
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Finish the run.
+
+        Args:
+            summary: Totals for the run, if it completed
+        """
+
+
+class CompositeResultSink(ResultSink):
+    """Forwards every call to a list of sinks."""
+
+    def __init__(self, sinks: Optional[Iterable[ResultSink]] = None):
+        """
+        Initialize the composite sink.
+
+        Args:
+            sinks: The sinks to forward to
+        """
+        self.sinks: List[ResultSink] = list(sinks or [])
+
+    def add(self, sink: ResultSink) -> None:
+        """Add a sink."""
+        self.sinks.append(sink)
+
+    def open(self, run_info: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            sink.open(run_info)
+
+    def write(self, result: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            sink.write(result)
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        for sink in self.sinks:
+            sink.close(summary)
+
+    def __bool__(self) -> bool:
+        return bool(self.sinks)
+
+
+class NDJSONResultSink(ResultSink):
+    """Writes results as newline-delimited JSON, flushing after every line."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the sink.
+
+        Args:
+            path: File to write; it is created or truncated when the run opens
+        """
+        self.path = path
+        self._file = None
+
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def open(self, run_info: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "w")
+        self._write_line({"type": "run", "started": datetime.now().isoformat(), **run_info})
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if self._file is None:
+            raise RuntimeError("NDJSONResultSink.write called before open")
+        self._write_line({"type": "test", **result})
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        if self._file is None:
+            return
+        if summary is not None:
+            self._write_line({"type": "summary", **summary})
+        self._file.close()
+        self._file = None
+
+
+def read_ndjson_results(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Read the test records from one or more NDJSON result files.
+
+    Truncated last lines, as left by a crashed run, are ignored.
+
+    Args:
+        paths: The files to read, in order
+
+    Returns:
+        The test result dictionaries without their "type" field
+    """
+    results = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.pop("type", None) == "test":
+                    results.append(record)
+    return results
+
+
+class JUnitXMLResultSink(ResultSink):
+    """Writes results as a JUnit XML test suite, appending each test case as it finishes."""
+
+    def __init__(self, path: str, suite_name: str = "mcp-compliance"):
+        """
+        Initialize the sink.
+
+        Args:
+            path: File to write
+            suite_name: Name of the test suite; replaced by the server name if the
+                run info provides one
+        """
+        self.path = path
+        self.suite_name = suite_name
+        self.classname = "mcp"
+        self._file = None
+        self._cases: List[str] = []
+        self._failures = 0
+        self._skipped = 0
+        self._time = 0.0
+        self._started = None
+
+    def _suite_open_tag(self, totals: bool) -> str:
+        attributes = f"name={quoteattr(self.suite_name)} timestamp={quoteattr(self._started)}"
+        if totals:
+            attributes += (f' tests="{len(self._cases)}" failures="{self._failures}" errors="0"'
+                           f' skipped="{self._skipped}" time="{self._time:.3f}"')
+        return f"  <testsuite {attributes}>\n"
+
+    def open(self, run_info: Dict[str, Any]) -> None:
+        self.suite_name = run_info.get("server") or self.suite_name
+        if run_info.get("protocol_version"):
+            self.classname = f"mcp.{run_info['protocol_version']}"
+        self._started = datetime.now().isoformat(timespec="seconds")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "w")
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+        self._file.write(self._suite_open_tag(totals=False))
+        self._file.flush()
+
+    def _testcase(self, result: Dict[str, Any]) -> str:
+        duration = result.get("duration") or 0.0
+        message = str(result.get("message") or "")
+        lines = [f"    <testcase classname={quoteattr(self.classname)} "
+                 f"name={quoteattr(result.get('name', 'unknown'))} time=\"{duration:.3f}\">"]
+        phases = result.get("phases")
+        if phases:
+            lines.append("      <properties>")
+            for phase, seconds in phases.items():
+                lines.append(f"        <property name={quoteattr('phase.' + phase)} value=\"{seconds:.6f}\"/>")
+            lines.append("      </properties>")
+        if result.get("skipped"):
+            lines.append(f"      <skipped message={quoteattr(message)}/>")
+        elif not result.get("passed", False):
+            kind = "timeout" if result.get("timeout") else "failure"
+            lines.append(f"      <failure type={quoteattr(kind)} message={quoteattr(message)}>"
+                         f"{escape(message)}</failure>")
+        elif message:
+            lines.append(f"      <system-out>{escape(message)}</system-out>")
+        lines.append("    </testcase>")
+        return "\n".join(lines) + "\n"
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if self._file is None:
+            raise RuntimeError("JUnitXMLResultSink.write called before open")
+        case = self._testcase(result)
+        self._cases.append(case)
+        self._time += result.get("duration") or 0.0
+        if result.get("skipped"):
+            self._skipped += 1
+        elif not result.get("passed", False):
+            self._failures += 1
+        self._file.write(case)
+        self._file.flush()
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+        # Rewrite the file so the suite element carries its totals
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+            f.write(self._suite_open_tag(totals=True))
+            f.writelines(self._cases)
+            f.write("  </testsuite>\n</testsuites>\n")
+        os.replace(temp_path, self.path)
+
+
+def create_result_sink(ndjson_path: Optional[str] = None,
+                       junit_path: Optional[str] = None) -> CompositeResultSink:
+    """
+    Create the sinks requested on a command line.
+
+    Args:
+        ndjson_path: File for NDJSON results, if any
+        junit_path: File for JUnit XML results, if any
+
+    Returns:
+        A composite sink, empty if neither path is given
+    """
+    sink = CompositeResultSink()
+    if ndjson_path:
+        sink.add(NDJSONResultSink(ndjson_path))
+    if junit_path:
+        sink.add(JUnitXMLResultSink(junit_path))
+    return sink
+
+
+class PhaseTimer:
+    """
+    Records how long each phase of a test takes.
+
+    Call mark(name) at the end of each phase; the time since the previous mark
+    (or since the timer was created) is recorded under that name.
+    """
+
+    def __init__(self):
+        """Start timing the first phase."""
+        self._last = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """End a phase now."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
@@ -20,6 +20,9 @@ from mcp_testing.transports.stdio import StdioTransportAdapter
 from mcp_testing.transports.http import HttpTransportAdapter
 from mcp_testing.protocols.v2024_11_05 import MCP2024_11_05Adapter
 from mcp_testing.protocols.v2025_03_26 import MCP2025_03_26Adapter
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.result_sink import ResultSink, PhaseTimer
+from mcp_testing.utils.cancellation import DEFAULT_CANCEL_GRACE, cancel_after_timeout
 
 
 class MCPTestRunner:
@@ -30,15 +33,22 @@ class MCPTestRunner:
     implementations and collecting results.
     """
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, sink: Optional[ResultSink] = None,
+                 cancel_grace: float = DEFAULT_CANCEL_GRACE):
         """
         Initialize the test runner.
         
         Args:
             debug: Whether to enable debug output
+            sink: Optional sink that receives each result as soon as its test finishes
+            cancel_grace: Seconds a server has to answer a ping after a timed-out test is cancelled
         """
         self.debug = debug
+        self.sink = sink or ResultSink()
+        self.cancel_grace = cancel_grace
         self.results = {}
+        # Request latency by method across all tests run
+        self.latency = LatencyRecorder()
         # Check for shutdown skipping early
         self.skip_shutdown = self._should_skip_shutdown()
         if self.skip_shutdown and self.debug:
@@ -135,6 +145,7 @@ class MCPTestRunner:
             raise ValueError(f"Unsupported protocol version: {protocol_version}")
             
         start_time = time.time()
+        phases = PhaseTimer()
         
         try:
             # Initialize the connection
@@ -147,19 +158,38 @@ class MCPTestRunner:
                 print(f"Sending initialized notification...")
                 
             await protocol_adapter.send_initialized()
+            phases.mark("initialize")
             
             # Run the test with timeout if specified
             if self.debug:
                 print(f"Executing test: {test_name}")
+            cancellation = None
 
             # Handle test with timeout if specified
             if timeout:
+                # The transport deadline also stops a read that is blocked on a hung server
+                has_deadline = getattr(transport_adapter, "supports_deadline", False) is True
+                if has_deadline:
+                    transport_adapter.set_deadline(timeout)
                 try:
                     # Create a task for the test function
                     test_task = asyncio.create_task(test_func(protocol_adapter))
                     # Wait for either the task to complete or timeout
-                    passed, message = await asyncio.wait_for(test_task, timeout=timeout)
+                    try:
+                        passed, message = await asyncio.wait_for(test_task, timeout=timeout)
+                    except Exception:
+                        if has_deadline and transport_adapter.deadline_expired:
+                            raise asyncio.TimeoutError()
+                        raise
+                    if has_deadline and transport_adapter.deadline_expired:
+                        raise asyncio.TimeoutError()
+                    if has_deadline:
+                        transport_adapter.set_deadline(None)
                 except asyncio.TimeoutError:
+                    phases.mark("test")
+                    # Cancel the outstanding requests rather than killing the server
+                    cancellation = cancel_after_timeout(
+                        transport_adapter, f"{test_name} timed out after {timeout}s", self.cancel_grace)
                     # Check if this is a tools test which can be treated as non-critical
                     if test_name.startswith("test_tools_") or test_name.startswith("test_tool_"):
                         if self.debug:
@@ -173,8 +203,11 @@ class MCPTestRunner:
                             "message": message,
                             "duration": time.time() - start_time,
                             "timeout": True,
-                            "non_critical": True
+                            "non_critical": True,
+                            "phases": phases.phases
                         }
+                        if cancellation:
+                            result["cancellation"] = cancellation
                         self.results[test_name] = result
                         
                         # Skip shutdown for this test since we couldn't complete it normally
@@ -182,8 +215,7 @@ class MCPTestRunner:
                             if self.debug:
                                 print(f"Skipping shutdown due to timeout")
                         
-                        # Just terminate the transport
-                        await transport_adapter.terminate()
+                        # The transport is stopped in the finally block
                         return result
                     else:
                         # For critical tests, consider timeout as failure
@@ -192,6 +224,7 @@ class MCPTestRunner:
             else:
                 # Run the test without timeout
                 passed, message = await test_func(protocol_adapter)
+            phases.mark("test")
             
             if self.debug:
                 status = "PASSED" if passed else "FAILED"
@@ -223,6 +256,7 @@ class MCPTestRunner:
                         print(f"Error during shutdown: {str(e)}")
                     # Don't fail the test just because shutdown failed
                     pass
+            phases.mark("teardown")
             
             # Calculate test duration
             duration = time.time() - start_time
@@ -232,13 +266,17 @@ class MCPTestRunner:
                 "name": test_name,
                 "passed": passed,
                 "message": message,
-                "duration": duration
+                "duration": duration,
+                "phases": phases.phases
             }
+            if cancellation:
+                result["cancellation"] = cancellation
             self.results[test_name] = result
             return result
             
         except Exception as e:
             duration = time.time() - start_time
+            phases.mark("error")
             error_message = f"Test failed with error: {str(e)}"
             if self.debug:
                 print(error_message)
@@ -249,15 +287,19 @@ class MCPTestRunner:
                 "name": test_name,
                 "passed": False,
                 "message": error_message,
-                "duration": duration
+                "duration": duration,
+                "phases": phases.phases
             }
             self.results[test_name] = result
             return result
             
         finally:
-            # Always terminate the transport
+            latency = getattr(transport_adapter, "latency", None)
+            if isinstance(latency, LatencyRecorder):
+                self.latency.merge(latency)
+            # Always stop the transport
             try:
-                await transport_adapter.terminate()
+                transport_adapter.stop()
             except:
                 pass
     
@@ -304,6 +346,7 @@ class MCPTestRunner:
             )
             
             results["results"].append(result)
+            self.sink.write(result)
             
             if result.get("skipped", False):
                 results["skipped"] += 1
@@ -313,7 +356,8 @@ class MCPTestRunner:
                 results["passed"] += 1
             else:
                 results["failed"] += 1
-                
+        
+        results["latency"] = self.latency.to_dict()
         return results
 
 
@@ -324,7 +368,8 @@ async def run_tests(tests: List[Tuple[Callable[[MCPProtocolAdapter], Tuple[bool,
                    server_command: str = None,
                    env_vars: Optional[Dict[str, str]] = None,
                    debug: bool = False,
-                   timeout: Optional[int] = None) -> Dict[str, Any]:
+                   timeout: Optional[int] = None,
+                   sink: Optional[ResultSink] = None) -> Dict[str, Any]:
     """
     Run a list of test cases.
     
@@ -336,11 +381,12 @@ async def run_tests(tests: List[Tuple[Callable[[MCPProtocolAdapter], Tuple[bool,
         env_vars: Environment variables to pass to the server process
         debug: Whether to enable debug output
         timeout: Optional timeout in seconds for each test execution
+        sink: Optional sink that receives each result as soon as its test finishes
         
     Returns:
         A dictionary containing the test results
     """
-    runner = MCPTestRunner(debug=debug)
+    runner = MCPTestRunner(debug=debug, sink=sink)
     return await runner.run_tests(
         tests=tests,
         protocol=protocol,
@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Test Sharding for MCP Testing Framework.
+
+Splits a planned list of tests into N shards that take about the same time, so
+parallel CI jobs finish together. Each test's cost is its median duration from
+the run history when available; tests without history fall back to static
+weights by name, scaled to the recorded durations. Tests are assigned longest
+first to the least loaded shard, and keep their planned order within a shard.
+
+Every job must plan from the same inputs (test list and history) to get
+disjoint shards that together cover every test.
+"""
+
+import re
+import statistics
+from typing import Dict, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Relative cost of tests by name prefix, used when there is no recorded duration
+STATIC_WEIGHTS: Sequence[Tuple[str, float]] = (
+    ("test_async_long_running", 5.0),
+    ("test_each_tool", 4.0),
+    ("test_dynamic_async", 3.0),
+    ("test_async_", 2.0),
+    ("test_tool", 1.5),
+)
+DEFAULT_WEIGHT = 1.0
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """
+    Parse a --shard value.
+
+    Args:
+        spec: "i/N" with 1 <= i <= N
+
+    Returns:
+        A tuple (i, N)
+
+    Raises:
+        ValueError: If the value is malformed or out of range
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec or "")
+    if not match:
+        raise ValueError(f"Invalid shard: {spec!r} (expected i/N, e.g. 2/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard: {spec!r} (i must be between 1 and N)")
+    return index, count
+
+
+def static_weight(test_name: str) -> float:
+    """Return the fallback cost of a test from its name."""
+    for prefix, weight in STATIC_WEIGHTS:
+        if test_name.startswith(prefix):
+            return weight
+    return DEFAULT_WEIGHT
+
+
+def estimate_costs(test_names: Sequence[str],
+                   durations: Optional[Dict[str, List[float]]] = None) -> Dict[str, float]:
+    """
+    Estimate how long each test takes.
+
+    Args:
+        test_names: The planned tests
+        durations: Recorded durations by test name, e.g. from RunHistory.test_durations
+
+    Returns:
+        A mapping of test name to estimated cost
+    """
+    durations = durations or {}
+    known = {name: statistics.median(durations[name]) for name in test_names if durations.get(name)}
+
+    # Seconds per unit of static weight, so unknown tests are comparable with known ones
+    scale = 1.0
+    if known:
+        scale = statistics.median(known[name] / static_weight(name) for name in known)
+
+    return {name: known[name] if name in known else static_weight(name) * scale for name in test_names}
+
+
+def plan_shards(tests: Sequence[T], count: int, durations: Optional[Dict[str, List[float]]] = None,
+                name=lambda test: test[1]) -> List[List[T]]:
+    """
+    Split tests into balanced shards.
+
+    Args:
+        tests: The planned tests, by default (function, name) tuples
+        count: Number of shards
+        durations: Recorded durations by test name
+        name: Function returning a test's name
+
+    Returns:
+        A list of ``count`` shards, each a list of tests in planned order
+    """
+    names = [name(test) for test in tests]
+    costs = estimate_costs(names, durations)
+    loads = [0.0] * count
+    assignment: Dict[int, int] = {}
+
+    # Longest processing time first; ties broken by name so every job agrees
+    for position in sorted(range(len(tests)), key=lambda i: (-costs[names[i]], names[i], i)):
+        shard = min(range(count), key=lambda s: (loads[s], s))
+        assignment[position] = shard
+        loads[shard] += costs[names[position]]
+
+    shards: List[List[T]] = [[] for _ in range(count)]
+    for position, test in enumerate(tests):
+        shards[assignment[position]].append(test)
+    return shards
+
+
+def select_shard(tests: Sequence[T], spec: str, durations: Optional[Dict[str, List[float]]] = None,
+                 name=lambda test: test[1]) -> List[T]:
+    """
+    Return the tests of one shard.
+
+    Args:
+        tests: The planned tests
+        spec: The shard as "i/N"
+        durations: Recorded durations by test name
+        name: Function returning a test's name
+
+    Returns:
+        The tests in shard i, in planned order
+    """
+    index, count = parse_shard_spec(spec)
+    return plan_shards(tests, count, durations, name)[index - 1]
+
+
+def merge_results(parts: Sequence[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Combine the results of several shards.
+
+    Args:
+        parts: Results dictionaries with a "results" list of test results
+
+    Returns:
+        A results dictionary with the combined test list and totals
+    """
+    # Test names are not unique (suites may share a test), so results are concatenated
+    results = [r for part in parts for r in part.get("results", []) if isinstance(r, dict)]
+    # Skipped tests are marked passed but, as in the runners, are counted separately
+    skipped = sum(1 for r in results if r.get("skipped"))
+    passed = sum(1 for r in results if r.get("passed") and not r.get("skipped"))
+    return {
+        "results": results,
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed - skipped,
+        "skipped": skipped,
+        "timeouts": sum(1 for r in results if r.get("timeout")),
+    }
+
+
+def compliance_percentage(results: Dict[str, object]) -> float:
+    """Return the percentage of non-skipped tests that passed."""
+    counted = results["total"] - results.get("skipped", 0)
+    return results["passed"] / counted * 100 if counted > 0 else 100.0
@@ -0,0 +1,395 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Soak Testing for MCP Testing Framework.
+
+This module repeats a set of test workloads on one long-lived server session and
+watches for slow degradation: memory that keeps growing and latency that keeps
+drifting upwards. The run is split into windows. For each window the server's RSS
+is sampled and the per-request latency recorded by the transport is summarized.
+A least-squares line is then fitted through the windows (after a warm-up) and the
+slopes, expressed per hour, are compared against pass/fail thresholds. A trend only
+fails the run if the lower end of its 95% confidence interval exceeds the threshold
+and the fitted change over the observed run is material, so noise in short runs is
+not extrapolated into a false leak.
+"""
+
+import asyncio
+import math
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from mcp_testing.protocols.base import MCPProtocolAdapter
+from mcp_testing.transports.base import MCPTransportAdapter
+from mcp_testing.utils.cancellation import DEFAULT_CANCEL_GRACE, cancel_after_timeout, summarize_cancellations
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.resource_monitor import read_process_stats
+
+# Default pass/fail thresholds
+DEFAULT_MAX_RSS_SLOPE_MB_PER_HOUR = 50.0
+DEFAULT_MAX_LATENCY_DRIFT_PCT_PER_HOUR = 25.0
+
+# A trend must also have changed the fitted value by at least this much over the
+# observed run; rates from short runs are otherwise dominated by extrapolation
+MIN_RSS_GROWTH_BYTES = 8 * 1024 * 1024
+MIN_LATENCY_GROWTH_PCT = 10.0
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_soak_spec(spec: str) -> Tuple[Optional[int], Optional[float]]:
+    """
+    Parse a --soak value.
+
+    A plain number is an iteration count; a number with an s, m or h suffix is a
+    duration.
+
+    Args:
+        spec: The value, e.g. "500", "90s", "30m" or "2h"
+
+    Returns:
+        A tuple (iterations, duration in seconds) with exactly one value set
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", spec or "")
+    if not match:
+        raise ValueError(f"Invalid soak value: {spec!r} (use an iteration count or a duration like 30m)")
+    number, unit = match.groups()
+    if unit:
+        return None, float(number) * _DURATION_UNITS[unit]
+    if "." in number or int(number) < 1:
+        raise ValueError(f"Soak iteration count must be a positive integer: {spec!r}")
+    return int(number), None
+
+
+# One-sided 95% Student t quantiles by degrees of freedom (1.645 beyond the table)
+_T_95 = {1: 6.314, 2: 2.920, 3: 2.353, 4: 2.132, 5: 2.015, 6: 1.943, 7: 1.895, 8: 1.860,
+         9: 1.833, 10: 1.812, 12: 1.782, 15: 1.753, 20: 1.725, 30: 1.697}
+
+
+def _t_quantile(df: int) -> float:
+    """Return the one-sided 95% t quantile for the given degrees of freedom."""
+    for limit in sorted(_T_95):
+        if df <= limit:
+            return _T_95[limit]
+    return 1.645
+
+
+def fit_slope(xs: List[float], ys: List[float]) -> Tuple[float, float, float]:
+    """
+    Fit a least-squares line through the points.
+
+    Args:
+        xs: The x values
+        ys: The y values
+
+    Returns:
+        A tuple (slope, intercept, standard error of the slope); the slope and its
+        error are 0.0 if the x values do not vary
+    """
+    n = len(xs)
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return 0.0, mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+    intercept = mean_y - slope * mean_x
+    if n < 3:
+        return slope, intercept, 0.0
+    residuals = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys))
+    return slope, intercept, math.sqrt(residuals / (n - 2) / variance)
+
+
+def trend_lower_bound(xs: List[float], ys: List[float]) -> Tuple[float, float, float]:
+    """
+    Fit a trend and return a conservative estimate of its slope.
+
+    Short or noisy runs produce large slopes by chance once extrapolated to an
+    hour. Using the lower end of the one-sided 95% confidence interval means a
+    trend only fails the run when it is both steep and consistent.
+
+    Returns:
+        A tuple (slope, intercept, lower bound of the slope)
+    """
+    slope, intercept, stderr = fit_slope(xs, ys)
+    return slope, intercept, slope - _t_quantile(max(1, len(xs) - 2)) * stderr
+
+
+class SoakRunner:
+    """
+    Repeats workloads on one session and checks for leaks and latency drift.
+
+    Each iteration runs every workload once. Workloads are ordinary test
+    functions taking a protocol adapter and returning (passed, message).
+    """
+
+    def __init__(self, workloads: List[Tuple[Callable, str]], iterations: Optional[int] = None,
+                 duration: Optional[float] = None, windows: int = 20, warmup_windows: int = 1,
+                 max_rss_slope: float = DEFAULT_MAX_RSS_SLOPE_MB_PER_HOUR,
+                 max_latency_drift: float = DEFAULT_MAX_LATENCY_DRIFT_PCT_PER_HOUR,
+                 timeout: float = 30.0, log: Optional[Callable[[str], None]] = None,
+                 cancel_grace: float = DEFAULT_CANCEL_GRACE):
+        """
+        Initialize the soak runner.
+
+        Args:
+            workloads: List of (test function, test name) tuples
+            iterations: Number of iterations to run
+            duration: Seconds to run (alternative to iterations)
+            windows: Number of windows to split the run into
+            warmup_windows: Leading windows excluded from the trend fit
+            max_rss_slope: Maximum allowed RSS growth in MB per hour
+            max_latency_drift: Maximum allowed p50 latency growth in percent per hour
+            timeout: Timeout in seconds for a single workload call
+            log: Optional function used to report progress
+            cancel_grace: Seconds the server has to recover after a timed-out call is cancelled
+        """
+        if not workloads:
+            raise ValueError("Soak mode needs at least one workload")
+        if (iterations is None) == (duration is None):
+            raise ValueError("Specify exactly one of iterations or duration")
+        self.workloads = workloads
+        self.iterations = iterations
+        self.duration = duration
+        self.windows = max(1, windows)
+        self.warmup_windows = warmup_windows
+        self.max_rss_slope = max_rss_slope
+        self.max_latency_drift = max_latency_drift
+        self.timeout = timeout
+        self.log = log or (lambda message: None)
+        self.cancel_grace = cancel_grace
+
+    def _window_due(self, iteration: int, window_start: float, now: float) -> bool:
+        if self.iterations is not None:
+            return iteration % max(1, math.ceil(self.iterations / self.windows)) == 0
+        return now - window_start >= self.duration / self.windows
+
+    def _finished(self, iteration: int, elapsed: float) -> bool:
+        if self.iterations is not None:
+            return iteration >= self.iterations
+        return elapsed >= self.duration
+
+    async def run(self, protocol: MCPProtocolAdapter, transport: MCPTransportAdapter) -> Dict[str, Any]:
+        """
+        Run the soak on an initialized session.
+
+        Args:
+            protocol: An initialized protocol adapter
+            transport: The transport the protocol adapter uses
+
+        Returns:
+            The soak summary, including per-window samples and the verdict
+        """
+        process = getattr(transport, "process", None)
+        overall = LatencyRecorder()
+        window_samples: List[Dict[str, Any]] = []
+        failures: Dict[str, int] = {}
+        cancellations: List[Dict[str, Any]] = []
+        error = None
+        # Transports with deadlines can cancel a timed-out call and keep the session
+        cancellable = getattr(transport, "supports_deadline", False) is True
+
+        start = time.monotonic()
+        window_start = start
+        window_iterations = 0
+        iteration = 0
+        transport.latency = LatencyRecorder()
+
+        def close_window() -> None:
+            recorder, transport.latency = transport.latency, LatencyRecorder()
+            overall.merge(recorder)
+            histogram = recorder.total()
+            stats = read_process_stats(process.pid) if process is not None else None
+            window_samples.append({
+                "index": len(window_samples),
+                "elapsed": time.monotonic() - start,
+                "iterations": window_iterations,
+                "requests": histogram.count,
+                "p50": histogram.percentile(50),
+                "p99": histogram.percentile(99),
+                "mean": histogram.mean,
+                "rss_bytes": stats["rss_bytes"] if stats else None,
+                "fds": stats["fds"] if stats else None,
+            })
+
+        while not self._finished(iteration, time.monotonic() - start):
+            for test_func, test_name in self.workloads:
+                timed_out = False
+                if cancellable:
+                    transport.set_deadline(self.timeout)
+                try:
+                    passed, _ = await asyncio.wait_for(test_func(protocol), timeout=self.timeout)
+                    timed_out = cancellable and transport.deadline_expired
+                except asyncio.TimeoutError:
+                    passed, timed_out = False, True
+                except ConnectionError as e:
+                    if not (cancellable and transport.deadline_expired):
+                        error = f"{test_name}: {e}"
+                        break
+                    passed, timed_out = False, True
+                if timed_out:
+                    passed = False
+                    cancellation = cancel_after_timeout(transport, f"soak workload {test_name} timed out",
+                                                        self.cancel_grace)
+                    if cancellation:
+                        cancellations.append(cancellation)
+                        if not cancellation["healthy"]:
+                            error = f"{test_name}: timed out and the server did not recover after cancellation"
+                            break
+                elif cancellable:
+                    transport.set_deadline(None)
+                if not passed:
+                    failures[test_name] = failures.get(test_name, 0) + 1
+            if error:
+                break
+
+            iteration += 1
+            window_iterations += 1
+            now = time.monotonic()
+            if self._window_due(iteration, window_start, now):
+                close_window()
+                self.log(f"  Soak window {len(window_samples)}: {iteration} iterations, "
+                         f"p50 {window_samples[-1]['p50'] * 1000:.2f}ms")
+                window_start = now
+                window_iterations = 0
+
+        if window_iterations or not window_samples:
+            close_window()
+
+        summary = self.analyze(window_samples, iteration, time.monotonic() - start,
+                               failures, error, overall)
+        summary["cancellation"] = summarize_cancellations(cancellations)
+        return summary
+
+    def analyze(self, window_samples: List[Dict[str, Any]], iterations: int, elapsed: float,
+                failures: Dict[str, int], error: Optional[str],
+                latency: Optional[LatencyRecorder] = None) -> Dict[str, Any]:
+        """
+        Fit trends through the windows and decide pass or fail.
+
+        Args:
+            window_samples: The per-window samples
+            iterations: Completed iterations
+            elapsed: Run time in seconds
+            failures: Failed workload calls by test name
+            error: Error that ended the session early, if any
+            latency: Per-method latency over the whole run
+
+        Returns:
+            The soak summary
+        """
+        fitted = window_samples[self.warmup_windows:]
+        if len(fitted) < 3:
+            fitted = window_samples
+        problems = []
+
+        rss_points = [(w["elapsed"], w["rss_bytes"]) for w in fitted if w["rss_bytes"] is not None]
+        rss_slope = None
+        if len(rss_points) >= 3:
+            slope, _, lower = trend_lower_bound([p[0] for p in rss_points], [p[1] for p in rss_points])
+            rss_slope = slope * 3600 / (1024 * 1024)
+            span = rss_points[-1][0] - rss_points[0][0]
+            if (lower * 3600 / (1024 * 1024) > self.max_rss_slope
+                    and slope * span >= MIN_RSS_GROWTH_BYTES):
+                problems.append(f"RSS grows {rss_slope:.1f} MB/hour (limit {self.max_rss_slope:g})")
+
+        fd_points = [(w["elapsed"], w["fds"]) for w in fitted if w["fds"] is not None]
+        fd_slope = None
+        if len(fd_points) >= 3:
+            fd_slope = fit_slope([p[0] for p in fd_points], [p[1] for p in fd_points])[0] * 3600
+
+        latency_points = [(w["elapsed"], w["p50"]) for w in fitted if w["requests"]]
+        latency_drift = None
+        if len(latency_points) >= 3:
+            slope, intercept, lower = trend_lower_bound([p[0] for p in latency_points],
+                                                        [p[1] for p in latency_points])
+            baseline = intercept + slope * latency_points[0][0]
+            if baseline > 0:
+                latency_drift = slope * 3600 / baseline * 100
+                span = latency_points[-1][0] - latency_points[0][0]
+                if (lower * 3600 / baseline * 100 > self.max_latency_drift
+                        and slope * span / baseline * 100 >= MIN_LATENCY_GROWTH_PCT):
+                    problems.append(f"p50 latency drifts {latency_drift:+.1f}%/hour "
+                                    f"(limit {self.max_latency_drift:g}%)")
+
+        if error:
+            problems.append(f"Session failed: {error}")
+        conclusive = rss_slope is not None or latency_drift is not None
+
+        return {
+            "workloads": [name for _, name in self.workloads],
+            "iterations": iterations,
+            "elapsed": elapsed,
+            "windows": window_samples,
+            "warmup_windows": self.warmup_windows,
+            "failures": failures,
+            "error": error,
+            "rss_slope_mb_per_hour": rss_slope,
+            "fd_slope_per_hour": fd_slope,
+            "latency_drift_pct_per_hour": latency_drift,
+            "max_rss_slope_mb_per_hour": self.max_rss_slope,
+            "max_latency_drift_pct_per_hour": self.max_latency_drift,
+            "conclusive": conclusive,
+            "passed": not problems,
+            "problems": problems,
+            "latency": latency.to_dict() if latency else {},
+        }
+
+
+def soak_to_markdown(summary: Dict[str, Any]) -> List[str]:
+    """
+    Render a soak summary as Markdown report lines.
+
+    Args:
+        summary: The summary returned by SoakRunner.run
+
+    Returns:
+        A list of Markdown lines
+    """
+    def optional(value, fmt):
+        return "n/a" if value is None else fmt.format(value)
+
+    status = "✅ Passed" if summary["passed"] else "❌ Failed"
+    if summary["passed"] and not summary["conclusive"]:
+        status += " (inconclusive: fewer than 3 windows to fit)"
+
+    lines = [
+        "## Soak Test",
+        "",
+        f"- **Workloads**: {', '.join(summary['workloads'])}",
+        f"- **Iterations**: {summary['iterations']}",
+        f"- **Duration**: {summary['elapsed']:.1f}s",
+        f"- **RSS Trend**: {optional(summary['rss_slope_mb_per_hour'], '{:+.2f}')} MB/hour "
+        f"(limit {summary['max_rss_slope_mb_per_hour']:g})",
+        f"- **p50 Latency Drift**: {optional(summary['latency_drift_pct_per_hour'], '{:+.1f}')}%/hour "
+        f"(limit {summary['max_latency_drift_pct_per_hour']:g}%)",
+        f"- **Open FD Trend**: {optional(summary['fd_slope_per_hour'], '{:+.1f}')}/hour",
+        f"- **Soak Status**: {status}",
+    ]
+    for problem in summary["problems"]:
+        lines.append(f"  - {problem}")
+    for test_name, count in sorted(summary["failures"].items()):
+        lines.append(f"- **Failed {test_name} calls**: {count}")
+
+    lines.extend([
+        "",
+        "| Window | Elapsed | Iterations | Requests | p50 | p99 | RSS | FDs |",
+        "|--------|---------|------------|----------|-----|-----|-----|-----|",
+    ])
+    for window in summary["windows"]:
+        warmup = " (warm-up)" if window["index"] < summary["warmup_windows"] else ""
+        rss = optional(window["rss_bytes"] and window["rss_bytes"] / (1024 * 1024), "{:.1f} MB")
+        lines.append(
+            f"| {window['index'] + 1}{warmup} | {window['elapsed']:.1f}s | {window['iterations']} | "
+            f"{window['requests']} | {window['p50'] * 1000:.2f}ms | {window['p99'] * 1000:.2f}ms | "
+            f"{rss} | {optional(window['fds'], '{}')} |"
+        )
+
+    return lines
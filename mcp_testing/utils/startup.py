@@ -0,0 +1,277 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Cold Start Benchmarking for MCP Testing Framework.
+
+Hosts usually spawn an STDIO MCP server per user session, so the time from
+launching the server command to a usable session is latency every user feels.
+This module launches a server command repeatedly and times each launch in three
+phases:
+
+- first_byte: exec to the first byte the server writes to stdout
+- initialize: exec to the complete initialize response
+- tools_list: initialize response to the complete tools/list response
+
+The initialize request is written as soon as the process is spawned, the way a
+host does it, so time the server spends importing and setting up is measured
+rather than hidden behind a fixed startup delay.
+"""
+
+import json
+import os
+import select
+import shlex
+import subprocess
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from mcp_testing.utils.histogram import LatencyHistogram
+
+# Phases timed for each launch, in report order
+STARTUP_PHASES = ("first_byte", "initialize", "tools_list")
+
+PHASE_LABELS = {
+    "first_byte": "Exec → first stdout byte",
+    "initialize": "Exec → initialize response",
+    "tools_list": "Initialize → tools/list response",
+}
+
+STARTUP_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+class StartupProbe:
+    """
+    Launches a server once and times how long it takes to become usable.
+
+    The process is launched like StdioTransportAdapter.start launches it, but
+    with unbuffered binary pipes so the first byte of output can be timed.
+    """
+
+    def __init__(self, server_command: str, protocol_version: str,
+                 env_vars: Optional[Dict[str, str]] = None, timeout: float = 30.0):
+        """
+        Initialize the probe.
+
+        Args:
+            server_command: The command to launch the server
+            protocol_version: Protocol version sent in the initialize request
+            env_vars: Environment variables for the server process
+            timeout: Seconds allowed for the whole launch
+        """
+        self.server_command = server_command
+        self.protocol_version = protocol_version
+        self.env_vars = env_vars
+        self.timeout = timeout
+        self._buffer = b""
+        self._first_byte: Optional[float] = None
+
+    def _send(self, process: subprocess.Popen, message: Dict[str, Any]) -> None:
+        process.stdin.write((json.dumps(message) + "\n").encode())
+        process.stdin.flush()
+
+    def _readline(self, process: subprocess.Popen, deadline: float) -> bytes:
+        """Read one line from stdout, noting when the first byte arrives."""
+        fd = process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"No response within {self.timeout:g}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise ConnectionError(f"Server exited with code {process.poll()} before responding")
+            if self._first_byte is None:
+                self._first_byte = time.perf_counter()
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def _wait_for_response(self, process: subprocess.Popen, request_id: str,
+                           deadline: float) -> Dict[str, Any]:
+        """Read stdout until the response to a request arrives, skipping other messages."""
+        while True:
+            line = self._readline(process, deadline).strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                # Some servers log to stdout; that still counts as the first byte
+                continue
+            if isinstance(message, dict) and message.get("id") == request_id:
+                if "error" in message:
+                    raise ConnectionError(
+                        f"{request_id} failed: {message['error'].get('message', 'Unknown error')}")
+                return message
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Launch the server once and time it.
+
+        Returns:
+            A dictionary with the duration in seconds of every phase reached and
+            an "error" entry if the launch did not complete
+        """
+        self._buffer = b""
+        self._first_byte = None
+        timings: Dict[str, Any] = {"error": None}
+        process = None
+
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        try:
+            process = subprocess.Popen(
+                shlex.split(self.server_command),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+                env=self.env_vars
+            )
+            # Servers that log on startup would otherwise block on a full stderr pipe
+            threading.Thread(target=process.stderr.read, daemon=True).start()
+
+            self._send(process, {
+                "jsonrpc": "2.0",
+                "id": "init",
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": self.protocol_version,
+                    "capabilities": {},
+                    "clientInfo": {"name": "MCP Test Client", "version": "1.0.0"}
+                }
+            })
+            self._wait_for_response(process, "init", deadline)
+            initialized = time.perf_counter()
+            timings["first_byte"] = self._first_byte - start
+            timings["initialize"] = initialized - start
+
+            self._send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+            self._send(process, {"jsonrpc": "2.0", "id": "tools", "method": "tools/list", "params": {}})
+            self._wait_for_response(process, "tools", deadline)
+            timings["tools_list"] = time.perf_counter() - initialized
+        except (OSError, ValueError, ConnectionError, TimeoutError) as e:
+            if self._first_byte is not None and "first_byte" not in timings:
+                timings["first_byte"] = self._first_byte - start
+            timings["error"] = str(e) or type(e).__name__
+        finally:
+            if process is not None:
+                _terminate(process)
+
+        return timings
+
+
+def _terminate(process: subprocess.Popen) -> None:
+    """Close stdin, which asks an STDIO server to exit, then make sure it has."""
+    try:
+        process.stdin.close()
+        process.wait(timeout=1.0)
+    except (OSError, subprocess.TimeoutExpired):
+        process.terminate()
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    finally:
+        process.stdout.close()
+
+
+def measure_startup(server_command: str, protocol_version: str,
+                    env_vars: Optional[Dict[str, str]] = None, runs: int = 10,
+                    timeout: float = 30.0, log=None) -> Dict[str, Any]:
+    """
+    Launch a server repeatedly and summarize its cold start.
+
+    Args:
+        server_command: The command to launch the server
+        protocol_version: Protocol version sent in the initialize request
+        env_vars: Environment variables for the server process
+        runs: Number of launches
+        timeout: Seconds allowed for each launch
+        log: Optional function used to report progress
+
+    Returns:
+        A summary with the individual launches, per-phase distributions and the
+        headline exec-to-initialize p50 in seconds (None if no launch succeeded)
+    """
+    probe = StartupProbe(server_command, protocol_version, env_vars, timeout)
+    histograms = {phase: LatencyHistogram() for phase in STARTUP_PHASES}
+    launches: List[Dict[str, Any]] = []
+
+    for index in range(runs):
+        timings = probe.run()
+        launches.append(timings)
+        for phase in STARTUP_PHASES:
+            if phase in timings:
+                histograms[phase].record(timings[phase])
+        if log:
+            if timings["error"]:
+                log(f"  Launch {index + 1}/{runs} failed: {timings['error']}")
+            else:
+                log(f"  Launch {index + 1}/{runs}: initialize after "
+                    f"{timings['initialize'] * 1000:.0f}ms")
+
+    phases = {}
+    for phase, histogram in histograms.items():
+        phases[phase] = {
+            "count": histogram.count,
+            "mean": histogram.mean,
+            "min": histogram.min,
+            "max": histogram.max,
+            "percentiles": histogram.percentiles(STARTUP_PERCENTILES),
+        }
+
+    initialize = histograms["initialize"]
+    return {
+        "runs": runs,
+        "failures": sum(1 for timings in launches if timings["error"]),
+        "launches": launches,
+        "phases": phases,
+        "headline": initialize.percentile(50) if initialize.count else None,
+    }
+
+
+def startup_to_markdown(summary: Dict[str, Any]) -> List[str]:
+    """
+    Render a cold start summary as Markdown report lines.
+
+    Args:
+        summary: The summary returned by measure_startup
+
+    Returns:
+        A list of Markdown lines
+    """
+    def ms(value):
+        return "n/a" if value is None else f"{value * 1000:.1f}ms"
+
+    lines = [
+        "## Cold Start",
+        "",
+        f"- **Launches**: {summary['runs']} ({summary['failures']} failed)",
+        f"- **Exec → Initialize (p50)**: {ms(summary['headline'])}",
+        "",
+        "| Phase | Count | Mean | Min | "
+        + " | ".join(f"p{p:g}" for p in STARTUP_PERCENTILES) + " | Max |",
+        "|-------|-------|------|-----|" + "-----|" * len(STARTUP_PERCENTILES) + "-----|",
+    ]
+    for phase in STARTUP_PHASES:
+        stats = summary["phases"][phase]
+        if not stats["count"]:
+            lines.append(f"| {PHASE_LABELS[phase]} | 0 | n/a | n/a | "
+                         + "n/a | " * len(STARTUP_PERCENTILES) + "n/a |")
+            continue
+        percentiles = " | ".join(ms(stats["percentiles"][str(p)]) for p in STARTUP_PERCENTILES)
+        lines.append(f"| {PHASE_LABELS[phase]} | {stats['count']} | {ms(stats['mean'])} | "
+                     f"{ms(stats['min'])} | {percentiles} | {ms(stats['max'])} |")
+
+    errors = sorted({timings["error"] for timings in summary["launches"] if timings["error"]})
+    if errors:
+        lines.extend(["", "### Failed Launches", ""])
+        lines.extend(f"- {error}" for error in errors)
+
+    return lines
@@ -0,0 +1,142 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Adaptive Test Timeouts for MCP Testing Framework.
+
+A single global timeout has to fit the slowest test, so a hung server costs the
+full timeout on every test. Instead each test's deadline can be derived from its
+own recorded durations: the p99 of the test phase over recent passing runs,
+multiplied by a safety factor and clamped between a floor and the configured
+timeout. A test that normally finishes in milliseconds then times out after the
+floor, while a slow tool keeps a deadline that fits it.
+
+Tests with too little history keep the configured timeout. A --learn pass runs
+the suite a few times with the configured timeouts to build that history.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from mcp_testing.utils.history import DEFAULT_HISTORY_RUNS, RunHistory
+
+DEFAULT_TIMEOUT_FACTOR = 3.0
+DEFAULT_TIMEOUT_FLOOR = 1.0
+# Fewer recorded durations than this and the configured timeout is used
+MIN_TIMEOUT_SAMPLES = 3
+DEFAULT_LEARN_RUNS = 3
+
+
+def nearest_rank_percentile(values: Sequence[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def adaptive_timeout(samples: Sequence[float], ceiling: float, factor: float = DEFAULT_TIMEOUT_FACTOR,
+                     floor: float = DEFAULT_TIMEOUT_FLOOR,
+                     min_samples: int = MIN_TIMEOUT_SAMPLES) -> Optional[float]:
+    """
+    Compute a deadline from recorded durations.
+
+    Args:
+        samples: Recorded durations of the test in seconds
+        ceiling: The configured timeout, which the deadline never exceeds
+        factor: Safety factor applied to the p99
+        floor: Smallest deadline in seconds
+        min_samples: Minimum number of samples needed
+
+    Returns:
+        The deadline in seconds, or None if there are too few samples
+    """
+    if len(samples) < max(1, min_samples):
+        return None
+    deadline = nearest_rank_percentile(samples, 99) * factor
+    return min(ceiling, max(floor, deadline))
+
+
+class AdaptiveTimeouts:
+    """Per-test deadlines learned from recorded durations."""
+
+    def __init__(self, durations: Dict[str, List[float]], factor: float = DEFAULT_TIMEOUT_FACTOR,
+                 floor: float = DEFAULT_TIMEOUT_FLOOR, min_samples: int = MIN_TIMEOUT_SAMPLES):
+        """
+        Initialize the timeouts.
+
+        Args:
+            durations: Recorded test phase durations by test name
+            factor: Safety factor applied to each test's p99
+            floor: Smallest deadline in seconds
+            min_samples: Minimum number of recorded durations before a test gets its own deadline
+        """
+        self.durations = durations
+        self.factor = factor
+        self.floor = floor
+        self.min_samples = min_samples
+
+    @classmethod
+    def from_history(cls, history: RunHistory, server: str, protocol_version: str,
+                     runs: int = DEFAULT_HISTORY_RUNS, **kwargs) -> "AdaptiveTimeouts":
+        """Build the timeouts from the test phase durations of the last ``runs`` runs."""
+        return cls(history.phase_durations(server, protocol_version, "test", runs), **kwargs)
+
+    def timeout_for(self, test_name: str, ceiling: float) -> Tuple[float, bool]:
+        """
+        Return the deadline of a test.
+
+        Args:
+            test_name: Name of the test
+            ceiling: The configured timeout for the test
+
+        Returns:
+            A tuple (deadline in seconds, whether it was learned from history)
+        """
+        deadline = adaptive_timeout(self.durations.get(test_name, []), ceiling,
+                                    self.factor, self.floor, self.min_samples)
+        if deadline is None:
+            return ceiling, False
+        return deadline, True
+
+    def learned(self, test_names: Sequence[str]) -> List[str]:
+        """Return the tests that have enough history for their own deadline."""
+        return [name for name in test_names if len(self.durations.get(name, [])) >= max(1, self.min_samples)]
+
+    def to_dict(self, results: Sequence[Dict[str, object]]) -> Dict[str, object]:
+        """Return the settings and the deadline each test ran with, from the runner's results."""
+        deadlines = {}
+        for result in results:
+            if isinstance(result, dict) and "deadline" in result:
+                deadlines[result["name"]] = {"deadline": result["deadline"],
+                                             "learned": bool(result.get("deadline_learned")),
+                                             "samples": len(self.durations.get(result["name"], []))}
+        return {"factor": self.factor, "floor": self.floor, "min_samples": self.min_samples,
+                "deadlines": deadlines}
+
+
+def timeouts_to_markdown(timeouts: Dict[str, object]) -> List[str]:
+    """
+    Format the deadlines used in a run as Markdown.
+
+    Args:
+        timeouts: The output of AdaptiveTimeouts.to_dict
+
+    Returns:
+        Markdown lines
+    """
+    deadlines = timeouts["deadlines"]
+    learned = sum(1 for d in deadlines.values() if d["learned"])
+    lines = [
+        "## Adaptive Timeouts",
+        "",
+        f"{learned} of {len(deadlines)} tests used a deadline learned from history "
+        f"(p99 × {timeouts['factor']:g}, at least {timeouts['floor']:g}s); "
+        "the others used the configured timeout.",
+        "",
+        "| Test | Deadline | Samples |",
+        "|------|----------|---------|",
+    ]
+    for name, deadline in sorted(deadlines.items()):
+        source = "" if deadline["learned"] else " (configured)"
+        lines.append(f"| {name} | {deadline['deadline']:.2f}s{source} | {deadline['samples']} |")
+    return lines
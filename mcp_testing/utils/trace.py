@@ -0,0 +1,442 @@
+# Copyright (c) 2025 Scott Wilcox
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Traffic Traces for MCP Testing Framework.
+
+The tap wraps a STDIO server command, typically in a host application's server
+configuration, and records the session as it happens. Bytes are forwarded
+unchanged as soon as they are read; copies are handed to a background thread
+that splits them into frames and writes them with timestamps to a trace. The
+tap never blocks forwarding on disk. If the writer falls behind, chunks are
+dropped from the trace and counted.
+
+A trace is a series of gzip-compressed NDJSON segments named
+``trace_<session>.<segment>.ndjson.gz``. A new segment starts once the current
+one holds ``max_segment_bytes`` of frames, and only the newest ``max_segments``
+are kept. Each segment starts with a header line, followed by one line per
+frame::
+
+    {"trace": "mcp-trace", "version": 1, "session": "...", "segment": 0, "started": "...", "command": "..."}
+    {"t": 0.0123, "dir": "c2s", "size": 97, "frame": "{\\"jsonrpc\\": \\"2.0\\", ...}"}
+
+``t`` is seconds since the session started and ``dir`` is ``c2s`` (client to
+server) or ``s2c``. The last segment of a session that ended normally ends with
+``{"end": <t>, "dropped_chunks": <n>}``.
+
+The analyzer matches requests and responses by id and reports per-method counts,
+latency percentiles, message sizes, concurrency and a workload mix for bench.
+"""
+
+import glob
+import gzip
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.timeouts import nearest_rank_percentile
+
+TRACE_FORMAT = "mcp-trace"
+TRACE_VERSION = 1
+
+CLIENT_TO_SERVER = "c2s"
+SERVER_TO_CLIENT = "s2c"
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_SEGMENTS = 10
+# Chunks waiting for the writer before further chunks are dropped from the trace
+DEFAULT_QUEUE_CHUNKS = 65536
+
+_READ_SIZE = 65536
+
+# Client requests that set up or end a session rather than make up its workload
+_SESSION_METHODS = ("initialize", "shutdown")
+
+
+class TraceWriter:
+    """Frames and writes traffic on a background thread."""
+
+    def __init__(self, directory: str, command: str = "", session: Optional[str] = None,
+                 max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+                 max_segments: int = DEFAULT_MAX_SEGMENTS, queue_size: int = DEFAULT_QUEUE_CHUNKS):
+        """
+        Initialize the writer and start its thread.
+
+        Args:
+            directory: Directory the trace segments are written to
+            command: The traced server command, stored in each header
+            session: Session name used in file names (default: timestamp and pid)
+            max_segment_bytes: Frame bytes per segment before a new one starts
+            max_segments: Number of segments kept; older ones are deleted
+            queue_size: Chunks buffered for the writer before chunks are dropped
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.command = command
+        self.session = session or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max(1, max_segments)
+        self.dropped_chunks = 0
+        self.started = time.perf_counter()
+        self.segments: List[str] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._resync = {CLIENT_TO_SERVER: False, SERVER_TO_CLIENT: False}
+        self._partial = {CLIENT_TO_SERVER: b"", SERVER_TO_CLIENT: b""}
+        self._file = None
+        self._segment_index = 0
+        self._segment_bytes = 0
+        self._thread = threading.Thread(target=self._run, name="mcp-trace-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, direction: str, chunk: bytes) -> None:
+        """Queue a chunk of forwarded bytes; never blocks."""
+        try:
+            self._queue.put_nowait((time.perf_counter() - self.started, direction, chunk,
+                                    self._resync[direction]))
+            self._resync[direction] = False
+        except queue.Full:
+            # The frame this chunk belonged to is lost; skip to the next complete one
+            self.dropped_chunks += 1
+            self._resync[direction] = True
+
+    def close(self) -> None:
+        """Write what is queued, end the trace and wait for the writer."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _open_segment(self) -> None:
+        if self._file:
+            self._file.close()
+        index = self._segment_index
+        self._segment_index += 1
+        path = os.path.join(self.directory, f"trace_{self.session}.{index:04d}.ndjson.gz")
+        self.segments.append(path)
+        while len(self.segments) > self.max_segments:
+            try:
+                os.remove(self.segments.pop(0))
+            except OSError:
+                pass
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._segment_bytes = 0
+        self._write({"trace": TRACE_FORMAT, "version": TRACE_VERSION, "session": self.session,
+                     "segment": index, "started": datetime.now().isoformat(), "command": self.command})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+
+    def _frame(self, t: float, direction: str, chunk: bytes, resync: bool) -> None:
+        if resync:
+            self._partial[direction] = b""
+            _, _, chunk = chunk.partition(b"\n")
+        data = self._partial[direction] + chunk
+        *frames, self._partial[direction] = data.split(b"\n")
+        for frame in frames:
+            if not frame.strip():
+                continue
+            if self._file is None or self._segment_bytes >= self.max_segment_bytes:
+                self._open_segment()
+            self._segment_bytes += len(frame)
+            self._write({"t": round(t, 6), "dir": direction, "size": len(frame),
+                         "frame": frame.decode("utf-8", "replace")})
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._frame(*item)
+            # Flush whenever the queue runs dry, so a killed session keeps its trace
+            if self._queue.empty() and self._file:
+                self._file.flush()
+        if self._file is None:
+            self._open_segment()
+        self._write({"end": round(time.perf_counter() - self.started, 6), "dropped_chunks": self.dropped_chunks})
+        self._file.close()
+
+
+def _pump(source_fd: int, target_fd: int, direction: str, writer: TraceWriter) -> None:
+    """
+    Forward bytes between descriptors, recording each chunk as it is read.
+
+    Recording before forwarding keeps the trace causal: a request is always
+    timestamped before the server can see it, so its response never appears
+    to arrive first.
+    """
+    while True:
+        try:
+            chunk = os.read(source_fd, _READ_SIZE)
+            if not chunk:
+                break
+            writer.record(direction, chunk)
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(target_fd, view):]
+        except OSError:
+            break
+
+
+def run_tap(command: Sequence[str], trace_dir: str, max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+            max_segments: int = DEFAULT_MAX_SEGMENTS) -> int:
+    """
+    Run a server, relaying this process's stdin and stdout and tracing the traffic.
+
+    Args:
+        command: The server command and its arguments
+        trace_dir: Directory the trace is written to
+        max_segment_bytes: Frame bytes per trace segment
+        max_segments: Number of segments kept
+
+    Returns:
+        The server's exit code
+    """
+    process = subprocess.Popen(list(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+    writer = TraceWriter(trace_dir, " ".join(command), max_segment_bytes=max_segment_bytes,
+                         max_segments=max_segments)
+
+    def finish(*_):
+        # Stopped by the host: take the server down too and keep the trace
+        process.terminate()
+        writer.close()
+        os._exit(128 + signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, finish)
+
+    def relay_client():
+        _pump(sys.stdin.fileno(), process.stdin.fileno(), CLIENT_TO_SERVER, writer)
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+    threading.Thread(target=relay_client, daemon=True).start()
+    _pump(process.stdout.fileno(), sys.stdout.fileno(), SERVER_TO_CLIENT, writer)
+    returncode = process.wait()
+    writer.close()
+    return returncode
+
+
+def trace_files(paths: Iterable[str]) -> List[str]:
+    """Expand directories to the trace segments they contain, in session and segment order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "trace_*.ndjson.gz")))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def read_trace(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Read the frames of one or more traces.
+
+    Segments cut short by a killed session are read up to the damage. Files
+    without a .gz suffix are read as plain NDJSON in the same record format.
+
+    Args:
+        paths: Trace segments or directories containing them
+
+    Yields:
+        Frame records with the session name added
+    """
+    for path in trace_files(paths):
+        session = None
+        try:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if record.get("trace") == TRACE_FORMAT:
+                        session = record.get("session")
+                    elif "frame" in record:
+                        record["session"] = session or path
+                        yield record
+        except (EOFError, OSError, zlib.error):
+            continue
+
+
+def _size_stats(sizes: List[int]) -> Optional[Dict[str, int]]:
+    if not sizes:
+        return None
+    return {"p50": nearest_rank_percentile(sizes, 50), "p99": nearest_rank_percentile(sizes, 99),
+            "max": max(sizes)}
+
+
+def _operation(message: Dict[str, Any]) -> str:
+    """Return the bench operation of a client request, e.g. tools/call:echo."""
+    method = message.get("method", "")
+    params = message.get("params") if isinstance(message.get("params"), dict) else {}
+    if method in ("tools/call", "prompts/get") and params.get("name"):
+        return f"{method}:{params['name']}"
+    if method == "resources/read" and params.get("uri"):
+        return f"{method}:{params['uri']}"
+    return method
+
+
+def analyze_trace(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute workload statistics from trace records.
+
+    Args:
+        records: Frame records as yielded by read_trace
+
+    Returns:
+        Session, frame and byte counts; per-method requests, errors, unanswered
+        requests and message sizes; latency by method (LatencyRecorder.to_dict);
+        client request concurrency; notifications and server requests by method;
+        and the client workload as a bench --mix string
+    """
+    latency = LatencyRecorder()
+    methods: Dict[str, Dict[str, Any]] = {}
+    server_requests: Dict[str, int] = {}
+    notifications = {CLIENT_TO_SERVER: {}, SERVER_TO_CLIENT: {}}
+    operations: Dict[str, int] = {}
+    in_flight_samples: List[int] = []
+    sessions: Dict[str, Dict[str, Any]] = {}
+    frames = total_bytes = 0
+
+    def method_stats(method):
+        return methods.setdefault(method, {"requests": 0, "errors": 0, "request_sizes": [],
+                                           "response_sizes": []})
+
+    for record in records:
+        frames += 1
+        total_bytes += record.get("size", 0)
+        t, direction = record["t"], record["dir"]
+        state = sessions.setdefault(record["session"], {
+            "start": t, "end": t, "pending": {}, "in_flight": 0, "last": t, "busy": 0.0, "peak": 0})
+        state["end"] = max(state["end"], t)
+        try:
+            message = json.loads(record["frame"])
+        except ValueError:
+            continue
+        batch = message if isinstance(message, list) else [message]
+        size = record.get("size", 0) // max(1, len(batch))
+
+        # Integrate the number of client requests in flight over time
+        state["busy"] += state["in_flight"] * (t - state["last"])
+        state["last"] = t
+
+        for item in batch:
+            if not isinstance(item, dict):
+                continue
+            if "method" in item and "id" in item:
+                key = (direction, json.dumps(item["id"]))
+                state["pending"][key] = (t, item["method"])
+                if direction == CLIENT_TO_SERVER:
+                    stats = method_stats(item["method"])
+                    stats["requests"] += 1
+                    stats["request_sizes"].append(size)
+                    state["in_flight"] += 1
+                    state["peak"] = max(state["peak"], state["in_flight"])
+                    in_flight_samples.append(state["in_flight"])
+                    if item["method"] not in _SESSION_METHODS:
+                        operation = _operation(item)
+                        operations[operation] = operations.get(operation, 0) + 1
+                else:
+                    server_requests[item["method"]] = server_requests.get(item["method"], 0) + 1
+            elif "method" in item:
+                counts = notifications[direction]
+                counts[item["method"]] = counts.get(item["method"], 0) + 1
+            elif "id" in item:
+                request_direction = SERVER_TO_CLIENT if direction == CLIENT_TO_SERVER else CLIENT_TO_SERVER
+                sent = state["pending"].pop((request_direction, json.dumps(item["id"])), None)
+                if sent is None or request_direction != CLIENT_TO_SERVER:
+                    continue
+                started, method = sent
+                latency.record(method, t - started)
+                stats = method_stats(method)
+                stats["response_sizes"].append(size)
+                if "error" in item:
+                    stats["errors"] += 1
+                state["in_flight"] -= 1
+
+    duration = sum(s["end"] - s["start"] for s in sessions.values())
+    for state in sessions.values():
+        for (direction, _), (_, method) in state["pending"].items():
+            if direction == CLIENT_TO_SERVER:
+                stats = method_stats(method)
+                stats["unanswered"] = stats.get("unanswered", 0) + 1
+
+    return {
+        "sessions": len(sessions),
+        "frames": frames,
+        "bytes": total_bytes,
+        "duration": duration,
+        "methods": {
+            method: {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "unanswered": stats.get("unanswered", 0),
+                "request_size": _size_stats(stats["request_sizes"]),
+                "response_size": _size_stats(stats["response_sizes"]),
+            }
+            for method, stats in sorted(methods.items())
+        },
+        "latency": latency.to_dict(),
+        "concurrency": {
+            "max": max((s["peak"] for s in sessions.values()), default=0),
+            "mean": sum(s["busy"] for s in sessions.values()) / duration if duration > 0 else 0.0,
+            "p50": nearest_rank_percentile(in_flight_samples, 50) if in_flight_samples else 0,
+            "p99": nearest_rank_percentile(in_flight_samples, 99) if in_flight_samples else 0,
+        },
+        "server_requests": dict(sorted(server_requests.items())),
+        "notifications": {"client_to_server": dict(sorted(notifications[CLIENT_TO_SERVER].items())),
+                          "server_to_client": dict(sorted(notifications[SERVER_TO_CLIENT].items()))},
+        "mix": ",".join(f"{operation}={count}" for operation, count
+                        in sorted(operations.items(), key=lambda item: (-item[1], item[0]))),
+    }
+
+
+def trace_to_markdown(analysis: Dict[str, Any]) -> List[str]:
+    """
+    Format a trace analysis as Markdown, without the latency tables.
+
+    Args:
+        analysis: The output of analyze_trace
+
+    Returns:
+        Markdown lines
+    """
+    def size(stats, key):
+        return f"{stats[key]} B" if stats else "n/a"
+
+    concurrency = analysis["concurrency"]
+    lines = [
+        "## Workload",
+        "",
+        f"- **Sessions**: {analysis['sessions']} ({analysis['duration']:.1f}s traced)",
+        f"- **Frames**: {analysis['frames']} ({analysis['bytes']} bytes)",
+        f"- **Requests in Flight**: mean {concurrency['mean']:.2f}, p50 {concurrency['p50']}, "
+        f"p99 {concurrency['p99']}, max {concurrency['max']} (seen by each new request)",
+    ]
+    if analysis["mix"]:
+        lines.append(f"- **Bench Mix**: `{analysis['mix']}`")
+    lines.extend([
+        "",
+        "| Method | Requests | Errors | Unanswered | Request p50 | Request p99 | Response p50 | Response p99 | Response Max |",
+        "|--------|----------|--------|------------|-------------|-------------|--------------|--------------|--------------|",
+    ])
+    for method, stats in analysis["methods"].items():
+        request, response = stats["request_size"], stats["response_size"]
+        lines.append(f"| {method} | {stats['requests']} | {stats['errors']} | {stats['unanswered']} | "
+                     f"{size(request, 'p50')} | {size(request, 'p99')} | {size(response, 'p50')} | "
+                     f"{size(response, 'p99')} | {size(response, 'max')} |")
+    for title, counts in (("Server-to-Client Requests", analysis["server_requests"]),
+                          ("Client Notifications", analysis["notifications"]["client_to_server"]),
+                          ("Server Notifications", analysis["notifications"]["server_to_client"])):
+        if counts:
+            lines.extend(["", f"**{title}**: " + ", ".join(f"{m} ({c})" for m, c in counts.items())])
+    return lines
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OAuth 2.0 token introspection endpoint (RFC 7662).
+
+Point the reference server at it to exercise its introspection client without a
+real authorization server:
+
+    python ref_http_server/introspection_server.py --port 8089 --latency 20
+    MCP_OAUTH_INTROSPECTION_URL=http://127.0.0.1:8089/introspect python ref_http_server/reference_mcp_server.py
+
+POST /introspect answers for the configured tokens and reports any other token
+as inactive. GET /stats returns how many introspection requests were served,
+which shows how many lookups the server's cache saved.
+
+Built-in tokens:
+    valid-test-token-123    active for an hour
+    short-lived-test-token  active for 5 seconds after startup
+    expired-test-token      expired a minute before startup
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+DEFAULT_SCOPE = "mcp:read mcp:write"
+DEFAULT_TOKENS = {
+    "valid-test-token-123": 3600,
+    "short-lived-test-token": 5,
+    "expired-test-token": -60,
+}
+
+
+class IntrospectionServer(ThreadingHTTPServer):
+    """HTTP server holding the token table and a count of introspection requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], tokens: Dict[str, float], scope: str = DEFAULT_SCOPE,
+                 latency: float = 0.0):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to bind; port 0 picks a free port
+            tokens: Token -> seconds from now until it expires (negative for expired tokens)
+            scope: Space-separated scopes granted to every token
+            latency: Seconds to wait before answering each introspection request
+        """
+        super().__init__(address, IntrospectionHandler)
+        now = time.time()
+        self.tokens = {token: int(now + lifetime) for token, lifetime in tokens.items()}
+        self.scope = scope
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def describe(self, token: Optional[str]) -> Dict[str, object]:
+        """The introspection response for a token."""
+        exp = self.tokens.get(token)
+        if exp is None or exp <= time.time():
+            return {"active": False}
+        return {"active": True, "scope": self.scope, "client_id": "mcp-test-client", "token_type": "Bearer",
+                "aud": "mcp-server", "exp": exp, "iat": int(time.time())}
+
+
+class IntrospectionHandler(BaseHTTPRequestHandler):
+    """Serves POST /introspect and GET /stats."""
+
+    def do_POST(self):
+        if self.path != "/introspect":
+            self._reply(404, {"error": "not_found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self._reply(200, self.server.describe(form.get("token", [None])[0]))
+
+    def do_GET(self):
+        if self.path != "/stats":
+            self._reply(404, {"error": "not_found"})
+            return
+        self._reply(200, {"requests": self.server.requests})
+
+    def _reply(self, status: int, body: Dict[str, object]):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_introspection_server(tokens: Optional[Dict[str, float]] = None, host: str = "127.0.0.1", port: int = 0,
+                               latency: float = 0.0) -> Tuple[IntrospectionServer, str]:
+    """
+    Serve introspection on a background thread.
+
+    Returns:
+        The server, for shutdown() and its request count, and the introspection URL
+    """
+    server = IntrospectionServer((host, port), DEFAULT_TOKENS if tokens is None else tokens, latency=latency)
+    threading.Thread(target=server.serve_forever, name="introspection-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/introspect"
+
+
+def parse_token(value: str) -> Tuple[str, float]:
+    """Parse --token NAME=SECONDS."""
+    name, _, lifetime = value.partition("=")
+    try:
+        return name, float(lifetime) if lifetime else 3600.0
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=SECONDS, got {value!r}")
+
+
+def main():
+    """Run the stand-in introspection endpoint."""
+    parser = argparse.ArgumentParser(description="Local stand-in OAuth token introspection endpoint")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=8089, help="Port to bind to")
+    parser.add_argument("--token", type=parse_token, action="append", default=[],
+                        help="Extra token as NAME=SECONDS until it expires (negative for already expired)")
+    parser.add_argument("--scope", default=DEFAULT_SCOPE, help="Space-separated scopes granted to every token")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds to wait before each answer")
+    args = parser.parse_args()
+
+    server = IntrospectionServer((args.host, args.port), {**DEFAULT_TOKENS, **dict(args.token)},
+                                 scope=args.scope, latency=args.latency / 1000)
+    print(f"Token introspection at http://{args.host}:{server.server_address[1]}/introspect")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,34 @@ correctly, focusing on proper session management and protocol compliance.
 
 import argparse
 import asyncio
+import base64
+import binascii
+import itertools
 import json
 import logging
+import math
+import os
+import random
+import sqlite3
 import sys
+import tempfile
+import threading
 import time
 import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from multiprocessing.managers import BaseManager
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, TypeVar, Generic
 
+import httpx
 import uvicorn
-from fastapi import FastAPI, Header, HTTPException, Request, Response, WebSocket, status, Depends
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, status, Depends
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field
 from sse_starlette.sse import EventSourceResponse
 
 # Configure logging
@@ -183,16 +197,158 @@ def create_www_authenticate_header(error: str = "invalid_token",
     
     return header
 
-async def check_authentication(request: Request,
-                        authorization: Optional[str] = Header(None),
-                        mcp_protocol_version: Optional[str] = Header(None, alias="MCP-Protocol-Version")) -> Dict[str, Any]:
+# Token introspection (RFC 7662), used instead of VALID_TOKENS when MCP_OAUTH_INTROSPECTION_URL is set
+INTROSPECTION_CACHE_TTL = 60.0
+INTROSPECTION_NEGATIVE_TTL = 10.0
+INTROSPECTION_TIMEOUT = 5.0
+INTROSPECTION_CACHE_SIZE = 10000
+
+
+class TokenIntrospector:
+    """
+    Token introspection client with a local cache.
+
+    Active tokens are cached for cache_ttl seconds, but never past their exp.
+    Inactive and unknown tokens are cached for negative_ttl seconds. Concurrent
+    lookups of a token that is not cached share a single introspection request.
+    Failed requests are not cached, and the token is refused.
+    """
+
+    def __init__(self, url: str, cache_ttl: float = INTROSPECTION_CACHE_TTL,
+                 negative_ttl: float = INTROSPECTION_NEGATIVE_TTL, timeout: float = INTROSPECTION_TIMEOUT,
+                 max_entries: int = INTROSPECTION_CACHE_SIZE, client_id: Optional[str] = None,
+                 client_secret: Optional[str] = None):
+        """Initialize the client with an empty cache."""
+        self.url = url
+        self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.auth = (client_id, client_secret or "") if client_id else None
+        # token -> (monotonic expiry, token info or None for an inactive token)
+        self._cache: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self.counters = {"hits": 0, "negative_hits": 0, "misses": 0, "coalesced": 0, "requests": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["TokenIntrospector"]:
+        """Build a client from the MCP_OAUTH_INTROSPECTION_* variables, or None without a URL."""
+        url = os.environ.get("MCP_OAUTH_INTROSPECTION_URL")
+        if not url:
+            return None
+        return cls(
+            url,
+            cache_ttl=float(os.environ.get("MCP_OAUTH_INTROSPECTION_CACHE_TTL", INTROSPECTION_CACHE_TTL)),
+            negative_ttl=float(os.environ.get("MCP_OAUTH_INTROSPECTION_NEGATIVE_TTL", INTROSPECTION_NEGATIVE_TTL)),
+            timeout=float(os.environ.get("MCP_OAUTH_INTROSPECTION_TIMEOUT", INTROSPECTION_TIMEOUT)),
+            client_id=os.environ.get("MCP_OAUTH_CLIENT_ID"),
+            client_secret=os.environ.get("MCP_OAUTH_CLIENT_SECRET")
+        )
+
+    async def introspect(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the token's info if it is active, or None."""
+        entry = self._cache.get(token)
+        if entry is not None:
+            expires, info = entry
+            if time.monotonic() < expires:
+                self._cache.move_to_end(token)
+                self.counters["hits" if info is not None else "negative_hits"] += 1
+                return info
+            del self._cache[token]
+
+        pending = self._inflight.get(token)
+        if pending is not None:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["misses"] += 1
+            pending = self._inflight[token] = asyncio.ensure_future(self._lookup(token))
+        # Shielded so a caller that goes away, even the one that started it, does not cancel the lookup
+        return await asyncio.shield(pending)
+
+    async def _lookup(self, token: str) -> Optional[Dict[str, Any]]:
+        """Introspect a token and cache the result, as a task shared by concurrent callers."""
+        try:
+            info = await self._request(token)
+            self._store(token, info)
+            return info
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.warning(f"Token introspection failed: {e}")
+            return None
+        finally:
+            del self._inflight[token]
+
+    async def _request(self, token: str) -> Optional[Dict[str, Any]]:
+        """Ask the introspection endpoint about a token."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        self.counters["requests"] += 1
+        response = await self._client.post(self.url, data={"token": token, "token_type_hint": "access_token"},
+                                           auth=self.auth)
+        response.raise_for_status()
+        body = response.json()
+        if not body.get("active"):
+            return None
+        exp = body.get("exp")
+        if isinstance(exp, (int, float)) and exp <= time.time():
+            return None
+        scope = body.get("scope", "")
+        return {**body, "scope": scope.split() if isinstance(scope, str) else list(scope)}
+
+    def _store(self, token: str, info: Optional[Dict[str, Any]]) -> None:
+        """Cache a lookup result, keeping an active token no longer than its exp."""
+        ttl = self.negative_ttl if info is None else self.cache_ttl
+        exp = info.get("exp") if info is not None else None
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+        self._cache[token] = (time.monotonic() + ttl, info)
+        self._cache.move_to_end(token)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def aclose(self) -> None:
+        """Close the HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and lookup counters."""
+        return {"url": self.url, "cached": len(self._cache), **self.counters}
+
+
+token_introspector = TokenIntrospector.from_env()
+
+
+async def authenticate_bearer_token(authorization: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Validate a Bearer token through the introspection endpoint when one is configured.
+    
+    Args:
+        authorization: Authorization header value
+        
+    Returns:
+        Token info if valid, None if invalid or missing
+    """
+    if token_introspector is None or not OAUTH_ENABLED:
+        return validate_bearer_token(authorization)
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    return await token_introspector.introspect(authorization[7:])
+
+async def check_authentication(request: Request) -> Dict[str, Any]:
     """
     Check authentication for requests.
     
+    The Authorization and MCP-Protocol-Version headers are read from the request
+    itself rather than declared as Header parameters, which FastAPI resolves far
+    more slowly on every request.
+    
     Args:
         request: FastAPI request object
-        authorization: Authorization header
-        mcp_protocol_version: MCP protocol version header (required for 2025-06-18)
         
     Returns:
         Authentication info
@@ -200,9 +356,12 @@ async def check_authentication(request: Request,
     Raises:
         HTTPException: If authentication fails
     """
+    authorization = request.headers.get("authorization")
+    mcp_protocol_version = request.headers.get("mcp-protocol-version")
+    
     # Try to parse the request body once and store it in state
     try:
-        body = await request.json()
+        body = decode_json(await request.body())
         request.state.body = body
     except (json.JSONDecodeError, RuntimeError):
         request.state.body = None
@@ -219,8 +378,9 @@ async def check_authentication(request: Request,
     
     # Check OAuth 2.1 authentication if enabled
     if OAUTH_ENABLED:
-        token_info = validate_bearer_token(authorization)
+        token_info = await authenticate_bearer_token(authorization)
         if not token_info:
+            mcp_server.metrics.auth_failure("invalid_token")
             www_authenticate = create_www_authenticate_header()
             raise HTTPException(
                 status_code=401,
@@ -234,6 +394,7 @@ async def check_authentication(request: Request,
         missing_scopes = [scope for scope in required_scopes if scope not in token_scopes]
         
         if missing_scopes:
+            mcp_server.metrics.auth_failure("insufficient_scope")
             www_authenticate = create_www_authenticate_header(
                 error="insufficient_scope",
                 error_description=f"The token is missing required scopes: {' '.join(missing_scopes)}"
@@ -248,16 +409,763 @@ async def check_authentication(request: Request,
     
     return {"valid": True, "scope": ["mcp:read", "mcp:write"]}
 
+# Session limits; sessions idle longer than the TTL or beyond the cap are dropped
+DEFAULT_SESSION_TTL = 3600.0
+DEFAULT_MAX_SESSIONS = 10000
+SESSION_SWEEP_INTERVAL = 30.0
+
+
+class SessionStore:
+    """
+    Bounded store of MCP sessions.
+
+    Sessions are kept in least-recently-used order with a monotonic last-access
+    time. A session idle for longer than ``idle_ttl`` is expired on its next
+    lookup or by the background sweeper, and once ``max_sessions`` are open the
+    least recently used one is evicted to make room for a new session.
+    """
+
+    # Whether calls wait on disk or another process, and so must be kept off the event loop
+    blocking = False
+
+    def __init__(self, idle_ttl: float = DEFAULT_SESSION_TTL, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 sweep_interval: float = SESSION_SWEEP_INTERVAL):
+        """Initialize an empty store."""
+        if idle_ttl <= 0 or max_sessions < 1:
+            raise ValueError("Session TTL and capacity must be positive")
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        # session_id -> [session data, last access (time.monotonic())], oldest access first
+        self._sessions: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._counters = {"created": 0, "expired": 0, "evicted": 0, "closed": 0}
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Add a session, evicting the least recently used ones beyond the cap."""
+        with self._lock:
+            self._sessions[session_id] = [data, time.monotonic()]
+            self._sessions.move_to_end(session_id)
+            self._counters["created"] += 1
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                self._counters["evicted"] += 1
+                logger.info(f"Evicted least recently used session: {evicted}")
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a session's data and mark it as used, or None if it is unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[1] > self.idle_ttl:
+                del self._sessions[session_id]
+                self._counters["expired"] += 1
+                return None
+            entry[1] = now
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def remove(self, session_id: str) -> bool:
+        """Close a session; returns False if it did not exist."""
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                return False
+            self._counters["closed"] += 1
+            return True
+
+    def sweep(self) -> int:
+        """Expire idle sessions; returns how many were removed."""
+        deadline = time.monotonic() - self.idle_ttl
+        removed = 0
+        with self._lock:
+            # Oldest access first, so stop at the first session still in use
+            while self._sessions:
+                session_id, (_, last_access) = next(iter(self._sessions.items()))
+                if last_access >= deadline:
+                    break
+                del self._sessions[session_id]
+                removed += 1
+            self._counters["expired"] += removed
+        if removed:
+            logger.info(f"Expired {removed} idle sessions")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of open sessions, the limits and lifetime counters."""
+        with self._lock:
+            return {"backend": "memory", "active": len(self._sessions), "max_sessions": self.max_sessions,
+                    "idle_ttl": self.idle_ttl, **self._counters}
+
+    def start_sweeper(self) -> None:
+        """Start the background thread that expires idle sessions."""
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper."""
+        if self._sweeper is None:
+            return
+        self._stop.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(min(self.sweep_interval, self.idle_ttl)):
+            self.sweep()
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Session store in a SQLite database in WAL mode, shared by worker processes.
+
+    Last-access times are ``time.time()`` values: the database outlives the
+    server, and monotonic clocks restart with the host, so sessions left by an
+    earlier run would otherwise never expire. To keep lookups read-only most of
+    the time, a session's last access is only written when it is older than
+    ``ACCESS_RESOLUTION``.
+    """
+
+    ACCESS_RESOLUTION = 1.0
+    blocking = True
+
+    def __init__(self, path: str, idle_ttl: float = DEFAULT_SESSION_TTL,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, sweep_interval: float = SESSION_SWEEP_INTERVAL):
+        """Open (or create) the session database."""
+        super().__init__(idle_ttl, max_sessions, sweep_interval)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS sessions "
+                             "(id TEXT PRIMARY KEY, data TEXT NOT NULL, last_access REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS sessions_by_access ON sessions (last_access)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS session_counters "
+                             "(name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        if amount:
+            self._db.execute("INSERT INTO session_counters VALUES (?, ?) "
+                             "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value", (name, amount))
+
+    def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Add a session, evicting the least recently used ones beyond the cap."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                                 (session_id, json.dumps(data), time.time()))
+                self._count("created")
+                excess = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+                if excess > 0:
+                    self._db.execute("DELETE FROM sessions WHERE id IN "
+                                     "(SELECT id FROM sessions ORDER BY last_access LIMIT ?)", (excess,))
+                    self._count("evicted", excess)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a session's data and mark it as used, or None if it is unknown or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT data, last_access FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            data, last_access = row
+            if now - last_access > self.idle_ttl:
+                deleted = self._db.execute("DELETE FROM sessions WHERE id = ? AND last_access = ?",
+                                           (session_id, last_access)).rowcount
+                self._count("expired", deleted)
+                return None
+            if now - last_access >= self.ACCESS_RESOLUTION:
+                self._db.execute("UPDATE sessions SET last_access = ? WHERE id = ?", (now, session_id))
+            return json.loads(data)
+
+    def remove(self, session_id: str) -> bool:
+        """Close a session; returns False if it did not exist."""
+        with self._lock:
+            if not self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount:
+                return False
+            self._count("closed")
+            return True
+
+    def sweep(self) -> int:
+        """Expire idle sessions; returns how many were removed."""
+        deadline = time.time() - self.idle_ttl
+        with self._lock:
+            removed = self._db.execute("DELETE FROM sessions WHERE last_access < ?", (deadline,)).rowcount
+            self._count("expired", removed)
+        if removed:
+            logger.info(f"Expired {removed} idle sessions")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of open sessions, the limits and counters shared by all workers."""
+        with self._lock:
+            counters = {"created": 0, "expired": 0, "evicted": 0, "closed": 0}
+            counters.update(self._db.execute("SELECT name, value FROM session_counters").fetchall())
+            active = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"backend": "sqlite", "active": active, "max_sessions": self.max_sessions,
+                "idle_ttl": self.idle_ttl, **counters}
+
+
+class SessionManager(BaseManager):
+    """Serves one SessionStore to worker processes over a local socket."""
+
+
+# The store served by SessionManager, set in the process that runs the manager
+_hosted_sessions: Optional[SessionStore] = None
+
+SessionManager.register("sessions", callable=lambda: _hosted_sessions)
+
+
+def host_shared_sessions(idle_ttl: float, max_sessions: int) -> Tuple[str, str]:
+    """
+    Serve an in-memory SessionStore to other processes from a background thread.
+
+    Returns:
+        The manager's "host:port" address and hex authentication key
+    """
+    global _hosted_sessions
+    _hosted_sessions = SessionStore(idle_ttl=idle_ttl, max_sessions=max_sessions)
+    _hosted_sessions.start_sweeper()
+    authkey = os.urandom(16)
+    server = SessionManager(address=("127.0.0.1", 0), authkey=authkey).get_server()
+    threading.Thread(target=server.serve_forever, name="session-manager", daemon=True).start()
+    host, port = server.address
+    return f"{host}:{port}", authkey.hex()
+
+
+class SharedSessionStore:
+    """
+    Client of the SessionStore served by host_shared_sessions.
+
+    Every call is forwarded to the hosting process, which also runs the sweeper.
+    """
+
+    blocking = True
+
+    def __init__(self, address: str, authkey: str):
+        """Connect to the session manager."""
+        host, _, port = address.rpartition(":")
+        manager = SessionManager(address=(host, int(port)), authkey=bytes.fromhex(authkey))
+        manager.connect()
+        self._store = manager.sessions()
+
+    def __len__(self) -> int:
+        return self._store.stats()["active"]
+
+    def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        self._store.create(session_id, data)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self._store.get(session_id)
+
+    def remove(self, session_id: str) -> bool:
+        return self._store.remove(session_id)
+
+    def sweep(self) -> int:
+        return self._store.sweep()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._store.stats(), "backend": "shared"}
+
+    def start_sweeper(self) -> None:
+        """The hosting process sweeps; nothing to start here."""
+
+    def stop_sweeper(self) -> None:
+        """The hosting process sweeps; nothing to stop here."""
+
+
+SESSION_BACKENDS = ("memory", "sqlite", "shared")
+
+
+def session_store_from_env() -> Any:
+    """
+    Create the session store described by the MCP_SESSION_* environment variables.
+
+    main() sets them before starting uvicorn, so every worker process opens the
+    same backend: MCP_SESSION_BACKEND (memory, sqlite or shared), MCP_SESSION_TTL,
+    MCP_MAX_SESSIONS, MCP_SESSION_DB for sqlite, and MCP_SESSION_MANAGER and
+    MCP_SESSION_AUTHKEY for shared.
+    """
+    backend = os.environ.get("MCP_SESSION_BACKEND", "memory")
+    idle_ttl = float(os.environ.get("MCP_SESSION_TTL", DEFAULT_SESSION_TTL))
+    max_sessions = int(os.environ.get("MCP_MAX_SESSIONS", DEFAULT_MAX_SESSIONS))
+    if backend == "sqlite":
+        return SqliteSessionStore(os.environ["MCP_SESSION_DB"], idle_ttl=idle_ttl, max_sessions=max_sessions)
+    if backend == "shared":
+        return SharedSessionStore(os.environ["MCP_SESSION_MANAGER"], os.environ["MCP_SESSION_AUTHKEY"])
+    if backend != "memory":
+        raise ValueError(f"Unknown session backend: {backend}")
+    return SessionStore(idle_ttl=idle_ttl, max_sessions=max_sessions)
+
+
+# SSE notification streams: queued notifications per stream, and what happens when a queue is full
+SSE_QUEUE_SIZE = 256
+SSE_OVERFLOW_POLICIES = ("drop-oldest", "drop-newest", "close")
+SSE_PING_INTERVAL = 21.0  # Slightly longer than typical SSE timeout
+
+
+class NotificationHub:
+    """
+    Per-session notification queues feeding the SSE streams.
+
+    Every open GET /mcp stream has a bounded asyncio queue. Notifications for a
+    session are queued on each of its streams with an event id that increases
+    across the hub; notifications for a session without an open stream are
+    counted as undelivered and discarded. When a queue is full the overflow
+    policy drops the oldest queued notification, drops the new one, or closes
+    the stream so the client reconnects.
+
+    Queues live in the worker process that serves the stream, so with several
+    workers a notification only reaches streams opened on the same worker.
+    """
+
+    def __init__(self, queue_size: int = SSE_QUEUE_SIZE, overflow: str = "drop-oldest"):
+        """Initialize the hub with no open streams."""
+        if queue_size < 1:
+            raise ValueError("SSE queue size must be positive")
+        if overflow not in SSE_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown SSE overflow policy: {overflow}")
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self._streams: Dict[str, List[asyncio.Queue]] = {}
+        self._event_ids = itertools.count(1)
+        self.counters = {"published": 0, "delivered": 0, "dropped": 0, "undelivered": 0, "closed_streams": 0}
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        """Open a stream for a session and return its queue."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._streams.setdefault(session_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        """Forget a stream that has ended."""
+        queues = self._streams.get(session_id, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._streams.pop(session_id, None)
+
+    def close(self, session_id: str) -> None:
+        """End every stream of a session."""
+        for queue in self._streams.pop(session_id, []):
+            self._end(queue)
+
+    def _end(self, queue: asyncio.Queue) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            self.counters["dropped"] += 1
+        queue.put_nowait(None)
+        self.counters["closed_streams"] += 1
+
+    def publish(self, session_id: str, method: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Queue a notification on every stream of a session.
+
+        Returns:
+            The number of streams it was queued on
+        """
+        self.counters["published"] += 1
+        queues = list(self._streams.get(session_id, []))
+        if not queues:
+            self.counters["undelivered"] += 1
+            return 0
+        event = (next(self._event_ids), {"jsonrpc": "2.0", "method": method, "params": params or {}})
+        queued = 0
+        for queue in queues:
+            if queue.full():
+                self.counters["dropped"] += 1
+                if self.overflow == "drop-newest":
+                    continue
+                if self.overflow == "close":
+                    self.unsubscribe(session_id, queue)
+                    self._end(queue)
+                    continue
+                queue.get_nowait()
+            queue.put_nowait(event)
+            queued += 1
+        return queued
+
+    def mark_delivered(self) -> None:
+        """Count a queued notification that a stream has sent to its client."""
+        self.counters["delivered"] += 1
+
+    def broadcast(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Queue a notification on every open stream."""
+        for session_id in list(self._streams):
+            self.publish(session_id, method, params)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of open streams, their queue depths, the queue settings and the counters."""
+        depths = [queue.qsize() for queues in self._streams.values() for queue in queues]
+        return {"streams": len(depths), "queued": sum(depths), "max_queued": max(depths, default=0),
+                "queue_size": self.queue_size, "overflow": self.overflow, **self.counters}
+
+
+# Latency histogram bucket bounds in seconds for GET /metrics
+METRICS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _metric_line(name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> str:
+    """One sample in the Prometheus text format."""
+    if labels:
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+        name += "{" + ",".join(f'{key}="{v}"' for key, v in zip(labels, escaped)) + "}"
+    return f"{name} {value}"
+
+
+class ServerMetrics:
+    """
+    Request, tool and authentication counters and latency histograms for GET /metrics.
+
+    Histograms keep a count per bucket, a sum and a count, so recording a sample
+    is a bisect and two additions. Everything is updated from the event loop
+    without locking. Metrics belong to the worker process that records them, so
+    with several workers each scrape sees only the worker that served it; every
+    per-worker sample carries a ``worker`` label with the process id so the
+    series of different workers are never mistaken for one counter. Session
+    metrics come from the shared store and have no worker label.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS):
+        """Initialize empty metrics."""
+        self.buckets = tuple(sorted(buckets))
+        self.requests: Dict[Tuple[str, int], int] = {}
+        self.request_latency: Dict[str, List[float]] = {}
+        self.tool_calls: Dict[Tuple[str, str], int] = {}
+        self.tool_latency: Dict[str, List[float]] = {}
+        self.auth_failures: Dict[str, int] = {}
+        self.in_flight = 0
+
+    def _observe(self, histograms: Dict[str, List[float]], key: str, seconds: float) -> None:
+        histogram = histograms.get(key)
+        if histogram is None:
+            # A count per bucket and one for +Inf, then the sum of all samples
+            histogram = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+
+    def observe_request(self, method: str, http_status: int, seconds: float) -> None:
+        """Record a finished request by JSON-RPC method and HTTP status."""
+        key = (method, http_status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self._observe(self.request_latency, method, seconds)
+
+    def observe_tool(self, tool: str, ok: bool, seconds: float) -> None:
+        """Record a finished tool call."""
+        key = (tool, "ok" if ok else "error")
+        self.tool_calls[key] = self.tool_calls.get(key, 0) + 1
+        self._observe(self.tool_latency, tool, seconds)
+
+    def auth_failure(self, reason: str) -> None:
+        """Record a request refused by authentication."""
+        self.auth_failures[reason] = self.auth_failures.get(reason, 0) + 1
+
+    def _histogram_lines(self, name: str, label: str, histograms: Dict[str, List[float]],
+                         worker: Dict[str, Any]) -> List[str]:
+        lines = []
+        for key, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), histogram):
+                cumulative += count
+                lines.append(_metric_line(f"{name}_bucket", cumulative,
+                                          {**worker, label: key, "le": "+Inf" if bound == float("inf") else bound}))
+            lines.append(_metric_line(f"{name}_sum", histogram[-1], {**worker, label: key}))
+            lines.append(_metric_line(f"{name}_count", cumulative, {**worker, label: key}))
+        return lines
+
+    def render(self, sessions: Dict[str, Any], notifications: Dict[str, Any],
+               introspection: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Args:
+            sessions: Session store stats
+            notifications: Notification hub stats
+            introspection: Token introspection stats, if introspection is configured
+        """
+        worker = {"worker": os.getpid()}
+
+        def sample(name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> str:
+            return _metric_line(name, value, {**worker, **(labels or {})})
+
+        families = [
+            ("mcp_requests_total", "counter", "JSON-RPC requests by method and HTTP status",
+             [sample("mcp_requests_total", count, {"method": method, "status": http_status})
+              for (method, http_status), count in sorted(self.requests.items())]),
+            ("mcp_request_duration_seconds", "histogram", "Time to answer a JSON-RPC request",
+             self._histogram_lines("mcp_request_duration_seconds", "method", self.request_latency, worker)),
+            ("mcp_requests_in_flight", "gauge", "JSON-RPC requests being handled",
+             [sample("mcp_requests_in_flight", self.in_flight)]),
+            ("mcp_tool_calls_total", "counter", "Tool calls by tool and outcome",
+             [sample("mcp_tool_calls_total", count, {"tool": tool, "outcome": outcome})
+              for (tool, outcome), count in sorted(self.tool_calls.items())]),
+            ("mcp_tool_duration_seconds", "histogram", "Time spent in tool handlers",
+             self._histogram_lines("mcp_tool_duration_seconds", "tool", self.tool_latency, worker)),
+            ("mcp_auth_failures_total", "counter", "Requests refused by authentication, by reason",
+             [sample("mcp_auth_failures_total", count, {"reason": reason})
+              for reason, count in sorted(self.auth_failures.items())]),
+            ("mcp_sessions_active", "gauge", "Open sessions",
+             [_metric_line("mcp_sessions_active", sessions["active"])]),
+            ("mcp_sessions_total", "counter", "Session lifecycle events",
+             [_metric_line("mcp_sessions_total", sessions[event], {"event": event})
+              for event in ("created", "expired", "evicted", "closed")]),
+            ("mcp_sse_subscribers", "gauge", "Open SSE notification streams",
+             [sample("mcp_sse_subscribers", notifications["streams"])]),
+            ("mcp_sse_queued_notifications", "gauge", "Notifications waiting in SSE stream queues",
+             [sample("mcp_sse_queued_notifications", notifications["queued"])]),
+            ("mcp_sse_queue_depth_max", "gauge", "Notifications waiting in the fullest SSE stream queue",
+             [sample("mcp_sse_queue_depth_max", notifications["max_queued"])]),
+            ("mcp_sse_notifications_total", "counter", "SSE notifications by outcome",
+             [sample("mcp_sse_notifications_total", notifications[outcome], {"outcome": outcome})
+              for outcome in ("published", "delivered", "dropped", "undelivered")]),
+        ]
+        if introspection is not None:
+            families += [
+                ("mcp_token_introspection_total", "counter", "Token lookups by result",
+                 [sample("mcp_token_introspection_total", introspection[result], {"result": result})
+                  for result in ("hits", "negative_hits", "misses", "coalesced", "errors")]),
+                ("mcp_token_introspection_cache_entries", "gauge", "Tokens in the introspection cache",
+                 [sample("mcp_token_introspection_cache_entries", introspection["cached"])]),
+            ]
+        lines = []
+        for name, kind, description, samples in families:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", *samples]
+        return "\n".join(lines) + "\n"
+
+
+# Synthetic workload tools for benchmarking clients, registered with --benchmark-tools
+MAX_CPU_BURN_MS = 60000
+MAX_ALLOC_MB = 1024
+MAX_PAYLOAD_BYTES = 64 * 1024 * 1024
+MAX_LATENCY_SECONDS = 60.0
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "exponential", "lognormal", "pareto")
+GENERATED_PROPERTY_TYPES = ("string", "number", "integer", "boolean", "array", "object")
+
+
+def _bounded(value: Any, name: str, maximum: float) -> float:
+    """Coerce a numeric tool argument, rejecting negatives and capping it at maximum."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Argument '{name}' must be a number")
+    if not math.isfinite(value):
+        raise ValueError(f"Argument '{name}' must be a finite number")
+    if value < 0:
+        raise ValueError(f"Argument '{name}' must not be negative")
+    return min(value, maximum)
+
+
+def burn_cpu(ms: float) -> int:
+    """Spin on this thread's CPU clock for ms milliseconds and return the loop count."""
+    deadline = time.thread_time() + ms / 1000
+    iterations = 0
+    value = 0
+    while time.thread_time() < deadline:
+        for i in range(1000):
+            value = (value * 31 + i) % 1000003
+        iterations += 1000
+    return iterations
+
+
+def touch_memory(mb: float) -> None:
+    """Allocate mb megabytes and write to every page so they are really committed."""
+    block = bytearray(int(mb * 1024 * 1024))
+    for offset in range(0, len(block), 4096):
+        block[offset] = 1
+
+
+def sample_latency(dist: str) -> float:
+    """
+    Draw a delay in seconds from a spec such as 'exponential:50'.
+
+    Parameters are milliseconds: fixed:MS, uniform:LOW,HIGH, normal:MEAN,SD,
+    exponential:MEAN, lognormal:MEDIAN,SIGMA and pareto:SCALE,ALPHA.
+    """
+    name, _, spec = str(dist).partition(":")
+    arity = {"fixed": 1, "uniform": 2, "normal": 2, "exponential": 1, "lognormal": 2, "pareto": 2}
+    if name not in arity:
+        raise ValueError(f"Unknown latency distribution '{name}', expected one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+    try:
+        values = [float(v) for v in spec.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid latency parameters: {dist}")
+    if len(values) != arity[name]:
+        raise ValueError(f"Distribution '{name}' takes {arity[name]} parameter(s)")
+    if not all(math.isfinite(v) for v in values):
+        raise ValueError(f"Latency parameters must be finite: {dist}")
+    if name in ("normal", "lognormal") and values[1] < 0:
+        raise ValueError(f"Distribution '{name}' needs a non-negative spread")
+    if name == "pareto" and values[1] <= 0:
+        raise ValueError("Distribution 'pareto' needs a positive alpha")
+    try:
+        if name == "fixed":
+            ms = values[0]
+        elif name == "uniform":
+            ms = random.uniform(*values)
+        elif name == "normal":
+            ms = random.gauss(*values)
+        elif name == "exponential":
+            ms = random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+        elif name == "lognormal":
+            ms = values[0] * math.exp(random.gauss(0, values[1]))
+        else:
+            ms = values[0] * random.paretovariate(values[1])
+    except (OverflowError, ZeroDivisionError):
+        # A heavy enough tail leaves the float range; the delay is capped below anyway
+        ms = math.inf if values[0] > 0 else 0.0
+    return min(max(ms, 0.0) / 1000, MAX_LATENCY_SECONDS)
+
+
+def generated_input_schema(index: int, schema_size: int) -> Dict[str, Any]:
+    """Input schema for generated tool index with schema_size properties of mixed types."""
+    properties = {}
+    for position in range(schema_size):
+        kind = GENERATED_PROPERTY_TYPES[position % len(GENERATED_PROPERTY_TYPES)]
+        prop = {"type": kind, "description": f"Generated {kind} property {position} of tool {index}"}
+        if kind == "array":
+            prop["items"] = {"type": "string"}
+        elif kind == "object":
+            prop["properties"] = {"key": {"type": "string"}, "value": {"type": "number"}}
+        properties[f"p{position}"] = prop
+    return {"type": "object", "properties": properties, "required": list(properties)[:min(2, schema_size)]}
+
+
+# Fast JSON encoding: orjson when installed, unless MCP_JSON_ENCODER=json asks for the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+if os.environ.get("MCP_JSON_ENCODER", "").lower() == "json":
+    orjson = None
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize content compactly, falling back to the standard library for anything orjson rejects."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(body: bytes) -> Any:
+    """Parse a request body; both decoders raise json.JSONDecodeError on malformed input."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with encode_json."""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def compile_params_validator(method: str, fields: Tuple[Tuple[str, type, str, bool], ...],
+                             params_required: bool) -> Callable[[Any], Optional[str]]:
+    """
+    Build a check for a method's params that returns an error message, or None when they are valid.
+
+    Args:
+        method: The JSON-RPC method, used in error messages
+        fields: (name, type, type name for messages, required) for each checked field
+        params_required: Whether params may be omitted
+    """
+    def validate(params: Any) -> Optional[str]:
+        if params is None:
+            return f"Missing params for {method}" if params_required else None
+        if not isinstance(params, dict):
+            return f"Invalid params type for {method}: expected object, got {type(params).__name__}"
+        for name, expected, type_name, required in fields:
+            if name not in params:
+                if required:
+                    return f"Missing '{name}' field in {method} params"
+                continue
+            if not isinstance(params[name], expected):
+                return f"Invalid {name} type for {method}: expected {type_name}, got {type(params[name]).__name__}"
+        return None
+    return validate
+
+
+# Param validators for the methods dispatched after a session is established
+PARAM_VALIDATORS = {
+    "tools/list": compile_params_validator("tools/list", (("cursor", str, "string", False),), False),
+    "tools/call": compile_params_validator("tools/call", (("name", str, "string", True),
+                                                          ("arguments", dict, "object", True)), True),
+}
+
+
+# Tools per tools/list page; 0 lists every tool in one page
+TOOLS_PAGE_SIZE = 100
+
+
+def encode_tools_cursor(generation: int, page: int) -> str:
+    """Opaque tools/list cursor pointing at a page of one version of the catalog."""
+    return base64.urlsafe_b64encode(f"tools:{generation}:{page}".encode()).decode()
+
+
+def decode_tools_cursor(cursor: str) -> Tuple[int, int]:
+    """Catalog generation and page index from a tools/list cursor, raising ValueError for anything else."""
+    try:
+        prefix, generation, page = base64.urlsafe_b64decode(str(cursor).encode()).decode().split(":")
+        if prefix == "tools" and generation.isdigit() and page.isdigit():
+            return int(generation), int(page)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise ValueError(f"Invalid cursor: {cursor}")
+
+
 # Reference MCP Server Implementation
 class McpReferenceServer:
     """Reference implementation of an MCP server."""
     
-    def __init__(self, name: str, protocol_versions: List[str]):
+    def __init__(self, name: str, protocol_versions: List[str], sessions: Optional[Any] = None,
+                 notifications: Optional[NotificationHub] = None, tools_page_size: int = TOOLS_PAGE_SIZE,
+                 metrics: Optional[ServerMetrics] = None):
         """Initialize the MCP server."""
         self.name = name
         self.protocol_versions = protocol_versions
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.notifications = notifications if notifications is not None else NotificationHub()
+        self.metrics = metrics if metrics is not None else ServerMetrics()
         self.tools: Dict[str, Dict[str, Any]] = {}
+        # Serialized tools/list pages per protocol version, built on first use after a change.
+        # Cursors carry the generation, which every registration bumps, so a stale one is refused.
+        self.tools_page_size = tools_page_size
+        self._tool_pages: Dict[str, List[bytes]] = {}
+        self._tools_generation = 0
+        # Handlers for requests within a session, called with (session_id, session, params, response template)
+        self._methods = {
+            "tools/list": self._dispatch_tools_list,
+            "tools/call": self._dispatch_tools_call,
+            "ping": self._dispatch_ping,
+        }
         
         # Check if we support 2025-06-18 features
         self.supports_2025_06_18 = "2025-06-18" in protocol_versions
@@ -321,17 +1229,25 @@ class McpReferenceServer:
                     "message": {"type": "string", "description": "Confirmation message"}
                 }
             } if self.supports_2025_06_18 else None,
-            handler=self._sleep_tool
+            handler=self._sleep_tool,
+            reports_progress=True
         )
     
     def register_tool(self, name: str, description: str, input_schema: Dict[str, Any], 
-                    handler: callable, title: str = None, output_schema: Dict[str, Any] = None):
-        """Register a new tool with the server."""
+                    handler: callable, title: str = None, output_schema: Dict[str, Any] = None,
+                    reports_progress: bool = False):
+        """
+        Register a new tool with the server.
+
+        Handlers registered with reports_progress receive a ``report_progress(progress, total)``
+        callable that sends notifications/progress when the caller gave a progressToken.
+        """
         tool_def = {
             "name": name,
             "description": description,
             "inputSchema": input_schema,  # Updated for 2025-06-18
-            "handler": handler
+            "handler": handler,
+            "reports_progress": reports_progress
         }
         
         # Add 2025-06-18 specific fields if supported
@@ -345,7 +1261,53 @@ class McpReferenceServer:
             tool_def["parameters"] = input_schema
             
         self.tools[name] = tool_def
+        self._tools_generation += 1
+        self._tool_pages.clear()
+        self.notifications.broadcast("notifications/tools/list_changed")
     
+    def register_benchmark_tools(self) -> None:
+        """Register the cpu_burn, alloc, payload, stream_progress and latency workload tools."""
+        def schema(properties: Dict[str, Any], required: List[str]) -> Dict[str, Any]:
+            return {"type": "object", "properties": properties, "required": required}
+
+        self.register_tool(
+            name="cpu_burn", description="Keep a CPU busy for the given number of milliseconds.",
+            title="CPU Burn", handler=self._cpu_burn_tool,
+            input_schema=schema({"ms": {"type": "number", "description": "Milliseconds of CPU time"}}, ["ms"]))
+        self.register_tool(
+            name="alloc", description="Allocate and touch the given number of megabytes, then release them.",
+            title="Allocate Memory", handler=self._alloc_tool,
+            input_schema=schema({"mb": {"type": "number", "description": "Megabytes to allocate"}}, ["mb"]))
+        self.register_tool(
+            name="payload", description="Return a response of roughly the given size.",
+            title="Payload", handler=self._payload_tool,
+            input_schema=schema({
+                "bytes": {"type": "integer", "description": "Approximate size of the returned data"},
+                "structured": {"type": "boolean", "description": "Return a list of records instead of one string"}
+            }, ["bytes"]))
+        self.register_tool(
+            name="stream_progress", description="Send n progress notifications, interval seconds apart.",
+            title="Stream Progress", handler=self._stream_progress_tool, reports_progress=True,
+            input_schema=schema({
+                "n": {"type": "integer", "description": "Number of notifications"},
+                "interval": {"type": "number", "description": "Seconds between notifications"}
+            }, ["n"]))
+        self.register_tool(
+            name="latency", description="Wait for a delay drawn from a distribution, e.g. 'uniform:10,100' (ms).",
+            title="Latency", handler=self._latency_tool,
+            input_schema=schema({"dist": {"type": "string", "description": "One of " + ", ".join(LATENCY_DISTRIBUTIONS) +
+                                          ", followed by ':' and its parameters in milliseconds"}}, ["dist"]))
+
+    def register_generated_tools(self, count: int, schema_size: int) -> None:
+        """Register count generated tools whose input schemas have schema_size properties each."""
+        for index in range(count):
+            self.register_tool(
+                name=f"generated_{index:04d}",
+                description=f"Generated tool {index} with {schema_size} properties.",
+                input_schema=generated_input_schema(index, schema_size),
+                handler=self._generated_tool
+            )
+
     async def initialize(self, params: InitializeParams) -> InitializeResult:
         """Handle initialize request from client."""
         # Validate protocol compatibility
@@ -371,12 +1333,11 @@ class McpReferenceServer:
         session_id = str(uuid.uuid4())
         
         # Store session information with negotiated protocol
-        self.sessions[session_id] = {
+        await self.session_call("create", session_id, {
             "created_at": datetime.now().isoformat(),
             "client_info": params.client_info.model_dump(),
             "protocol_version": selected_version,
-            "last_activity": datetime.now().isoformat(),
-        }
+        })
         
         logger.info(f"Created new session: {session_id} with protocol {selected_version}")
         
@@ -393,25 +1354,50 @@ class McpReferenceServer:
             }
         })
     
-    def get_session(self, session_id: str) -> Dict[str, Any]:
-        """Get session by ID, raising exception if not found."""
-        if session_id not in self.sessions:
+    async def session_call(self, method: str, *args: Any) -> Any:
+        """Call a session store method, on a worker thread if the store blocks."""
+        call = getattr(self.sessions, method)
+        if getattr(self.sessions, "blocking", False):
+            return await asyncio.to_thread(call, *args)
+        return call(*args)
+
+    async def get_session(self, session_id: str) -> Dict[str, Any]:
+        """Get session by ID, raising exception if not found or expired."""
+        session = await self.session_call("get", session_id)
+        if session is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Session not found: {session_id}"
             )
-        
-        # Update last activity timestamp
-        self.sessions[session_id]["last_activity"] = datetime.now().isoformat()
-        return self.sessions[session_id]
+        return session
     
-    async def list_tools(self, session_id: str) -> List[ToolDescription]:
-        """List available tools."""
-        # Validate session and get protocol version
-        session = self.get_session(session_id)
+    async def list_tools(self, session_id: str, cursor: Optional[str] = None,
+                         session: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Return one page of the tool list for the session's protocol version, serialized.
+
+        Raises:
+            ValueError: If the cursor is malformed, or was issued before the tool list last changed
+        """
+        # Validate session and get protocol version, unless the caller already has it
+        if session is None:
+            session = await self.get_session(session_id)
         session_protocol = session.get("protocol_version", "2024-11-05")
-        
-        # Return tool descriptions based on session protocol version
+
+        pages = self._tool_pages.get(session_protocol)
+        if pages is None:
+            pages = self._tool_pages[session_protocol] = self._build_tool_pages(session_protocol)
+        if cursor is None:
+            return pages[0]
+        generation, index = decode_tools_cursor(cursor)
+        if generation != self._tools_generation:
+            raise ValueError(f"Stale cursor, the tool list has changed: {cursor}")
+        if index >= len(pages):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return pages[index]
+
+    def _build_tool_pages(self, session_protocol: str) -> List[bytes]:
+        """Describe every tool for a protocol version and serialize the list in pages."""
         tools = []
         for tool in self.tools.values():
             tool_desc = ToolDescription(
@@ -427,14 +1413,24 @@ class McpReferenceServer:
                 if "outputSchema" in tool:
                     tool_desc.outputSchema = tool["outputSchema"]
             
-            tools.append(tool_desc)
-        
-        return tools
-    
-    async def call_tool(self, session_id: str, params: CallToolParams) -> CallToolResult:
-        """Call a tool with the provided parameters."""
-        # Validate session and get protocol version
-        session = self.get_session(session_id)
+            tools.append(tool_desc.model_dump())
+
+        size = self.tools_page_size or max(1, len(tools))
+        pages = []
+        for start in range(0, max(1, len(tools)), size):
+            page = {"tools": tools[start:start + size]}
+            if start + size < len(tools):
+                page["nextCursor"] = encode_tools_cursor(self._tools_generation, len(pages) + 1)
+            pages.append(encode_json(page))
+        return pages
+
+    async def call_tool(self, session_id: str, params: CallToolParams,
+                        progress_token: Optional[Union[str, int]] = None,
+                        session: Optional[Dict[str, Any]] = None) -> CallToolResult:
+        """Call a tool, streaming progress and a log message to the session's SSE streams."""
+        # Validate session and get protocol version, unless the caller already has it
+        if session is None:
+            session = await self.get_session(session_id)
         session_protocol = session.get("protocol_version", "2024-11-05")
         
         # Check if tool exists
@@ -448,14 +1444,32 @@ class McpReferenceServer:
         # Get tool
         tool = self.tools[tool_name]
         
+        def report_progress(progress: float, total: Optional[float] = None) -> None:
+            if progress_token is not None:
+                self.notifications.publish(session_id, "notifications/progress", {
+                    "progressToken": progress_token, "progress": progress,
+                    **({"total": total} if total is not None else {})
+                })
+
+        started = time.perf_counter()
         try:
             # Call tool handler
-            result = await tool["handler"](**params.arguments)
+            arguments = dict(params.arguments)
+            if tool.get("reports_progress"):
+                arguments["report_progress"] = report_progress
+            result = await tool["handler"](**arguments)
+            duration = time.perf_counter() - started
+            self.metrics.observe_tool(tool_name, True, duration)
+            self.notifications.publish(session_id, "notifications/message", {
+                "level": "info", "logger": "tools",
+                "data": {"tool": tool_name, "duration": duration}
+            })
             
             # Format result based on session protocol version
+            text = json.dumps(result) if isinstance(result, (dict, list)) else str(result)
             if session_protocol == "2025-06-18":
                 # 2025-06-18 format with structured content
-                content = [{"type": "text", "text": str(result)}]
+                content = [{"type": "text", "text": text}]
                 structured_content = None
                 
                 # If the tool has an output schema, create structured content
@@ -476,12 +1490,16 @@ class McpReferenceServer:
             else:
                 # Legacy format for older protocols
                 return CallToolResult(
-                    content=[{"type": "text", "text": str(result)}],
+                    content=[{"type": "text", "text": text}],
                     isError=False
                 )
                 
         except Exception as e:
+            self.metrics.observe_tool(tool_name, False, time.perf_counter() - started)
             logger.error(f"Error calling tool {tool_name}: {e}")
+            self.notifications.publish(session_id, "notifications/message", {
+                "level": "error", "logger": "tools", "data": {"tool": tool_name, "error": str(e)}
+            })
             
             if session_protocol == "2025-06-18":
                 return CallToolResult(
@@ -505,14 +1523,61 @@ class McpReferenceServer:
         logger.debug(f"Add tool called with a={a}, b={b}")
         return a + b
     
-    async def _sleep_tool(self, seconds: float) -> str:
-        """Sleep for the specified number of seconds."""
+    async def _sleep_tool(self, seconds: float, report_progress: callable = None) -> str:
+        """Sleep for the specified number of seconds, reporting progress in tenths."""
         logger.debug(f"Sleep tool called with seconds={seconds}")
-        await asyncio.sleep(seconds)
+        for step in range(1, 11):
+            await asyncio.sleep(seconds / 10)
+            if report_progress:
+                report_progress(step, 10)
         return f"Slept for {seconds} seconds"
 
-    async def handle_message(self, data: Dict[str, Any], session_id: Optional[str] = None) -> JSONResponse:
-        """Handle an MCP message."""
+    async def _cpu_burn_tool(self, ms: float) -> Dict[str, Any]:
+        """Burn CPU on a worker thread so the event loop keeps serving other requests."""
+        ms = _bounded(ms, "ms", MAX_CPU_BURN_MS)
+        return {"burned_ms": ms, "iterations": await asyncio.to_thread(burn_cpu, ms)}
+
+    async def _alloc_tool(self, mb: float) -> Dict[str, Any]:
+        """Allocate memory on a worker thread."""
+        mb = _bounded(mb, "mb", MAX_ALLOC_MB)
+        await asyncio.to_thread(touch_memory, mb)
+        return {"allocated_mb": mb}
+
+    async def _payload_tool(self, bytes: int, structured: bool = False) -> Any:
+        """Return a string, or a list of records, of roughly the requested size."""
+        size = int(_bounded(bytes, "bytes", MAX_PAYLOAD_BYTES))
+        if not structured:
+            return "x" * size
+        record = {"id": 0, "name": "item-000000", "value": 0.5, "tags": ["alpha", "beta"]}
+        count = max(1, size // (len(json.dumps(record)) + 2))
+        return {"bytes": size,
+                "items": [{"id": i, "name": f"item-{i:06d}", "value": i / 2, "tags": ["alpha", "beta"]}
+                          for i in range(count)]}
+
+    async def _stream_progress_tool(self, n: int, interval: float = 0,
+                                    report_progress: callable = None) -> Dict[str, Any]:
+        """Publish n progress notifications to the session's SSE streams."""
+        n = int(_bounded(n, "n", 100000))
+        interval = _bounded(interval, "interval", MAX_LATENCY_SECONDS)
+        for step in range(1, n + 1):
+            if interval:
+                await asyncio.sleep(interval)
+            if report_progress:
+                report_progress(step, n)
+        return {"notifications": n}
+
+    async def _latency_tool(self, dist: str) -> Dict[str, Any]:
+        """Sleep for a delay sampled from dist."""
+        seconds = sample_latency(dist)
+        await asyncio.sleep(seconds)
+        return {"dist": dist, "slept_ms": round(seconds * 1000, 3)}
+
+    async def _generated_tool(self, **arguments: Any) -> Dict[str, Any]:
+        """Report how many arguments a generated tool received."""
+        return {"arguments": len(arguments)}
+
+    async def handle_message(self, data: Dict[str, Any], session_id: Optional[str] = None) -> Response:
+        """Handle an MCP message, dispatching requests through the method table."""
         # Create JSON-RPC response template
         response = {
             "jsonrpc": "2.0"
@@ -529,7 +1594,7 @@ class McpReferenceServer:
                 "message": "Parse error: Invalid JSON"
             }
             response["id"] = None
-            return JSONResponse(status_code=400, content=response)
+            return FastJSONResponse(status_code=400, content=response)
         
         # Check for required JSON-RPC fields
         if "jsonrpc" not in data or data.get("jsonrpc") != "2.0":
@@ -538,7 +1603,7 @@ class McpReferenceServer:
                 "message": "Invalid Request: Missing or invalid jsonrpc field"
             }
             response["id"] = data.get("id", None)
-            return JSONResponse(status_code=400, content=response)
+            return FastJSONResponse(status_code=400, content=response)
         
         if "method" not in data:
             response["error"] = {
@@ -546,32 +1611,20 @@ class McpReferenceServer:
                 "message": "Invalid Request: Missing method field"
             }
             response["id"] = data.get("id", None)
-            return JSONResponse(status_code=400, content=response)
+            return FastJSONResponse(status_code=400, content=response)
+        
+        method = data["method"]
+        if not isinstance(method, str):
+            response["error"] = {
+                "code": -32600,  # Invalid Request
+                "message": "Invalid Request: method must be a string"
+            }
+            response["id"] = data.get("id", None)
+            return FastJSONResponse(status_code=400, content=response)
         
         # Handle initialize request (no session required)
-        if data["method"] == "initialize":
-            if "params" not in data:
-                response["error"] = {
-                    "code": -32602,  # Invalid params
-                    "message": "Missing params for initialize"
-                }
-                return JSONResponse(status_code=400, content=response)
-            
-            try:
-                params = InitializeParams(**data["params"])
-                result = await self.initialize(params)
-                response["result"] = result.model_dump()
-                # Set session ID header
-                response_obj = JSONResponse(content=response)
-                response_obj.headers["Mcp-Session-Id"] = result.session_id
-                return response_obj
-            except Exception as e:
-                logger.error(f"Error handling initialize: {e}")
-                response["error"] = {
-                    "code": -32603,  # Internal error
-                    "message": str(e)
-                }
-                return JSONResponse(status_code=500, content=response)
+        if method == "initialize":
+            return await self._dispatch_initialize(data, response)
         
         # For all other requests, session ID is required
         if not session_id:
@@ -579,126 +1632,135 @@ class McpReferenceServer:
                 "code": -32602,  # Invalid params
                 "message": "Missing session_id query parameter"
             }
-            return JSONResponse(status_code=400, content=response)
+            return FastJSONResponse(status_code=400, content=response)
         
-        # Validate session
+        # Validate session, handing it to the method handler so it is only looked up once
         try:
-            self.get_session(session_id)
+            session = await self.get_session(session_id)
         except HTTPException:
             response["error"] = {
                 "code": -32003,  # Session expired (custom error code)
                 "message": f"Invalid or expired session: {session_id}"
             }
-            return JSONResponse(status_code=401, content=response)  # 401 Unauthorized for invalid session
+            return FastJSONResponse(status_code=401, content=response)  # 401 Unauthorized for invalid session
         
-        # Handle notifications (no ID)
+        # Handle notifications (no ID); notifications/initialized needs nothing else
         if "id" not in data:
-            if data["method"] == "notifications/initialized":
-                # Always return 202 for notifications with empty content
-                return JSONResponse(
-                    status_code=202,
-                    content={}
-                )
-            return JSONResponse(
-                status_code=202,
-                content={}
-            )
+            return FastJSONResponse(status_code=202, content={})
+        
+        handler = self._methods.get(method)
+        if handler is None:
+            # Method not found - return 200 with JSON-RPC error per JSON-RPC specification
+            response["error"] = {
+                "code": -32601,  # Method not found
+                "message": f"Method not found: {method}"
+            }
+            return FastJSONResponse(status_code=200, content=response)  # 200 OK with JSON-RPC error
+        
+        params = data.get("params")
+        validate = PARAM_VALIDATORS.get(method)
+        problem = validate(params) if validate else None
+        if problem:
+            response["error"] = {
+                "code": -32602,  # Invalid params
+                "message": problem
+            }
+            return FastJSONResponse(status_code=400, content=response)
         
         # Handle regular methods (with ID)
         try:
-            method = data["method"]
-            
-            if method == "tools/list":
-                tools = await self.list_tools(session_id)
-                response["result"] = {"tools": [tool.model_dump() for tool in tools]}
-            
-            elif method == "tools/call":
-                if "params" not in data:
-                    response["error"] = {
-                        "code": -32602,  # Invalid params
-                        "message": "Missing params for tools/call"
-                    }
-                    return JSONResponse(status_code=400, content=response)
-                
-                tool_params = data["params"]
-                
-                # Validate that params is a dictionary
-                if not isinstance(tool_params, dict):
-                    response["error"] = {
-                        "code": -32602,  # Invalid params
-                        "message": f"Invalid params type for tools/call: expected object, got {type(tool_params).__name__}"
-                    }
-                    return JSONResponse(status_code=400, content=response)
-                
-                # Validate required fields
-                if "name" not in tool_params:
-                    response["error"] = {
-                        "code": -32602,  # Invalid params
-                        "message": "Missing 'name' field in tools/call params"
-                    }
-                    return JSONResponse(status_code=400, content=response)
-                
-                if "arguments" not in tool_params:
-                    response["error"] = {
-                        "code": -32602,  # Invalid params
-                        "message": "Missing 'arguments' field in tools/call params"
-                    }
-                    return JSONResponse(status_code=400, content=response)
-                
-                # Validate arguments is a dictionary
-                if not isinstance(tool_params["arguments"], dict):
-                    response["error"] = {
-                        "code": -32602,  # Invalid params
-                        "message": f"Invalid arguments type for tools/call: expected object, got {type(tool_params['arguments']).__name__}"
-                    }
-                    return JSONResponse(status_code=400, content=response)
-                
-                try:
-                    params = CallToolParams(
-                        name=tool_params["name"],
-                        arguments=tool_params["arguments"]
-                    )
-                    result = await self.call_tool(session_id, params)
-                    response["result"] = result.model_dump()
-                except ValidationError as e:
-                    response["error"] = {
-                        "code": -32602,  # Invalid params
-                        "message": f"Invalid tool call parameters: {str(e)}"
-                    }
-                    return JSONResponse(status_code=400, content=response)
-            
-            elif method == "ping":
-                response["result"] = {"timestamp": datetime.now().isoformat()}
-            
-            else:
-                # Method not found - return 200 with JSON-RPC error per JSON-RPC specification
-                response["error"] = {
-                    "code": -32601,  # Method not found
-                    "message": f"Method not found: {method}"
-                }
-                return JSONResponse(status_code=200, content=response)  # 200 OK with JSON-RPC error
-            
-            return JSONResponse(content=response)
-            
+            return await handler(session_id, session, params or {}, response)
         except HTTPException as e:
             response["error"] = {
                 "code": -32000,  # Server error
                 "message": e.detail
             }
-            return JSONResponse(status_code=e.status_code, content=response)
+            return FastJSONResponse(status_code=e.status_code, content=response)
         except Exception as e:
             logger.error(f"Error handling {method}: {e}")
             response["error"] = {
                 "code": -32603,  # Internal error
                 "message": str(e)
             }
-            return JSONResponse(status_code=500, content=response)  # 500 for internal errors
+            return FastJSONResponse(status_code=500, content=response)  # 500 for internal errors
+
+    async def _dispatch_initialize(self, data: Dict[str, Any], response: Dict[str, Any]) -> Response:
+        """Create a session; initialize keeps its Pydantic models since it runs once per session."""
+        if "params" not in data:
+            response["error"] = {
+                "code": -32602,  # Invalid params
+                "message": "Missing params for initialize"
+            }
+            return FastJSONResponse(status_code=400, content=response)
+        
+        try:
+            params = InitializeParams(**data["params"])
+            result = await self.initialize(params)
+            response["result"] = result.model_dump()
+            # Set session ID header
+            response_obj = FastJSONResponse(content=response)
+            response_obj.headers["Mcp-Session-Id"] = result.session_id
+            return response_obj
+        except Exception as e:
+            logger.error(f"Error handling initialize: {e}")
+            response["error"] = {
+                "code": -32603,  # Internal error
+                "message": str(e)
+            }
+            return FastJSONResponse(status_code=500, content=response)
+
+    async def _dispatch_tools_list(self, session_id: str, session: Dict[str, Any], params: Dict[str, Any],
+                                   response: Dict[str, Any]) -> Response:
+        """Serve a cached tools/list page."""
+        try:
+            page = await self.list_tools(session_id, params.get("cursor"), session=session)
+        except ValueError as e:
+            response["error"] = {
+                "code": -32602,  # Invalid params
+                "message": str(e)
+            }
+            return FastJSONResponse(status_code=400, content=response)
+        # The page is already serialized, so splice it in rather than encoding the catalog again
+        return Response(
+            content=b'{"jsonrpc":"2.0","id":' + encode_json(response["id"]) + b',"result":' + page + b'}',
+            media_type="application/json"
+        )
+
+    async def _dispatch_tools_call(self, session_id: str, session: Dict[str, Any], params: Dict[str, Any],
+                                   response: Dict[str, Any]) -> Response:
+        """Call a tool with params already checked by the tools/call validator."""
+        meta = params.get("_meta")
+        progress_token = meta.get("progressToken") if isinstance(meta, dict) else None
+        result = await self.call_tool(
+            session_id,
+            CallToolParams(name=params["name"], arguments=params["arguments"]),
+            progress_token,
+            session=session
+        )
+        response["result"] = result.model_dump()
+        return FastJSONResponse(content=response)
+
+    async def _dispatch_ping(self, session_id: str, session: Dict[str, Any], params: Dict[str, Any],
+                             response: Dict[str, Any]) -> Response:
+        """Answer a ping with the server time."""
+        response["result"] = {"timestamp": datetime.now().isoformat()}
+        return FastJSONResponse(content=response)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Expire idle sessions in the background while the server runs."""
+    mcp_server.sessions.start_sweeper()
+    yield
+    mcp_server.sessions.stop_sweeper()
+    if token_introspector is not None:
+        await token_introspector.aclose()
 
 # Create FastAPI application
 app = FastAPI(
     title="MCP Reference Server",
     description="Reference implementation of Model Context Protocol server with OAuth 2.1 support",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware with proper security headers
@@ -711,12 +1773,79 @@ app.add_middleware(
     expose_headers=["Mcp-Session-Id", "WWW-Authenticate", "MCP-Protocol-Version"],
 )
 
+
+def request_metric_label(body: Any) -> str:
+    """The method label for a request body, limited to methods the server knows so labels stay bounded."""
+    if isinstance(body, list):
+        return "batch"
+    method = body.get("method") if isinstance(body, dict) else None
+    if not isinstance(method, str):
+        return "invalid"
+    if method in mcp_server._methods or method in ("initialize", "notifications/initialized"):
+        return method
+    return "other"
+
+
+class MetricsMiddleware:
+    """
+    Times POST /mcp requests for GET /metrics, by JSON-RPC method and HTTP status.
+
+    A plain ASGI middleware, so requests refused by authentication are counted
+    too. The method comes from the body that check_authentication leaves in the
+    request state.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != "/mcp":
+            await self.app(scope, receive, send)
+            return
+        metrics = mcp_server.metrics
+        state = scope.setdefault("state", {})
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe_request(request_metric_label(state.get("body")), status_code,
+                                    time.perf_counter() - started)
+
+
+app.add_middleware(MetricsMiddleware)
+
 # Create MCP server instance
 mcp_server = McpReferenceServer(
     name="MCP Reference Server",
-    protocol_versions=["2024-11-05", "2025-03-26", "2025-06-18"]  # Added 2025-06-18 support
+    protocol_versions=["2024-11-05", "2025-03-26", "2025-06-18"],  # Added 2025-06-18 support
+    sessions=session_store_from_env(),
+    notifications=NotificationHub(int(os.environ.get("MCP_SSE_QUEUE_SIZE", SSE_QUEUE_SIZE)),
+                                  os.environ.get("MCP_SSE_OVERFLOW", "drop-oldest")),
+    tools_page_size=int(os.environ.get("MCP_TOOLS_PAGE_SIZE", TOOLS_PAGE_SIZE))
 )
 
+
+def register_workload_tools_from_env(server: McpReferenceServer) -> None:
+    """Register the opt-in benchmark and generated tools described by MCP_BENCHMARK_TOOLS and MCP_GENERATED_TOOLS."""
+    if os.environ.get("MCP_BENCHMARK_TOOLS", "").lower() in ("1", "true", "yes"):
+        server.register_benchmark_tools()
+    generated = int(os.environ.get("MCP_GENERATED_TOOLS", "0"))
+    if generated > 0:
+        server.register_generated_tools(generated, int(os.environ.get("MCP_GENERATED_SCHEMA_SIZE", "8")))
+
+
+register_workload_tools_from_env(mcp_server)
+
 @app.post("/mcp")
 async def handle_post_message(request: Request, 
                             auth_info: Dict[str, Any] = Depends(check_authentication)):
@@ -791,7 +1920,7 @@ async def handle_get_message(request: Request,
     
     # Validate session exists
     try:
-        mcp_server.get_session(session_id)
+        await mcp_server.get_session(session_id)
     except HTTPException as e:
         if e.status_code == 404:
             return JSONResponse(
@@ -808,8 +1937,10 @@ async def handle_get_message(request: Request,
         raise
     
     # Return SSE stream
+    queue = mcp_server.notifications.subscribe(session_id)
+
     async def event_generator():
-        """Generate SSE events for the client."""
+        """Stream the session's notifications, with a ping whenever the stream is idle."""
         try:
             while True:
                 # Send periodic ping messages
@@ -825,13 +1956,29 @@ async def handle_get_message(request: Request,
                     "data": json.dumps(ping_data)
                 }
                 
-                # Wait before next ping
-                await asyncio.sleep(21)  # Slightly longer than typical SSE timeout
+                # Deliver queued notifications until the stream has been idle for a ping interval
+                while True:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=SSE_PING_INTERVAL)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        # Session closed, or the queue overflowed under the close policy
+                        return
+                    event_id, notification = item
+                    mcp_server.notifications.mark_delivered()
+                    yield {
+                        "id": str(event_id),
+                        "event": "message",
+                        "data": json.dumps(notification)
+                    }
                 
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled for session {session_id}")
         except Exception as e:
             logger.error(f"Error in SSE stream: {str(e)}")
+        finally:
+            mcp_server.notifications.unsubscribe(session_id, queue)
     
     return EventSourceResponse(
         event_generator(),
@@ -842,6 +1989,19 @@ async def handle_get_message(request: Request,
         }
     )
 
+@app.delete("/mcp")
+async def handle_delete_session(request: Request,
+                                auth_info: Dict[str, Any] = Depends(check_authentication)):
+    """Terminate the session named in the Mcp-Session-Id header."""
+    session_id = request.headers.get("Mcp-Session-Id") or request.query_params.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=400, content={"error": "Mcp-Session-Id header required"})
+    if not await mcp_server.session_call("remove", session_id):
+        return JSONResponse(status_code=404, content={"error": f"Session not found: {session_id}"})
+    mcp_server.notifications.close(session_id)
+    logger.info(f"Closed session: {session_id}")
+    return Response(status_code=204)
+
 @app.get("/")
 async def server_info():
     """Return server information and OAuth 2.1 discovery metadata."""
@@ -849,7 +2009,9 @@ async def server_info():
         "name": "MCP Reference Server",
         "version": "1.0.0",
         "protocol_versions": ["2024-11-05", "2025-03-26", "2025-06-18"],
-        "description": "Reference implementation of MCP server with OAuth 2.1 support"
+        "description": "Reference implementation of MCP server with OAuth 2.1 support",
+        "sessions": await mcp_server.session_call("stats"),
+        "notifications": mcp_server.notifications.stats()
     }
     
     # Add OAuth 2.1 Protected Resource Metadata (RFC 9728)
@@ -861,9 +2023,18 @@ async def server_info():
             "token_endpoint_auth_methods_supported": ["client_secret_basic", "client_secret_post"],
             "resource_indicators_supported": True  # RFC 8707 requirement
         }
+        if token_introspector is not None:
+            info["oauth"]["introspection"] = token_introspector.stats()
     
     return info
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Return request, tool, session, SSE and authentication metrics in the Prometheus text format."""
+    content = mcp_server.metrics.render(await mcp_server.session_call("stats"), mcp_server.notifications.stats(),
+                                        token_introspector.stats() if token_introspector is not None else None)
+    return Response(content=content, media_type=METRICS_CONTENT_TYPE)
+
 # OAuth 2.1 Metadata Endpoints
 @app.get("/.well-known/oauth-authorization-server")
 async def oauth_authorization_server_metadata():
@@ -919,19 +2090,84 @@ def main():
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8088, help="Port to bind to")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument("--session-ttl", type=float, default=DEFAULT_SESSION_TTL,
+                        help="Seconds a session may stay idle before it expires")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS,
+                        help="Maximum open sessions; the least recently used is evicted beyond this")
+    parser.add_argument("--workers", type=int, default=1, help="Number of uvicorn worker processes")
+    parser.add_argument("--session-backend", choices=SESSION_BACKENDS,
+                        help="Where sessions are kept: memory (one process only), sqlite (WAL database) "
+                             "or shared (served from the main process); default: memory, or sqlite with --workers")
+    parser.add_argument("--session-db", help="SQLite session database (default: a temporary file)")
+    parser.add_argument("--sse-queue-size", type=int, default=SSE_QUEUE_SIZE,
+                        help="Notifications queued per SSE stream before the overflow policy applies")
+    parser.add_argument("--sse-overflow", choices=SSE_OVERFLOW_POLICIES, default="drop-oldest",
+                        help="What to do when a stream's queue is full")
+    parser.add_argument("--tools-page-size", type=int, default=TOOLS_PAGE_SIZE,
+                        help="Tools per tools/list page, 0 for a single page")
+    parser.add_argument("--benchmark-tools", action="store_true",
+                        help="Add the cpu_burn, alloc, payload, stream_progress and latency workload tools")
+    parser.add_argument("--generated-tools", type=int, default=0, help="Number of generated tools to add")
+    parser.add_argument("--generated-schema-size", type=int, default=8,
+                        help="Properties in each generated tool's input schema")
     args = parser.parse_args()
+    if args.session_ttl <= 0 or args.max_sessions < 1:
+        parser.error("--session-ttl and --max-sessions must be positive")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.sse_queue_size < 1:
+        parser.error("--sse-queue-size must be positive")
+    if args.generated_tools < 0 or args.generated_schema_size < 0 or args.tools_page_size < 0:
+        parser.error("--generated-tools, --generated-schema-size and --tools-page-size must not be negative")
+    backend = args.session_backend or ("sqlite" if args.workers > 1 else "memory")
+    if backend == "memory" and args.workers > 1:
+        parser.error("--workers needs a session backend that workers share: sqlite or shared")
     
     # Configure logging level
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.setLevel(logging.DEBUG)
     
+    # Describe the session backend to this process and every worker
+    os.environ.update({"MCP_SESSION_BACKEND": backend, "MCP_SESSION_TTL": str(args.session_ttl),
+                       "MCP_MAX_SESSIONS": str(args.max_sessions)})
+    if backend == "sqlite":
+        if args.session_db:
+            os.environ["MCP_SESSION_DB"] = args.session_db
+        else:
+            session_dir = tempfile.TemporaryDirectory(prefix="mcp-sessions-")
+            os.environ["MCP_SESSION_DB"] = os.path.join(session_dir.name, "sessions.db")
+    elif backend == "shared":
+        address, authkey = host_shared_sessions(args.session_ttl, args.max_sessions)
+        os.environ.update({"MCP_SESSION_MANAGER": address, "MCP_SESSION_AUTHKEY": authkey})
+    mcp_server.sessions = session_store_from_env()
+    os.environ.update({"MCP_SSE_QUEUE_SIZE": str(args.sse_queue_size), "MCP_SSE_OVERFLOW": args.sse_overflow})
+    mcp_server.notifications = NotificationHub(args.sse_queue_size, args.sse_overflow)
+    os.environ["MCP_TOOLS_PAGE_SIZE"] = str(args.tools_page_size)
+    mcp_server.tools_page_size = args.tools_page_size
+    if args.benchmark_tools:
+        os.environ["MCP_BENCHMARK_TOOLS"] = "1"
+    os.environ.update({"MCP_GENERATED_TOOLS": str(args.generated_tools),
+                       "MCP_GENERATED_SCHEMA_SIZE": str(args.generated_schema_size)})
+    register_workload_tools_from_env(mcp_server)
+    
     # Start server
     logger.info(f"Starting MCP Reference Server at http://{args.host}:{args.port}")
     logger.info(f"Protocol versions: {mcp_server.protocol_versions}")
-    logger.info(f"Available tools: {', '.join(mcp_server.tools.keys())}")
+    logger.info(f"JSON encoder: {JSON_ENCODER}")
+    logger.info(f"Available tools: {len(mcp_server.tools)} "
+                f"({', '.join(name for name in mcp_server.tools if not name.startswith('generated_'))}"
+                f"{', generated_*' if args.generated_tools else ''})")
+    logger.info(f"Sessions: {backend} backend, up to {args.max_sessions}, "
+                f"expiring after {args.session_ttl:g}s idle")
     
-    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    if args.workers > 1:
+        # Workers import the module afresh and build their session store from the environment
+        logger.info(f"Workers: {args.workers}")
+        uvicorn.run("reference_mcp_server:app", app_dir=os.path.dirname(os.path.abspath(__file__)),
+                    host=args.host, port=args.port, workers=args.workers, log_level="info")
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -12,8 +12,13 @@ import os
 import sys
 import json
 import logging
+import argparse
+import math
+import random
+import threading
 import uuid
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Union
 
 # Configure logging
@@ -27,6 +32,19 @@ logger = logging.getLogger("minimal-mcp-stdio-server")
 # Get environment variables
 DEFAULT_PROTOCOL_VERSION = os.environ.get("MCP_PROTOCOL_VERSION", "2025-03-26")
 DEBUG = os.environ.get("MCP_DEBUG", "").lower() in ("1", "true", "yes")
+WORKERS = int(os.environ.get("MCP_WORKERS", "8"))
+STRICT_ORDER = os.environ.get("MCP_STRICT_ORDER", "").lower() in ("1", "true", "yes")
+BENCHMARK_TOOLS = os.environ.get("MCP_BENCHMARK_TOOLS", "").lower() in ("1", "true", "yes")
+GENERATED_TOOLS = int(os.environ.get("MCP_GENERATED_TOOLS", "0"))
+GENERATED_SCHEMA_SIZE = int(os.environ.get("MCP_GENERATED_SCHEMA_SIZE", "8"))
+
+# Async tool calls: longest sleep, progress notifications per call, and seconds a finished call is kept for tools/result
+MAX_ASYNC_SLEEP = 10
+ASYNC_PROGRESS_STEPS = 10
+ASYNC_RETENTION = float(os.environ.get("MCP_ASYNC_RETENTION", "300"))
+
+# Methods handled on the reader thread in arrival order, even when requests run concurrently
+SEQUENTIAL_METHODS = ("initialize", "initialized", "shutdown", "exit", "notifications/cancelled")
 
 # Enable debug logging if requested
 if DEBUG:
@@ -34,9 +52,19 @@ if DEBUG:
 
 
 class MinimalMCPServer:
-    """Minimal MCP-compliant server implementation."""
+    """
+    Minimal MCP-compliant server implementation.
+
+    Requests run on a thread pool and each response is written as soon as it is
+    ready, so a slow tool call does not hold up the requests behind it. Session
+    lifecycle methods, notifications and parse errors are handled on the reader
+    thread in arrival order. With strict_order every request is handled on the
+    reader thread and answered in the order it arrived.
+    """
     
-    def __init__(self):
+    def __init__(self, workers: int = WORKERS, strict_order: bool = STRICT_ORDER,
+                 benchmark_tools: bool = BENCHMARK_TOOLS, generated_tools: int = GENERATED_TOOLS,
+                 generated_schema_size: int = GENERATED_SCHEMA_SIZE):
         """Initialize the server."""
         self.running = True
         self.negotiated_version = DEFAULT_PROTOCOL_VERSION
@@ -44,35 +72,119 @@ class MinimalMCPServer:
         self.resources = {}
         self.pending_async_calls = {}  # Store pending async tool calls
         
+        # Opt-in synthetic workload and generated tools, listed after the built-in ones
+        self.extra_tools = benchmark_tool_definitions() if benchmark_tools else []
+        self.extra_tools += generated_tool_definitions(generated_tools, generated_schema_size)
+        # Catalogs by name, built once so tools/call finds its tool without describing every tool
+        self._tools = {tool["name"]: tool for tool in self._tool_catalog("2025-03-26")}
+        self._tools_2024_11_05 = {tool["name"]: tool for tool in self._tool_catalog("2024-11-05")}
+        self._extra_tool_names = {tool["name"] for tool in self.extra_tools}
+        
+        # One writer at a time, so concurrent responses never interleave on stdout
+        self._write_lock = threading.Lock()
+        self._executor = None if strict_order else ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="mcp-request")
+        # Request id -> event set by notifications/cancelled, for requests still running
+        self._in_flight: Dict[Any, threading.Event] = {}
+        self._in_flight_lock = threading.Lock()
+        self._local = threading.local()
+        
+        # Async tool calls run on their own pool so they never hold up requests.
+        # Call id -> {"cancel": Event, "future": Future, "finished": monotonic time or None}
+        self._async_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-async")
+        self._async_tasks: Dict[str, Dict[str, Any]] = {}
+        self._async_lock = threading.Lock()
+        
         logger.info(f"Minimal MCP STDIO Server initializing")
         logger.info(f"Default protocol version: {DEFAULT_PROTOCOL_VERSION}")
+        if strict_order:
+            logger.info("Strict ordering: requests are handled one at a time")
+        else:
+            logger.info(f"Handling up to {workers} requests concurrently")
     
     def run(self):
         """Run the server, processing stdin requests."""
         logger.info("Server started. Waiting for input...")
         
-        # Main loop
-        while self.running:
-            try:
-                # Read a line from stdin
-                line = sys.stdin.readline()
-                
-                # Check for EOF
-                if not line:
-                    logger.info("End of input stream, shutting down")
+        try:
+            # Main loop
+            while self.running:
+                try:
+                    # Read a line from stdin
+                    line = sys.stdin.readline()
+                    
+                    # Check for EOF
+                    if not line:
+                        logger.info("End of input stream, shutting down")
+                        break
+                    
+                    # Process the request
+                    self.dispatch(line.strip())
+                    
+                except KeyboardInterrupt:
+                    logger.info("Interrupted, shutting down")
                     break
-                
-                # Process the request
-                self.process_request(line.strip())
-                
-            except KeyboardInterrupt:
-                logger.info("Interrupted, shutting down")
-                break
-            except Exception as e:
-                logger.error(f"Unhandled exception: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
-                sys.exit(1)
+                except Exception as e:
+                    logger.error(f"Unhandled exception: {str(e)}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                    sys.exit(1)
+        finally:
+            # Answer every request already accepted before exiting
+            if self._executor:
+                self._executor.shutdown(wait=True)
+            # Async calls have nobody left to poll them
+            with self._async_lock:
+                for task in self._async_tasks.values():
+                    task["cancel"].set()
+            self._async_executor.shutdown(wait=True, cancel_futures=True)
+    
+    def dispatch(self, request_str: str):
+        """
+        Handle a line from stdin, on the worker pool unless it must stay in order.
+        
+        Args:
+            request_str: The JSON-RPC request string
+        """
+        if self._executor is None or not request_str:
+            self.process_request(request_str)
+            return
+        try:
+            request = json.loads(request_str)
+        except json.JSONDecodeError:
+            self.process_request(request_str)
+            return
+        
+        if isinstance(request, dict):
+            request_id = request.get("id")
+            if request_id is None or request.get("method") in SEQUENTIAL_METHODS:
+                self.process_message(request)
+                return
+            if isinstance(request_id, (str, int, float)):
+                with self._in_flight_lock:
+                    self._in_flight[request_id] = threading.Event()
+        self._executor.submit(self._process_concurrently, request)
+    
+    def _process_concurrently(self, request: Any):
+        """Process a request on a worker thread, making its cancellation event available to handlers."""
+        request_id = request.get("id") if isinstance(request, dict) else None
+        with self._in_flight_lock:
+            self._local.cancel_event = self._in_flight.get(request_id) if isinstance(
+                request_id, (str, int, float)) else None
+        try:
+            self.process_message(request)
+        finally:
+            self._local.cancel_event = None
+            if isinstance(request_id, (str, int, float)):
+                with self._in_flight_lock:
+                    self._in_flight.pop(request_id, None)
+    
+    def _is_cancelled(self, request_id: Any) -> bool:
+        if not isinstance(request_id, (str, int, float)):
+            return False
+        with self._in_flight_lock:
+            event = self._in_flight.get(request_id)
+        return event is not None and event.is_set()
     
     def process_request(self, request_str: str):
         """
@@ -90,7 +202,30 @@ class MinimalMCPServer:
                 logger.debug(f"Received: {request_str}")
                 
             request = json.loads(request_str)
-            
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON: {request_str}")
+            # Send parse error for requests
+            response = {
+                "jsonrpc": "2.0",
+                "id": None,  # We don't know the ID for invalid JSON
+                "error": {
+                    "code": -32700,
+                    "message": "Parse error"
+                }
+            }
+            self.send_response(response)
+            return
+        
+        self.process_message(request)
+    
+    def process_message(self, request: Any):
+        """
+        Process a parsed JSON-RPC request, notification or batch.
+        
+        Args:
+            request: The decoded JSON-RPC message
+        """
+        try:
             # Check if it's a batch request
             if isinstance(request, list):
                 self.process_batch_request(request)
@@ -145,18 +280,6 @@ class MinimalMCPServer:
                     logger.error(f"Error handling notification {method}: {str(e)}")
                     import traceback
                     logger.error(traceback.format_exc())
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON: {request_str}")
-            # Send parse error for requests
-            response = {
-                "jsonrpc": "2.0",
-                "id": None,  # We don't know the ID for invalid JSON
-                "error": {
-                    "code": -32700,
-                    "message": "Parse error"
-                }
-            }
-            self.send_response(response)
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}")
             import traceback
@@ -220,12 +343,18 @@ class MinimalMCPServer:
         Args:
             response: The JSON-RPC response object or batch of responses
         """
+        # A cancelled request gets no response
+        if isinstance(response, dict) and "method" not in response and self._is_cancelled(response.get("id")):
+            logger.info(f"Dropping response to cancelled request {response.get('id')}")
+            return
+        
         response_str = json.dumps(response)
         if DEBUG:
             logger.debug(f"Sending: {response_str}")
         
         # Write the response to stdout
-        print(response_str, flush=True)
+        with self._write_lock:
+            print(response_str, flush=True)
     
     def handle_method(self, method: str, params: Dict[str, Any]) -> Any:
         """
@@ -253,6 +382,8 @@ class MinimalMCPServer:
         elif method == "exit":
             self.running = False
             return None  # Notification, no response needed
+        elif method == "notifications/cancelled":
+            return self.handle_cancelled(params)
             
         # Tools methods
         elif method == "tools/list":
@@ -288,6 +419,23 @@ class MinimalMCPServer:
         else:
             raise MethodNotFoundError(f"Method not found: {method}")
     
+    def handle_cancelled(self, params: Dict[str, Any]) -> None:
+        """
+        Handle notifications/cancelled by signalling the request if it is still running.
+        
+        Args:
+            params: The notification parameters with the requestId
+        """
+        request_id = params.get("requestId")
+        if not isinstance(request_id, (str, int, float)):
+            return None
+        with self._in_flight_lock:
+            event = self._in_flight.get(request_id)
+        if event is not None:
+            logger.info(f"Cancelling request {request_id}: {params.get('reason', 'no reason given')}")
+            event.set()
+        return None
+    
     def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle the initialize method.
@@ -368,10 +516,29 @@ class MinimalMCPServer:
         Returns:
             A list of available tools
         """
+        result = {"tools": list(self._tools_for(self.negotiated_version).values())}
+        if DEBUG:
+            logger.debug(f"handle_tools_list returning: {json.dumps(result)}")
+        return result
+    
+    def _tools_for(self, version: str) -> Dict[str, Dict[str, Any]]:
+        """The tools offered to a protocol version, by name."""
+        return self._tools_2024_11_05 if version == "2024-11-05" else self._tools
+    
+    def _tool_catalog(self, version: str) -> List[Dict[str, Any]]:
+        """
+        Describe the tools offered to a protocol version.
+        
+        Args:
+            version: The negotiated protocol version
+            
+        Returns:
+            The built-in tools followed by the extra tools
+        """
         tools = []
         
         # Define tools based on protocol version
-        if self.negotiated_version == "2024-11-05":
+        if version == "2024-11-05":
             tools = [
                 {
                     "name": "echo",
@@ -496,9 +663,7 @@ class MinimalMCPServer:
                 }
             ]
         
-        result = {"tools": tools}
-        print(f"DEBUG: handle_tools_list returning: {json.dumps(result)}", file=sys.stderr)
-        return result
+        return tools + self.extra_tools
     
     def handle_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle the tools/call method."""
@@ -511,12 +676,7 @@ class MinimalMCPServer:
         arguments = params["arguments"]
         
         # Find the tool
-        tool = None
-        for t in self.handle_tools_list()["tools"]:
-            if t["name"] == tool_name:
-                tool = t
-                break
-                
+        tool = self._tools_for(self.negotiated_version).get(tool_name)
         if not tool:
             raise InvalidParamsError(f"Unknown tool: {tool_name}")
             
@@ -546,17 +706,37 @@ class MinimalMCPServer:
                 raise InvalidParamsError("Missing required argument: seconds")
             try:
                 seconds = float(seconds)
-                time.sleep(seconds)
-                return {"content": {"slept": seconds}}
             except (TypeError, ValueError):
                 raise InvalidParamsError("Argument 'seconds' must be a number")
+            # On a worker thread, wake up early if the client cancels the request
+            cancel_event = getattr(self._local, "cancel_event", None)
+            if cancel_event is None:
+                time.sleep(seconds)
+            elif cancel_event.wait(seconds):
+                raise RequestCancelledError("Request cancelled")
+            return {"content": {"slept": seconds}}
         else:
-            raise InvalidParamsError(f"Unknown tool: {tool_name}")
+            progress_token = (params.get("_meta") or {}).get("progressToken")
+            
+            def report_progress(progress: float, total: float):
+                if progress_token is not None:
+                    self.send_response({
+                        "jsonrpc": "2.0",
+                        "method": "notifications/progress",
+                        "params": {"progressToken": progress_token, "progress": progress, "total": total}
+                    })
+            
+            return {"content": run_benchmark_tool(tool_name, arguments, report_progress,
+                                                  getattr(self._local, "cancel_event", None))}
     
     def handle_tools_call_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle the tools/call-async method.
         
+        The call is started on the async executor and its ID returned straight
+        away. Clients that pass _meta.progressToken receive notifications/progress
+        while it runs and notifications/tools/completed when it finishes.
+        
         Args:
             params: The method parameters
             
@@ -588,35 +768,125 @@ class MinimalMCPServer:
                 arguments = params.get("params", {})
                 print(f"DEBUG: Using 'params' instead of 'arguments': {json.dumps(arguments)}", file=sys.stderr)
         
+        progress_token = (params.get("_meta") or {}).get("progressToken")
+        
         # Generate a call ID
         call_id = str(uuid.uuid4())
+        cancel_event = threading.Event()
         
-        # Store the call details for later processing
-        self.pending_async_calls[call_id] = {
-            "name": tool_name,
-            "arguments": arguments,
-            "status": "running",
-            "createdAt": int(time.time() * 1000),
-            "result": None,
-            "error": None
-        }
-        
-        # For sleep tool, store the requested duration
-        if tool_name == "sleep" and "duration" in arguments:
-            try:
-                duration = float(arguments["duration"])
-                if duration > 10:  # Limit sleep duration for safety
-                    duration = 10
-                self.pending_async_calls[call_id]["sleepDuration"] = duration
-            except (ValueError, TypeError):
-                # Handle invalid duration in get_result
-                pass
+        with self._async_lock:
+            self._evict_finished_calls()
+            # Store the call details for tools/result
+            self.pending_async_calls[call_id] = {
+                "name": tool_name,
+                "arguments": arguments,
+                "status": "running",
+                "createdAt": int(time.time() * 1000),
+                "result": None,
+                "error": None
+            }
+            self._async_tasks[call_id] = {"cancel": cancel_event, "future": None, "finished": None,
+                                          "progress_token": progress_token}
+            self._async_tasks[call_id]["future"] = self._async_executor.submit(
+                self._run_async_call, call_id, tool_name, arguments, progress_token, cancel_event)
         
         # Return the call ID immediately
         return {
             "id": call_id
         }
     
+    def _run_async_call(self, call_id: str, tool_name: str, arguments: Dict[str, Any],
+                        progress_token: Any, cancel_event: threading.Event):
+        """Run an async tool call on the executor and record how it ended."""
+        def report_progress(progress: float, total: float):
+            if progress_token is not None:
+                self.send_response({
+                    "jsonrpc": "2.0",
+                    "method": "notifications/progress",
+                    "params": {"progressToken": progress_token, "progress": progress, "total": total}
+                })
+        
+        try:
+            result, error = self._execute_async_tool(tool_name, arguments, report_progress, cancel_event), None
+        except RequestCancelledError:
+            result, error = None, None
+        except Exception as e:
+            result, error = None, str(e)
+        
+        with self._async_lock:
+            call_info = self.pending_async_calls.get(call_id)
+            task = self._async_tasks.get(call_id)
+            if call_info is None or task is None:
+                return
+            task["finished"] = time.monotonic()
+            # A cancelled call keeps its status even if the tool finished first
+            if call_info["status"] == "running":
+                call_info["status"] = "error" if error is not None else "completed"
+                call_info["result"] = result
+                call_info["error"] = error
+                call_info["completedAt"] = int(time.time() * 1000)
+            status = call_info["status"]
+        
+        self._notify_completed(call_id, progress_token, status, result, error)
+    
+    def _notify_completed(self, call_id: str, progress_token: Any, status: str, result: Any = None,
+                          error: Optional[str] = None):
+        """Send notifications/tools/completed for an async call, if the client asked for progress."""
+        if progress_token is None:
+            return
+        notification = {"id": call_id, "status": status}
+        if status == "completed":
+            notification["content"] = result
+        elif status == "error":
+            notification["error"] = error
+        self.send_response({"jsonrpc": "2.0", "method": "notifications/tools/completed", "params": notification})
+    
+    def _execute_async_tool(self, tool_name: str, arguments: Dict[str, Any], report_progress,
+                            cancel_event: threading.Event) -> Dict[str, Any]:
+        """
+        Execute a tool for tools/call-async.
+        
+        Args:
+            tool_name: The tool to run
+            arguments: The tool arguments
+            report_progress: Called with (progress, total) as a long-running tool advances
+            cancel_event: Set when the call is cancelled
+            
+        Returns:
+            The tool content
+            
+        Raises:
+            RequestCancelledError: If the call was cancelled while running
+        """
+        if tool_name == "sleep":
+            duration = arguments.get("duration", arguments.get("seconds"))
+            if duration is None:
+                raise InvalidParamsError("Missing required argument: duration")
+            try:
+                duration = min(float(duration), MAX_ASYNC_SLEEP)
+            except (TypeError, ValueError):
+                raise InvalidParamsError("Duration must be a number")
+            for step in range(ASYNC_PROGRESS_STEPS):
+                if cancel_event.wait(duration / ASYNC_PROGRESS_STEPS):
+                    raise RequestCancelledError("Tool call cancelled")
+                report_progress(step + 1, ASYNC_PROGRESS_STEPS)
+            return {"slept": duration}
+        elif tool_name in ["list_directory", "read_file", "write_file"]:
+            # Simulate the execution of these tools
+            return {"success": True, "message": f"Async {tool_name} completed"}
+        elif tool_name in self._extra_tool_names:
+            return run_benchmark_tool(tool_name, arguments, report_progress, cancel_event)
+        return self.handle_tools_call({"name": tool_name, "arguments": arguments})["content"]
+    
+    def _evict_finished_calls(self):
+        """Forget async calls that finished more than ASYNC_RETENTION seconds ago. Call with _async_lock held."""
+        cutoff = time.monotonic() - ASYNC_RETENTION
+        expired = [call_id for call_id, task in self._async_tasks.items()
+                   if task["finished"] is not None and task["finished"] < cutoff]
+        for call_id in expired:
+            self._async_tasks.pop(call_id, None)
+            self.pending_async_calls.pop(call_id, None)
+    
     def handle_tools_result(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle the tools/result method.
@@ -638,83 +908,12 @@ class MinimalMCPServer:
             
         call_id = params.get("id", "")
         
-        # Check if the call exists
-        if call_id not in self.pending_async_calls:
-            raise InvalidParamsError(f"Tool call not found: {call_id}")
-            
-        call_info = self.pending_async_calls[call_id]
-        
-        # If the call is still running, check if it should be completed
-        if call_info["status"] == "running":
-            tool_name = call_info["name"]
-            arguments = call_info["arguments"]
-            current_time = int(time.time() * 1000)
-            elapsed_seconds = (current_time - call_info["createdAt"]) / 1000
-            
-            # Special handling for sleep tool
-            if tool_name == "sleep" and "sleepDuration" in call_info:
-                sleep_duration = call_info["sleepDuration"]
-                
-                # Check if the sleep duration has elapsed
-                if elapsed_seconds >= sleep_duration:
-                    # Sleep completed
-                    call_info["status"] = "completed"
-                    call_info["result"] = {"slept": sleep_duration}
-                    call_info["completedAt"] = current_time
-                else:
-                    # Sleep still in progress
-                    return {
-                        "status": "running"
-                    }
-            else:
-                try:
-                    # Execute other tools (immediately)
-                    result = None
-                    if tool_name == "echo":
-                        if "text" not in arguments:
-                            raise InvalidParamsError("Missing required argument: text")
-                        result = {
-                            "echo": arguments["text"]
-                        }
-                    elif tool_name == "add":
-                        if "a" not in arguments or "b" not in arguments:
-                            raise InvalidParamsError("Missing required arguments: a, b")
-                        try:
-                            a = float(arguments["a"])
-                            b = float(arguments["b"])
-                            result = {
-                                "sum": a + b
-                            }
-                        except ValueError:
-                            raise InvalidParamsError("Arguments must be numbers")
-                    elif tool_name == "sleep":
-                        if "duration" not in arguments:
-                            raise InvalidParamsError("Missing required argument: duration")
-                        try:
-                            duration = float(arguments["duration"])
-                            if duration > 10:  # Limit sleep duration for safety
-                                duration = 10
-                            result = {
-                                "slept": duration
-                            }
-                        except ValueError:
-                            raise InvalidParamsError("Duration must be a number")
-                    elif tool_name in ["list_directory", "read_file", "write_file"]:
-                        # Simulate the execution of these tools
-                        result = {"success": True, "message": f"Async {tool_name} completed"}
-                    else:
-                        raise MethodNotFoundError(f"Tool not found: {tool_name}")
-                    
-                    # Update the call info
-                    call_info["status"] = "completed"
-                    call_info["result"] = result
-                    call_info["completedAt"] = current_time
-                    
-                except Exception as e:
-                    # Handle errors
-                    call_info["status"] = "error"
-                    call_info["error"] = str(e)
-                    call_info["completedAt"] = current_time
+        with self._async_lock:
+            self._evict_finished_calls()
+            # Check if the call exists
+            if call_id not in self.pending_async_calls:
+                raise InvalidParamsError(f"Tool call not found: {call_id}")
+            call_info = dict(self.pending_async_calls[call_id])
         
         # Return the current status of the call
         response = {
@@ -749,16 +948,28 @@ class MinimalMCPServer:
             
         call_id = params.get("id", "")
         
-        # Check if the call exists
-        if call_id not in self.pending_async_calls:
-            raise InvalidParamsError(f"Tool call not found: {call_id}")
-            
-        # Cancel the call
-        call_info = self.pending_async_calls[call_id]
-        if call_info["status"] == "running":
-            # Mark as cancelled (use British spelling with two l's)
-            call_info["status"] = "cancelled"
-            call_info["canceledAt"] = int(time.time() * 1000)
+        dropped = False
+        with self._async_lock:
+            # Check if the call exists
+            if call_id not in self.pending_async_calls:
+                raise InvalidParamsError(f"Tool call not found: {call_id}")
+                
+            # Cancel the call
+            call_info = self.pending_async_calls[call_id]
+            task = self._async_tasks[call_id]
+            if call_info["status"] == "running":
+                # Mark as cancelled (use British spelling with two l's)
+                call_info["status"] = "cancelled"
+                call_info["canceledAt"] = int(time.time() * 1000)
+                # Stop the tool, or drop it if it has not started yet
+                task["cancel"].set()
+                if task["future"].cancel():
+                    task["finished"] = time.monotonic()
+                    dropped = True
+        
+        # A dropped call never runs, so it is announced here like one stopped while running
+        if dropped:
+            self._notify_completed(call_id, task["progress_token"], "cancelled")
             
         return {
             "success": True
@@ -955,10 +1166,215 @@ class InvalidParamsError(Exception):
     pass
 
 
+class RequestCancelledError(Exception):
+    """Exception raised when the client cancelled the request being handled."""
+    pass
+
+
+# Benchmark tools, registered with --benchmark-tools or MCP_BENCHMARK_TOOLS
+MAX_CPU_BURN_MS = 60000
+MAX_ALLOC_MB = 1024
+MAX_PAYLOAD_BYTES = 64 * 1024 * 1024
+MAX_LATENCY_SECONDS = 60.0
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "exponential", "lognormal", "pareto")
+GENERATED_PROPERTY_TYPES = ("string", "number", "integer", "boolean", "array", "object")
+
+
+def benchmark_tool_definitions() -> List[Dict[str, Any]]:
+    """Definitions of the synthetic workload tools."""
+    def tool(name, description, properties, required):
+        return {"name": name, "description": description,
+                "inputSchema": {"type": "object", "properties": properties, "required": required}}
+    
+    return [
+        tool("cpu_burn", "Keep a CPU busy for the given number of milliseconds",
+             {"ms": {"type": "number", "description": "Milliseconds of CPU time to burn"}}, ["ms"]),
+        tool("alloc", "Allocate and touch the given number of megabytes, then release them",
+             {"mb": {"type": "number", "description": "Megabytes to allocate"}}, ["mb"]),
+        tool("payload", "Return a response of roughly the given size",
+             {"bytes": {"type": "integer", "description": "Approximate size of the returned data"},
+              "structured": {"type": "boolean", "description": "Return a list of records instead of one string"}},
+             ["bytes"]),
+        tool("stream_progress", "Send n progress notifications, interval seconds apart",
+             {"n": {"type": "integer", "description": "Number of notifications"},
+              "interval": {"type": "number", "description": "Seconds between notifications"}}, ["n"]),
+        tool("latency", "Wait for a delay drawn from a distribution, e.g. 'exponential:50' or 'uniform:10,100' (ms)",
+             {"dist": {"type": "string", "description": "One of " + ", ".join(LATENCY_DISTRIBUTIONS) +
+                       ", followed by ':' and its parameters in milliseconds"}}, ["dist"]),
+    ]
+
+
+def generated_tool_definitions(count: int, schema_size: int) -> List[Dict[str, Any]]:
+    """
+    Definitions of count generated tools with schema_size properties each.
+    
+    Calling a generated tool reports how many arguments it received, so the
+    tools measure catalog and schema handling rather than tool work.
+    """
+    tools = []
+    for index in range(count):
+        properties = {}
+        for position in range(schema_size):
+            kind = GENERATED_PROPERTY_TYPES[position % len(GENERATED_PROPERTY_TYPES)]
+            prop = {"type": kind, "description": f"Generated {kind} property {position} of tool {index}"}
+            if kind == "array":
+                prop["items"] = {"type": "string"}
+            elif kind == "object":
+                prop["properties"] = {"key": {"type": "string"}, "value": {"type": "number"}}
+            properties[f"p{position}"] = prop
+        tools.append({
+            "name": f"generated_{index:04d}",
+            "description": f"Generated tool {index} with {schema_size} properties",
+            "inputSchema": {"type": "object", "properties": properties,
+                            "required": list(properties)[:min(2, schema_size)]}
+        })
+    return tools
+
+
+def _number_argument(arguments: Dict[str, Any], name: str, maximum: float, default: Any = None) -> float:
+    value = arguments.get(name, default)
+    if value is None:
+        raise InvalidParamsError(f"Missing required argument: {name}")
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise InvalidParamsError(f"Argument '{name}' must be a number")
+    if not math.isfinite(value):
+        raise InvalidParamsError(f"Argument '{name}' must be a finite number")
+    if value < 0:
+        raise InvalidParamsError(f"Argument '{name}' must not be negative")
+    return min(value, maximum)
+
+
+def sample_latency(dist: str) -> float:
+    """
+    Draw a delay in seconds from a distribution spec such as 'normal:50,10'.
+    
+    Parameters are milliseconds: fixed:MS, uniform:LOW,HIGH, normal:MEAN,SD,
+    exponential:MEAN, lognormal:MEDIAN,SIGMA (sigma of the log) and
+    pareto:SCALE,ALPHA.
+    """
+    name, _, spec = str(dist).partition(":")
+    try:
+        values = [float(v) for v in spec.split(",") if v.strip()]
+    except ValueError:
+        raise InvalidParamsError(f"Invalid latency parameters: {dist}")
+    arity = {"fixed": 1, "uniform": 2, "normal": 2, "exponential": 1, "lognormal": 2, "pareto": 2}
+    if name not in arity:
+        raise InvalidParamsError(f"Unknown latency distribution '{name}', expected one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+    if len(values) != arity[name]:
+        raise InvalidParamsError(f"Distribution '{name}' takes {arity[name]} parameter(s)")
+    if not all(math.isfinite(v) for v in values):
+        raise InvalidParamsError(f"Latency parameters must be finite: {dist}")
+    if name in ("normal", "lognormal") and values[1] < 0:
+        raise InvalidParamsError(f"Distribution '{name}' needs a non-negative spread")
+    if name == "pareto" and values[1] <= 0:
+        raise InvalidParamsError("Distribution 'pareto' needs a positive alpha")
+    try:
+        if name == "fixed":
+            ms = values[0]
+        elif name == "uniform":
+            ms = random.uniform(*values)
+        elif name == "normal":
+            ms = random.gauss(*values)
+        elif name == "exponential":
+            ms = random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+        elif name == "lognormal":
+            ms = values[0] * math.exp(random.gauss(0, values[1]))
+        else:
+            ms = values[0] * random.paretovariate(values[1])
+    except (OverflowError, ZeroDivisionError):
+        # A heavy enough tail leaves the float range; the delay is capped below anyway
+        ms = math.inf if values[0] > 0 else 0.0
+    return min(max(ms, 0.0) / 1000, MAX_LATENCY_SECONDS)
+
+
+def run_benchmark_tool(tool_name: str, arguments: Dict[str, Any], report_progress,
+                       cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Run one of the synthetic workload tools.
+    
+    Args:
+        tool_name: The tool to run
+        arguments: The tool arguments
+        report_progress: Called with (progress, total) by stream_progress
+        cancel_event: Set when the client cancels the request
+        
+    Returns:
+        The tool content
+    """
+    def wait(seconds):
+        if cancel_event is None:
+            time.sleep(seconds)
+        elif cancel_event.wait(seconds):
+            raise RequestCancelledError("Request cancelled")
+    
+    if tool_name == "cpu_burn":
+        ms = _number_argument(arguments, "ms", MAX_CPU_BURN_MS)
+        deadline = time.thread_time() + ms / 1000
+        iterations = 0
+        value = 0
+        while time.thread_time() < deadline:
+            for i in range(1000):
+                value = (value * 31 + i) % 1000003
+            iterations += 1000
+        return {"burned_ms": ms, "iterations": iterations}
+    elif tool_name == "alloc":
+        mb = _number_argument(arguments, "mb", MAX_ALLOC_MB)
+        block = bytearray(int(mb * 1024 * 1024))
+        # Write one byte per page so the memory is really committed
+        for offset in range(0, len(block), 4096):
+            block[offset] = 1
+        del block
+        return {"allocated_mb": mb}
+    elif tool_name == "payload":
+        size = int(_number_argument(arguments, "bytes", MAX_PAYLOAD_BYTES))
+        if not arguments.get("structured"):
+            return {"bytes": size, "text": "x" * size}
+        record = {"id": 0, "name": "item-000000", "value": 0.5, "tags": ["alpha", "beta"]}
+        count = max(1, size // (len(json.dumps(record)) + 2))
+        items = [{"id": i, "name": f"item-{i:06d}", "value": i / 2, "tags": ["alpha", "beta"]} for i in range(count)]
+        return {"bytes": size, "items": items}
+    elif tool_name == "stream_progress":
+        n = int(_number_argument(arguments, "n", 100000))
+        interval = _number_argument(arguments, "interval", MAX_LATENCY_SECONDS, default=0)
+        for step in range(1, n + 1):
+            if interval:
+                wait(interval)
+            report_progress(step, n)
+        return {"notifications": n}
+    elif tool_name == "latency":
+        if "dist" not in arguments:
+            raise InvalidParamsError("Missing required argument: dist")
+        seconds = sample_latency(arguments["dist"])
+        wait(seconds)
+        return {"dist": arguments["dist"], "slept_ms": round(seconds * 1000, 3)}
+    elif tool_name.startswith("generated_"):
+        return {"tool": tool_name, "arguments": len(arguments)}
+    raise InvalidParamsError(f"Unknown tool: {tool_name}")
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Minimal MCP STDIO server")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="Requests handled concurrently (default: MCP_WORKERS or 8)")
+    parser.add_argument("--strict-order", action="store_true", default=STRICT_ORDER,
+                        help="Handle requests one at a time and answer in arrival order (or set MCP_STRICT_ORDER)")
+    parser.add_argument("--benchmark-tools", action="store_true", default=BENCHMARK_TOOLS,
+                        help="Add the cpu_burn, alloc, payload, stream_progress and latency tools "
+                             "(or set MCP_BENCHMARK_TOOLS)")
+    parser.add_argument("--generated-tools", type=int, default=GENERATED_TOOLS,
+                        help="Number of generated tools to add (default: MCP_GENERATED_TOOLS or 0)")
+    parser.add_argument("--generated-schema-size", type=int, default=GENERATED_SCHEMA_SIZE,
+                        help="Properties in each generated tool's input schema (default: MCP_GENERATED_SCHEMA_SIZE or 8)")
+    args, _ = parser.parse_known_args()
+    
     try:
-        server = MinimalMCPServer()
+        server = MinimalMCPServer(workers=max(1, args.workers), strict_order=args.strict_order,
+                                  benchmark_tools=args.benchmark_tools,
+                                  generated_tools=max(0, args.generated_tools),
+                                  generated_schema_size=max(0, args.generated_schema_size))
         server.run()
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}")
@@ -0,0 +1,627 @@
+"""
+Unit tests for the reference HTTP server's building blocks.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "ref_http_server"))
+
+import reference_mcp_server as server  # noqa: E402
+from introspection_server import start_introspection_server  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for the time module in the server; moved forward by hand."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the server's clock with a FakeClock."""
+    fake = FakeClock(time.time())
+    monkeypatch.setattr(server, "time", fake)
+    return fake
+
+
+class TestSessionStore:
+    """Tests for the in-memory SessionStore."""
+
+    def test_idle_session_expires_on_lookup(self, clock):
+        """Test that a session idle for longer than the TTL is gone, and use keeps it alive."""
+        store = server.SessionStore(idle_ttl=10, max_sessions=5)
+        store.create("a", {"n": 1})
+        store.create("b", {"n": 2})
+
+        clock.advance(8)
+        assert store.get("a") == {"n": 1}
+        clock.advance(8)
+
+        assert store.get("a") == {"n": 1}
+        assert store.get("b") is None
+        assert len(store) == 1
+        assert store.stats()["expired"] == 1
+
+    def test_least_recently_used_session_is_evicted_at_cap(self, clock):
+        """Test that creating a session beyond the cap evicts the least recently used one."""
+        store = server.SessionStore(idle_ttl=60, max_sessions=2)
+        store.create("a", {})
+        clock.advance(1)
+        store.create("b", {})
+        clock.advance(1)
+        store.get("a")
+        store.create("c", {})
+
+        assert "b" not in store
+        assert "a" in store and "c" in store
+        assert store.stats()["evicted"] == 1
+
+    def test_sweep_removes_only_idle_sessions(self, clock):
+        """Test that sweep expires idle sessions and leaves recently used ones."""
+        store = server.SessionStore(idle_ttl=10, max_sessions=10)
+        for session_id in ("a", "b", "c"):
+            store.create(session_id, {})
+            clock.advance(4)
+
+        assert store.sweep() == 1
+        assert store.get("a") is None
+        assert store.sweep() == 0
+        assert len(store) == 2
+
+    def test_sweeper_thread_expires_sessions(self):
+        """Test that the background sweeper expires sessions without lookups."""
+        store = server.SessionStore(idle_ttl=0.05, max_sessions=10, sweep_interval=0.01)
+        store.create("a", {})
+        store.start_sweeper()
+        try:
+            for _ in range(200):
+                if not len(store):
+                    break
+                time.sleep(0.01)
+        finally:
+            store.stop_sweeper()
+
+        assert len(store) == 0
+        assert store.stats()["expired"] == 1
+
+    def test_stats_count_each_way_a_session_ends(self, clock):
+        """Test that created, closed, expired and evicted sessions are counted separately."""
+        store = server.SessionStore(idle_ttl=10, max_sessions=2)
+        store.create("a", {})
+        store.create("b", {})
+        store.create("c", {})
+        assert store.remove("b") is True
+        assert store.remove("b") is False
+        clock.advance(11)
+        store.sweep()
+
+        assert store.stats() == {"backend": "memory", "active": 0, "max_sessions": 2, "idle_ttl": 10,
+                                 "created": 3, "expired": 1, "evicted": 1, "closed": 1}
+
+    def test_invalid_limits_are_rejected(self):
+        """Test that a non-positive TTL or capacity is refused."""
+        with pytest.raises(ValueError):
+            server.SessionStore(idle_ttl=0)
+        with pytest.raises(ValueError):
+            server.SessionStore(max_sessions=0)
+
+
+class TestSqliteSessionStore:
+    """Tests for the SQLite session store shared by worker processes."""
+
+    def test_sessions_survive_reopening_and_expire_by_wall_clock(self, clock, tmp_path):
+        """Test that sessions and counters persist, and idle ones left by an earlier run expire."""
+        path = str(tmp_path / "sessions.db")
+        store = server.SqliteSessionStore(path, idle_ttl=10, max_sessions=5)
+        store.create("a", {"protocol": "2025-03-26"})
+        store.create("b", {})
+
+        reopened = server.SqliteSessionStore(path, idle_ttl=10, max_sessions=5)
+        assert reopened.get("a") == {"protocol": "2025-03-26"}
+        clock.advance(11)
+
+        assert reopened.get("a") is None
+        assert reopened.sweep() == 1
+        assert reopened.stats()["created"] == 2
+        assert reopened.stats()["expired"] == 2
+
+    def test_last_access_is_stored_as_wall_clock_time(self, clock, tmp_path):
+        """Test that last-access times in the database are time.time() values."""
+        store = server.SqliteSessionStore(str(tmp_path / "sessions.db"))
+        store.create("a", {})
+
+        assert store._db.execute("SELECT last_access FROM sessions").fetchone()[0] == clock.time()
+
+    def test_least_recently_used_session_is_evicted_at_cap(self, clock, tmp_path):
+        """Test that the cap evicts by last access, and lookups refresh it."""
+        store = server.SqliteSessionStore(str(tmp_path / "sessions.db"), idle_ttl=60, max_sessions=2)
+        store.create("a", {})
+        clock.advance(2)
+        store.create("b", {})
+        clock.advance(2)
+        store.get("a")
+        store.create("c", {})
+
+        assert store.get("b") is None
+        assert store.get("a") == {} and store.get("c") == {}
+        assert store.remove("a") is True
+        stats = store.stats()
+        assert (stats["backend"], stats["active"], stats["evicted"], stats["closed"]) == ("sqlite", 1, 1, 1)
+
+
+class TestSharedSessionStore:
+    """Tests for the session store served to workers by host_shared_sessions."""
+
+    def test_clients_share_one_store(self):
+        """Test that sessions created through one client are visible to another."""
+        address, authkey = server.host_shared_sessions(idle_ttl=60, max_sessions=2)
+        try:
+            first = server.SharedSessionStore(address, authkey)
+            second = server.SharedSessionStore(address, authkey)
+            first.create("a", {"n": 1})
+            first.create("b", {})
+            second.create("c", {})
+
+            assert second.get("a") is None
+            assert second.get("c") == {}
+            assert first.remove("c") is True
+            assert len(first) == 1
+            stats = second.stats()
+            assert (stats["backend"], stats["created"], stats["evicted"], stats["closed"]) == ("shared", 3, 1, 1)
+        finally:
+            server._hosted_sessions.stop_sweeper()
+
+    def test_wrong_authkey_is_refused(self):
+        """Test that a client without the manager's key cannot connect."""
+        address, _ = server.host_shared_sessions(idle_ttl=60, max_sessions=2)
+        server._hosted_sessions.stop_sweeper()
+        with pytest.raises(multiprocessing.AuthenticationError):
+            server.SharedSessionStore(address, "00" * 16)
+
+
+def drain(queue):
+    """Return everything queued on an SSE stream's queue."""
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+class TestNotificationHub:
+    """Tests for the NotificationHub feeding the SSE streams."""
+
+    def test_drop_oldest_keeps_newest_notifications(self):
+        """Test that a full queue drops its oldest notification for the new one."""
+        hub = server.NotificationHub(queue_size=2, overflow="drop-oldest")
+        queue = hub.subscribe("s")
+        for n in range(3):
+            assert hub.publish("s", "notifications/message", {"n": n}) == 1
+
+        assert [event["params"]["n"] for _, event in drain(queue)] == [1, 2]
+        assert hub.counters["dropped"] == 1
+
+    def test_drop_newest_keeps_queued_notifications(self):
+        """Test that a full queue discards the new notification."""
+        hub = server.NotificationHub(queue_size=2, overflow="drop-newest")
+        queue = hub.subscribe("s")
+        results = [hub.publish("s", "notifications/message", {"n": n}) for n in range(3)]
+
+        assert results == [1, 1, 0]
+        assert [event["params"]["n"] for _, event in drain(queue)] == [0, 1]
+        assert hub.counters["dropped"] == 1
+
+    def test_close_ends_a_full_stream(self):
+        """Test that a full queue is emptied, ended and unsubscribed, leaving other streams alone."""
+        hub = server.NotificationHub(queue_size=1, overflow="close")
+        slow = hub.subscribe("s")
+        hub.publish("s", "notifications/message")
+        fast = hub.subscribe("s")
+
+        assert hub.publish("s", "notifications/message") == 1
+        assert drain(slow) == [None]
+        assert len(drain(fast)) == 1
+        assert hub.stats()["streams"] == 1
+        assert hub.counters["closed_streams"] == 1
+        assert hub.counters["dropped"] == 2
+
+    def test_event_ids_increase_across_sessions(self):
+        """Test that event ids increase across the hub, and are not used by undelivered notifications."""
+        hub = server.NotificationHub()
+        first = hub.subscribe("a")
+        second = hub.subscribe("b")
+        hub.publish("a", "notifications/message")
+        assert hub.publish("nobody", "notifications/message") == 0
+        hub.broadcast("notifications/tools/list_changed")
+        hub.publish("a", "notifications/message")
+
+        first_ids = [event_id for event_id, _ in drain(first)]
+        second_ids = [event_id for event_id, _ in drain(second)]
+        assert first_ids == sorted(first_ids) and len(set(first_ids)) == 3
+        assert set(first_ids).isdisjoint(second_ids)
+        assert sorted(first_ids + second_ids) == [1, 2, 3, 4]
+        assert hub.counters["undelivered"] == 1
+
+    def test_delivered_notifications_are_counted(self):
+        """Test that streams report sent notifications through the hub, which counts them with the rest."""
+        hub = server.NotificationHub()
+        queue = hub.subscribe("s")
+        hub.publish("s", "notifications/message")
+        for _ in drain(queue):
+            hub.mark_delivered()
+
+        stats = hub.stats()
+        assert (stats["published"], stats["delivered"], stats["queued"]) == (1, 1, 0)
+
+    def test_unknown_overflow_policy_is_rejected(self):
+        """Test that only the documented overflow policies are accepted."""
+        with pytest.raises(ValueError):
+            server.NotificationHub(overflow="block")
+
+
+class TestWorkloadArguments:
+    """Tests for the numeric arguments of the synthetic workload tools."""
+
+    @pytest.mark.parametrize("dist", ["lognormal:10,nan", "fixed:inf", "uniform:-inf,10", "pareto:10,0",
+                                      "pareto:10,-1", "normal:10,-5", "lognormal:10,-1", "gamma:1"])
+    def test_invalid_latency_specs_are_rejected(self, dist):
+        """Test that non-finite parameters, degenerate shapes and unknown distributions are refused."""
+        with pytest.raises(ValueError):
+            server.sample_latency(dist)
+
+    @pytest.mark.parametrize("dist", ["fixed:5", "uniform:1,2", "normal:10,0", "exponential:0",
+                                      "lognormal:10,800", "pareto:10,0.0001"])
+    def test_latency_is_bounded(self, dist):
+        """Test that every valid spec, however heavy its tail, gives a delay within the cap."""
+        for _ in range(20):
+            assert 0.0 <= server.sample_latency(dist) <= server.MAX_LATENCY_SECONDS
+
+    @pytest.mark.parametrize("value", ["nan", "inf", float("-inf"), -1, "ten"])
+    def test_invalid_numeric_arguments_are_rejected(self, value):
+        """Test that numeric tool arguments must be finite and not negative."""
+        with pytest.raises(ValueError):
+            server._bounded(value, "ms", 100)
+
+    def test_numeric_arguments_are_capped(self):
+        """Test that large numeric arguments are capped at the maximum."""
+        assert server._bounded("250", "ms", 100) == 100
+
+
+def make_server(**kwargs):
+    """Create a reference server with its own session store and notification hub."""
+    return server.McpReferenceServer("test-server", ["2025-03-26"], sessions=server.SessionStore(),
+                                     notifications=server.NotificationHub(), **kwargs)
+
+
+def register_tools(mcp, count, prefix="tool"):
+    """Register count tools that do nothing."""
+    for n in range(count):
+        mcp.register_tool(f"{prefix}{n}", "A test tool", {"type": "object", "properties": {}}, handler=None)
+
+
+class TestToolsPagination:
+    """Tests for tools/list pages and cursors."""
+
+    SESSION = {"protocol_version": "2025-03-26"}
+
+    async def list_all(self, mcp):
+        """Follow nextCursor through every page and return the pages."""
+        pages = [server.decode_json(await mcp.list_tools("s", session=self.SESSION))]
+        while "nextCursor" in pages[-1]:
+            pages.append(server.decode_json(await mcp.list_tools("s", pages[-1]["nextCursor"], session=self.SESSION)))
+        return pages
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_tool_once(self):
+        """Test that following the cursors lists every tool exactly once, in registration order."""
+        mcp = make_server(tools_page_size=4)
+        register_tools(mcp, 7)
+
+        pages = await self.list_all(mcp)
+
+        names = [tool["name"] for page in pages for tool in page["tools"]]
+        assert names == list(mcp.tools)
+        assert all(len(page["tools"]) == 4 for page in pages[:-1])
+        assert 0 < len(pages[-1]["tools"]) <= 4
+
+    @pytest.mark.asyncio
+    async def test_page_size_zero_lists_everything(self):
+        """Test that a page size of 0 returns the whole catalog without a cursor."""
+        mcp = make_server(tools_page_size=0)
+        register_tools(mcp, 150)
+
+        pages = await self.list_all(mcp)
+
+        assert len(pages) == 1 and len(pages[0]["tools"]) == len(mcp.tools)
+
+    @pytest.mark.asyncio
+    async def test_registration_invalidates_cache_and_cursors(self):
+        """Test that a new tool shows up in the next listing, and cursors from before are refused."""
+        mcp = make_server(tools_page_size=2)
+        first = await self.list_all(mcp)
+        stale = first[0]["nextCursor"]
+
+        register_tools(mcp, 1, prefix="late")
+
+        assert "late0" in [tool["name"] for page in await self.list_all(mcp) for tool in page["tools"]]
+        with pytest.raises(ValueError, match="Stale cursor"):
+            await mcp.list_tools("s", stale, session=self.SESSION)
+
+    @pytest.mark.asyncio
+    async def test_pages_are_serialized_once(self):
+        """Test that repeated listings reuse the cached pages until the catalog changes."""
+        mcp = make_server(tools_page_size=2)
+        page = await mcp.list_tools("s", session=self.SESSION)
+
+        assert await mcp.list_tools("s", session=self.SESSION) is page
+        register_tools(mcp, 1)
+        assert await mcp.list_tools("s", session=self.SESSION) is not page
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursors_are_rejected(self):
+        """Test that malformed, out-of-range and unversioned cursors raise ValueError."""
+        mcp = make_server(tools_page_size=2)
+        current = server.decode_tools_cursor((await self.list_all(mcp))[0]["nextCursor"])[0]
+        for cursor in ("not-a-cursor", server.encode_tools_cursor(current, 99),
+                       server.base64.urlsafe_b64encode(b"tools:1").decode()):
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                await mcp.list_tools("s", cursor, session=self.SESSION)
+
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the generation and page it was made for."""
+        assert server.decode_tools_cursor(server.encode_tools_cursor(3, 5)) == (3, 5)
+
+
+class ThreadRecordingStore(server.SessionStore):
+    """A session store that records which thread each lookup ran on."""
+
+    def __init__(self, blocking):
+        super().__init__()
+        self.blocking = blocking
+        self.threads = []
+
+    def get(self, session_id):
+        self.threads.append(server.threading.get_ident())
+        return super().get(session_id)
+
+
+class TestSessionCalls:
+    """Tests for how the server calls its session store."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("blocking", [True, False])
+    async def test_only_blocking_stores_leave_the_event_loop(self, blocking):
+        """Test that sqlite and shared stores are called on a worker thread, and the memory store inline."""
+        store = ThreadRecordingStore(blocking)
+        mcp = server.McpReferenceServer("test-server", ["2025-03-26"], sessions=store,
+                                        notifications=server.NotificationHub())
+        store.create("s", {"protocol_version": "2025-03-26"})
+
+        assert (await mcp.get_session("s"))["protocol_version"] == "2025-03-26"
+        with pytest.raises(server.HTTPException):
+            await mcp.get_session("missing")
+        assert all((thread != server.threading.get_ident()) == blocking for thread in store.threads)
+
+    def test_persistent_stores_are_blocking(self):
+        """Test that the stores doing disk or IPC work are marked as blocking."""
+        assert server.SessionStore.blocking is False
+        assert server.SqliteSessionStore.blocking is True
+        assert server.SharedSessionStore.blocking is True
+
+
+class TestHandleMessage:
+    """Tests for validation in McpReferenceServer.handle_message."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", [["tools/list"], {"name": "ping"}, 7, None])
+    async def test_non_string_method_is_invalid_request(self, method):
+        """Test that a method that is not a string is answered with -32600 and the request id."""
+        mcp = make_server()
+        mcp.sessions.create("s", {"protocol_version": "2025-03-26"})
+
+        response = await mcp.handle_message({"jsonrpc": "2.0", "id": 5, "method": method}, "s")
+
+        assert response.status_code == 400
+        assert server.decode_json(response.body) == {
+            "jsonrpc": "2.0", "id": 5, "error": {"code": -32600, "message": "Invalid Request: method must be a string"}}
+
+
+@pytest.fixture
+def introspection():
+    """Start the introspection stand-in; yields it and a function creating clients for it."""
+    stand_in, url = start_introspection_server(latency=0.05)
+
+    def client(**kwargs):
+        return server.TokenIntrospector(kwargs.pop("url", url), **kwargs)
+
+    yield stand_in, client
+    stand_in.shutdown()
+    stand_in.server_close()
+
+
+class TestTokenIntrospector:
+    """Tests for the caching token introspection client."""
+
+    @pytest.mark.asyncio
+    async def test_active_token_is_cached_until_ttl(self, introspection, clock):
+        """Test that an active token is served from the cache until the TTL passes."""
+        stand_in, client = introspection
+        introspector = client(cache_ttl=30)
+
+        info = await introspector.introspect("valid-test-token-123")
+        assert info["scope"] == ["mcp:read", "mcp:write"]
+        assert await introspector.introspect("valid-test-token-123") == info
+        assert stand_in.requests == 1
+        clock.advance(31)
+
+        assert await introspector.introspect("valid-test-token-123") is not None
+        assert stand_in.requests == 2
+        assert (introspector.counters["hits"], introspector.counters["misses"]) == (1, 2)
+        await introspector.aclose()
+
+    @pytest.mark.asyncio
+    async def test_inactive_token_is_negatively_cached(self, introspection, clock):
+        """Test that an unknown or expired token is refused from the cache for the negative TTL."""
+        stand_in, client = introspection
+        introspector = client(negative_ttl=5)
+
+        assert await introspector.introspect("expired-test-token") is None
+        assert await introspector.introspect("expired-test-token") is None
+        assert stand_in.requests == 1
+        assert introspector.counters["negative_hits"] == 1
+        clock.advance(6)
+
+        assert await introspector.introspect("expired-test-token") is None
+        assert stand_in.requests == 2
+        await introspector.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cache_never_outlives_token_exp(self, introspection, clock):
+        """Test that a token expiring before the TTL is only cached until its exp."""
+        stand_in, client = introspection
+        introspector = client(cache_ttl=60)
+
+        info = await introspector.introspect("short-lived-test-token")
+        expires, cached = introspector._cache["short-lived-test-token"]
+        assert cached == info
+        assert expires - clock.monotonic() <= info["exp"] - clock.time() <= 5
+        clock.advance(6)
+
+        assert await introspector.introspect("short-lived-test-token") is None
+        assert stand_in.requests == 2
+        await introspector.aclose()
+
+    def test_store_skips_tokens_already_past_exp(self, clock):
+        """Test that _store does not cache an active token whose exp has passed."""
+        introspector = server.TokenIntrospector("http://unused")
+        introspector._store("token", {"active": True, "exp": clock.time() - 1})
+        introspector._store("other", {"active": True, "exp": clock.time() + 10})
+
+        assert list(introspector._cache) == ["other"]
+        assert introspector._cache["other"][0] == clock.monotonic() + 10
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_request(self, introspection):
+        """Test that concurrent lookups of an uncached token make a single introspection request."""
+        stand_in, client = introspection
+        introspector = client()
+
+        results = await server.asyncio.gather(*(introspector.introspect("valid-test-token-123") for _ in range(10)))
+
+        assert all(result == results[0] for result in results) and results[0] is not None
+        assert stand_in.requests == 1
+        assert (introspector.counters["misses"], introspector.counters["coalesced"]) == (1, 9)
+        await introspector.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancelling_first_caller_does_not_fail_the_others(self, introspection):
+        """Test that the lookup continues for waiting callers when the caller that started it goes away."""
+        stand_in, client = introspection
+        introspector = client()
+
+        first = server.asyncio.ensure_future(introspector.introspect("valid-test-token-123"))
+        await server.asyncio.sleep(0.01)
+        second = server.asyncio.ensure_future(introspector.introspect("valid-test-token-123"))
+        await server.asyncio.sleep(0.01)
+        first.cancel()
+
+        assert (await second)["active"] is True
+        assert first.cancelled()
+        assert stand_in.requests == 1
+        assert "valid-test-token-123" in introspector._cache
+        await introspector.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, introspection):
+        """Test that a failed introspection refuses the token and is retried on the next lookup."""
+        stand_in, client = introspection
+        introspector = client(url=f"http://127.0.0.1:{stand_in.server_address[1]}/missing")
+
+        assert await introspector.introspect("valid-test-token-123") is None
+        assert await introspector.introspect("valid-test-token-123") is None
+
+        assert introspector.counters["errors"] == 2
+        assert introspector.counters["requests"] == 2
+        assert introspector._cache == {}
+        assert introspector._inflight == {}
+        await introspector.aclose()
+
+
+def parse_exposition(text):
+    """Parse the Prometheus text format into {family: type} and {(name, frozenset(labels)): value}."""
+    types, samples = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+            continue
+        if line.startswith("#") or not line:
+            continue
+        series, _, value = line.rpartition(" ")
+        name, _, labels = series.partition("{")
+        pairs = [pair.split("=", 1) for pair in labels.rstrip("}").split(",") if pair]
+        samples[(name, frozenset((key, raw.strip('"')) for key, raw in pairs))] = float(value)
+    return types, samples
+
+
+class TestServerMetrics:
+    """Tests for the Prometheus exposition of ServerMetrics."""
+
+    def render(self, metrics, introspection=None):
+        sessions = server.SessionStore().stats()
+        return parse_exposition(metrics.render(sessions, server.NotificationHub().stats(), introspection))
+
+    def test_requests_and_histograms_are_exposed(self):
+        """Test that request counters and cumulative histogram buckets parse with the expected values."""
+        metrics = server.ServerMetrics(buckets=(0.01, 0.1))
+        metrics.observe_request("tools/call", 200, 0.005)
+        metrics.observe_request("tools/call", 200, 0.05)
+        metrics.observe_request("tools/call", 401, 0.5)
+        types, samples = self.render(metrics)
+        worker = ("worker", str(os.getpid()))
+
+        assert types["mcp_requests_total"] == "counter"
+        assert types["mcp_request_duration_seconds"] == "histogram"
+        assert samples[("mcp_requests_total", frozenset({worker, ("method", "tools/call"), ("status", "200")}))] == 2
+        assert samples[("mcp_requests_total", frozenset({worker, ("method", "tools/call"), ("status", "401")}))] == 1
+        buckets = [samples[("mcp_request_duration_seconds_bucket", frozenset({worker, ("method", "tools/call"),
+                                                                              ("le", le)}))]
+                   for le in ("0.01", "0.1", "+Inf")]
+        assert buckets == [1, 2, 3]
+        assert samples[("mcp_request_duration_seconds_count", frozenset({worker, ("method", "tools/call")}))] == 3
+        assert samples[("mcp_request_duration_seconds_sum",
+                        frozenset({worker, ("method", "tools/call")}))] == pytest.approx(0.555)
+
+    def test_every_family_is_declared_and_labelled(self):
+        """Test that every sample belongs to a declared family, and only session metrics lack a worker label."""
+        metrics = server.ServerMetrics()
+        metrics.observe_tool("echo", False, 0.001)
+        metrics.auth_failure("invalid_token")
+        introspection = server.TokenIntrospector("http://unused").stats()
+        types, samples = self.render(metrics, introspection)
+
+        assert "mcp_token_introspection_total" in types
+        for name, labels in samples:
+            family = name.rsplit("_", 1)[0] if name.endswith(("_bucket", "_sum", "_count")) else name
+            assert family in types, name
+            assert any(key == "worker" for key, _ in labels) == (not family.startswith("mcp_sessions_")), name
+        assert samples[("mcp_tool_calls_total", frozenset({("worker", str(os.getpid())), ("tool", "echo"),
+                                                           ("outcome", "error")}))] == 1
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        assert server._metric_line("m", 1, {"a": 'x"y\\z\n'}) == 'm{a="x\\"y\\\\z\\n"} 1'
@@ -0,0 +1,242 @@
+"""
+Tests for the 2025-03-26 reference STDIO server, run as a subprocess.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "..", "..", "ref_stdio_server", "stdio_server_2025_03_26.py")
+
+
+class ServerProcess:
+    """The server under test, with its stdout read on a background thread."""
+
+    def __init__(self, args, env):
+        self.process = subprocess.Popen([sys.executable, SERVER, *args], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env)
+        self.messages = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.messages.put(json.loads(line))
+
+    def send(self, message):
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+
+    def receive(self, timeout=5.0):
+        """Return the next message from the server, failing the test if none arrives in time."""
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            pytest.fail(f"No message from the server within {timeout}s")
+
+    def request(self, request_id, method, params=None):
+        """Send a request and return the next message, which must be its response."""
+        self.send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        response = self.receive()
+        assert response["id"] == request_id
+        return response
+
+
+@pytest.fixture
+def start_server():
+    """Start initialized servers with the given arguments and environment."""
+    servers = []
+
+    def start(*args, **env):
+        server = ServerProcess(args, {**os.environ, **env})
+        servers.append(server)
+        server.request(0, "initialize", {"protocolVersion": "2025-03-26", "capabilities": {},
+                                         "clientInfo": {"name": "test", "version": "1"}})
+        server.send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        return server
+
+    yield start
+    for server in servers:
+        server.process.kill()
+        server.process.wait()
+
+
+def call(server, request_id, tool, **arguments):
+    """Send a tools/call request without waiting for the response."""
+    server.send({"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+                 "params": {"name": tool, "arguments": arguments}})
+
+
+def test_fast_request_overtakes_slow_one(start_server):
+    """Test that a request is answered while an earlier slow one is still running."""
+    server = start_server()
+    started = time.monotonic()
+    call(server, 1, "sleep", seconds=1.0)
+    call(server, 2, "echo", message="hi")
+
+    first = server.receive()
+    assert first["id"] == 2 and first["result"]["content"] == {"echo": "hi"}
+    assert time.monotonic() - started < 1.0
+    assert server.receive()["id"] == 1
+
+
+def test_overlapping_requests_run_concurrently(start_server):
+    """Test that several slow requests share the worker pool instead of queueing."""
+    server = start_server("--workers", "4")
+    started = time.monotonic()
+    for request_id in range(1, 5):
+        call(server, request_id, "sleep", seconds=0.5)
+
+    assert sorted(server.receive()["id"] for _ in range(4)) == [1, 2, 3, 4]
+    assert time.monotonic() - started < 1.5
+
+
+def test_strict_order_answers_in_arrival_order(start_server):
+    """Test that --strict-order handles one request at a time and answers in order."""
+    server = start_server("--strict-order")
+    started = time.monotonic()
+    call(server, 1, "sleep", seconds=0.3)
+    call(server, 2, "echo", message="hi")
+
+    assert [server.receive()["id"] for _ in range(2)] == [1, 2]
+    assert time.monotonic() - started >= 0.3
+
+
+def test_cancelled_request_gets_no_response(start_server):
+    """Test that notifications/cancelled stops a running call and suppresses its response."""
+    server = start_server("--workers", "1")
+    call(server, 1, "sleep", seconds=5)
+    time.sleep(0.2)
+    server.send({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                 "params": {"requestId": 1, "reason": "test"}})
+
+    # With one worker, the echo is only answered once the sleep has stopped
+    call(server, 2, "echo", message="hi")
+    assert server.receive(timeout=2.0)["id"] == 2
+    time.sleep(0.2)
+    assert server.messages.empty()
+
+
+def call_async(server, request_id, tool, progress_token=None, **arguments):
+    """Start an async tool call and return its call id, with any notifications sent before the response."""
+    params = {"name": tool, "arguments": arguments}
+    if progress_token is not None:
+        params["_meta"] = {"progressToken": progress_token}
+    server.send({"jsonrpc": "2.0", "id": request_id, "method": "tools/call-async", "params": params})
+    early = receive_until(server, lambda message: message.get("id") == request_id)
+    return early.pop()["result"]["id"], early
+
+
+def receive_until(server, done):
+    """Return the messages received up to and including the first one for which done is true."""
+    messages = [server.receive()]
+    while not done(messages[-1]):
+        messages.append(server.receive())
+    return messages
+
+
+def is_completed(message):
+    """Return whether a message is the completion notification of an async call."""
+    return message.get("method") == "notifications/tools/completed"
+
+
+def test_async_call_runs_in_background(start_server):
+    """Test that an async call runs without polling and reports progress and completion."""
+    server = start_server()
+    call_id, early = call_async(server, 1, "sleep", progress_token="p", duration=0.2)
+
+    messages = early + receive_until(server, is_completed)
+    assert [m["params"]["progress"] for m in messages[:-1]] == list(range(1, 11))
+    assert messages[-1]["params"] == {"id": call_id, "status": "completed", "content": {"slept": 0.2}}
+    assert server.request(2, "tools/result", {"id": call_id})["result"]["status"] == "completed"
+
+
+def test_cancel_stops_running_async_call(start_server):
+    """Test that tools/cancel stops a running call, which stays cancelled."""
+    server = start_server()
+    call_id, _ = call_async(server, 1, "sleep", progress_token="p", duration=30)
+    started = time.monotonic()
+
+    server.send({"jsonrpc": "2.0", "id": 2, "method": "tools/cancel", "params": {"id": call_id}})
+    messages = [server.receive(), server.receive()]
+    assert time.monotonic() - started < 2
+    assert {"jsonrpc": "2.0", "id": 2, "result": {"success": True}} in messages
+    completed = [message for message in messages if is_completed(message)]
+    assert completed[0]["params"] == {"id": call_id, "status": "cancelled"}
+    assert server.request(3, "tools/result", {"id": call_id})["result"] == {"status": "cancelled"}
+
+
+def test_cancel_of_queued_async_call_is_announced(start_server):
+    """Test that a call cancelled before an async worker picks it up still reports its cancellation."""
+    server = start_server("--workers", "1")
+    running, _ = call_async(server, 1, "sleep", progress_token="a", duration=30)
+    queued, _ = call_async(server, 2, "sleep", progress_token="b", duration=30)
+
+    server.send({"jsonrpc": "2.0", "id": 3, "method": "tools/cancel", "params": {"id": queued}})
+    messages = [server.receive(timeout=2.0), server.receive(timeout=2.0)]
+
+    assert {"jsonrpc": "2.0", "id": 3, "result": {"success": True}} in messages
+    assert [m["params"] for m in messages if is_completed(m)] == [{"id": queued, "status": "cancelled"}]
+    assert server.request(4, "tools/result", {"id": queued})["result"] == {"status": "cancelled"}
+    assert server.request(5, "tools/result", {"id": running})["result"] == {"status": "running"}
+
+
+def test_finished_async_calls_are_evicted_after_retention(start_server):
+    """Test that a finished call is forgotten once the retention window has passed."""
+    server = start_server(MCP_ASYNC_RETENTION="0.3")
+    call_id, early = call_async(server, 1, "echo", progress_token="p", message="hi")
+    if not early:
+        receive_until(server, is_completed)
+
+    assert server.request(2, "tools/result", {"id": call_id})["result"]["status"] == "completed"
+    time.sleep(0.5)
+    error = server.request(3, "tools/result", {"id": call_id})["error"]
+    assert error["code"] == -32602 and call_id in error["message"]
+
+
+@pytest.mark.parametrize("tool, arguments", [
+    ("latency", {"dist": "lognormal:10,nan"}),
+    ("latency", {"dist": "fixed:inf"}),
+    ("latency", {"dist": "pareto:10,0"}),
+    ("latency", {"dist": "normal:10,-5"}),
+    ("cpu_burn", {"ms": "nan"}),
+    ("payload", {"bytes": "inf"}),
+])
+def test_benchmark_tools_reject_invalid_numbers(start_server, tool, arguments):
+    """Test that non-finite arguments and degenerate distributions are invalid params."""
+    server = start_server("--benchmark-tools")
+    error = server.request(1, "tools/call", {"name": tool, "arguments": arguments})["error"]
+    assert error["code"] == -32602
+
+
+def test_latency_tool_stays_within_cap(start_server):
+    """Test that a tail heavy enough to leave the float range still gives a bounded delay."""
+    server = start_server("--benchmark-tools")
+    response = server.request(1, "tools/call", {"name": "latency", "arguments": {"dist": "pareto:0,0.0001"}})
+    assert "error" not in response
+
+
+def test_tools_follow_negotiated_version(start_server):
+    """Test that tools/list and tools/call use the catalog of the session's protocol version."""
+    server = start_server("--generated-tools", "3")
+    names = [tool["name"] for tool in server.request(1, "tools/list")["result"]["tools"]]
+    assert names == ["echo", "add", "sleep", "generated_0000", "generated_0001", "generated_0002"]
+    assert "result" in server.request(2, "tools/call", {"name": "generated_0001", "arguments": {"p0": "x"}})
+    assert server.request(3, "tools/call", {"name": "missing", "arguments": {}})["error"]["code"] == -32602
+
+    legacy = ServerProcess(["--generated-tools", "3"], os.environ)
+    try:
+        legacy.request(0, "initialize", {"protocolVersion": "2024-11-05", "capabilities": {},
+                                         "clientInfo": {"name": "test", "version": "1"}})
+        names = [tool["name"] for tool in legacy.request(1, "tools/list")["result"]["tools"]]
+        assert names == ["echo", "add", "generated_0000", "generated_0001", "generated_0002"]
+        error = legacy.request(2, "tools/call", {"name": "sleep", "arguments": {"seconds": 0.01}})["error"]
+        assert error["code"] == -32602
+    finally:
+        legacy.process.kill()
+        legacy.process.wait()
@@ -696,6 +696,13 @@ class TestComplianceReport(unittest.TestCase):
             # Clean up temp file
             os.unlink(config_path)
 
+    def test_differential_test_runner_cancel_grace(self):
+        """Test that the differential runner honours --cancel-grace like the verbose runner."""
+        runner = compliance_report.DifferentialTestRunner(baseline_command="baseline-server", cancel_grace=3.5)
+
+        self.assertEqual(runner.cancel_grace, 3.5)
+        self.assertEqual(runner.baseline_command, "baseline-server")
+
     def test_log_with_timestamp(self):
         """Test the log_with_timestamp function."""
         with patch('mcp_testing.scripts.compliance_report.datetime') as mock_datetime:
@@ -0,0 +1,60 @@
+"""
+Unit tests for the merge_results.py script.
+"""
+
+import json
+import sys
+from unittest.mock import patch
+
+from mcp_testing.scripts import merge_results
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.result_sink import NDJSONResultSink
+
+
+def write_json_shard(path, shard, results, latency=None):
+    path.write_text(json.dumps({
+        "server": "echo",
+        "server_command": "python echo.py",
+        "protocol_version": "2025-03-26",
+        "shard": shard,
+        "results": {"results": results, "latency": latency or {}},
+    }))
+
+
+def test_load_result_file_formats(tmp_path):
+    """Test reading compliance JSON, plain results JSON and NDJSON inputs."""
+    report = tmp_path / "shard1.json"
+    write_json_shard(report, "1/2", [{"name": "test_a", "passed": True}])
+    plain = tmp_path / "plain.json"
+    plain.write_text(json.dumps({"results": [{"name": "test_b", "passed": False}]}))
+    stream = tmp_path / "shard2.ndjson"
+    sink = NDJSONResultSink(str(stream))
+    sink.open({"server_command": "python echo.py", "shard": "2/2"})
+    sink.write({"name": "test_c", "passed": True})
+
+    info, part = merge_results.load_result_file(str(report))
+    assert info["shard"] == "1/2" and part["results"][0]["name"] == "test_a"
+    assert merge_results.load_result_file(str(plain)) == ({}, {"results": [{"name": "test_b", "passed": False}]})
+    info, part = merge_results.load_result_file(str(stream))
+    assert info["shard"] == "2/2" and part["results"] == [{"name": "test_c", "passed": True}]
+
+
+def test_main_merges_shards(tmp_path):
+    """Test the merged report, latency and exit code."""
+    latency = LatencyRecorder()
+    latency.record("tools/list", 0.002)
+    first, second = tmp_path / "shard1.json", tmp_path / "shard2.json"
+    write_json_shard(first, "1/2", [{"name": "test_a", "passed": True, "duration": 1.0}], latency.to_dict())
+    write_json_shard(second, "2/2", [{"name": "test_b", "passed": False, "duration": 2.0, "message": "bad"}],
+                     latency.to_dict())
+    output_dir = tmp_path / "out"
+
+    argv = ["merge_results", str(first), str(second), "--output-dir", str(output_dir), "--json"]
+    with patch.object(sys, "argv", argv):
+        assert merge_results.main() == 1
+
+    merged = json.loads(next(output_dir.glob("*_merged.json")).read_text())
+    assert merged["shards"] == 2
+    assert merged["compliance_percentage"] == 50.0
+    assert merged["results"]["latency"]["tools/list"]["count"] == 2
+    assert "| B | 2.00s | bad |" in next(output_dir.glob("*_merged.md")).read_text()
@@ -0,0 +1,134 @@
+"""
+Tests for the client-side request dispatcher.
+"""
+
+import json
+import sys
+import textwrap
+
+import pytest
+
+from mcp_testing.transports.dispatcher import (
+    METHOD_NOT_FOUND,
+    CannedResponder,
+    ClientRequestDispatcher,
+    LatencyResponder,
+    ScriptedResponder,
+    load_responders,
+    server_requests_to_markdown,
+)
+from mcp_testing.transports.stdio import StdioTransportAdapter
+
+# Answers tools/call only after asking the client for a sampling message, and
+# sends a log notification first
+FAKE_SERVER = textwrap.dedent("""
+    import json, sys
+    for line in sys.stdin:
+        message = json.loads(line)
+        if message.get("method") == "tools/call":
+            print(json.dumps({"jsonrpc": "2.0", "method": "notifications/message", "params": {"data": "working"}}))
+            print(json.dumps({"jsonrpc": "2.0", "id": "s1", "method": "sampling/createMessage",
+                              "params": {"messages": []}}), flush=True)
+            answer = json.loads(sys.stdin.readline())
+            print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {"sampled": answer}}), flush=True)
+        elif "id" in message:
+            print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}), flush=True)
+""")
+
+
+def answer(dispatcher, request):
+    """Dispatch a request and return the written response."""
+    written = []
+    dispatcher.dispatch(request, written.append).result(timeout=5)
+    return written[0]
+
+
+def test_default_and_unknown_methods():
+    """Test the default answers and method-not-found for anything else."""
+    dispatcher = ClientRequestDispatcher()
+    try:
+        roots = answer(dispatcher, {"jsonrpc": "2.0", "id": 1, "method": "roots/list"})
+        elicit = answer(dispatcher, {"jsonrpc": "2.0", "id": 2, "method": "elicitation/create", "params": {
+            "message": "Who?", "requestedSchema": {"properties": {
+                "name": {"type": "string"}, "age": {"type": "integer"}, "size": {"enum": ["s", "m"]}}}}})
+        unknown = answer(dispatcher, {"jsonrpc": "2.0", "id": 3, "method": "unknown/method"})
+    finally:
+        dispatcher.close()
+
+    assert roots["id"] == 1 and roots["result"]["roots"]
+    assert elicit["result"] == {"action": "accept", "content": {"name": "test", "age": 1, "size": "s"}}
+    assert unknown["error"]["code"] == METHOD_NOT_FOUND
+    summary = dispatcher.summary()
+    assert summary["unknown/method"]["errors"] == 1
+    assert summary["roots/list"]["count"] == 1
+
+
+def test_scripted_and_latency_responders():
+    """Test that scripted steps run in order and latency is injected."""
+    scripted = ScriptedResponder([{"result": {"n": 1}}, {"error": {"code": -1, "message": "no"}}])
+    dispatcher = ClientRequestDispatcher({
+        "sampling/createMessage": scripted,
+        "roots/list": LatencyResponder(CannedResponder({"roots": []}), delay=0.1),
+    })
+    try:
+        request = {"jsonrpc": "2.0", "id": 1, "method": "sampling/createMessage"}
+        responses = [answer(dispatcher, request) for _ in range(3)]
+        slow = answer(dispatcher, {"jsonrpc": "2.0", "id": 2, "method": "roots/list"})
+    finally:
+        dispatcher.close()
+
+    assert responses[0]["result"] == {"n": 1}
+    assert responses[1]["error"] == {"code": -1, "message": "no"} == responses[2]["error"]
+    assert slow["result"] == {"roots": []}
+    assert dispatcher.summary()["roots/list"]["p50"] >= 0.09
+
+
+def test_load_responders(tmp_path):
+    """Test reading responders from a JSON file."""
+    path = tmp_path / "responders.json"
+    path.write_text(json.dumps({
+        "sampling/createMessage": {"script": [{"result": {"a": 1}}], "delay": 0.01},
+        "roots/list": {"error": {"code": -32000, "message": "denied"}},
+        "elicitation/create": {"delay": 0.01},
+    }))
+    responders = load_responders(str(path))
+
+    assert isinstance(responders["sampling/createMessage"], LatencyResponder)
+    assert responders["sampling/createMessage"].respond({}) == {"a": 1}
+    assert responders["elicitation/create"].respond({})["action"] == "accept"
+
+    path.write_text(json.dumps({"custom/method": {"delay": 1}}))
+    with pytest.raises(ValueError):
+        load_responders(str(path))
+
+
+@pytest.mark.parametrize("with_dispatcher", [True, False])
+def test_stdio_answers_server_requests(tmp_path, with_dispatcher):
+    """Test that server requests and notifications are not mistaken for the response."""
+    script = tmp_path / "server.py"
+    script.write_text(FAKE_SERVER)
+    dispatcher = ClientRequestDispatcher() if with_dispatcher else None
+    transport = StdioTransportAdapter(f"{sys.executable} {script}", dispatcher=dispatcher)
+    assert transport.start()
+    try:
+        response = transport.send_request({"jsonrpc": "2.0", "id": "c1", "method": "tools/call"})
+    finally:
+        transport.stop()
+
+    assert response["id"] == "c1"
+    sampled = response["result"]["sampled"]
+    assert sampled["id"] == "s1"
+    if with_dispatcher:
+        assert sampled["result"]["role"] == "assistant"
+        assert dispatcher.summary()["sampling/createMessage"]["count"] == 1
+        dispatcher.close()
+    else:
+        assert sampled["error"]["code"] == METHOD_NOT_FOUND
+    assert [n["method"] for n in transport.notifications] == ["notifications/message"]
+
+
+def test_markdown():
+    """Test the report table."""
+    lines = server_requests_to_markdown({"roots/list": {"count": 2, "errors": 0, "p50": 0.001,
+                                                        "p99": 0.002, "max": 0.002}})
+    assert "| roots/list | 2 | 0 | 1.00ms | 2.00ms | 2.00ms |" in lines
@@ -0,0 +1,177 @@
+"""
+Unit tests for the mirroring transport adapter.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from mcp_testing.transports.mirror import MirroringTransportAdapter
+from mcp_testing.utils.cancellation import cancel_after_timeout
+from mcp_testing.utils.differential import compare_exchanges
+
+
+def make_transport(responses=None, start=True):
+    """Create a mock transport that returns the given responses in order."""
+    transport = MagicMock()
+    transport.start.return_value = start
+    transport.stop.return_value = True
+    transport.send_request.side_effect = list(responses or [])
+    return transport
+
+
+class TestMirroringTransportAdapter:
+    """Tests for the MirroringTransportAdapter class."""
+
+    def test_start_requires_both_transports(self):
+        """Test that start fails and cleans up when the baseline fails to start."""
+        primary = make_transport()
+        mirror = make_transport(start=False)
+        adapter = MirroringTransportAdapter(primary, mirror)
+
+        assert adapter.start() is False
+        assert adapter.is_started is False
+        primary.stop.assert_called_once()
+        mirror.stop.assert_called_once()
+
+    def test_send_request_returns_primary_and_records_both(self):
+        """Test that requests go to both servers and the target response is returned."""
+        primary = make_transport([{"jsonrpc": "2.0", "id": 1, "result": {"value": "target"}}])
+        mirror = make_transport([{"jsonrpc": "2.0", "id": 1, "result": {"value": "baseline"}}])
+        adapter = MirroringTransportAdapter(primary, mirror)
+        adapter.start()
+
+        request = {"jsonrpc": "2.0", "id": 1, "method": "ping"}
+        response = adapter.send_request(request)
+        adapter.wait_for_mirror(1.0)
+
+        assert response["result"]["value"] == "target"
+        mirror.send_request.assert_called_once_with(request)
+        assert len(adapter.exchanges) == 1
+        exchange = adapter.exchanges[0]
+        assert exchange["method"] == "ping"
+        assert exchange["baseline_response"]["result"]["value"] == "baseline"
+        assert exchange["target_latency"] >= 0
+        assert exchange["baseline_latency"] >= 0
+
+    def test_recorded_response_is_isolated_from_caller_mutation(self):
+        """Test that mutating the returned response does not change the record."""
+        primary = make_transport([{"jsonrpc": "2.0", "id": 1, "result": {"tools": []}}])
+        mirror = make_transport([{"jsonrpc": "2.0", "id": 1, "result": {"tools": []}}])
+        adapter = MirroringTransportAdapter(primary, mirror)
+        adapter.start()
+
+        response = adapter.send_request({"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+        response["result"]["tools"].append({"name": "added"})
+
+        assert adapter.exchanges[0]["target_response"]["result"]["tools"] == []
+
+    def test_server_issued_ids_are_translated_for_baseline(self):
+        """Test that ids returned by the target are rewritten to the baseline's ids."""
+        primary = make_transport([
+            {"jsonrpc": "2.0", "id": "a", "result": {"id": "target-call"}},
+            {"jsonrpc": "2.0", "id": "b", "result": {"status": "completed"}},
+        ])
+        mirror = make_transport([
+            {"jsonrpc": "2.0", "id": "a", "result": {"id": "baseline-call"}},
+            {"jsonrpc": "2.0", "id": "b", "result": {"status": "completed"}},
+        ])
+        adapter = MirroringTransportAdapter(primary, mirror)
+        adapter.start()
+
+        adapter.send_request({"jsonrpc": "2.0", "id": "a", "method": "tools/call-async"})
+        adapter.send_request({"jsonrpc": "2.0", "id": "b", "method": "tools/result",
+                              "params": {"id": "target-call"}})
+        adapter.wait_for_mirror(1.0)
+
+        primary_request = primary.send_request.call_args[0][0]
+        mirror_request = mirror.send_request.call_args[0][0]
+        assert primary_request["params"]["id"] == "target-call"
+        assert mirror_request["params"]["id"] == "baseline-call"
+
+    def test_target_error_is_raised_baseline_error_is_recorded(self):
+        """Test error handling on each side of the mirror."""
+        primary = make_transport([{"jsonrpc": "2.0", "id": 1, "result": {}}])
+        mirror = make_transport()
+        mirror.send_request.side_effect = ConnectionError("baseline down")
+        adapter = MirroringTransportAdapter(primary, mirror)
+        adapter.start()
+
+        adapter.send_request({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        adapter.wait_for_mirror(1.0)
+        assert adapter.exchanges[0]["baseline_error"] == "baseline down"
+
+        primary.send_request.side_effect = ConnectionError("target down")
+        with pytest.raises(ConnectionError, match="target down"):
+            adapter.send_request({"jsonrpc": "2.0", "id": 2, "method": "ping"})
+
+    def test_not_started(self):
+        """Test that sending before start raises ConnectionError."""
+        adapter = MirroringTransportAdapter(make_transport(), make_transport())
+        with pytest.raises(ConnectionError):
+            adapter.send_request({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        with pytest.raises(ConnectionError):
+            adapter.send_notification({"jsonrpc": "2.0", "method": "initialized"})
+
+    def test_slow_baseline_does_not_hold_up_target(self):
+        """Test that the target's response is returned while the baseline is still busy."""
+        release = threading.Event()
+        primary = make_transport([{"jsonrpc": "2.0", "id": 1, "result": {}}])
+        mirror = make_transport()
+        mirror.send_request.side_effect = lambda request: release.wait(5) and {"jsonrpc": "2.0", "id": 1}
+        adapter = MirroringTransportAdapter(primary, mirror, mirror_timeout=0.05)
+        adapter.start()
+
+        started = time.monotonic()
+        adapter.send_request({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        assert time.monotonic() - started < 1.0
+
+        assert adapter.stop() is True
+        release.set()
+        exchange = adapter.exchanges[0]
+        assert "did not answer" in exchange["baseline_error"]
+        assert exchange["target_error"] is None
+        assert compare_exchanges(adapter.exchanges)[0]["differences"][0]["target"] == "ok"
+
+    def test_stop_shuts_down_worker(self):
+        """Test that stopping the adapter releases its worker thread."""
+        adapter = MirroringTransportAdapter(make_transport(), make_transport())
+        adapter.start()
+        executor = adapter._executor
+
+        adapter.stop()
+
+        assert adapter._executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+    def test_deadlines_and_cancellation_follow_primary(self):
+        """Test that deadlines reach both servers and a timed-out request is cancelled on both."""
+        primary = make_transport([{"jsonrpc": "2.0", "id": "ping", "result": {}}])
+        mirror = make_transport([{"jsonrpc": "2.0", "id": "ping", "result": {}}])
+        for transport in (primary, mirror):
+            transport.supports_deadline = True
+            transport.deadline_expired = False
+            transport.outstanding = {7: "tools/call"}
+            transport.cancelled = set()
+            transport.late_responses = 0
+        adapter = MirroringTransportAdapter(primary, mirror)
+        adapter.start()
+
+        assert adapter.supports_deadline is True
+        adapter.set_deadline(2.0)
+        primary.set_deadline.assert_called_with(2.0)
+        mirror.set_deadline.assert_called_with(2.0)
+        primary.deadline_expired = True
+        assert adapter.deadline_expired is True
+
+        cancellation = cancel_after_timeout(adapter, "timed out")
+        adapter.wait_for_mirror(1.0)
+
+        assert cancellation["requests"] == ["7"] and cancellation["healthy"] is True
+        assert primary.outstanding == {} and mirror.outstanding == {}
+        assert 7 in primary.cancelled and 7 in mirror.cancelled
+        cancelled = [call.args[0] for call in mirror.send_notification.call_args_list]
+        assert cancelled[0]["params"]["requestId"] == 7
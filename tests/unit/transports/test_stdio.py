@@ -2,6 +2,7 @@
 Unit tests for the StdIO transport adapter.
 """
 
+import io
 import pytest
 import json
 import subprocess
@@ -275,6 +276,33 @@ class TestStdioTransportAdapter:
         adapter.process.stdin.flush.assert_called_once()
         adapter.process.stdout.readline.assert_called_once()
 
+    def test_send_request_records_latency(self):
+        """Test that successful requests are recorded in the latency histograms."""
+        adapter = StdioTransportAdapter(server_command="python server.py")
+        adapter.is_started = True
+        adapter.process = MagicMock()
+        adapter.process.stdout.readline.return_value = '{"jsonrpc": "2.0", "result": {}, "id": 1}'
+        
+        adapter.send_request({"jsonrpc": "2.0", "method": "tools/list", "id": 1})
+        adapter.send_request({"jsonrpc": "2.0", "method": "tools/list", "id": 2})
+        
+        assert adapter.latency.histograms["tools/list"].count == 2
+
+    def test_send_batch_records_latency(self):
+        """Test that a batch is answered and recorded in the latency histograms."""
+        adapter = StdioTransportAdapter(server_command="python server.py")
+        adapter.is_started = True
+        adapter.process = MagicMock()
+        responses = [{"jsonrpc": "2.0", "result": {}, "id": 1}, {"jsonrpc": "2.0", "result": {}, "id": 2}]
+        # Batches wait on a deadline, so stdout is read by the reader thread
+        adapter.process.stdout = io.StringIO(json.dumps(responses) + "\n")
+
+        result = adapter.send_batch([{"jsonrpc": "2.0", "method": "ping", "id": 1},
+                                     {"jsonrpc": "2.0", "method": "ping", "id": 2}])
+
+        assert result == responses
+        assert adapter.latency.histograms["batch"].count == 1
+
     def test_send_request_empty_response(self):
         """Test sending request with empty response."""
         # Create adapter with mock process
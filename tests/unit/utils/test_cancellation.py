@@ -0,0 +1,142 @@
+"""
+Unit tests for the cooperative cancellation module.
+"""
+
+import sys
+import textwrap
+import time
+
+import pytest
+
+from mcp_testing.transports.base import RequestTimeoutError
+from mcp_testing.transports.stdio import StdioTransportAdapter
+from mcp_testing.utils.cancellation import (
+    cancel_after_timeout,
+    cancellation_to_markdown,
+    summarize_cancellations,
+)
+
+# Never answers "slow"; on cancellation it still sends the stale answer, and
+# answers pings unless started with "dead"
+FAKE_SERVER = textwrap.dedent("""
+    import json, sys
+    dead = "dead" in sys.argv
+    for line in sys.stdin:
+        message = json.loads(line)
+        if isinstance(message, list):
+            if all(m["method"] != "slow" for m in message):
+                print(json.dumps([{"jsonrpc": "2.0", "id": m["id"], "result": {}} for m in message]), flush=True)
+            continue
+        method = message.get("method")
+        if method == "notifications/cancelled":
+            if not dead:
+                print(json.dumps({"jsonrpc": "2.0", "id": message["params"]["requestId"], "result": {}}), flush=True)
+        elif method == "slow" or (dead and method == "ping"):
+            continue
+        elif "id" in message:
+            print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}), flush=True)
+""")
+
+
+@pytest.fixture
+def start_server(tmp_path):
+    """Start the fake server over the stdio transport."""
+    script = tmp_path / "server.py"
+    script.write_text(FAKE_SERVER)
+    transports = []
+
+    def start(*args):
+        transport = StdioTransportAdapter(" ".join([sys.executable, str(script), *args]))
+        assert transport.start()
+        transports.append(transport)
+        return transport
+
+    yield start
+    for transport in transports:
+        transport.process.kill()
+        transport.stop()
+
+
+def test_deadline_stops_blocked_read(start_server):
+    """Test that a request to a hung server fails at the deadline."""
+    transport = start_server()
+    transport.set_deadline(0.3)
+    started = time.monotonic()
+    with pytest.raises(RequestTimeoutError):
+        transport.send_request({"jsonrpc": "2.0", "id": 7, "method": "slow"})
+
+    assert time.monotonic() - started < 2
+    assert transport.deadline_expired
+    assert transport.outstanding == {7: "slow"}
+
+
+def test_batch_respects_deadline(start_server):
+    """Test that batches are read through the deadline reader, and a hung batch fails at the deadline."""
+    transport = start_server()
+    transport.set_deadline(2.0)
+    assert transport.send_request({"jsonrpc": "2.0", "id": 1, "method": "tools/list"})["id"] == 1
+    batch = transport.send_batch([{"jsonrpc": "2.0", "id": i, "method": "tools/list"} for i in (2, 3)])
+    assert [r["id"] for r in batch] == [2, 3]
+
+    transport.set_deadline(0.3)
+    with pytest.raises(RequestTimeoutError):
+        transport.send_batch([{"jsonrpc": "2.0", "id": 4, "method": "slow"}])
+
+
+def test_cancel_keeps_healthy_server(start_server):
+    """Test that cancelled requests are reported, stale answers dropped and the session reused."""
+    transport = start_server()
+    transport.set_deadline(0.2)
+    with pytest.raises(RequestTimeoutError):
+        transport.send_request({"jsonrpc": "2.0", "id": "call-1", "method": "slow"})
+
+    cancellation = cancel_after_timeout(transport, "test timed out", grace=2.0)
+
+    assert cancellation["healthy"]
+    assert cancellation["requests"] == ["call-1"]
+    assert cancellation["late_responses"] == 1
+    assert 0 <= cancellation["latency"] < 2.0
+    assert transport.deadline is None
+    assert transport.send_request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})["id"] == 2
+
+
+def test_cancel_gives_up_on_unresponsive_server(start_server):
+    """Test that a server that does not answer the ping is reported and not waited for again."""
+    transport = start_server("dead")
+    transport.set_deadline(0.2)
+    with pytest.raises(RequestTimeoutError):
+        transport.send_request({"jsonrpc": "2.0", "id": 1, "method": "slow"})
+
+    cancellation = cancel_after_timeout(transport, "test timed out", grace=0.2)
+
+    assert not cancellation["healthy"]
+    assert cancellation["latency"] is None
+    with pytest.raises(RequestTimeoutError):
+        transport.send_request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+
+
+def test_initialize_is_not_cancelled(start_server):
+    """Test that a hung initialize is never cancelled."""
+    transport = start_server()
+    transport.outstanding["init"] = "initialize"
+
+    cancellation = cancel_after_timeout(transport, "initialize timed out")
+
+    assert cancellation["requests"] == [] and not cancellation["healthy"]
+
+
+def test_summary_and_markdown():
+    """Test the per-run cancellation summary."""
+    summary = summarize_cancellations([
+        None,
+        {"requests": ["1"], "healthy": True, "latency": 0.010, "late_responses": 0},
+        {"requests": ["2", "3"], "healthy": True, "latency": 0.030, "late_responses": 1},
+        {"requests": ["4"], "healthy": False, "latency": None, "late_responses": 0},
+    ])
+
+    assert (summary["timeouts"], summary["requests"], summary["healthy"]) == (3, 4, 2)
+    assert summary["latency"]["p50"] == pytest.approx(0.020)
+    assert summarize_cancellations([None]) is None
+    lines = "\n".join(cancellation_to_markdown(summary))
+    assert "- **Server Recovered**: 2 of 3" in lines
+    assert "p50 20.0ms, max 30.0ms" in lines
@@ -0,0 +1,194 @@
+"""
+Unit tests for the chaos proxy.
+"""
+
+import http.client
+import json
+import random
+import sys
+import textwrap
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mcp_testing.transports.stdio import StdioTransportAdapter
+from mcp_testing.utils.chaos import (
+    ChaosChannel,
+    ChaosHTTPProxy,
+    ChaosProfile,
+    ChaosSettings,
+    LatencyDistribution,
+    chaos_server_command,
+    chaos_to_markdown,
+    read_chaos_stats,
+    summarize_chaos,
+)
+from mcp_testing.utils.histogram import LatencyRecorder
+
+# Answers every request with its id
+ECHO_SERVER = textwrap.dedent("""
+    import json, sys
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" in message:
+            print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}), flush=True)
+""")
+
+
+def deliver(settings, frames, seed=1):
+    """Send frames through a channel and return what was written, in order."""
+    written = []
+    channel = ChaosChannel(ChaosSettings(settings), written.append, random.Random(seed))
+    for frame in frames:
+        channel.send(frame)
+    channel.close()
+    return written, channel.stats()
+
+
+def test_profile_validation():
+    """Test that per-direction settings override shared ones and bad profiles are rejected."""
+    profile = ChaosProfile({"latency": 0.01, "drop": 0.5, "server_to_client": {"drop": 0}})
+    assert profile.directions["client_to_server"].drop == 0.5
+    assert profile.directions["server_to_client"].drop == 0
+    assert profile.directions["server_to_client"].latency.describe() == "fixed(value=0.01)"
+
+    for spec in ({"drop": 2}, {"lag": 1}, {"latency": {"distribution": "weibull"}},
+                 {"latency": {"distribution": "uniform", "min": 0}}, {"client_to_server": []}):
+        with pytest.raises(ValueError):
+            ChaosProfile(spec)
+
+
+def test_latency_distributions():
+    """Test that samples are non-negative and follow the parameters."""
+    rng = random.Random(3)
+    uniform = [LatencyDistribution({"distribution": "uniform", "min": 0.1, "max": 0.2}).sample(rng)
+               for _ in range(200)]
+    lognormal = sorted(LatencyDistribution({"distribution": "lognormal", "median": 0.05, "sigma": 0.5})
+                       .sample(rng) for _ in range(1001))
+    normal = [LatencyDistribution({"distribution": "normal", "mean": 0, "stddev": 1}).sample(rng)
+              for _ in range(200)]
+
+    assert all(0.1 <= value <= 0.2 for value in uniform)
+    assert lognormal[500] == pytest.approx(0.05, rel=0.15)
+    assert min(normal) == 0.0
+
+
+def test_channel_faults():
+    """Test dropping, duplicating, reordering and partial writes."""
+    frames = [f"{i}\n".encode() for i in range(20)]
+
+    written, stats = deliver({"drop": 1}, frames)
+    assert written == [] and stats["dropped"] == 20
+
+    written, stats = deliver({"duplicate": 1}, frames[:3])
+    assert written == [b"0\n", b"0\n", b"1\n", b"1\n", b"2\n", b"2\n"]
+
+    written, stats = deliver({"reorder": 0.3, "reorder_delay": 0.05}, frames)
+    assert sorted(written) == sorted(frames) and written != frames
+    assert stats["reordered"] > 0
+
+    written, stats = deliver({"partial_write": 1, "partial_pause": 0}, [b"abcdef\n"])
+    assert b"".join(written) == b"abcdef\n" and len(written) == 2
+    assert stats["partial_writes"] == 1
+
+
+def test_seeded_channel_is_reproducible():
+    """Test that a seeded channel makes the same drops and partial-write splits on every run."""
+    frames = [f"frame-{i:03d}\n".encode() for i in range(40)]
+    settings = {"drop": 0.2, "partial_write": 0.5, "partial_pause": 0}
+
+    runs = [deliver(settings, frames, seed=7) for _ in range(3)]
+
+    assert runs[0][0] == runs[1][0] == runs[2][0]
+    assert 0 < runs[0][1]["partial_writes"] < 40
+
+
+def test_channel_latency_and_bandwidth():
+    """Test that frames are delayed in order and slowed to the bandwidth cap."""
+    started = time.monotonic()
+    written, stats = deliver({"latency": 0.05, "bandwidth": 1000}, [b"x" * 100, b"y" * 100])
+
+    assert written == [b"x" * 100, b"y" * 100]
+    assert time.monotonic() - started >= 0.25
+    assert stats["delivered"] == 2
+
+
+def test_stdio_proxy(tmp_path):
+    """Test that a server behind the proxy still answers and the session's counters are kept."""
+    server = tmp_path / "server.py"
+    server.write_text(ECHO_SERVER)
+    profile = tmp_path / "chaos.json"
+    profile.write_text(json.dumps({"seed": 1, "latency": 0.01, "server_to_client": {"partial_write": 1}}))
+    stats = tmp_path / "stats.ndjson"
+
+    transport = StdioTransportAdapter(chaos_server_command(f"{sys.executable} {server}", str(profile), str(stats)))
+    assert transport.start()
+    try:
+        for i in range(3):
+            assert transport.send_request({"jsonrpc": "2.0", "id": i, "method": "tools/list"})["id"] == i
+    finally:
+        transport.stop()
+
+    records = read_chaos_stats(str(stats))
+    assert len(records) == 1
+    server_to_client = records[0]["directions"]["server_to_client"]
+    assert server_to_client["delivered"] >= 3 and server_to_client["partial_writes"] >= 3
+
+
+def test_http_proxy():
+    """Test that the HTTP proxy forwards requests and drops responses."""
+    class Upstream(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            data = json.dumps({"echo": json.loads(body)}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    target = f"http://127.0.0.1:{upstream.server_address[1]}"
+
+    def post(proxy):
+        connection = http.client.HTTPConnection("127.0.0.1", proxy.server.server_address[1], timeout=5)
+        connection.request("POST", "/mcp", body=json.dumps({"id": 1}), headers={"Content-Type": "application/json"})
+        return connection.getresponse()
+
+    proxy = ChaosHTTPProxy(ChaosProfile({"latency": 0.01, "server_to_client": {"partial_write": 1}}), target).start()
+    lossy = ChaosHTTPProxy(ChaosProfile({"server_to_client": {"drop": 1}}), target).start()
+    try:
+        assert json.loads(post(proxy).read()) == {"echo": {"id": 1}}
+        with pytest.raises((http.client.RemoteDisconnected, ConnectionError)):
+            post(lossy)
+    finally:
+        proxy.stop()
+        lossy.stop()
+        upstream.shutdown()
+
+    assert proxy.stats()["directions"]["server_to_client"]["partial_writes"] == 1
+    assert lossy.stats()["directions"]["server_to_client"]["dropped"] == 1
+
+
+def test_summary_and_markdown():
+    """Test the report section with the clean baseline."""
+    channel_stats = deliver({"latency": 0.01, "duplicate": 1}, [b"1\n"])[1]
+    latency, baseline = LatencyRecorder(), LatencyRecorder()
+    latency.record("tools/list", 0.020)
+    baseline.record("tools/list", 0.010)
+
+    summary = summarize_chaos(ChaosProfile({"latency": 0.01}),
+                              [{"mode": "stdio", "directions": {"server_to_client": channel_stats}}],
+                              latency, baseline.histograms)
+
+    assert summary["directions"]["server_to_client"]["duplicated"] == 1
+    assert summary["methods"][0]["baseline_p50"] == pytest.approx(0.010, rel=0.02)
+    lines = chaos_to_markdown(summary)
+    assert "| server to client | 1 | 0 | 1 | 0 | 0 |" in "\n".join(lines)
+    assert lines[-1].startswith("| tools/list | 1 |") and lines[-1].endswith("| +100% |")
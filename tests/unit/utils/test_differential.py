@@ -0,0 +1,98 @@
+"""
+Unit tests for the differential comparison module.
+"""
+
+from mcp_testing.utils.differential import (
+    DEFAULT_IGNORE_PATHS,
+    compare_values,
+    compare_exchanges,
+    differential_to_markdown,
+    is_ignored,
+    parse_ignore_paths,
+    summarize_differential,
+)
+
+
+def make_exchange(target, baseline, method="tools/call", target_latency=0.01, baseline_latency=0.02):
+    """Build an exchange in the format recorded by the mirroring transport."""
+    return {
+        "kind": "request",
+        "method": method,
+        "request": {},
+        "target_response": target,
+        "target_error": None,
+        "target_latency": target_latency,
+        "baseline_response": baseline,
+        "baseline_error": None,
+        "baseline_latency": baseline_latency,
+    }
+
+
+class TestDifferential:
+    """Tests for the differential module functions."""
+
+    def test_parse_ignore_paths(self):
+        """Test parsing of the --diff-ignore option."""
+        assert parse_ignore_paths(None) == DEFAULT_IGNORE_PATHS
+        assert parse_ignore_paths("id, result.serverInfo.version") == ["id", "result.serverInfo.version"]
+
+    def test_is_ignored_patterns(self):
+        """Test exact, wildcard and recursive ignore patterns."""
+        assert is_ignored("id", ["id"])
+        assert is_ignored("result.tools.3.name", ["result.tools.*.name"])
+        assert is_ignored("result.content.createdAt", ["**.createdAt"])
+        assert is_ignored("createdAt", ["**.createdAt"])
+        assert not is_ignored("result.name", ["result.tools.*.name"])
+
+    def test_compare_values(self):
+        """Test field-by-field comparison of nested responses."""
+        target = {"id": 1, "result": {"a": 1, "b": [1, 2], "timestamp": "now", "extra": True}}
+        baseline = {"id": 2, "result": {"a": 2, "b": [1], "timestamp": "later"}}
+
+        differences = compare_values(target, baseline)
+        paths = {d["path"] for d in differences}
+
+        assert paths == {"result.a", "result.b.length", "result.extra"}
+        extra = next(d for d in differences if d["path"] == "result.extra")
+        assert extra["baseline"] == "<missing>"
+
+    def test_compare_identical_values(self):
+        """Test that identical values produce no differences."""
+        value = {"result": {"tools": [{"name": "echo"}]}}
+        assert compare_values(value, value) == []
+
+    def test_compare_exchanges_skips_notifications_and_reports_errors(self):
+        """Test exchange comparison including transport errors."""
+        notification = make_exchange(None, None, method="initialized")
+        notification["kind"] = "notification"
+        errored = make_exchange(None, {"result": {}})
+        errored["target_error"] = "timeout"
+
+        comparisons = compare_exchanges([notification, errored])
+
+        assert len(comparisons) == 1
+        assert comparisons[0]["differences"][0]["path"] == "<transport>"
+        assert comparisons[0]["differences"][0]["target"] == "timeout"
+
+    def test_summarize_and_render(self):
+        """Test summary totals, latency deltas and the Markdown section."""
+        exchanges = {
+            "test_echo": [
+                make_exchange({"result": {"echo": "hi"}}, {"result": {"echo": "hi"}}),
+                make_exchange({"result": {"echo": "hi"}}, {"result": {"echo": "bye"}}),
+            ]
+        }
+
+        summary = summarize_differential(exchanges)
+
+        assert summary["total_requests"] == 2
+        assert summary["total_mismatches"] == 1
+        test = summary["tests"][0]
+        assert round(test["mean_latency_delta"], 3) == -0.01
+
+        lines = differential_to_markdown(summary, "python baseline.py")
+        report = "\n".join(lines)
+        assert "## Differential Comparison" in report
+        assert "`python baseline.py`" in report
+        assert "| Echo | 2 | 1 |" in report
+        assert "`result.echo`" in report
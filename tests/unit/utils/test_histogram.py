@@ -0,0 +1,91 @@
+"""
+Unit tests for the latency histogram module.
+"""
+
+import math
+import random
+
+import pytest
+
+from mcp_testing.utils.histogram import LatencyHistogram, LatencyRecorder
+
+
+class TestLatencyHistogram:
+    """Tests for the LatencyHistogram class."""
+
+    def test_percentiles_within_precision(self):
+        """Test that percentiles stay within the bucket precision of exact values."""
+        rng = random.Random(3)
+        values = sorted(rng.lognormvariate(-6, 1) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for pct in (50, 90, 99, 99.9):
+            exact = values[math.ceil(pct / 100 * len(values)) - 1]
+            assert histogram.percentile(pct) == pytest.approx(exact, rel=0.02, abs=1e-6)
+        assert histogram.count == len(values)
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+        assert histogram.max == values[-1]
+
+    def test_memory_is_constant(self):
+        """Test that the bucket array does not grow with samples or large values."""
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for i in range(10000):
+            histogram.record(i * 0.5)
+
+        assert len(histogram.counts) == size
+        assert histogram.percentile(99.99) == 4999.5
+        assert histogram.percentile(100) == 4999.5
+
+    def test_empty(self):
+        """Test an empty histogram."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0.0
+        assert histogram.mean == 0.0
+        assert histogram.coarse_buckets() == []
+
+    def test_merge_and_serialization(self):
+        """Test merging and round-tripping through to_dict/from_dict."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for _ in range(90):
+            first.record(0.001)
+        for _ in range(10):
+            second.record(0.5)
+
+        merged = LatencyHistogram.from_dict(first.to_dict()).merge(second)
+
+        assert merged.count == 100
+        assert merged.min == 0.001
+        assert merged.max == 0.5
+        assert merged.percentile(50) == pytest.approx(0.001, rel=0.02)
+        assert merged.percentile(95) == pytest.approx(0.5, rel=0.02)
+        assert sum(count for _, _, count in merged.coarse_buckets()) == 100
+
+    def test_merge_rejects_different_configuration(self):
+        """Test that histograms with different precision cannot be merged."""
+        with pytest.raises(ValueError):
+            LatencyHistogram(significant_bits=7).merge(LatencyHistogram(significant_bits=5))
+
+
+class TestLatencyRecorder:
+    """Tests for the LatencyRecorder class."""
+
+    def test_record_merge_and_total(self):
+        """Test per-method recording across recorders."""
+        first, second = LatencyRecorder(), LatencyRecorder()
+        first.record("ping", 0.001)
+        second.record("ping", 0.002)
+        second.record("tools/list", 0.004)
+
+        first.merge(second)
+
+        assert not LatencyRecorder()
+        assert first.histograms["ping"].count == 2
+        assert first.total().count == 3
+        restored = LatencyRecorder.from_dict(first.to_dict())
+        assert set(restored.histograms) == {"ping", "tools/list"}
+        # Merging copies, so the source recorder is not aliased
+        second.record("tools/list", 0.004)
+        assert first.histograms["tools/list"].count == 1
@@ -0,0 +1,137 @@
+"""
+Unit tests for the run history module.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.history import (
+    RunHistory,
+    compare_to_history,
+    history_to_markdown,
+    mann_whitney_greater,
+)
+
+RESULTS = [
+    {"name": "test_initialization", "passed": True, "duration": 0.6,
+     "phases": {"launch": 0.5, "initialize": 0.05, "test": 0.05}},
+    {"name": "test_tools_list", "passed": False, "duration": 0.8},
+    {"name": "test_shutdown", "passed": True, "skipped": True, "duration": 0},
+]
+
+
+def recorder(method, center, count=200, seed=0):
+    """Build a recorder with latencies spread around ``center`` seconds."""
+    rng = random.Random(seed)
+    latency = LatencyRecorder()
+    for _ in range(count):
+        latency.record(method, center * rng.uniform(0.8, 1.2))
+    return latency
+
+
+class TestMannWhitney:
+    """Tests for the Mann-Whitney U test."""
+
+    def test_exact_matches_enumeration(self):
+        """Test the exact small-sample p-value against brute-force enumeration."""
+        sample, baseline = [5, 9, 11], [1, 2, 6, 8, 10]
+        u, p = mann_whitney_greater([(x, 1) for x in sample], [(x, 1) for x in baseline])
+
+        values = sample + baseline
+        as_large = 0
+        combinations = list(itertools.combinations(values, len(sample)))
+        for chosen in combinations:
+            rest = [v for v in values if v not in chosen]
+            as_large += sum(x > y for x in chosen for y in rest) >= u
+        assert u == 11
+        assert p == pytest.approx(as_large / len(combinations))
+
+    def test_large_shift_is_significant(self):
+        """Test the normal approximation on weighted samples."""
+        _, p = mann_whitney_greater([(2.0, 300), (3.0, 300)], [(1.0, 300), (2.0, 300)])
+        assert p < 1e-6
+        _, p = mann_whitney_greater([(1.0, 300), (2.0, 300)], [(2.0, 300), (3.0, 300)])
+        assert p > 0.99
+
+    def test_empty_sample(self):
+        """Test that an empty sample is never significant."""
+        assert mann_whitney_greater([], [(1.0, 5)]) == (0.0, 1.0)
+
+
+class TestRunHistory:
+    """Tests for storing and comparing runs."""
+
+    def test_record_run(self, tmp_path):
+        """Test that tests, phases and latency percentiles are stored."""
+        with RunHistory(str(tmp_path / "history.sqlite")) as history:
+            run_id = history.record_run("echo", "2025-03-26", RESULTS, recorder("ping", 0.001),
+                                        server_version="1.2.0")
+            db = history.connection
+
+            assert db.execute("SELECT server, server_version, total, passed, failed FROM runs").fetchone() == \
+                ("echo", "1.2.0", 3, 2, 1)
+            assert db.execute("SELECT seconds FROM test_phases WHERE test = 'test_initialization' "
+                              "AND phase = 'launch'").fetchone() == (0.5,)
+            count, p50 = db.execute("SELECT count, p50 FROM method_latency WHERE run_id = ?",
+                                    (run_id,)).fetchone()
+            assert count == 200
+            assert 0.0008 < p50 < 0.0012
+            assert history.test_durations("echo", "2025-03-26") == {
+                "test_initialization": [0.6], "test_tools_list": [0.8]}
+
+    def test_recent_runs_are_scoped(self, tmp_path):
+        """Test that the baseline only includes the same server and protocol version."""
+        with RunHistory(str(tmp_path / "history.sqlite")) as history:
+            first = history.record_run("echo", "2025-03-26", RESULTS)
+            history.record_run("other", "2025-03-26", RESULTS)
+            history.record_run("echo", "2024-11-05", RESULTS)
+            last = history.record_run("echo", "2025-03-26", RESULTS)
+
+            assert history.recent_runs("echo", "2025-03-26", 10) == [last, first]
+            assert history.recent_runs("echo", "2025-03-26", 10, before=last) == [first]
+
+    def test_compare_flags_slowdown(self, tmp_path):
+        """Test that a consistent slowdown is a regression and unchanged methods are not."""
+        with RunHistory(str(tmp_path / "history.sqlite")) as history:
+            for seed in range(5):
+                baseline = recorder("tools/call", 0.010, seed=seed)
+                baseline.merge(recorder("ping", 0.001, seed=seed))
+                history.record_run("echo", "2025-03-26", RESULTS, baseline)
+
+            current = recorder("tools/call", 0.015, seed=99)
+            current.merge(recorder("ping", 0.001, seed=99))
+            comparison = compare_to_history(history, "echo", "2025-03-26", current)
+
+        assert comparison["baseline_runs"] == 5
+        assert comparison["regressions"] == ["tools/call"]
+        rows = {row["method"]: row for row in comparison["methods"]}
+        assert rows["tools/call"]["ratio"] == pytest.approx(1.5, rel=0.1)
+        assert not rows["ping"]["regression"]
+
+        report = "\n".join(history_to_markdown(comparison))
+        assert "❌ 1 regression" in report
+        assert "| tools/call | 200 |" in report
+
+    def test_small_but_significant_shift_needs_min_ratio(self, tmp_path):
+        """Test that a statistically significant but small slowdown is not flagged."""
+        with RunHistory(str(tmp_path / "history.sqlite")) as history:
+            for seed in range(3):
+                history.record_run("echo", "2025-03-26", RESULTS, recorder("ping", 0.010, 2000, seed))
+            comparison = compare_to_history(history, "echo", "2025-03-26",
+                                            recorder("ping", 0.0108, 2000, 99))
+
+        row = comparison["methods"][0]
+        assert row["p_value"] < 0.01
+        assert not row["regression"]
+
+    def test_not_enough_history(self, tmp_path):
+        """Test that no comparison is made without enough earlier runs."""
+        with RunHistory(str(tmp_path / "history.sqlite")) as history:
+            history.record_run("echo", "2025-03-26", RESULTS, recorder("ping", 0.001))
+            comparison = compare_to_history(history, "echo", "2025-03-26", recorder("ping", 0.1))
+
+        assert comparison["regressions"] == []
+        assert "Not enough history" in "\n".join(history_to_markdown(comparison))
@@ -0,0 +1,189 @@
+"""
+Unit tests for the load generator module.
+"""
+
+import random
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from mcp_testing.utils.load_generator import (
+    BenchmarkSession,
+    LoadGenerator,
+    LoadStats,
+    WorkloadMix,
+    benchmark_to_markdown,
+)
+
+
+class FakeSession:
+    """Session stand-in that answers after a fixed delay."""
+
+    def __init__(self, delay=0.0, fail_methods=()):
+        self.delay = delay
+        self.fail_methods = fail_methods
+        self.opened = False
+        self.closed = False
+
+    def open(self):
+        self.opened = True
+
+    def close(self):
+        self.closed = True
+
+    def execute(self, method, target):
+        if self.delay:
+            time.sleep(self.delay)
+        return method not in self.fail_methods
+
+
+class TestWorkloadMix:
+    """Tests for the WorkloadMix class."""
+
+    def test_parse(self):
+        """Test parsing of operation, target and weight."""
+        mix = WorkloadMix.parse("ping=5, tools/call:echo=3,resources/read")
+        assert mix.operations == [
+            ("ping", None, 5.0),
+            ("tools/call", "echo", 3.0),
+            ("resources/read", None, 1.0),
+        ]
+        assert mix.labels() == ["ping", "tools/call:echo", "resources/read"]
+
+    def test_parse_invalid(self):
+        """Test that bad weights and empty mixes are rejected."""
+        with pytest.raises(ValueError):
+            WorkloadMix.parse("ping=fast")
+        with pytest.raises(ValueError):
+            WorkloadMix.parse("ping=0")
+        with pytest.raises(ValueError):
+            WorkloadMix.parse("")
+
+    def test_choose_follows_weights(self):
+        """Test that operations are chosen in proportion to their weights."""
+        mix = WorkloadMix.parse("ping=3,tools/list=1")
+        rng = random.Random(7)
+        picks = [mix.choose(rng)[0] for _ in range(4000)]
+        assert 0.7 < picks.count("ping") / len(picks) < 0.8
+
+
+class TestBenchmarkSession:
+    """Tests for request construction in BenchmarkSession."""
+
+    def test_build_tool_call_from_schema(self):
+        """Test that tool arguments are generated from the input schema."""
+        session = BenchmarkSession("server", "2025-03-26", name="w0")
+        session.tools = {
+            "add": {"name": "add", "inputSchema": {"properties": {
+                "a": {"type": "number"}, "b": {"type": "number"}}}}
+        }
+
+        request = session.build_request("tools/call", "add")
+
+        assert request["id"] == "w0-1"
+        assert request["params"]["name"] == "add"
+        assert set(request["params"]["arguments"]) == {"a", "b"}
+        assert session.build_request("ping", None)["id"] == "w0-2"
+
+    def test_build_resource_read(self):
+        """Test resources/read uses the discovered resource unless a target is given."""
+        session = BenchmarkSession("server", "2025-03-26")
+        with pytest.raises(ValueError):
+            session.build_request("resources/read", None)
+
+        session.resource_uri = "file:///a"
+        assert session.build_request("resources/read", None)["params"] == {"uri": "file:///a"}
+        assert session.build_request("resources/read", "file:///b")["params"] == {"uri": "file:///b"}
+
+    def test_execute_reports_errors(self):
+        """Test that JSON-RPC errors are reported as failures."""
+        session = BenchmarkSession("server", "2025-03-26")
+        session.transport = MagicMock()
+        session.transport.send_request.side_effect = [
+            {"jsonrpc": "2.0", "id": "x", "result": {}},
+            {"jsonrpc": "2.0", "id": "x", "error": {"code": -32601, "message": "nope"}},
+        ]
+        assert session.execute("ping", None) is True
+        assert session.execute("ping", None) is False
+
+
+class TestLoadStats:
+    """Tests for statistics and rendering."""
+
+    def test_summary_and_markdown(self):
+        """Test summary totals and the Markdown report section."""
+        stats = LoadStats()
+        for _ in range(9):
+            stats.record("ping", 0.001, True)
+        stats.record("tools/call:echo", 0.010, False)
+
+        summary = stats.summary(elapsed=2.0)
+        summary.update({"mode": "closed", "concurrency": 2})
+
+        assert summary["overall"]["count"] == 10
+        assert summary["overall"]["throughput"] == 5.0
+        assert summary["overall"]["error_rate"] == 0.1
+        assert summary["operations"]["tools/call:echo"]["errors"] == 1
+
+        report = "\n".join(benchmark_to_markdown(summary))
+        assert "Closed loop, 2 sessions" in report
+        assert "| ping | 9 | 0 |" in report
+        assert "p99.9" in report
+        assert "### tools/call:echo" in report
+
+
+class TestLoadGenerator:
+    """Tests for the closed-loop and open-loop runs."""
+
+    def test_closed_loop_request_count(self):
+        """Test that a closed loop stops after the requested number of requests."""
+        sessions = []
+
+        def factory(index):
+            session = FakeSession(fail_methods=("tools/list",))
+            sessions.append(session)
+            return session
+
+        generator = LoadGenerator(factory, WorkloadMix.parse("ping=1,tools/list=1"),
+                                  concurrency=3, seed=1)
+        summary = generator.run_closed_loop(requests=200)
+
+        assert summary["overall"]["count"] == 200
+        assert summary["overall"]["errors"] == summary["operations"]["tools/list"]["count"]
+        assert len(sessions) == 3
+        assert all(s.opened and s.closed for s in sessions)
+
+    def test_open_loop_counts_queueing_delay(self):
+        """Test that open-loop latency includes time spent waiting for a session."""
+        generator = LoadGenerator(lambda i: FakeSession(delay=0.02), WorkloadMix.parse("ping"),
+                                  concurrency=1)
+
+        # 100 req/s against a server that handles 50 req/s: the backlog grows
+        summary = generator.run_open_loop(rate=100, duration=0.3)
+
+        assert summary["mode"] == "open"
+        assert summary["overall"]["count"] == 30
+        assert summary["overall"]["max"] > 0.2
+        assert summary["overall"]["percentiles"]["50.0"] > 0.05
+
+    def test_open_loop_drain_timeout_counts_dropped_requests(self):
+        """Test that requests not started before the drain deadline count as errors."""
+        generator = LoadGenerator(lambda i: FakeSession(delay=0.05), WorkloadMix.parse("ping"))
+
+        summary = generator.run_open_loop(rate=100, duration=0.2, drain_timeout=0.0)
+
+        assert summary["overall"]["count"] == 20
+        assert summary["overall"]["errors"] > 0
+
+    def test_failed_session_open_closes_others(self):
+        """Test that sessions are cleaned up when one fails to open."""
+        good = FakeSession()
+        bad = FakeSession()
+        bad.open = MagicMock(side_effect=ConnectionError("boom"))
+        sessions = iter([good, bad])
+
+        generator = LoadGenerator(lambda i: next(sessions), WorkloadMix.parse("ping"), concurrency=2)
+        with pytest.raises(ConnectionError):
+            generator.run_closed_loop(requests=1)
+        assert good.closed
@@ -0,0 +1,156 @@
+"""
+Unit tests for trace replay.
+"""
+
+import json
+import sys
+import textwrap
+import time
+
+import pytest
+
+from mcp_testing.utils.load_generator import BenchmarkSession
+from mcp_testing.utils.replay import TraceReplayer, load_traced_sessions, replay_to_markdown
+from mcp_testing.utils.trace import CLIENT_TO_SERVER, SERVER_TO_CLIENT, TraceWriter, read_trace
+
+# Hands out a fresh resource URI per session and reads back only URIs it issued
+SERVER = textwrap.dedent("""
+    import json, sys, uuid
+    issued = set()
+
+    def answer(message):
+        method, params = message["method"], message.get("params", {})
+        if method == "initialize":
+            return {"result": {"protocolVersion": params["protocolVersion"], "capabilities": {},
+                               "serverInfo": {"name": "replay-test", "version": "1"}}}
+        if method == "resources/create":
+            uri = f"mem://{uuid.uuid4()}"
+            issued.add(uri)
+            return {"result": {"uri": uri}}
+        if method == "resources/read":
+            if params.get("uri") not in issued:
+                return {"error": {"code": -32602, "message": "unknown resource"}}
+            return {"result": {"contents": [{"uri": params["uri"], "text": "hello"}]}}
+        if method == "tools/list":
+            return {"result": {"tools": []}}
+        return {"result": {}}
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        batch = message if isinstance(message, list) else [message]
+        responses = [{"jsonrpc": "2.0", "id": m["id"], **answer(m)} for m in batch if "id" in m]
+        if responses:
+            print(json.dumps(responses if isinstance(message, list) else responses[0]), flush=True)
+""")
+
+
+def frame(t, direction, message):
+    """Build a trace record."""
+    return {"t": t, "dir": direction, "size": 0, "frame": json.dumps(message), "session": "s"}
+
+
+def recorded_session():
+    """A traced session that creates a resource, reads it back and lists tools."""
+    return [
+        frame(0.0, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 0, "method": "initialize",
+                                      "params": {"protocolVersion": "2025-03-26"}}),
+        frame(0.01, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": 0, "result": {}}),
+        frame(0.02, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "method": "notifications/initialized"}),
+        frame(0.10, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 1, "method": "resources/create"}),
+        frame(0.11, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": 1, "result": {"uri": "mem://traced"}}),
+        frame(0.20, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 1, "method": "resources/read",
+                                       "params": {"uri": "mem://traced"}}),
+        frame(0.22, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": 1, "result": {
+            "contents": [{"uri": "mem://traced", "text": "hello"}]}}),
+        frame(0.30, CLIENT_TO_SERVER, [{"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+                                       {"jsonrpc": "2.0", "id": 3, "method": "ping"}]),
+        frame(0.31, SERVER_TO_CLIENT, [{"jsonrpc": "2.0", "id": 2, "result": {"tools": ["stale"]}},
+                                       {"jsonrpc": "2.0", "id": 3, "result": {}}]),
+        frame(0.40, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 9, "method": "shutdown"}),
+    ]
+
+
+def test_load_traced_sessions():
+    """Test that setup is skipped, offsets start at the first step and reused ids are matched in order."""
+    sessions = load_traced_sessions(recorded_session())
+
+    assert len(sessions) == 1 and sessions[0]["protocol_version"] == "2025-03-26"
+    steps = sessions[0]["steps"]
+    assert [step["method"] for step in steps] == ["resources/create", "resources/read", "batch"]
+    assert [step["offset"] for step in steps] == pytest.approx([0.0, 0.1, 0.2])
+    assert steps[1]["response"]["result"]["contents"][0]["text"] == "hello"
+    assert steps[1]["latency"] == pytest.approx(0.02)
+    assert len(steps[2]["response"]) == 2
+
+
+def test_load_traced_sessions_from_trace_files(tmp_path):
+    """Test reading a trace written by the tap."""
+    writer = TraceWriter(str(tmp_path), session="tapped")
+    for record in recorded_session():
+        writer.record(record["dir"], record["frame"].encode() + b"\n")
+    writer.close()
+
+    sessions = load_traced_sessions(read_trace([str(tmp_path)]))
+
+    assert sessions[0]["session"] == "tapped"
+    assert len(sessions[0]["steps"]) == 3
+
+
+def test_replay(tmp_path):
+    """Test replays that follow server-issued URIs and report the diverging response."""
+    server = tmp_path / "server.py"
+    server.write_text(SERVER)
+
+    def session_factory(index, protocol_version):
+        return BenchmarkSession(f"{sys.executable} {server}", protocol_version, name=f"replay-{index}")
+
+    replayer = TraceReplayer(load_traced_sessions(recorded_session()), session_factory,
+                             speed=2.0, replays=2, concurrency=2, timeout=5)
+    started = time.monotonic()
+    summary = replayer.run()
+
+    assert time.monotonic() - started >= 0.1
+    assert summary["failures"] == []
+    assert (summary["requests"], summary["errors"]) == (6, 0)
+    methods = {row["method"]: row for row in summary["methods"]}
+    assert methods["resources/read"]["diverged"] == 0
+    assert methods["batch"]["diverged"] == 2
+    assert methods["resources/create"]["trace_p50"] == pytest.approx(0.01, rel=0.02)
+    assert {d["path"] for d in summary["differences"]} == {"result.tools.length"}
+
+    lines = "\n".join(replay_to_markdown(summary))
+    assert "- **Pace**: 2x traced pace" in lines
+    assert "| batch | 2 | 0 | 2 |" in lines
+    assert "`result.tools.length`" in lines
+
+
+def test_replay_sends_notification_batches_without_waiting(tmp_path):
+    """Test that a traced batch of notifications is sent without waiting for a reply nobody sends."""
+    server = tmp_path / "server.py"
+    server.write_text(SERVER)
+    trace = recorded_session()
+    trace.insert(-1, frame(0.35, CLIENT_TO_SERVER, [
+        {"jsonrpc": "2.0", "method": "notifications/progress", "params": {"progressToken": 1, "progress": 1}},
+        {"jsonrpc": "2.0", "method": "notifications/roots/list_changed"}]))
+
+    def session_factory(index, protocol_version):
+        return BenchmarkSession(f"{sys.executable} {server}", protocol_version)
+
+    sessions = load_traced_sessions(trace)
+    assert [step["method"] for step in sessions[0]["steps"]][-1] == "batch"
+    started = time.monotonic()
+    summary = TraceReplayer(sessions, session_factory, speed=None, timeout=3).run()
+
+    assert summary["failures"] == []
+    assert time.monotonic() - started < 3
+    assert summary["requests"] == 3
+
+
+def test_replay_reports_failed_sessions():
+    """Test that a server that cannot start is reported as a failed replay."""
+    def session_factory(index, protocol_version):
+        return BenchmarkSession("/nonexistent/server", protocol_version)
+
+    summary = TraceReplayer(load_traced_sessions(recorded_session()), session_factory, speed=None).run()
+
+    assert len(summary["failures"]) == 1 and summary["requests"] == 0
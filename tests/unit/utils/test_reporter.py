@@ -3,7 +3,8 @@ Unit tests for the reporter module.
 """
 
 import pytest
-from mcp_testing.utils.reporter import extract_server_name, generate_markdown_report
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.reporter import extract_server_name, generate_markdown_report, latency_to_markdown
 
 class TestReporter:
     """Tests for the reporter module functions."""
@@ -93,4 +94,22 @@ class TestReporter:
         }
         
         very_poor_report = generate_markdown_report(very_poor_results, server_command, protocol_version)
-        assert "**Compliance Status**: ❌ Non-Compliant (50.0%)" in very_poor_report 
\ No newline at end of file
+        assert "**Compliance Status**: ❌ Non-Compliant (50.0%)" in very_poor_report 
+
+    def test_latency_to_markdown(self):
+        """Test the per-method latency section with percentiles and histograms."""
+        assert latency_to_markdown(LatencyRecorder()) == []
+
+        recorder = LatencyRecorder()
+        for _ in range(10):
+            recorder.record("tools/call", 0.003)
+        recorder.record("tools/call", 0.100)
+        recorder.record("initialize", 0.020)
+
+        report = "\n".join(latency_to_markdown(recorder.to_dict()))
+
+        assert "## Latency by Method" in report
+        assert "| tools/call | 11 |" in report
+        assert "### initialize" in report
+        assert "#" * 40 in report
+
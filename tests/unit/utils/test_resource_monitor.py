@@ -0,0 +1,105 @@
+"""
+Unit tests for the resource monitor module.
+"""
+
+import os
+
+import pytest
+
+from mcp_testing.utils import resource_monitor
+from mcp_testing.utils.resource_monitor import (
+    ResourceMonitor,
+    read_process_stats,
+    resources_to_markdown,
+)
+
+
+def write_proc_entry(root, pid, ppid, utime, stime, threads, rss_pages, fds):
+    """Create a fake /proc/<pid> entry."""
+    entry = root / str(pid)
+    (entry / "fd").mkdir(parents=True)
+    for fd in range(fds):
+        (entry / "fd" / str(fd)).write_text("")
+    # pid (comm) state ppid ... with utime, stime, num_threads and rss at their stat positions
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(utime), str(stime)] + ["0"] * 4 + [str(threads)] + ["0"] * 3 + [str(rss_pages)]
+    (entry / "stat").write_text(f"{pid} (my server) " + " ".join(fields) + "\n")
+
+
+class TestReadProcessStats:
+    """Tests for read_process_stats."""
+
+    def test_includes_descendants(self, tmp_path):
+        """Test that a process tree is summed and unrelated processes are ignored."""
+        write_proc_entry(tmp_path, 100, 1, utime=100, stime=50, threads=2, rss_pages=10, fds=3)
+        write_proc_entry(tmp_path, 101, 100, utime=100, stime=0, threads=4, rss_pages=20, fds=2)
+        write_proc_entry(tmp_path, 200, 1, utime=999, stime=999, threads=9, rss_pages=999, fds=9)
+
+        stats = read_process_stats(100, proc_root=str(tmp_path))
+
+        ticks = resource_monitor.CLOCK_TICKS
+        assert stats["cpu_seconds"] == pytest.approx(250 / ticks)
+        assert stats["threads"] == 6
+        assert stats["rss_bytes"] == 30 * resource_monitor.PAGE_SIZE
+        assert stats["fds"] == 5
+
+        only_parent = read_process_stats(100, include_children=False, proc_root=str(tmp_path))
+        assert only_parent["threads"] == 2
+
+    def test_missing_process(self, tmp_path):
+        """Test that a missing process yields None."""
+        assert read_process_stats(12345, proc_root=str(tmp_path)) is None
+
+
+class TestResourceMonitor:
+    """Tests for the ResourceMonitor class."""
+
+    @pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requires /proc")
+    def test_samples_own_process(self):
+        """Test sampling the current process."""
+        monitor = ResourceMonitor(os.getpid(), interval=0.01).start()
+        summary = monitor.stop()
+
+        assert summary["samples"] >= 2
+        assert summary["rss_peak"] > 0
+        assert summary["threads_peak"] >= 1
+        assert summary["rss_growth"] is False
+
+    def test_summary_flags_rss_growth(self):
+        """Test that large RSS growth is flagged."""
+        monitor = ResourceMonitor(1)
+        mb = 1024 * 1024
+        for i, rss in enumerate([80 * mb, 500 * mb, 2048 * mb]):
+            monitor.samples.append({"rss_bytes": rss, "cpu_seconds": i, "fds": 4, "threads": 2, "time": i})
+
+        summary = monitor.summary()
+
+        assert summary["rss_growth"] is True
+        assert summary["rss_peak"] == 2048 * mb
+        assert summary["cpu_seconds"] == 2
+        assert ResourceMonitor(1).summary() is None
+
+    def test_summary_counts_cpu_used_in_window(self):
+        """Test that CPU time spent before sampling began, e.g. by a reused process, is left out."""
+        monitor = ResourceMonitor(1)
+        for i, cpu in enumerate([40.0, 40.5, 41.25]):
+            monitor.samples.append({"rss_bytes": 1, "cpu_seconds": cpu, "fds": 4, "threads": 2, "time": i})
+
+        assert monitor.summary()["cpu_seconds"] == pytest.approx(1.25)
+
+    def test_resources_to_markdown(self):
+        """Test the report section and findings."""
+        assert resources_to_markdown([{"name": "test_a", "passed": True}]) == []
+
+        mb = 1024 * 1024
+        resources = {
+            "samples": 3, "duration": 1.0, "rss_start": 80 * mb, "rss_peak": 2048 * mb,
+            "rss_avg": 900 * mb, "cpu_seconds": 1.5, "fds_peak": 7, "fds_avg": 6.0,
+            "threads_peak": 3, "threads_avg": 2.0, "rss_growth": True,
+        }
+        report = "\n".join(resources_to_markdown([
+            {"name": "test_each_tool", "passed": True, "resources": resources}
+        ]))
+
+        assert "## Server Resources" in report
+        assert "| Each Tool | 2048.0 MB ⚠️ |" in report
+        assert "RSS grew from 80.0 MB to 2048.0 MB" in report
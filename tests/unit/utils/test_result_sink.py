@@ -0,0 +1,125 @@
+"""
+Unit tests for the streaming result sinks.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_testing.utils.result_sink import (
+    CompositeResultSink,
+    JUnitXMLResultSink,
+    NDJSONResultSink,
+    PhaseTimer,
+    create_result_sink,
+    read_ndjson_results,
+)
+from mcp_testing.utils.runner import MCPTestRunner
+
+RUN_INFO = {"server": "Echo Server", "protocol_version": "2025-03-26"}
+
+PASSED = {"name": "test_initialization", "passed": True, "duration": 0.5,
+          "message": "ok", "phases": {"launch": 0.4, "test": 0.1}}
+FAILED = {"name": "test_tools_list", "passed": False, "duration": 1.25,
+          "message": "Expected <tools> & got none"}
+SKIPPED = {"name": "test_shutdown", "passed": True, "skipped": True, "duration": 0,
+           "message": "Test skipped because shutdown is disabled"}
+
+
+class TestNDJSONResultSink:
+    """Tests for the NDJSON sink."""
+
+    def test_lines_are_flushed_as_tests_finish(self, tmp_path):
+        """Test that each result is on disk before the sink is closed."""
+        path = tmp_path / "out" / "results.ndjson"
+        sink = NDJSONResultSink(str(path))
+        sink.open(RUN_INFO)
+        sink.write(PASSED)
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["type"] for line in lines] == ["run", "test"]
+        assert lines[0]["server"] == "Echo Server"
+        assert lines[1]["phases"] == {"launch": 0.4, "test": 0.1}
+
+        sink.write(FAILED)
+        sink.close({"total": 2, "passed": 1, "failed": 1})
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines[-1] == {"type": "summary", "total": 2, "passed": 1, "failed": 1}
+
+    def test_read_merges_shards_and_skips_truncated_lines(self, tmp_path):
+        """Test reading test records from several files, one of them cut off mid-line."""
+        first, second = tmp_path / "a.ndjson", tmp_path / "b.ndjson"
+        for path, result in ((first, PASSED), (second, FAILED)):
+            sink = NDJSONResultSink(str(path))
+            sink.open(RUN_INFO)
+            sink.write(result)
+            sink.close({"total": 1})
+        with open(second, "a") as f:
+            f.write('{"type": "test", "name": "test_cut')
+
+        results = read_ndjson_results([str(first), str(second)])
+
+        assert [r["name"] for r in results] == ["test_initialization", "test_tools_list"]
+        assert "type" not in results[0]
+
+
+class TestJUnitXMLResultSink:
+    """Tests for the JUnit XML sink."""
+
+    def test_partial_file_then_totals_on_close(self, tmp_path):
+        """Test that test cases stream out and the suite totals are written on close."""
+        path = tmp_path / "results.xml"
+        sink = JUnitXMLResultSink(str(path))
+        sink.open(RUN_INFO)
+        sink.write(PASSED)
+        assert 'name="test_initialization"' in path.read_text()
+
+        sink.write(FAILED)
+        sink.write(SKIPPED)
+        sink.close()
+
+        suite = ET.parse(path).getroot().find("testsuite")
+        assert suite.get("name") == "Echo Server"
+        assert (suite.get("tests"), suite.get("failures"), suite.get("skipped")) == ("3", "1", "1")
+        cases = suite.findall("testcase")
+        assert cases[0].get("classname") == "mcp.2025-03-26"
+        assert cases[0].find("properties/property").get("name") == "phase.launch"
+        assert cases[1].find("failure").get("message") == "Expected <tools> & got none"
+        assert cases[2].find("skipped") is not None
+
+    def test_write_before_open(self, tmp_path):
+        """Test that writing to an unopened sink is an error."""
+        with pytest.raises(RuntimeError):
+            JUnitXMLResultSink(str(tmp_path / "results.xml")).write(PASSED)
+
+
+def test_create_result_sink(tmp_path):
+    """Test that only the requested sinks are created."""
+    assert not create_result_sink()
+    sink = create_result_sink(str(tmp_path / "r.ndjson"), str(tmp_path / "r.xml"))
+    assert [type(s) for s in sink.sinks] == [NDJSONResultSink, JUnitXMLResultSink]
+
+
+def test_phase_timer():
+    """Test that marks record the time since the previous mark and accumulate."""
+    with patch("mcp_testing.utils.result_sink.time.perf_counter", side_effect=[0.0, 1.0, 1.5, 2.5]):
+        timer = PhaseTimer()
+        timer.mark("launch")
+        timer.mark("test")
+        timer.mark("test")
+    assert timer.phases == {"launch": 1.0, "test": 1.5}
+
+
+@pytest.mark.asyncio
+async def test_runner_streams_each_result():
+    """Test that MCPTestRunner hands every result to its sink as it finishes."""
+    sink = CompositeResultSink([MagicMock()])
+    runner = MCPTestRunner(sink=sink)
+    runner.run_test = AsyncMock(side_effect=[PASSED, FAILED])
+
+    await runner.run_tests([(None, "a"), (None, "b")], server_command="server")
+
+    written = [c.args[0] for c in sink.sinks[0].write.call_args_list]
+    assert written == [PASSED, FAILED]
@@ -0,0 +1,87 @@
+"""
+Unit tests for the sharding module.
+"""
+
+import pytest
+
+from mcp_testing.utils.sharding import (
+    compliance_percentage,
+    estimate_costs,
+    merge_results,
+    parse_shard_spec,
+    plan_shards,
+    select_shard,
+    static_weight,
+)
+
+TESTS = [(None, name) for name in (
+    "test_initialization", "test_server_capabilities", "test_tools_list", "test_tool_functionality",
+    "test_each_tool", "test_async_long_running_tool", "test_async_echo_tool", "test_shutdown",
+)]
+
+
+def test_parse_shard_spec():
+    """Test valid and invalid shard specifications."""
+    assert parse_shard_spec("2/4") == (2, 4)
+    assert parse_shard_spec(" 1 / 1 ") == (1, 1)
+    for bad in ("", "0/3", "4/3", "1/0", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard_spec(bad)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 10])
+def test_shards_cover_every_test_once(count):
+    """Test that shards are disjoint, complete and keep the planned order."""
+    shards = plan_shards(TESTS, count)
+
+    assert len(shards) == count
+    assert sorted(t[1] for shard in shards for t in shard) == sorted(t[1] for t in TESTS)
+    for shard in shards:
+        assert shard == [t for t in TESTS if t in shard]
+
+
+def test_static_weights_balance():
+    """Test that heavy tests are spread over shards when there is no history."""
+    assert static_weight("test_async_long_running_tool") > static_weight("test_initialization")
+
+    shards = plan_shards(TESTS, 2)
+    costs = estimate_costs([t[1] for t in TESTS])
+    loads = [sum(costs[t[1]] for t in shard) for shard in shards]
+    assert abs(loads[0] - loads[1]) <= max(costs.values())
+    heavy = {"test_each_tool", "test_async_long_running_tool"}
+    assert all(len(heavy & {t[1] for t in shard}) == 1 for shard in shards)
+
+
+def test_recorded_durations_override_static_weights():
+    """Test that recorded durations drive the plan and scale the fallback weights."""
+    durations = {name: [1.0] for _, name in TESTS if name != "test_async_echo_tool"}
+    durations["test_initialization"] = [30.0, 28.0, 35.0]
+    durations["test_each_tool"] = [2.0]
+    costs = estimate_costs([t[1] for t in TESTS], durations)
+
+    assert costs["test_initialization"] == 30.0
+    # Unknown tests are scaled by the median seconds per unit of static weight
+    assert costs["test_async_echo_tool"] == pytest.approx(2 * 1.0 / 1.5)
+
+    shards = plan_shards(TESTS, 3, durations)
+    assert [(None, "test_initialization")] in shards
+
+
+def test_select_shard_is_deterministic():
+    """Test that every job computes the same plan."""
+    first = [select_shard(TESTS, f"{i}/3") for i in (1, 2, 3)]
+    second = [select_shard(list(TESTS), f"{i}/3") for i in (1, 2, 3)]
+    assert first == second
+
+
+def test_merge_results():
+    """Test combining shard results into one total and compliance percentage."""
+    merged = merge_results([
+        {"results": [{"name": "test_a", "passed": True}, {"name": "test_b", "passed": False}]},
+        {"results": [{"name": "test_shutdown", "passed": True, "skipped": True},
+                     {"name": "test_a", "passed": True, "timeout": False}]},
+    ])
+
+    assert (merged["total"], merged["passed"], merged["failed"], merged["skipped"]) == (4, 2, 1, 1)
+    assert compliance_percentage(merged) == pytest.approx(200 / 3)
+    assert compliance_percentage(merge_results([])) == 100.0
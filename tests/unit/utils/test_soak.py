@@ -0,0 +1,138 @@
+"""
+Unit tests for the soak testing module.
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from mcp_testing.utils.histogram import LatencyRecorder
+from mcp_testing.utils.soak import (
+    SoakRunner,
+    fit_slope,
+    parse_soak_spec,
+    soak_to_markdown,
+    trend_lower_bound,
+)
+
+MB = 1024 * 1024
+
+
+def make_windows(rss, p50, step=60.0):
+    """Build window samples from per-window RSS (MB) and p50 latency (seconds)."""
+    return [
+        {"index": i, "elapsed": (i + 1) * step, "iterations": 10, "requests": 10,
+         "p50": latency, "p99": latency * 2, "mean": latency,
+         "rss_bytes": int(size * MB), "fds": 5}
+        for i, (size, latency) in enumerate(zip(rss, p50))
+    ]
+
+
+async def passing_workload(protocol):
+    protocol.transport.latency.record("tools/list", 0.001)
+    return True, "ok"
+
+
+def test_parse_soak_spec():
+    """Test iteration counts and durations."""
+    assert parse_soak_spec("500") == (500, None)
+    assert parse_soak_spec("90s") == (None, 90.0)
+    assert parse_soak_spec("30m") == (None, 1800.0)
+    assert parse_soak_spec("1.5h") == (None, 5400.0)
+    for bad in ("", "0", "2.5", "10d", "fast"):
+        with pytest.raises(ValueError):
+            parse_soak_spec(bad)
+
+
+def test_fit_slope():
+    """Test the least-squares fit and its confidence bound."""
+    slope, intercept, stderr = fit_slope([0, 1, 2, 3], [1, 3, 5, 7])
+    assert slope == pytest.approx(2.0)
+    assert intercept == pytest.approx(1.0)
+    assert stderr == pytest.approx(0.0)
+    assert fit_slope([1, 1, 1], [1, 2, 3]) == (0.0, 2.0, 0.0)
+
+    # Noisy points: the lower bound is below the fitted slope
+    slope, _, lower = trend_lower_bound([0, 1, 2, 3, 4], [0, 3, 1, 4, 2])
+    assert lower < slope
+
+
+class TestAnalyze:
+    """Tests for the pass/fail decision."""
+
+    def runner(self, **kwargs):
+        return SoakRunner([(passing_workload, "test_tools_list")], iterations=1, **kwargs)
+
+    def test_steady_run_passes(self):
+        """Test that flat RSS and latency pass."""
+        windows = make_windows([20, 20.1, 20, 20.1, 20, 20.1], [0.001, 0.0011, 0.001, 0.0011, 0.001, 0.0011])
+        summary = self.runner().analyze(windows, 60, 360.0, {}, None)
+        assert summary["passed"]
+        assert summary["conclusive"]
+
+    def test_memory_leak_fails(self):
+        """Test that steady RSS growth fails the run."""
+        windows = make_windows([20, 30, 40, 50, 60, 70], [0.001] * 6)
+        summary = self.runner().analyze(windows, 60, 360.0, {}, None)
+        assert not summary["passed"]
+        assert summary["rss_slope_mb_per_hour"] == pytest.approx(600.0)
+        assert "RSS grows" in summary["problems"][0]
+
+    def test_latency_drift_fails(self):
+        """Test that steadily rising latency fails the run."""
+        windows = make_windows([20] * 6, [0.001, 0.002, 0.003, 0.004, 0.005, 0.006])
+        summary = self.runner().analyze(windows, 60, 360.0, {}, None)
+        assert not summary["passed"]
+        assert "latency drifts" in summary["problems"][0]
+
+    def test_short_run_small_change_passes(self):
+        """Test that a small trend in a short run is not extrapolated into a failure."""
+        windows = make_windows([20] * 6, [0.000100, 0.000101, 0.000102, 0.000103, 0.000104, 0.000105], step=1.0)
+        summary = self.runner().analyze(windows, 60, 6.0, {}, None)
+        assert summary["latency_drift_pct_per_hour"] > 25
+        assert summary["passed"]
+
+    def test_too_few_windows_is_inconclusive(self):
+        """Test that runs with fewer than three windows pass but are inconclusive."""
+        summary = self.runner().analyze(make_windows([20, 80], [0.001, 0.01]), 2, 2.0, {}, None)
+        assert summary["passed"]
+        assert not summary["conclusive"]
+        assert "inconclusive" in "\n".join(soak_to_markdown(summary))
+
+
+@pytest.mark.asyncio
+async def test_run_collects_windows():
+    """Test that a run splits iterations into windows and records latency per window."""
+    transport = SimpleNamespace(latency=LatencyRecorder())
+    protocol = SimpleNamespace(transport=transport)
+
+    async def failing_workload(protocol):
+        return False, "bad"
+
+    runner = SoakRunner([(passing_workload, "test_tools_list"), (failing_workload, "test_bad")],
+                        iterations=20, windows=4)
+    summary = await runner.run(protocol, transport)
+
+    assert summary["iterations"] == 20
+    assert len(summary["windows"]) == 4
+    assert all(w["requests"] == 5 for w in summary["windows"])
+    assert summary["failures"] == {"test_bad": 20}
+    assert summary["latency"]["tools/list"]["count"] == 20
+
+    report = "\n".join(soak_to_markdown(summary))
+    assert "| 1 (warm-up) |" in report
+    assert "**Failed test_bad calls**: 20" in report
+
+
+@pytest.mark.asyncio
+async def test_run_stops_on_connection_error():
+    """Test that a lost session ends the soak and fails it."""
+    transport = SimpleNamespace(latency=LatencyRecorder())
+
+    async def broken_workload(protocol):
+        raise ConnectionError("server exited")
+
+    summary = await SoakRunner([(broken_workload, "test_each_tool")], duration=5.0).run(
+        SimpleNamespace(transport=transport), transport)
+
+    assert not summary["passed"]
+    assert summary["error"] == "test_each_tool: server exited"
@@ -0,0 +1,77 @@
+"""
+Unit tests for the cold start benchmark.
+"""
+
+import os
+import sys
+import textwrap
+
+import pytest
+
+from mcp_testing.utils.startup import (
+    STARTUP_PHASES,
+    StartupProbe,
+    measure_startup,
+    startup_to_markdown,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="select() on pipes needs POSIX")
+
+SERVER = textwrap.dedent("""
+    import json, sys, time
+    time.sleep(float(sys.argv[1]))
+    print("starting up", flush=True)
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        result = {"tools": []} if message["method"] == "tools/list" else {"capabilities": {}}
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+""")
+
+
+@pytest.fixture
+def server_command(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER)
+    return lambda delay=0.0: f"{sys.executable} {script} {delay}"
+
+
+def test_probe_times_each_phase(server_command):
+    """Test that startup delay shows up in exec-to-initialize but not after it."""
+    timings = StartupProbe(server_command(0.2), "2025-03-26", dict(os.environ)).run()
+
+    assert timings["error"] is None
+    assert timings["first_byte"] <= timings["initialize"]
+    assert timings["initialize"] >= 0.2
+    assert timings["tools_list"] < timings["initialize"]
+
+
+def test_probe_reports_server_exit(tmp_path):
+    """Test that a server exiting before it responds is reported as an error."""
+    script = tmp_path / "broken.py"
+    script.write_text("import sys; sys.exit(3)\n")
+
+    timings = StartupProbe(f"{sys.executable} {script}", "2025-03-26", dict(os.environ)).run()
+
+    assert "exited with code" in timings["error"]
+    assert "initialize" not in timings
+
+
+def test_probe_timeout(server_command):
+    """Test that a server that never answers in time is reported as a timeout."""
+    timings = StartupProbe(server_command(5), "2025-03-26", dict(os.environ), timeout=0.3).run()
+    assert "No response" in timings["error"]
+
+
+def test_measure_startup_summary(server_command):
+    """Test the summary distributions and Markdown rendering."""
+    summary = measure_startup(server_command(), "2025-03-26", dict(os.environ), runs=3)
+
+    assert summary["failures"] == 0
+    assert all(summary["phases"][phase]["count"] == 3 for phase in STARTUP_PHASES)
+    assert summary["headline"] == summary["phases"]["initialize"]["percentiles"]["50.0"]
+
+    report = "\n".join(startup_to_markdown(summary))
+    assert "## Cold Start" in report
+    assert "| Exec → initialize response | 3 |" in report
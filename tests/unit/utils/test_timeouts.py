@@ -0,0 +1,74 @@
+"""
+Unit tests for the adaptive timeouts module.
+"""
+
+import pytest
+
+from mcp_testing.utils.history import RunHistory
+from mcp_testing.utils.timeouts import (
+    AdaptiveTimeouts,
+    adaptive_timeout,
+    nearest_rank_percentile,
+    timeouts_to_markdown,
+)
+
+
+def test_nearest_rank_percentile():
+    """Test that the p99 of a small sample is its maximum."""
+    values = [float(v) for v in range(1, 101)]
+    assert nearest_rank_percentile(values, 99) == 99.0
+    assert nearest_rank_percentile(values, 50) == 50.0
+    assert nearest_rank_percentile([0.2, 0.1, 0.3], 99) == 0.3
+
+
+def test_adaptive_timeout_is_clamped():
+    """Test the safety factor and the floor and ceiling."""
+    assert adaptive_timeout([1.0, 2.0, 4.0], ceiling=30.0, factor=3.0) == 12.0
+    assert adaptive_timeout([0.01, 0.02, 0.01], ceiling=30.0, floor=1.0) == 1.0
+    assert adaptive_timeout([20.0, 25.0, 22.0], ceiling=30.0, factor=3.0) == 30.0
+    assert adaptive_timeout([0.01, 0.02], ceiling=30.0, min_samples=3) is None
+
+
+def test_timeout_for_falls_back_to_ceiling():
+    """Test that tests without enough history keep the configured timeout."""
+    timeouts = AdaptiveTimeouts({"test_fast": [0.01] * 5, "test_new": [0.01]}, floor=0.5)
+
+    assert timeouts.timeout_for("test_fast", 30.0) == (0.5, True)
+    assert timeouts.timeout_for("test_new", 30.0) == (30.0, False)
+    assert timeouts.timeout_for("test_unknown", 10.0) == (10.0, False)
+    assert timeouts.learned(["test_fast", "test_new"]) == ["test_fast"]
+
+
+def test_from_history_uses_passing_test_phases(tmp_path):
+    """Test that deadlines come from the test phase of passing runs only."""
+    with RunHistory(str(tmp_path / "history.sqlite")) as history:
+        for seconds in (0.5, 0.6, 0.7):
+            history.record_run("echo", "2025-03-26", [
+                {"name": "test_tool_slow", "passed": True, "duration": seconds + 1,
+                 "phases": {"launch": 0.5, "initialize": 0.5, "test": seconds}},
+            ])
+        # A timed-out attempt is not a normal duration
+        history.record_run("echo", "2025-03-26", [
+            {"name": "test_tool_slow", "passed": False, "timeout": True, "duration": 31,
+             "phases": {"launch": 0.5, "initialize": 0.5, "test": 30.0}},
+        ])
+        timeouts = AdaptiveTimeouts.from_history(history, "echo", "2025-03-26", factor=2.0)
+
+    assert sorted(timeouts.durations["test_tool_slow"]) == [0.5, 0.6, 0.7]
+    assert timeouts.timeout_for("test_tool_slow", 30.0) == (pytest.approx(1.4), True)
+
+
+def test_to_dict_and_markdown():
+    """Test the report of the deadlines a run used."""
+    timeouts = AdaptiveTimeouts({"test_a": [0.1, 0.1, 0.1]})
+    results = [
+        {"name": "test_a", "passed": True, "deadline": 1.0, "deadline_learned": True},
+        {"name": "test_b", "passed": False, "timeout": True, "deadline": 30.0, "deadline_learned": False},
+        {"name": "test_skipped", "passed": True, "skipped": True},
+    ]
+    report = timeouts.to_dict(results)
+
+    assert set(report["deadlines"]) == {"test_a", "test_b"}
+    lines = "\n".join(timeouts_to_markdown(report))
+    assert "1 of 2 tests used a deadline learned from history" in lines
+    assert "| test_b | 30.00s (configured) | 0 |" in lines
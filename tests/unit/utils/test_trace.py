@@ -0,0 +1,129 @@
+"""
+Unit tests for the traffic tap and trace analyzer.
+"""
+
+import gzip
+import json
+import os
+import sys
+import textwrap
+
+import pytest
+
+from mcp_testing.transports.stdio import StdioTransportAdapter
+from mcp_testing.utils.trace import (
+    CLIENT_TO_SERVER,
+    SERVER_TO_CLIENT,
+    TraceWriter,
+    analyze_trace,
+    read_trace,
+    trace_files,
+    trace_to_markdown,
+)
+
+# Answers every request with its id
+ECHO_SERVER = textwrap.dedent("""
+    import json, sys
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" in message:
+            print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}), flush=True)
+""")
+
+
+def frame(t, direction, message):
+    """Build a trace record."""
+    text = json.dumps(message)
+    return {"t": t, "dir": direction, "size": len(text), "frame": text, "session": "s"}
+
+
+def test_writer_frames_chunks_and_rotates(tmp_path):
+    """Test that frames split across chunks are joined and old segments are removed."""
+    writer = TraceWriter(str(tmp_path), "server", session="test", max_segment_bytes=60, max_segments=2)
+    writer.record(CLIENT_TO_SERVER, b'{"jsonrpc": "2.0", "id": 1, ')
+    writer.record(CLIENT_TO_SERVER, b'"method": "ping"}\n')
+    for i in range(2, 6):
+        writer.record(SERVER_TO_CLIENT, json.dumps({"jsonrpc": "2.0", "id": i, "result": {}}).encode() + b"\n")
+    writer.close()
+
+    files = trace_files([str(tmp_path)])
+    assert len(files) == 2 and not os.path.exists(tmp_path / "trace_test.0000.ndjson.gz")
+    ids = [json.loads(r["frame"])["id"] for r in read_trace(files)]
+    assert ids == list(range(6 - len(ids), 6))
+    with gzip.open(files[-1], "rt") as f:
+        end = json.loads(f.readlines()[-1])
+    assert end["dropped_chunks"] == 0 and end["end"] >= 0
+
+
+def test_read_trace_tolerates_truncated_segment(tmp_path):
+    """Test that a segment cut short by a killed session is read up to the damage."""
+    writer = TraceWriter(str(tmp_path), session="killed")
+    for i in range(50):
+        writer.record(CLIENT_TO_SERVER, json.dumps({"jsonrpc": "2.0", "id": i, "method": "ping"}).encode() + b"\n")
+    writer.close()
+    path = trace_files([str(tmp_path)])[0]
+    data = open(path, "rb").read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+
+    records = list(read_trace([path]))
+
+    assert 0 < len(records) < 50
+    assert records[0]["session"] == "killed"
+
+
+def test_analyze_trace():
+    """Test latency, sizes, concurrency and the bench mix."""
+    records = [
+        frame(0.0, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 0, "method": "initialize"}),
+        frame(0.01, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": 0, "result": {}}),
+        frame(0.02, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "method": "notifications/initialized"}),
+        frame(1.0, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "echo"}}),
+        frame(1.5, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "echo"}}),
+        frame(1.6, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": "s1", "method": "roots/list"}),
+        frame(1.7, CLIENT_TO_SERVER, {"jsonrpc": "2.0", "id": "s1", "result": {"roots": []}}),
+        frame(2.0, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": 1, "result": {"content": []}}),
+        frame(2.5, SERVER_TO_CLIENT, {"jsonrpc": "2.0", "id": 2, "error": {"code": -1, "message": "x"}}),
+        frame(3.0, CLIENT_TO_SERVER, [{"jsonrpc": "2.0", "id": 3, "method": "tools/list"},
+                                      {"jsonrpc": "2.0", "id": 4, "method": "ping"}]),
+        frame(3.5, SERVER_TO_CLIENT, [{"jsonrpc": "2.0", "id": 3, "result": {}}]),
+    ]
+
+    analysis = analyze_trace(records)
+
+    call = analysis["methods"]["tools/call"]
+    assert (call["requests"], call["errors"], call["unanswered"]) == (2, 1, 0)
+    assert analysis["methods"]["ping"]["unanswered"] == 1
+    assert analysis["latency"]["tools/call"]["count"] == 2
+    assert analysis["latency"]["tools/call"]["max"] == pytest.approx(1.0, rel=0.02)
+    assert analysis["concurrency"]["max"] == 2
+    assert analysis["server_requests"] == {"roots/list": 1}
+    assert analysis["notifications"]["client_to_server"] == {"notifications/initialized": 1}
+    assert analysis["mix"] == "tools/call:echo=2,ping=1,tools/list=1"
+    assert analysis["duration"] == pytest.approx(3.5)
+
+    lines = "\n".join(trace_to_markdown(analysis))
+    assert "- **Bench Mix**: `tools/call:echo=2,ping=1,tools/list=1`" in lines
+    assert "| tools/call | 2 | 1 | 0 |" in lines
+
+
+def test_tap_forwards_and_traces(tmp_path):
+    """Test a session through the tap script."""
+    server = tmp_path / "server.py"
+    server.write_text(ECHO_SERVER)
+    trace_dir = tmp_path / "traces"
+    tap = os.path.join(os.path.dirname(__file__), "..", "..", "..", "mcp_testing", "scripts", "tap.py")
+
+    transport = StdioTransportAdapter(
+        f"{sys.executable} {os.path.abspath(tap)} --trace-dir {trace_dir} -- {sys.executable} {server}")
+    assert transport.start()
+    try:
+        for i in range(3):
+            assert transport.send_request({"jsonrpc": "2.0", "id": i, "method": "tools/list"})["id"] == i
+    finally:
+        transport.stop()
+
+    analysis = analyze_trace(read_trace([str(trace_dir)]))
+    assert analysis["sessions"] == 1
+    assert analysis["methods"]["tools/list"]["requests"] == 3
+    assert analysis["latency"]["tools/list"]["count"] == 3